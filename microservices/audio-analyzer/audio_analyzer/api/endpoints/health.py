@@ -3,7 +3,8 @@
 
 from fastapi import APIRouter
 
-from audio_analyzer.schemas.transcription import HealthResponse
+from audio_analyzer.core.model_cache import model_cache
+from audio_analyzer.schemas.transcription import HealthResponse, LoadedModelInfo
 
 router = APIRouter()
 
@@ -14,6 +15,10 @@ async def health_check() -> HealthResponse:
     Health check endpoint.
     
     Returns:
-        A response indicating the service status, version and a descriptive message.
+        A response indicating the service status, version, a descriptive message and the loaded models.
     """
-    return HealthResponse()
\ No newline at end of file
+    loaded_models = [
+        LoadedModelInfo(model_id=key.model.value, backend=key.backend, device=key.device)
+        for key in model_cache.loaded_models()
+    ]
+    return HealthResponse(loaded_models=loaded_models)
\ No newline at end of file
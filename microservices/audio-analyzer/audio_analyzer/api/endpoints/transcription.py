@@ -1,10 +1,14 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import traceback
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, AsyncIterator, Optional
 
 from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
 from pydantic.json_schema import SkipJsonSchema
 
 from audio_analyzer.schemas.transcription import (
@@ -14,7 +18,10 @@ from audio_analyzer.schemas.transcription import (
     TranscriptionFormData
 )
 from audio_analyzer.core.audio_extractor import AudioExtractor
+from audio_analyzer.core.job_queue import TranscriptionJob, transcription_queue
+from audio_analyzer.core.settings import settings
 from audio_analyzer.core.transcriber import TranscriptionService
+from audio_analyzer.schemas.types import AudioExtractionMode
 from audio_analyzer.utils.file_utils import get_file_duration
 from audio_analyzer.utils.validation import RequestValidation
 from audio_analyzer.utils.transcription_utils import get_video_path, store_transcript_output
@@ -22,6 +29,154 @@ from audio_analyzer.utils.logger import logger
 
 router = APIRouter()
 
+LanguageQuery = Annotated[
+    str | SkipJsonSchema[None], 
+    Query(description="_(Optional)_ Language for transcription. If not provided, auto-detection will be used.")
+]
+
+
+async def _process_transcription(
+    job: TranscriptionJob,
+    request: TranscriptionFormData,
+    video_path: Path,
+    filename: str,
+    language: Optional[str]
+) -> TranscriptionResponse:
+    """
+    Extract audio from the video, transcribe it and store the transcript output.
+    
+    Args:
+        job: The transcription job, checked for cancellation between processing steps
+        request: Form data containing the transcription settings
+        video_path: Path to the video file
+        filename: Name of the video file
+        language: Optional language code for transcription
+    
+    Returns:
+        A response with the transcription status and details
+    """
+    if settings.AUDIO_EXTRACTION_MODE == AudioExtractionMode.MEMORY:
+        # Decode audio into memory, the duration is read while decoding
+        audio, duration = await AudioExtractor.extract_audio_array(video_path)
+        logger.debug("Audio decoded successfully into memory")
+    else:
+        # Extract audio from video
+        audio = await AudioExtractor.extract_audio(video_path)
+        logger.debug(f"Audio extracted successfully to: {audio}")
+        
+        # Get file duration
+        duration = get_file_duration(video_path)
+    logger.debug(f"File duration: {duration} seconds")
+    job.check_cancelled()
+    
+    logger.info(f"Initializing transcription service with model: {request.model_name}, device: {request.device}")
+    transcriber = TranscriptionService(
+        model_name=request.model_name,
+        device=request.device
+    )
+    
+    # Perform transcription
+    job_id, transcript_path = await transcriber.transcribe(
+        audio,
+        language=language,
+        include_timestamps=request.include_timestamps,
+        video_duration=duration,  # Pass the video duration to optimize processing
+        job_id=job.id,
+        audio_name=video_path.stem,
+        segment_callback=job.add_segments  # Segments are streamed to clients of the job as they are transcribed
+    )
+    job.transcript_file = transcript_path
+    job.check_cancelled()
+    
+    # Store the transcript output using the configured backend
+    output_location = store_transcript_output(
+        transcript_path, 
+        job_id, 
+        filename,
+        minio_bucket=request.minio_bucket,
+        video_id=request.video_id
+    )
+
+    if not output_location:
+        raise Exception("Failed to store transcript output.")
+    
+    logger.info(f"Transcription completed using {transcriber.backend.value} on {transcriber.device_type.value}")
+    
+    return TranscriptionResponse(
+        status=TranscriptionStatus.COMPLETED,
+        message="Transcription completed successfully",
+        job_id=job_id,
+        transcript_path=output_location,
+        video_name=filename,
+        video_duration=duration
+    )
+
+
+async def _submit_transcription(request: TranscriptionFormData, language: Optional[str]) -> TranscriptionJob:
+    """
+    Validate the request, get the video and queue its transcription.
+    
+    Args:
+        request: Form data containing the file or MinIO parameters and transcription settings
+        language: Optional language code for transcription
+    
+    Returns:
+        The queued transcription job
+    """
+    # Validate the request parameters
+    RequestValidation.validate_form_data(request)
+
+    logger.info(f"Received transcription request for {'file upload' if request.file else 'MinIO video'}")
+    logger.debug(f"Transcription parameters: model={request.model_name}, device={request.device}, language={language}")
+
+    # Get video path either from direct upload or MinIO
+    video_path, filename = await get_video_path(request)
+
+    # Processing runs on a worker thread with its own event loop, so that the event loop
+    # of the API is not blocked by audio extraction and transcription
+    return transcription_queue.submit(
+        filename,
+        lambda job: asyncio.run(_process_transcription(job, request, video_path, filename, language))
+    )
+
+
+def _get_job(job_id: str) -> TranscriptionJob:
+    job = transcription_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                error_message="Transcription job not found.",
+                details=f"No transcription job with ID '{job_id}' exists."
+            ).model_dump()
+        )
+    return job
+
+
+def _sse_event(event: str, data: BaseModel) -> str:
+    return f"event: {event}\ndata: {data.model_dump_json()}\n\n"
+
+
+async def _stream_job_events(job: TranscriptionJob) -> AsyncIterator[str]:
+    """Server-sent events with the transcribed segments of a job, followed by its final status"""
+    async for segment in job.stream_segments():
+        yield _sse_event("segment", segment)
+    yield _sse_event("status", job.to_response())
+
+
+def _transcription_error(e: Exception) -> HTTPException:
+    error_details = "".join(traceback.format_exception(e))
+    logger.error(f"Transcription failed: {str(e)}")
+    logger.debug(f"Error details: {error_details}")
+
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=ErrorResponse(
+            error_message=f"Transcription failed!",
+            details="An error occurred during transcription. Please check logs for details."
+        ).model_dump()
+    )
+
 
 @router.post(
     "/transcriptions",
@@ -36,10 +191,7 @@ router = APIRouter()
 )
 async def transcribe_video(
     request: Annotated[TranscriptionFormData, Depends()],
-    language: Annotated[
-        str | SkipJsonSchema[None], 
-        Query(description="_(Optional)_ Language for transcription. If not provided, auto-detection will be used.")
-    ] = None
+    language: LanguageQuery = None
 ) -> TranscriptionResponse:
     """
     Transcribe speech from a video file.
@@ -59,72 +211,181 @@ async def transcribe_video(
     """
     
     try:
-        # Validate the request parameters
-        RequestValidation.validate_form_data(request)
+        job = await _submit_transcription(request, language)
 
-        logger.info(f"Received transcription request for {'file upload' if request.file else 'MinIO video'}")
-        logger.debug(f"Transcription parameters: model={request.model_name}, device={request.device}, language={language}")
-    
-        # Get video path either from direct upload or MinIO
-        video_path, filename = await get_video_path(request)
-        
-        # Extract audio from video
-        audio_path = await AudioExtractor.extract_audio(video_path)
-        logger.debug(f"Audio extracted successfully to: {audio_path}")
-        
-        # Get file duration
-        duration = get_file_duration(video_path)
-        logger.debug(f"File duration: {duration} seconds")
-        
-        logger.info(f"Initializing transcription service with model: {request.model_name}, device: {request.device}")
-        transcriber = TranscriptionService(
-            model_name=request.model_name,
-            device=request.device
-        )
-        
-        # Perform transcription
-        job_id, transcript_path = await transcriber.transcribe(
-            audio_path,
-            language=language,
-            include_timestamps=request.include_timestamps,
-            video_duration=duration  # Pass the video duration to optimize processing
-        )
-        
-        # Store the transcript output using the configured backend
-        output_location = store_transcript_output(
-            transcript_path, 
-            job_id, 
-            filename,
-            minio_bucket=request.minio_bucket,
-            video_id=request.video_id
-        )
+        # Wait for the queued job without blocking other requests
+        await transcription_queue.wait(job)
 
-        if not output_location:
-            raise Exception("Failed to store transcript output.")
+        if job.status == TranscriptionStatus.COMPLETED:
+            return job.result
         
-        logger.info(f"Transcription completed using {transcriber.backend.value} on {transcriber.device_type.value}")
+        if job.status == TranscriptionStatus.CANCELLED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=ErrorResponse(
+                    error_message="Transcription job was cancelled.",
+                    details=f"Transcription job '{job.id}' was cancelled before completion."
+                ).model_dump()
+            )
         
-        return TranscriptionResponse(
-            status=TranscriptionStatus.COMPLETED,
-            message="Transcription completed successfully",
-            job_id=job_id,
-            transcript_path=output_location,
-            video_name=filename,
-            video_duration=duration
-        )
+        raise job.error
     
     except HTTPException as http_exc:
         raise http_exc
     
     except Exception as e:
-        error_details = traceback.format_exc()
-        logger.error(f"Transcription failed: {str(e)}")
-        logger.debug(f"Error details: {error_details}")
-        
+        raise _transcription_error(e)
+
+
+@router.post(
+    "/transcriptions/jobs",
+    response_model=TranscriptionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid request body or parameter provided"},
+    },
+    tags=["Transcription API"],
+    summary="Queue transcription of an uploaded video file or a video stored at Minio"
+)
+async def submit_transcription_job(
+    request: Annotated[TranscriptionFormData, Depends()],
+    language: LanguageQuery = None
+) -> TranscriptionResponse:
+    """
+    Queue transcription of a video file and return immediately with the job ID.
+    
+    The video is provided in the same ways as for `/transcriptions`. Use the job ID to get
+    the status and result of the transcription, or to cancel it.
+     
+    Args:
+        request: Form data containing the file or MinIO parameters and transcription settings
+        language: Optional language code for transcription
+    
+    Returns:
+        A response with the pending status and the job ID
+    """
+    
+    try:
+        job = await _submit_transcription(request, language)
+        return job.to_response()
+    
+    except HTTPException as http_exc:
+        raise http_exc
+    
+    except Exception as e:
+        raise _transcription_error(e)
+
+
+@router.get(
+    "/transcriptions/jobs/{job_id}",
+    response_model=TranscriptionResponse,
+    responses={status.HTTP_404_NOT_FOUND: {"model": ErrorResponse}},
+    tags=["Transcription API"],
+    summary="Get status of a transcription job"
+)
+async def get_transcription_job(job_id: str) -> TranscriptionResponse:
+    """
+    Get the status of a transcription job. Completed jobs include the transcript location.
+    
+    Args:
+        job_id: ID of the transcription job
+    
+    Returns:
+        A response with the transcription status and details
+    """
+    return _get_job(job_id).to_response()
+
+
+@router.get(
+    "/transcriptions/jobs/{job_id}/result",
+    response_class=FileResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
+        status.HTTP_409_CONFLICT: {"model": ErrorResponse},
+    },
+    tags=["Transcription API"],
+    summary="Download the transcript of a completed transcription job"
+)
+async def get_transcription_job_result(job_id: str) -> FileResponse:
+    """
+    Download the transcript (SRT or TXT) of a completed transcription job.
+    
+    Args:
+        job_id: ID of the transcription job
+    
+    Returns:
+        The transcript file
+    """
+    job = _get_job(job_id)
+    if job.status != TranscriptionStatus.COMPLETED or job.transcript_file is None or not job.transcript_file.is_file():
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_409_CONFLICT,
             detail=ErrorResponse(
-                error_message=f"Transcription failed!",
-                details="An error occurred during transcription. Please check logs for details."
+                error_message="Transcript is not available.",
+                details=f"Transcription job '{job_id}' is {job.status.value}."
             ).model_dump()
-        )
\ No newline at end of file
+        )
+    
+    return FileResponse(job.transcript_file, filename=job.transcript_file.name)
+
+
+@router.get(
+    "/transcriptions/jobs/{job_id}/stream",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Stream of `segment` events followed by one `status` event",
+        },
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
+    },
+    tags=["Transcription API"],
+    summary="Stream the transcript segments of a transcription job"
+)
+async def stream_transcription_job(job_id: str) -> StreamingResponse:
+    """
+    Stream the transcript of a transcription job as server-sent events, while the transcription
+    is in progress.
+    
+    A `segment` event, with the start and end time in seconds and the text of the segment, is
+    sent for each transcribed segment, in video order, as soon as its audio window is transcribed.
+    Segments transcribed before the stream was opened are sent first. A final `status` event
+    with the status of the job, as returned by `/transcriptions/jobs/{job_id}`, is sent once the
+    job is finished.
+    
+    Args:
+        job_id: ID of the transcription job
+    
+    Returns:
+        A stream of server-sent events
+    """
+    job = _get_job(job_id)
+    return StreamingResponse(
+        _stream_job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete(
+    "/transcriptions/jobs/{job_id}",
+    response_model=TranscriptionResponse,
+    responses={status.HTTP_404_NOT_FOUND: {"model": ErrorResponse}},
+    tags=["Transcription API"],
+    summary="Cancel a transcription job"
+)
+async def cancel_transcription_job(job_id: str) -> TranscriptionResponse:
+    """
+    Cancel a transcription job. A queued job is not processed. A running job stops after its
+    current processing step and its transcript is not stored. Finished jobs are not changed.
+    
+    Args:
+        job_id: ID of the transcription job
+    
+    Returns:
+        A response with the status of the job
+    """
+    _get_job(job_id)
+    return transcription_queue.cancel(job_id).to_response()
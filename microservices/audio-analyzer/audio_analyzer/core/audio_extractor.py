@@ -1,20 +1,39 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import re
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
+import numpy as np
 from fastapi import HTTPException, status
 from moviepy import VideoFileClip, AudioFileClip
+from moviepy.config import FFMPEG_BINARY
 
 from audio_analyzer.core.settings import settings
 from audio_analyzer.utils.logger import logger
 
 
+DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+def _no_audio_stream_error() -> HTTPException:
+    error_msg = "No audio stream found in the video file"
+    logger.error(error_msg)
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "error_message": error_msg,
+            "details": "The video file doesn't contain any audible track that can be transcribed"
+        }
+    )
+
+
 class AudioExtractor:
     """
-    Service for extracting audio from video files using MoviePy
+    Service for extracting audio from video files using MoviePy or an ffmpeg pipe
     """
     
     @staticmethod
@@ -50,15 +69,7 @@ class AudioExtractor:
             logger.debug(f"Opening video file: {video_path}")
             with VideoFileClip(str(video_path)) as video:
                 if video.audio is None:
-                    error_msg = "No audio stream found in the video file"
-                    logger.error(error_msg)
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={
-                            "error_message": error_msg,
-                            "details": "The video file doesn't contain any audible track that can be transcribed"
-                        }
-                    )
+                    raise _no_audio_stream_error()
                 
                 # Extract audio with specific parameters for 16-bit audio
                 audio_params = settings.AUDIO_FORMAT_PARAMS
@@ -97,4 +108,72 @@ class AudioExtractor:
             error_msg = f"Failed to extract audio from video: {e}"
             logger.error(error_msg)
             logger.debug(f"Error details: {traceback.format_exc()}")
-            raise RuntimeError(error_msg) from e
\ No newline at end of file
+            raise RuntimeError(error_msg) from e
+
+    @staticmethod
+    async def extract_audio_array(video_path: Path) -> Tuple[np.ndarray, float]:
+        """
+        Decode audio of a video file into memory through an ffmpeg pipe.
+
+        Audio is decoded to 16 kHz mono float32 PCM, the input format of the Whisper models,
+        without writing an intermediate file. The duration is read from the same ffmpeg run,
+        so the video container is parsed only once.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Tuple containing the audio samples and the duration of the video in seconds
+
+        Raises:
+            HTTPException: If the video has no audio stream
+            RuntimeError: If ffmpeg fails to decode the audio
+        """
+        logger.info(f"Decoding audio from video file into memory: {video_path}")
+        sample_rate = settings.AUDIO_SAMPLE_RATE
+
+        command = [
+            FFMPEG_BINARY, "-hide_banner", "-nostdin",
+            "-i", str(video_path),
+            "-map", "0:a:0", "-vn",
+            "-ac", "1",  # Whisper models take single channel audio
+            "-ar", str(sample_rate),
+            "-f", "f32le", "-acodec", "pcm_f32le",
+            "pipe:1",
+        ]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+        except Exception as e:
+            error_msg = f"Failed to extract audio from video: {e}"
+            logger.error(error_msg)
+            logger.debug(f"Error details: {traceback.format_exc()}")
+            raise RuntimeError(error_msg) from e
+
+        ffmpeg_log = stderr.decode(errors="replace")
+        if process.returncode != 0:
+            if "matches no streams" in ffmpeg_log:
+                raise _no_audio_stream_error()
+
+            error_msg = f"Failed to extract audio from video: ffmpeg exited with code {process.returncode}"
+            logger.error(error_msg)
+            logger.debug(f"ffmpeg output: {ffmpeg_log}")
+            raise RuntimeError(error_msg)
+
+        audio = np.frombuffer(stdout, dtype=np.float32)
+
+        # Use the container duration reported by ffmpeg, or the decoded audio length if not reported
+        if match := DURATION_PATTERN.search(ffmpeg_log):
+            hours, minutes, seconds = match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        else:
+            duration = len(audio) / sample_rate
+
+        logger.info(f"Audio decoded successfully: {len(audio)} samples")
+        logger.debug(f"Audio properties - Sample rate: {sample_rate}, Duration: {duration:.2f} seconds")
+        return audio, duration
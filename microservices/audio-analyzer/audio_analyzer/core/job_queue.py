@@ -0,0 +1,254 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from audio_analyzer.core.settings import settings
+from audio_analyzer.core.transcriber import TranscriptionService
+from audio_analyzer.schemas.transcription import TranscriptionResponse, TranscriptSegment
+from audio_analyzer.schemas.types import TranscriptionStatus
+from audio_analyzer.utils.logger import logger
+
+
+FINISHED_STATUSES = {TranscriptionStatus.COMPLETED, TranscriptionStatus.FAILED, TranscriptionStatus.CANCELLED}
+
+
+class TranscriptionJob:
+    """
+    A transcription request queued for processing along with its progress and result.
+    """
+
+    def __init__(self, video_name: str):
+        self.id = str(uuid.uuid4())[-8:]
+        self.video_name = video_name
+        self.status = TranscriptionStatus.PENDING
+        self.created_at = time.time()
+        self.result: Optional[TranscriptionResponse] = None
+        self.transcript_file: Optional[Path] = None
+        self.error: Optional[Exception] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+        self.segments: List[TranscriptSegment] = []
+        self._segments_lock = threading.Lock()
+        self._listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def add_segments(self, segments: List[Any]) -> None:
+        """
+        Add transcribed segments of the audio, in audio order, and notify the streams of the job.
+
+        Args:
+            segments: Segments with start and end times in centiseconds, as produced by the transcriber
+        """
+        with self._segments_lock:
+            self.segments.extend(
+                TranscriptSegment(start=segment.t0 / 100, end=segment.t1 / 100, text=segment.text.strip())
+                for segment in segments
+            )
+        self.notify()
+
+    def notify(self) -> None:
+        """Wake up the streams of the job, after new segments were added or the job finished"""
+        with self._segments_lock:
+            listeners = list(self._listeners)
+        for loop, event in listeners:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(event.set)
+
+    async def stream_segments(self) -> AsyncIterator[TranscriptSegment]:
+        """
+        Yield the transcribed segments of the job, from the first one, as they are added
+        until the job is finished.
+        """
+        listener = (asyncio.get_running_loop(), asyncio.Event())
+        with self._segments_lock:
+            self._listeners.append(listener)
+
+        try:
+            sent = 0
+            while True:
+                listener[1].clear()
+                # Segments are added before the job finishes, read the status first to not miss any
+                finished = self.finished
+                with self._segments_lock:
+                    segments = self.segments[sent:]
+
+                for segment in segments:
+                    yield segment
+                sent += len(segments)
+
+                if finished:
+                    return
+                await listener[1].wait()
+
+        finally:
+            with self._segments_lock:
+                self._listeners.remove(listener)
+
+    def check_cancelled(self) -> None:
+        """
+        Raise CancelledError if cancellation of the job was requested. Called between
+        processing steps, as a running transcription can not be interrupted.
+        """
+        if self.cancel_event.is_set():
+            raise CancelledError()
+
+    def to_response(self) -> TranscriptionResponse:
+        """Get the current status of the job, including the result if the job is completed"""
+        if self.result is not None:
+            return self.result
+
+        messages = {
+            TranscriptionStatus.PENDING: "Transcription job is queued",
+            TranscriptionStatus.PROCESSING: "Transcription is in progress",
+            TranscriptionStatus.CANCELLED: "Transcription job was cancelled",
+            TranscriptionStatus.FAILED: "Transcription failed! Please check logs for details.",
+        }
+        message = messages.get(self.status, "")
+        if isinstance(self.error, HTTPException) and isinstance(self.error.detail, dict):
+            message = self.error.detail.get("error_message", message)
+
+        return TranscriptionResponse(
+            status=self.status,
+            message=message,
+            job_id=self.id,
+            video_name=self.video_name
+        )
+
+
+class TranscriptionJobQueue:
+    """
+    Queue of transcription jobs processed by a bounded pool of worker threads.
+
+    Transcription runs on the workers, so long videos do not block the event loop and
+    concurrent requests are processed in submission order. Finished jobs are kept for
+    status queries until more than `max_history` jobs exist.
+    """
+
+    def __init__(self, max_workers: int, max_history: int):
+        """
+        Initialize the job queue.
+
+        Args:
+            max_workers: Number of jobs processed concurrently
+            max_history: Number of jobs kept for status queries
+        """
+        self.max_workers = max_workers
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, TranscriptionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcription")
+        logger.info(f"Transcription job queue started with {max_workers} worker(s)")
+
+    def _run_job(self, job: TranscriptionJob, process: Callable[[TranscriptionJob], TranscriptionResponse]) -> None:
+        try:
+            job.check_cancelled()
+            job.status = TranscriptionStatus.PROCESSING
+            logger.info(f"Job {job.id}: processing transcription of {job.video_name}")
+
+            result = process(job)
+
+            job.check_cancelled()
+            job.result = result
+            job.status = TranscriptionStatus.COMPLETED
+            logger.info(f"Job {job.id}: transcription completed")
+
+        except CancelledError:
+            job.status = TranscriptionStatus.CANCELLED
+            logger.info(f"Job {job.id}: transcription cancelled")
+
+        except Exception as e:
+            job.error = e
+            job.status = TranscriptionStatus.FAILED
+            logger.error(f"Job {job.id}: transcription failed: {e}")
+            logger.debug(f"Error details: {traceback.format_exc()}")
+
+        finally:
+            job.notify()
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def submit(
+        self,
+        video_name: str,
+        process: Callable[[TranscriptionJob], TranscriptionResponse]
+    ) -> TranscriptionJob:
+        """
+        Queue a transcription job.
+
+        Args:
+            video_name: Name of the video to be transcribed
+            process: Called with the job on a worker thread. Returns the transcription result.
+
+        Returns:
+            The queued job
+        """
+        job = TranscriptionJob(video_name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+
+        job.future = self._executor.submit(self._run_job, job, process)
+        logger.info(f"Job {job.id}: queued transcription of {video_name}")
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[TranscriptionJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[TranscriptionJob]:
+        """
+        Cancel a job. A queued job is never processed. A running job is stopped after its
+        current processing step and its transcript is not stored.
+
+        Returns:
+            The cancelled job, or None if there is no job with this ID
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            job.status = TranscriptionStatus.CANCELLED
+            job.notify()
+
+        logger.info(f"Job {job.id}: cancellation requested")
+        return job
+
+    async def wait(self, job: TranscriptionJob) -> TranscriptionJob:
+        """Wait, without blocking the event loop, until the job is finished"""
+        if job.future is not None:
+            await asyncio.gather(asyncio.wrap_future(job.future), return_exceptions=True)
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop the workers without waiting for running jobs"""
+        for job in self.list():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+transcription_queue = TranscriptionJobQueue(
+    max_workers=TranscriptionService.transcription_workers(),
+    max_history=settings.TRANSCRIPTION_JOB_HISTORY
+)
@@ -0,0 +1,154 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+from audio_analyzer.core.settings import settings
+from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
+from audio_analyzer.utils.logger import logger
+
+
+class ModelKey(NamedTuple):
+    """Identifies a loaded model instance"""
+    model: WhisperModel
+    backend: TranscriptionBackend
+    device: DeviceType
+
+
+class ModelPool:
+    """
+    Instances of a model, each running one transcription at a time.
+
+    The first instance is loaded when the pool is created. More instances are loaded on
+    demand, up to `size`, when all loaded instances are in use.
+    """
+
+    def __init__(self, loader: Callable[[], Any], size: int):
+        """
+        Initialize the pool and load the first model instance.
+
+        Args:
+            loader: Function which loads and returns a model instance
+            size: Maximum number of model instances
+        """
+        self.size = max(1, size)
+        self._loader = loader
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._idle.put(loader())
+        self._instances = 1
+
+    @property
+    def instances(self) -> int:
+        """Number of loaded model instances"""
+        return self._instances
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """
+        Get a model instance for exclusive use, loading a new instance if all loaded instances
+        are in use and the pool is not full, or else waiting for an instance to be released.
+        """
+        try:
+            instance = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                load = self._instances < self.size
+                if load:
+                    self._instances += 1
+
+            if load:
+                try:
+                    instance = self._loader()
+                except Exception:
+                    with self._lock:
+                        self._instances -= 1
+                    raise
+                logger.debug(f"Loaded model instance {self._instances} of {self.size}")
+            else:
+                instance = self._idle.get()
+
+        try:
+            yield instance
+        finally:
+            self._idle.put(instance)
+
+
+class ModelCache:
+    """
+    Process-wide cache of loaded Whisper models.
+
+    Models are loaded once per (model, backend, device), as a pool of model instances, and
+    shared by all requests. At most `max_size` models are kept loaded; the least recently used
+    model is evicted first.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the model cache.
+
+        Args:
+            max_size: Maximum number of models kept loaded at the same time
+        """
+        self.max_size = max(1, max_size)
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+
+    def get_or_load(self, key: ModelKey, loader: Callable[[], Any]) -> Any:
+        """
+        Get a loaded model from the cache or load it.
+
+        Concurrent requests for the same model wait for a single load. Other models are
+        served from the cache while a model is being loaded.
+
+        Args:
+            key: Model, backend and device of the model
+            loader: Function which loads and returns the model
+
+        Returns:
+            The loaded model
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            logger.info(f"Loading model {key.model.value} for {key.backend.value} on {key.device.value}")
+            start_time = time.time()
+            model = loader()
+            logger.info(f"Model {key.model.value} loaded in {time.time() - start_time:.2f} seconds")
+
+            with self._lock:
+                self._models[key] = model
+                while len(self._models) > self.max_size:
+                    evicted_key, _ = self._models.popitem(last=False)
+                    logger.info(f"Evicted model {evicted_key.model.value} ({evicted_key.backend.value}) from cache")
+                self._load_locks.pop(key, None)
+
+        return model
+
+    def loaded_models(self) -> List[ModelKey]:
+        """Get the keys of the loaded models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self) -> None:
+        """Unload all models"""
+        with self._lock:
+            self._models.clear()
+
+
+model_cache = ModelCache(max_size=settings.WHISPER_MODEL_CACHE_SIZE)
@@ -0,0 +1,146 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from audio_analyzer.utils.logger import logger
+
+
+FRAME_SECONDS = 0.03  # Length of the frames used for voice activity detection
+PADDING_SECONDS = 0.2  # Audio kept before and after each speech region
+MIN_WINDOW_SECONDS = 1.05  # whisper.cpp does not transcribe less than 1 second of audio
+
+
+@dataclass
+class AudioWindow:
+    """A window of audio samples to be transcribed, given as sample offsets"""
+    start: int
+    end: int
+
+    def offset(self, sample_rate: int) -> float:
+        """Start of the window in seconds"""
+        return self.start / sample_rate
+
+    def samples(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Get the samples of the window, padded with silence to the minimum window length"""
+        samples = audio[self.start:self.end]
+        min_samples = int(MIN_WINDOW_SECONDS * sample_rate)
+        if len(samples) < min_samples:
+            samples = np.pad(samples, (0, min_samples - len(samples)))
+        return samples
+
+
+def _frame_energies(audio: np.ndarray, frame_length: int) -> np.ndarray:
+    """Get the RMS energy of each frame in dBFS"""
+    n_frames = len(audio) // frame_length
+    frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int,
+    threshold_db: float,
+    min_silence: float
+) -> List[Tuple[int, int]]:
+    """
+    Detect regions of voice activity, based on the energy of the audio.
+
+    Args:
+        audio: Mono float32 audio samples
+        sample_rate: Sample rate of the audio
+        threshold_db: Frames louder than this level (in dBFS) are considered voice activity
+        min_silence: Silences shorter than this (in seconds) do not split speech regions
+
+    Returns:
+        Start and end sample offsets of the speech regions, including padding
+    """
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    if len(audio) < frame_length:
+        return [(0, len(audio))] if len(audio) else []
+
+    active = _frame_energies(audio, frame_length) > threshold_db
+    if not active.any():
+        return []
+
+    # Find start and end frames of consecutive active frames
+    changes = np.diff(active.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+
+    # Merge regions separated by short silences
+    min_gap = int(min_silence / FRAME_SECONDS)
+    regions = [[starts[0], ends[0]]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    padding = int(PADDING_SECONDS * sample_rate)
+    return [
+        (max(0, int(start) * frame_length - padding), min(len(audio), int(end) * frame_length + padding))
+        for start, end in regions
+    ]
+
+
+def _split_region(audio: np.ndarray, start: int, end: int, window: int, frame_length: int) -> List[Tuple[int, int]]:
+    """Split a speech region longer than a window at the quietest frame of the second half of each window"""
+    parts = []
+    while end - start > window:
+        search_start = start + window // 2
+        energies = _frame_energies(audio[search_start:start + window], frame_length)
+        split = search_start + int(np.argmin(energies)) * frame_length if len(energies) else start + window
+        parts.append((start, split))
+        start = split
+    parts.append((start, end))
+    return parts
+
+
+def split_windows(
+    audio: np.ndarray,
+    sample_rate: int,
+    window_seconds: float,
+    threshold_db: float,
+    min_silence: float
+) -> List[AudioWindow]:
+    """
+    Split audio into windows of at most `window_seconds` which contain voice activity.
+
+    Consecutive speech regions are packed into the same window while they fit, as Whisper
+    processes audio in windows of 30 seconds. Silences between windows are not transcribed.
+
+    Args:
+        audio: Mono float32 audio samples
+        sample_rate: Sample rate of the audio
+        window_seconds: Maximum length of a window in seconds
+        threshold_db: Frames louder than this level (in dBFS) are considered voice activity
+        min_silence: Silences shorter than this (in seconds) do not split speech regions
+
+    Returns:
+        Windows in audio order
+    """
+    window = int(window_seconds * sample_rate)
+    frame_length = int(FRAME_SECONDS * sample_rate)
+
+    regions = []
+    for start, end in detect_speech(audio, sample_rate, threshold_db, min_silence):
+        regions.extend(_split_region(audio, start, end, window, frame_length))
+
+    windows: List[AudioWindow] = []
+    for start, end in regions:
+        if windows and end - windows[-1].start <= window:
+            windows[-1].end = end
+        else:
+            windows.append(AudioWindow(start, end))
+
+    speech_seconds = sum(w.end - w.start for w in windows) / sample_rate
+    logger.debug(
+        f"Split {len(audio) / sample_rate:.2f} seconds of audio into {len(windows)} windows "
+        f"with {speech_seconds:.2f} seconds of audio to be transcribed"
+    )
+    return windows
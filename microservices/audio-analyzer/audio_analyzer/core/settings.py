@@ -8,7 +8,7 @@ from enum import Enum
 from pydantic import DirectoryPath, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from audio_analyzer.schemas.types import DeviceType, WhisperModel, StorageBackend
+from audio_analyzer.schemas.types import AudioExtractionMode, DeviceType, WhisperModel, StorageBackend
 
 class Settings(BaseSettings):
     """
@@ -53,6 +53,13 @@ class Settings(BaseSettings):
     # Whisper configuration
     DEFAULT_WHISPER_MODEL: Optional[WhisperModel] = None
     TRANSCRIPT_LANGUAGE: Optional[str] = None  # If None, auto-detection based on model capabilities will be used
+    WHISPER_MODEL_CACHE_SIZE: int = 2  # Maximum number of whisper models kept loaded in memory
+    PRELOAD_WHISPER_MODELS: bool = True  # Load enabled models at startup, up to the cache size
+    WHISPER_MODEL_INSTANCES: Optional[int] = None  # Instances per loaded model. If None, one per transcription worker or more on CPU
+
+    # Transcription job queue configuration
+    TRANSCRIPTION_WORKERS: Optional[int] = None  # If None, sized by CPU core count and default model size
+    TRANSCRIPTION_JOB_HISTORY: int = 100  # Number of transcription jobs kept for status queries
     
     # Device configuration
     DEFAULT_DEVICE: DeviceType = DeviceType.CPU  # Default compute device to use for transcription
@@ -62,6 +69,13 @@ class Settings(BaseSettings):
     AUDIO_SAMPLE_RATE: int = 16000
     AUDIO_BIT_DEPTH: int = 16
     AUDIO_CHANNELS: int = 1
+    AUDIO_EXTRACTION_MODE: AudioExtractionMode = AudioExtractionMode.MEMORY  # Decode audio in memory or through a WAV file
+
+    # Voice activity segmentation of audio decoded in memory
+    VAD_SEGMENTATION: bool = True  # Split audio into windows on silences and transcribe the windows in parallel
+    VAD_WINDOW_SECONDS: float = 30.0  # Maximum length of a window
+    VAD_MIN_SILENCE_SECONDS: float = 1.0  # Shorter silences do not split speech
+    VAD_ENERGY_THRESHOLD_DB: float = -45.0  # Audio quieter than this level (in dBFS) is silence
     
     # Uploaded video file size limits (in bytes)
     MAX_FILE_SIZE: int = 300 * 1024 * 1024  # 300MB by default
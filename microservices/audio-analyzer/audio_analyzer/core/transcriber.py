@@ -7,9 +7,14 @@ import math
 import traceback
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
+from audio_analyzer.core.model_cache import ModelKey, ModelPool, model_cache
+from audio_analyzer.core.segmenter import AudioWindow, split_windows
 from audio_analyzer.core.settings import settings
 from audio_analyzer.schemas.types import DeviceType, WhisperModel, TranscriptionBackend
 from audio_analyzer.utils.hardware_utils import is_intel_gpu_available
@@ -53,6 +58,7 @@ class TranscriptionService:
         """
         logger.debug("Initializing TranscriptionService")
         self.model = None
+        self.model_pool: Optional[ModelPool] = None
         self.model_name = WhisperModel(model_name.lower()) if model_name else settings.DEFAULT_WHISPER_MODEL
         self.device_type = DeviceType(device.lower()) if device else settings.DEFAULT_DEVICE
         logger.debug(f"Using model: {self.model_name.value} on device: {self.device_type.value}")
@@ -97,14 +103,47 @@ class TranscriptionService:
             logger.warning("No compatible GPU detected or required model not available, falling back to Whisper.cpp backend on CPU")
             return TranscriptionBackend.WHISPER_CPP
 
+    @property
+    def model_key(self) -> ModelKey:
+        """Key of the model in the model cache, based on the model, backend and inference device"""
+        device = DeviceType.CPU if self.backend == TranscriptionBackend.WHISPER_CPP else DeviceType.GPU
+        return ModelKey(self.model_name, self.backend, device)
+
+    @property
+    def model_instances(self) -> int:
+        """
+        Maximum number of instances of the model, each running one transcription at a time.
+        There is an instance for each transcription worker, so concurrent jobs never wait for
+        each other. A whisper.cpp model gets more instances if they fit on the CPU cores, to
+        transcribe the windows of a job in parallel.
+        """
+        if settings.WHISPER_MODEL_INSTANCES:
+            return settings.WHISPER_MODEL_INSTANCES
+        if self.backend == TranscriptionBackend.WHISPER_CPP:
+            return max(self.transcription_workers(), self.optimal_worker_count(self.model_name))
+        return self.transcription_workers()
+
     def _load_model(self):
         """
-        Load the appropriate Whisper model based on the backend.
+        Get the pool of instances of the appropriate Whisper model based on the backend from
+        the model cache. The model is loaded only if it is not loaded already.
         """
-        if self.model is not None:
+        if self.model_pool is not None:
             logger.debug("Model already loaded, skipping initialization")
             return
-            
+
+        self.model_pool = model_cache.get_or_load(
+            self.model_key,
+            lambda: ModelPool(self._create_model, self.model_instances)
+        )
+
+    def _create_model(self) -> Any:
+        """
+        Load the appropriate Whisper model based on the backend.
+
+        Returns:
+            The whisper.cpp model, or a dictionary with the compiled OpenVINO model components
+        """
         logger.info(f"Loading model: {self.model_name.value} using backend: {self.backend}")
         try:
             if self.backend == TranscriptionBackend.WHISPER_CPP:
@@ -125,8 +164,9 @@ class TranscriptionService:
                 n_threads: int = min(max(1, self.num_cores-1), max(thread_count, self.DEFAULT_N_THREADS))
                 logger.debug(f"Using {n_threads} threads for CPU inference based on model size and core count: {self.model_name.value}")
 
-                self.model = Model(str(model_path), n_threads=n_threads)
+                model = Model(str(model_path), n_threads=n_threads)
                 logger.info("whispercpp model loaded successfully")
+                return model
             else: 
                 logger.debug("Initializing OpenVINO Whisper model")
                 import openvino as ov
@@ -159,77 +199,127 @@ class TranscriptionService:
             
                 processor = AutoProcessor.from_pretrained(str(model_path))
                 
-                self.model = {
+                logger.info("OpenVINO Whisper model loaded successfully")
+                return {
                     "encoder": encoder_compiled,
                     "decoder": decoder_compiled,
                     "processor": processor
                 }
-                
-                logger.info("OpenVINO Whisper model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             logger.debug(f"Error details: {traceback.format_exc()}")
             raise RuntimeError(f"Failed to load transcription model: {e}")
 
+    @classmethod
+    def optimal_worker_count(cls, model_name: WhisperModel) -> int:
+        """
+        Get the number of transcriptions which can run concurrently without oversubscribing the
+        CPU cores, as each transcription uses a share of the cores given by the thread discount
+        factor of the model.
+
+        Args:
+            model_name: Whisper model used by most transcriptions
+
+        Returns:
+            Number of transcription workers, at least 1 and at most the number of cores
+        """
+        thread_discount_factor: float = cls.OPTIMAL_THREAD_DISCOUNT_FACTOR.get(model_name, 1.0)
+        return max(1, min(multiprocessing.cpu_count(), int(1 / thread_discount_factor)))
+
+    @classmethod
+    def transcription_workers(cls) -> int:
+        """Get the number of transcription jobs processed concurrently by the job queue"""
+        return settings.TRANSCRIPTION_WORKERS or cls.optimal_worker_count(settings.DEFAULT_WHISPER_MODEL)
+
+    @classmethod
+    def preload_models(cls, models: List[WhisperModel], device: Optional[DeviceType] = None) -> None:
+        """
+        Load models into the model cache, so that the first requests do not wait for model loading.
+        The default model is loaded first and no more models than the cache size are loaded.
+
+        Args:
+            models: Whisper models to be loaded
+            device: Device to load the models for
+        """
+        if settings.DEFAULT_WHISPER_MODEL in models:
+            models = [settings.DEFAULT_WHISPER_MODEL] + [m for m in models if m != settings.DEFAULT_WHISPER_MODEL]
+
+        for model in models[:model_cache.max_size]:
+            try:
+                cls(model_name=model.value, device=device)._load_model()
+            except Exception as e:
+                logger.error(f"Failed to preload model {model.value}: {e}")
+
     async def transcribe(
         self, 
-        audio_path: Path, 
+        audio: Union[Path, np.ndarray], 
         language: Optional[str] = None,
         include_timestamps: bool = True,
-        video_duration: Optional[float] = None
+        video_duration: Optional[float] = None,
+        job_id: Optional[str] = None,
+        audio_name: Optional[str] = None,
+        segment_callback: Optional[Callable[[List[Any]], None]] = None
     ) -> Tuple[str, Path]:
         """
         Transcribe audio using the selected backend.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or 16 kHz mono float32 audio samples
             language: Language code for transcription (optional)
             include_timestamps: Whether to include timestamps in the output
             video_duration: Duration of the video in seconds (optional)
+            job_id: ID of the transcription job, generated if not provided (optional)
+            audio_name: Name used for the output files if audio samples are provided (optional)
+            segment_callback: Called with the segments transcribed so far, in audio order, as soon
+                as they are available. Timestamps are in centiseconds (optional)
             
         Returns:
             Tuple containing the job ID and path to the transcription file
         """
-        logger.info(f"Starting transcription for audio: {audio_path}")
+        logger.info(f"Starting transcription for audio: {audio if isinstance(audio, Path) else audio_name}")
         logger.debug(f"Transcription parameters - language: {language}, include_timestamps: {include_timestamps}, video_duration: {video_duration}")
         
         try:
             self._load_model()
             
-            job_id = str(uuid.uuid4())[-8:]
-            logger.debug(f"Generated job ID: {job_id}")
+            if job_id is None:
+                job_id = str(uuid.uuid4())[-8:]
+                logger.debug(f"Generated job ID: {job_id}")
             
             output_dir = Path(settings.OUTPUT_DIR / "transcript")
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Extract audio file name without extension
-            audio_filename = audio_path.stem
+            audio_filename = audio.stem if isinstance(audio, Path) else (audio_name or "audio")
             
             # Define output paths with audio filename directly concatenated with job_id
             srt_path = output_dir / f"{audio_filename}-{job_id}.srt"
             txt_path = output_dir / f"{audio_filename}-{job_id}.txt"
             logger.debug(f"Output paths - SRT: {srt_path}, TXT: {txt_path}")
             
-            # Choose the appropriate transcription method based on backend
-            if self.backend == TranscriptionBackend.WHISPER_CPP:
-                logger.info("Using whispercpp backend for transcription")
-                await self._transcribe_with_whisper_cpp(
-                    audio_path, 
-                    srt_path, 
-                    txt_path, 
-                    language, 
+            if isinstance(audio, np.ndarray) and settings.VAD_SEGMENTATION:
+                # Transcribe the windows of the audio which have voice activity in parallel
+                await self._transcribe_windows(
+                    audio,
+                    srt_path,
+                    txt_path,
+                    language,
                     include_timestamps,
-                    video_duration
+                    segment_callback=segment_callback
                 )
             else:
-                logger.info("Using OpenVINO backend for transcription")
-                await self._transcribe_with_openvino(
-                    audio_path, 
-                    srt_path, 
-                    txt_path, 
-                    language, 
-                    include_timestamps
-                )
+                # Model instances are shared by all requests for the model, each runs one transcription at a time
+                with self.model_pool.acquire() as model:
+                    self.model = model
+                    await self._transcribe_audio(
+                        audio,
+                        srt_path,
+                        txt_path,
+                        language,
+                        include_timestamps,
+                        video_duration,
+                        segment_callback=segment_callback
+                    )
             
             output_path = srt_path if include_timestamps else txt_path
             logger.info(f"Transcription completed successfully. Output at: {output_path}")
@@ -240,38 +330,185 @@ class TranscriptionService:
             logger.error(f"Transcription failed: {e}")
             logger.debug(f"Error details: {traceback.format_exc()}")
             raise RuntimeError(f"Transcription failed: {e}")
-    
+
+    async def _transcribe_audio(
+        self,
+        audio: Union[Path, np.ndarray],
+        srt_path: Path,
+        txt_path: Path,
+        language: Optional[str],
+        include_timestamps: bool,
+        video_duration: Optional[float] = None,
+        segment_callback: Optional[Callable[[List[Any]], None]] = None
+    ) -> None:
+        """Transcribe the whole audio in one pass with the selected backend"""
+        if self.backend == TranscriptionBackend.WHISPER_CPP:
+            logger.info("Using whispercpp backend for transcription")
+            await self._transcribe_with_whisper_cpp(
+                audio, 
+                srt_path, 
+                txt_path, 
+                language, 
+                include_timestamps,
+                video_duration,
+                segment_callback=segment_callback
+            )
+        else:
+            logger.info("Using OpenVINO backend for transcription")
+            await self._transcribe_with_openvino(
+                audio, 
+                srt_path, 
+                txt_path, 
+                language, 
+                include_timestamps,
+                segment_callback=segment_callback
+            )
+
+    async def _transcribe_windows(
+        self,
+        audio: np.ndarray,
+        srt_path: Path,
+        txt_path: Path,
+        language: Optional[str],
+        include_timestamps: bool,
+        segment_callback: Optional[Callable[[List[Any]], None]] = None
+    ) -> None:
+        """
+        Split the audio on silences into windows of up to `VAD_WINDOW_SECONDS` and transcribe
+        the windows concurrently on the instances of the model. Silent audio is not transcribed.
+        Segment timestamps of the windows are shifted to the position of the window in the audio.
+        
+        Args:
+            audio: 16 kHz mono float32 audio samples
+            srt_path: Output path for SRT file
+            txt_path: Output path for text file
+            language: Language code
+            include_timestamps: Whether to include timestamps
+            segment_callback: Called with the segments of each window, in audio order, as soon as
+                the window and all windows before it are transcribed
+        """
+        from pywhispercpp.utils import output_srt, output_txt
+
+        start_time = time.time()
+        windows = split_windows(
+            audio,
+            settings.AUDIO_SAMPLE_RATE,
+            settings.VAD_WINDOW_SECONDS,
+            settings.VAD_ENERGY_THRESHOLD_DB,
+            settings.VAD_MIN_SILENCE_SECONDS
+        )
+        logger.info(f"Transcribing {len(windows)} audio windows on up to {self.model_pool.size} model instances")
+
+        segments = []
+        with ThreadPoolExecutor(max_workers=self.model_pool.size, thread_name_prefix="window") as executor:
+            # Results are returned in audio order while later windows are still being transcribed
+            for window_segments in executor.map(lambda window: self._transcribe_window(audio, window, language), windows):
+                segments.extend(window_segments)
+                if segment_callback is not None and window_segments:
+                    segment_callback(window_segments)
+
+        output_txt(segments, str(txt_path))
+        logger.debug(f"Text file written to: {txt_path}")
+
+        if include_timestamps:
+            output_srt(segments, str(srt_path))
+            logger.debug(f"SRT file written to: {srt_path}")
+
+        elapsed_time = time.time() - start_time
+        logger.debug(f"Windowed transcription of {len(segments)} segments completed in {elapsed_time:.2f} seconds")
+
+    def _transcribe_window(self, audio: np.ndarray, window: AudioWindow, language: Optional[str]) -> List[Any]:
+        """
+        Transcribe a window of the audio on an instance of the model.
+
+        Returns:
+            Segments of the window, with timestamps in centiseconds from the start of the audio
+        """
+        from pywhispercpp.model import Segment
+
+        samples = window.samples(audio, settings.AUDIO_SAMPLE_RATE)
+        offset = round(window.offset(settings.AUDIO_SAMPLE_RATE) * 100)
+
+        with self.model_pool.acquire() as model:
+            if self.backend == TranscriptionBackend.WHISPER_CPP:
+                segments = [
+                    (segment.t0, segment.t1, segment.text)
+                    for segment in model.transcribe(samples, **self._whisper_cpp_params(language))
+                ]
+            else:
+                result = self._openvino_pipeline(model)(
+                    samples,
+                    language=language or settings.TRANSCRIPT_LANGUAGE,
+                    return_timestamps=True
+                )
+                segments = [
+                    (segment.get("start", 0), segment.get("end", segment.get("start", 0) + 1), segment.get("text", ""))
+                    for segment in result.get("segments", [])
+                ]
+                if not segments and result.get("text", "").strip():
+                    segments = [(0, round(len(samples) / settings.AUDIO_SAMPLE_RATE * 100), result.get("text", ""))]
+
+        return [Segment(t0 + offset, t1 + offset, text) for t0, t1, text in segments]
+
+    def _whisper_cpp_params(self, language: Optional[str]) -> Dict[str, Any]:
+        """Get the whisper.cpp transcription parameters"""
+        params: Dict[str, Any] = {}
+
+        lang_code = language or settings.TRANSCRIPT_LANGUAGE
+        if lang_code:
+            params["language"] = lang_code
+            logger.debug(f"Set language to: {lang_code}")
+
+        params["beam_search"] = {"beam_size": 5, "patience": 1.5}  # Use small beam size for faster inference
+        params["greedy"] = {"best_of": 1}    # Only consider one candidate
+        return params
+
+    def _openvino_pipeline(self, model: Dict[str, Any]) -> Any:
+        """
+        Get the WhisperPipeline of an instance of the OpenVINO model. The pipeline is initialized
+        with the pre-loaded model components once, and kept along with the model components.
+        """
+        from openvino_genai import WhisperPipeline
+
+        pipeline = model.get("pipeline")
+        if pipeline is None:
+            logger.debug("Initializing OpenVINO-Genai WhisperPipeline with pre-loaded model components")
+            pipeline = WhisperPipeline(
+                encoder=model["encoder"],
+                decoder=model["decoder"],
+                processor=model["processor"]
+            )
+            model["pipeline"] = pipeline
+        return pipeline
+
     async def _transcribe_with_whisper_cpp(
         self,
-        audio_path: Path,
+        audio: Union[Path, np.ndarray],
         srt_path: Path,
         txt_path: Path,
         language: Optional[str],
         include_timestamps: bool,
-        video_duration: Optional[float] = None
+        video_duration: Optional[float] = None,
+        segment_callback: Optional[Callable[[List[Any]], None]] = None
     ) -> None:
         """
         Transcribe using whisper.cpp backend with pywhispercpp package.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or audio samples
             srt_path: Output path for SRT file
             txt_path: Output path for text file
             language: Language code
             include_timestamps: Whether to include timestamps
             video_duration: Duration of the video in seconds
+            segment_callback: Called with the transcribed segments as they are decoded
         """
         logger.debug("Preparing whispercpp transcription parameters")
         
         try:
             from pywhispercpp.utils import output_srt, output_txt
             
-            lang_code = language or settings.TRANSCRIPT_LANGUAGE
-            params = {}
-            
-            if lang_code:
-                params["language"] = lang_code
-                logger.debug(f"Set language to: {lang_code}")
+            params = self._whisper_cpp_params(language)
             
             # Calculate optimal number of processors based on video duration and core count
             # Each processor will handle at least 1 minute (60 seconds) of audio
@@ -284,18 +521,24 @@ class TranscriptionService:
                 n_processors = self.DEFAULT_N_PROCESSORS
                 logger.debug(f"Using default {n_processors} processor(s) as video duration is unknown")
             
-            params["beam_search"] = {"beam_size": 5, "patience": 1.5}  # Use small beam size for faster inference
-            params["greedy"] = {"best_of": 1}    # Only consider one candidate
-
+            # Segments are reported while decoding on a single processor. Segments of parallel
+            # processors are reported once all processors are done.
+            stream_segments = segment_callback is not None and n_processors == 1
+            if stream_segments:
+                params["new_segment_callback"] = lambda segment: segment_callback([segment])
+            
             # perform transcription
             logger.debug(f"Starting whispercpp transcription with {n_processors} processors")
             start_time = time.time()
             segments = self.model.transcribe(
-                str(audio_path),
+                str(audio) if isinstance(audio, Path) else audio,
                 n_processors=n_processors,
                 **params
             )
             
+            if segment_callback is not None and not stream_segments and segments:
+                segment_callback(segments)
+            
             output_txt(segments, str(txt_path))
             logger.debug(f"Text file written to: {txt_path}")
             
@@ -314,44 +557,48 @@ class TranscriptionService:
 
     async def _transcribe_with_openvino(
         self,
-        audio_path: Path,
+        audio: Union[Path, np.ndarray],
         srt_path: Path,
         txt_path: Path,
         language: Optional[str],
-        include_timestamps: bool
+        include_timestamps: bool,
+        segment_callback: Optional[Callable[[List[Any]], None]] = None
     ) -> None:
         """
         Transcribe using OpenVINO backend with WhisperPipeline from openvino-genai package.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or audio samples
             srt_path: Output path for SRT file
             txt_path: Output path for text file
             language: Language code
             include_timestamps: Whether to include timestamps
+            segment_callback: Called with the transcribed segments once the pipeline is done
         """
         
         try:
             start_time = time.time()
-            from openvino_genai import WhisperPipeline
-            
-            # Initialize the WhisperPipeline with pre-loaded model components
-            logger.debug("Initializing OpenVINO-Genai WhisperPipeline with pre-loaded model components")
-            pipeline = WhisperPipeline(
-                encoder=self.model["encoder"],
-                decoder=self.model["decoder"],
-                processor=self.model["processor"]
-            )
+            pipeline = self._openvino_pipeline(self.model)
             
             # Perform transcription
-            logger.debug(f"Starting transcription of {audio_path}")
+            logger.debug("Starting transcription with OpenVINO-Genai WhisperPipeline")
             result = pipeline(
-                str(audio_path),
+                str(audio) if isinstance(audio, Path) else audio,
                 language=language or settings.TRANSCRIPT_LANGUAGE,
                 return_timestamps=include_timestamps
             )
             
             full_text = result.get("text", "")
+            if segment_callback is not None:
+                from pywhispercpp.model import Segment
+                
+                segments = [
+                    Segment(segment.get("start", 0), segment.get("end", segment.get("start", 0) + 1), segment.get("text", ""))
+                    for segment in result.get("segments", [])
+                ]
+                if segments:
+                    segment_callback(segments)
+            
             with open(txt_path, "w", encoding="utf-8") as txt_file:
                 txt_file.write(full_text)
             logger.debug(f"Text file written to: {txt_path}")
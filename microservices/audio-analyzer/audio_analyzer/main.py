@@ -1,13 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import pathlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from audio_analyzer.api.router import api_router
+from audio_analyzer.core.job_queue import transcription_queue
 from audio_analyzer.core.settings import settings
+from audio_analyzer.core.transcriber import TranscriptionService
 from audio_analyzer.utils.model_manager import ModelManager
 from audio_analyzer.utils.logger import logger
 
@@ -31,8 +34,17 @@ async def lifespan(app: FastAPI):
     logger.info("Starting model download for enabled models")
     await ModelManager.download_models()
     logger.info("Models download completed")
+
+    # Load models once, so that requests do not wait for model loading
+    if settings.PRELOAD_WHISPER_MODELS:
+        logger.info("Preloading enabled models")
+        await asyncio.to_thread(
+            TranscriptionService.preload_models, settings.ENABLED_WHISPER_MODELS, settings.DEFAULT_DEVICE
+        )
     
     yield
+    # Queued transcription jobs are not processed after shutdown
+    transcription_queue.shutdown()
     logger.info("Application shutdown")
 
 
@@ -10,15 +10,25 @@ from pydantic import BaseModel, Field, field_validator, BeforeValidator
 from pydantic.json_schema import SkipJsonSchema
 
 from audio_analyzer.core.settings import settings
-from audio_analyzer.schemas.types import TranscriptionStatus, DeviceType
+from audio_analyzer.schemas.types import TranscriptionStatus, DeviceType, TranscriptionBackend
 
 
 EnabledWhisperModels = settings.EnabledWhisperModelsEnum
+class LoadedModelInfo(BaseModel):
+    """Schema for a whisper model loaded in the model cache"""
+    model_id: Annotated[str, Field(description="Variant of the whisper model")]
+    backend: Annotated[TranscriptionBackend, Field(description="Transcription backend the model is loaded for")]
+    device: Annotated[DeviceType, Field(description="Device the model is loaded on")]
+
+
 class HealthResponse(BaseModel):
     """Response schema for the health check endpoint"""
     status: Annotated[str, Field(description="Current health status of the API")] = settings.API_STATUS
     version: Annotated[str, Field(description="API version")] = settings.API_VER
     message: Annotated[str, Field(description="Detailed status message")] = settings.API_STATUS_MSG
+    loaded_models: Annotated[
+        List[LoadedModelInfo], Field(description="Whisper models loaded in memory, least recently used first")
+    ] = []
 
     model_config = {
         "json_schema_extra": {
@@ -26,7 +36,10 @@ class HealthResponse(BaseModel):
                 {
                     "status": "healthy",
                     "version": "1.0.0",
-                    "message": "Service is running smoothly."
+                    "message": "Service is running smoothly.",
+                    "loaded_models": [
+                        {"model_id": "small.en", "backend": "whisper_cpp", "device": "cpu"}
+                    ]
                 }
             ]
         }
@@ -105,6 +118,25 @@ class TranscriptionResponse(BaseModel):
     }
 
 
+class TranscriptSegment(BaseModel):
+    """Schema for a transcribed segment of the audio, streamed while the transcription is in progress"""
+    start: Annotated[float, Field(description="Start of the segment in seconds from the start of the video")]
+    end: Annotated[float, Field(description="End of the segment in seconds from the start of the video")]
+    text: Annotated[str, Field(description="Transcribed text of the segment")]
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "start": 12.4,
+                    "end": 15.1,
+                    "text": "Welcome to the weekly meeting."
+                }
+            ]
+        }
+    }
+
+
 class ErrorResponse(BaseModel):
     """Response schema for errors"""
     error_message: Annotated[str, Field(description="Human-readable error message")]
@@ -70,11 +70,11 @@ class WhisperModel(str, Enum):
 
 class TranscriptionStatus(str, Enum):
     """Enum for the status of a transcription job"""
-    #TODO Use this type in asynchronous API design,if required. Currently, only COMPLETED status is used.
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class TranscriptionBackend(str, Enum):
@@ -82,6 +82,11 @@ class TranscriptionBackend(str, Enum):
     WHISPER_CPP = "whisper_cpp"
     OPENVINO = "openvino"
 
+class AudioExtractionMode(str, Enum):
+    """Available modes for extracting audio from video files"""
+    FILE = "file"  # Write a WAV file which is read back for transcription
+    MEMORY = "memory"  # Decode audio into memory through an ffmpeg pipe
+
 class StorageBackend(str, Enum):
     """Available storage backends for handling files and outputs"""
     FILESYSTEM = "local"
@@ -9,6 +9,7 @@ import pytest
 from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
+from audio_analyzer.core.model_cache import model_cache
 from audio_analyzer.main import app
 from audio_analyzer.schemas.types import DeviceType, StorageBackend, WhisperModel
 
@@ -20,6 +21,14 @@ def test_client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_model_cache():
+    """Fixture to unload models cached by a test, so that tests do not share loaded models"""
+
+    yield
+    model_cache.clear()
+
+
 @pytest.fixture
 def temp_test_dir():
     """Fixture to create a temporary directory for test files"""
@@ -40,6 +49,13 @@ def mock_settings(temp_test_dir):
         mock_settings.ENABLED_WHISPER_MODELS = [WhisperModel.TINY_EN, WhisperModel.BASE_EN]
         mock_settings.DEFAULT_DEVICE = DeviceType.CPU
         mock_settings.USE_FP16 = True
+        mock_settings.WHISPER_MODEL_INSTANCES = None
+        mock_settings.TRANSCRIPTION_WORKERS = 1
+        mock_settings.AUDIO_SAMPLE_RATE = 16000
+        mock_settings.VAD_SEGMENTATION = True
+        mock_settings.VAD_WINDOW_SECONDS = 30.0
+        mock_settings.VAD_MIN_SILENCE_SECONDS = 1.0
+        mock_settings.VAD_ENERGY_THRESHOLD_DB = -45.0
         
         # Create a computed_field property
         mock_settings.AUDIO_FORMAT_PARAMS = {
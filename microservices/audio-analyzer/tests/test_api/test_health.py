@@ -4,7 +4,9 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from audio_analyzer.core.model_cache import ModelKey, model_cache
 from audio_analyzer.core.settings import settings
+from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
 
 
 @pytest.mark.api
@@ -19,3 +21,17 @@ def test_health_endpoint(test_client: TestClient):
     assert data["status"] == settings.API_STATUS
     assert data["version"] == settings.API_VER
     assert data["message"] == settings.API_STATUS_MSG
+
+
+@pytest.mark.api
+def test_health_endpoint_loaded_models(test_client: TestClient):
+    """Test that the health check API endpoint reports the models loaded in the model cache"""
+
+    model_cache.get_or_load(ModelKey(WhisperModel.TINY_EN, TranscriptionBackend.WHISPER_CPP, DeviceType.CPU), object)
+
+    response = test_client.get("/api/v1/health")
+
+    assert response.status_code == 200
+    assert response.json()["loaded_models"] == [
+        {"model_id": "tiny.en", "backend": "whisper_cpp", "device": "cpu"}
+    ]
@@ -1,6 +1,7 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -8,11 +9,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
-from audio_analyzer.schemas.types import StorageBackend, TranscriptionStatus
+from audio_analyzer.schemas.types import AudioExtractionMode, StorageBackend, TranscriptionStatus
 
 
 @pytest.mark.api
 @pytest.mark.asyncio
+@patch("audio_analyzer.api.endpoints.transcription.settings.AUDIO_EXTRACTION_MODE", AudioExtractionMode.FILE)
 @patch("audio_analyzer.utils.validation.settings")
 @patch("audio_analyzer.api.endpoints.transcription.get_video_path")
 @patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.extract_audio")
@@ -96,6 +98,7 @@ async def test_transcription_endpoint_with_file_upload(
 
 @pytest.mark.api
 @pytest.mark.asyncio
+@patch("audio_analyzer.api.endpoints.transcription.settings.AUDIO_EXTRACTION_MODE", AudioExtractionMode.FILE)
 @patch("audio_analyzer.utils.validation.MinioHandler.ensure_bucket_exists")
 @patch("audio_analyzer.utils.validation.settings")
 @patch("audio_analyzer.api.endpoints.transcription.get_video_path")
@@ -206,3 +209,104 @@ def test_transcription_endpoint_validation_error(mock_validator, test_client):
     assert "detail" in data
     assert "error_message" in data["detail"]
     assert "Missing file upload" in data["detail"]["error_message"]
+
+
+@pytest.mark.api
+@pytest.mark.asyncio
+@patch("audio_analyzer.api.endpoints.transcription.settings.AUDIO_EXTRACTION_MODE", AudioExtractionMode.FILE)
+@patch("audio_analyzer.utils.validation.settings")
+@patch("audio_analyzer.api.endpoints.transcription.get_video_path")
+@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.extract_audio")
+@patch("audio_analyzer.api.endpoints.transcription.get_file_duration")
+@patch("audio_analyzer.api.endpoints.transcription.store_transcript_output")
+async def test_transcription_job_endpoints(
+    mock_store_transcript, 
+    mock_get_duration, 
+    mock_extract_audio, 
+    mock_get_video_path,
+    mock_validator,
+    test_client: TestClient,
+    mock_transcriber,
+    mock_upload_file, 
+    mock_settings,
+    mock_audio_file,
+    mock_video_file
+):
+    """Test queueing a transcription job and getting its status and result"""
+
+    from audio_analyzer.api.endpoints.transcription import transcription_queue
+
+    transcript_path = mock_settings.OUTPUT_DIR / f"{mock_video_file.stem}.srt"
+    transcript_path.write_text("1\n00:00:00,000 --> 00:00:01,000\nHello\n\n")
+
+    mock_store_transcript.return_value = str(transcript_path)
+    mock_get_video_path.return_value = (mock_video_file, mock_video_file.name)
+    mock_extract_audio.return_value = mock_audio_file
+    mock_get_duration.return_value = 59
+
+    mock_validator.STORAGE_BACKEND = StorageBackend.FILESYSTEM
+    mock_validator.ENABLED_WHISPER_MODELS = mock_settings.ENABLED_WHISPER_MODELS
+    mock_validator.MAX_FILE_SIZE = mock_settings.MAX_FILE_SIZE
+
+    file_content = await mock_upload_file.read()
+    files = {"file": (mock_upload_file.filename, file_content, mock_upload_file.content_type)}
+
+    response = test_client.post("/api/v1/transcriptions/jobs", data={"model_name": "tiny.en"}, files=files)
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] in (TranscriptionStatus.PENDING, TranscriptionStatus.PROCESSING)
+
+    # Wait for the job to be processed while the mocks are active
+    transcription_queue.get(job_id).future.result(timeout=5)
+
+    response = test_client.get(f"/api/v1/transcriptions/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == TranscriptionStatus.COMPLETED
+    assert response.json()["transcript_path"] == str(transcript_path)
+
+    response = test_client.get(f"/api/v1/transcriptions/jobs/{job_id}/result")
+    assert response.status_code == 200
+    assert "Hello" in response.text
+
+    # Cancelling a finished job does not change it
+    response = test_client.delete(f"/api/v1/transcriptions/jobs/{job_id}")
+    assert response.json()["status"] == TranscriptionStatus.COMPLETED
+
+
+@pytest.mark.api
+def test_transcription_job_stream(test_client):
+    """Test that the segments of a job are streamed as server-sent events, followed by the job status"""
+
+    from pywhispercpp.model import Segment
+    from audio_analyzer.api.endpoints.transcription import transcription_queue
+    from audio_analyzer.schemas.transcription import TranscriptionResponse
+
+    def process(job):
+        job.add_segments([Segment(0, 150, " Hello")])
+        job.add_segments([Segment(3000, 3250, " world")])
+        return TranscriptionResponse(
+            status=TranscriptionStatus.COMPLETED, message="Transcription completed successfully", job_id=job.id
+        )
+
+    job = transcription_queue.submit("test_video.mp4", process)
+
+    response = test_client.get(f"/api/v1/transcriptions/jobs/{job.id}/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [event.split("\n") for event in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: segment", "event: segment", "event: status"]
+    assert json.loads(events[0][1][len("data: "):]) == {"start": 0.0, "end": 1.5, "text": "Hello"}
+    assert json.loads(events[1][1][len("data: "):]) == {"start": 30.0, "end": 32.5, "text": "world"}
+    assert json.loads(events[2][1][len("data: "):])["status"] == TranscriptionStatus.COMPLETED
+
+
+@pytest.mark.api
+def test_transcription_job_not_found(test_client):
+    """Test that unknown job IDs are reported with 404 for status, result and cancellation"""
+
+    assert test_client.get("/api/v1/transcriptions/jobs/unknown").status_code == 404
+    assert test_client.get("/api/v1/transcriptions/jobs/unknown/result").status_code == 404
+    assert test_client.get("/api/v1/transcriptions/jobs/unknown/stream").status_code == 404
+    assert test_client.delete("/api/v1/transcriptions/jobs/unknown").status_code == 404
@@ -4,6 +4,7 @@
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
 
+import numpy as np
 import pytest
 from fastapi import HTTPException
 from moviepy import VideoFileClip, AudioFileClip
@@ -205,3 +206,82 @@ async def test_extract_audio_moviepy_error(mock_video_file):
         
         # Verify interactions
         mock_video_clip.assert_called_once_with(str(mock_video_file))
+
+
+def mock_ffmpeg_process(stdout: bytes, stderr: bytes, returncode: int = 0) -> MagicMock:
+    """Create a mock ffmpeg subprocess with the given output"""
+
+    process = MagicMock()
+    process.communicate = AsyncMock(return_value=(stdout, stderr))
+    process.returncode = returncode
+    return process
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_extract_audio_array_success(mock_video_file, mock_settings):
+    """Test decoding audio into memory and reading the duration from the same ffmpeg run"""
+
+    samples = np.linspace(-0.5, 0.5, 16000, dtype=np.float32)
+    stderr = b"Input #0, mov,mp4, from 'test_video.mp4':\n  Duration: 00:01:02.50, start: 0.000000, bitrate: 98 kb/s\n"
+    process = mock_ffmpeg_process(samples.tobytes(), stderr)
+
+    with patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec",
+               AsyncMock(return_value=process)) as mock_exec, \
+         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
+        mock_settings.AUDIO_SAMPLE_RATE = 16000
+        audio, duration = await AudioExtractor.extract_audio_array(mock_video_file)
+
+    assert audio.dtype == np.float32
+    np.testing.assert_array_equal(audio, samples)
+    assert duration == 62.5
+
+    command = mock_exec.call_args.args
+    assert str(mock_video_file) in command
+    assert command[command.index("-ar") + 1] == "16000"
+    assert command[command.index("-f") + 1] == "f32le"
+    assert command[-1] == "pipe:1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_extract_audio_array_without_duration(mock_video_file, mock_settings):
+    """Test that the duration is computed from the decoded samples if ffmpeg does not report it"""
+
+    process = mock_ffmpeg_process(np.zeros(8000, dtype=np.float32).tobytes(), b"")
+
+    with patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", AsyncMock(return_value=process)), \
+         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
+        mock_settings.AUDIO_SAMPLE_RATE = 16000
+        _, duration = await AudioExtractor.extract_audio_array(mock_video_file)
+
+    assert duration == 0.5
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_extract_audio_array_no_audio_stream(mock_video_file):
+    """Test decoding audio of a video file without an audio stream"""
+
+    process = mock_ffmpeg_process(b"", b"Stream map '0:a:0' matches no streams.\n", returncode=1)
+
+    with patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+        with pytest.raises(HTTPException) as excinfo:
+            await AudioExtractor.extract_audio_array(mock_video_file)
+
+    assert excinfo.value.status_code == 400
+    assert "No audio stream found" in excinfo.value.detail["error_message"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_extract_audio_array_ffmpeg_error(mock_video_file):
+    """Test decoding audio of an invalid video file"""
+
+    process = mock_ffmpeg_process(b"", b"test_video.mp4: Invalid data found when processing input\n", returncode=1)
+
+    with patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+        with pytest.raises(RuntimeError) as excinfo:
+            await AudioExtractor.extract_audio_array(mock_video_file)
+
+    assert "Failed to extract audio from video" in str(excinfo.value)
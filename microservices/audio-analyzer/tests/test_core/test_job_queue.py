@@ -0,0 +1,150 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from pywhispercpp.model import Segment
+
+from audio_analyzer.core.job_queue import TranscriptionJobQueue
+from audio_analyzer.core.transcriber import TranscriptionService
+from audio_analyzer.schemas.transcription import TranscriptionResponse
+from audio_analyzer.schemas.types import TranscriptionStatus, WhisperModel
+
+
+@pytest.fixture
+def job_queue():
+    """Fixture to provide a job queue with a single worker"""
+
+    queue = TranscriptionJobQueue(max_workers=1, max_history=2)
+    yield queue
+    queue.shutdown()
+
+
+def completed_response(job) -> TranscriptionResponse:
+    return TranscriptionResponse(
+        status=TranscriptionStatus.COMPLETED,
+        message="Transcription completed successfully",
+        job_id=job.id,
+        video_name=job.video_name
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_job_queue_completed(job_queue):
+    """Test that a queued job is processed and its result is reported"""
+
+    job = job_queue.submit("test_video.mp4", completed_response)
+    await job_queue.wait(job)
+
+    assert job.status == TranscriptionStatus.COMPLETED
+    assert job.to_response().job_id == job.id
+    assert job.to_response().status == TranscriptionStatus.COMPLETED
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_job_queue_failed(job_queue):
+    """Test that errors of a job are kept and reported with the job status"""
+
+    def process(job):
+        raise HTTPException(status_code=400, detail={"error_message": "No audio stream found in the video file"})
+
+    job = job_queue.submit("test_video.mp4", process)
+    await job_queue.wait(job)
+
+    assert job.status == TranscriptionStatus.FAILED
+    assert isinstance(job.error, HTTPException)
+    assert job.to_response().message == "No audio stream found in the video file"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_job_queue_cancel(job_queue):
+    """Test that cancelling stops a running job after its current step and skips a queued job"""
+
+    started = threading.Event()
+    processed = []
+
+    def process(job):
+        processed.append(job.id)
+        started.set()
+        job.cancel_event.wait(timeout=5)
+        job.check_cancelled()
+        return completed_response(job)
+
+    running_job = job_queue.submit("first.mp4", process)
+    queued_job = job_queue.submit("second.mp4", process)
+    assert started.wait(timeout=5)
+    assert running_job.status == TranscriptionStatus.PROCESSING
+    assert queued_job.status == TranscriptionStatus.PENDING
+
+    job_queue.cancel(queued_job.id)
+    job_queue.cancel(running_job.id)
+    await job_queue.wait(running_job)
+    await job_queue.wait(queued_job)
+
+    assert processed == [running_job.id]
+    assert running_job.status == TranscriptionStatus.CANCELLED
+    assert queued_job.status == TranscriptionStatus.CANCELLED
+    assert running_job.result is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_job_queue_history(job_queue):
+    """Test that only the most recent finished jobs are kept"""
+
+    jobs = []
+    for i in range(3):
+        job = job_queue.submit(f"video{i}.mp4", completed_response)
+        await job_queue.wait(job)
+        jobs.append(job)
+
+    assert job_queue.get(jobs[0].id) is None
+    assert [job.id for job in job_queue.list()] == [jobs[1].id, jobs[2].id]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_job_stream_segments(job_queue):
+    """Test that segments are streamed as they are added, in order, until the job is finished"""
+
+    first_window_streamed = threading.Event()
+
+    def process(job):
+        job.add_segments([Segment(0, 150, " Hello"), Segment(150, 300, " world")])
+        assert first_window_streamed.wait(timeout=5)
+        job.add_segments([Segment(3000, 3200, " again")])
+        return completed_response(job)
+
+    job = job_queue.submit("test_video.mp4", process)
+    streamed = []
+    async for segment in job.stream_segments():
+        streamed.append(segment)
+        if len(streamed) == 2:
+            # The job is still running when the first segments are streamed
+            assert not job.finished
+            first_window_streamed.set()
+
+    assert job.status == TranscriptionStatus.COMPLETED
+    assert [(s.start, s.end, s.text) for s in streamed] == [(0.0, 1.5, "Hello"), (1.5, 3.0, "world"), (30.0, 32.0, "again")]
+
+    # A stream opened after the job finished gets all segments
+    assert [s async for s in job.stream_segments()] == streamed
+
+
+@pytest.mark.unit
+def test_optimal_worker_count():
+    """Test that the worker count is sized by the thread discount factor and the core count"""
+
+    with patch("audio_analyzer.core.transcriber.multiprocessing.cpu_count", return_value=16):
+        assert TranscriptionService.optimal_worker_count(WhisperModel.TINY_EN) == 5
+        assert TranscriptionService.optimal_worker_count(WhisperModel.LARGE_V3) == 1
+
+    with patch("audio_analyzer.core.transcriber.multiprocessing.cpu_count", return_value=2):
+        assert TranscriptionService.optimal_worker_count(WhisperModel.TINY_EN) == 2
@@ -0,0 +1,159 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from audio_analyzer.core.model_cache import ModelCache, ModelKey, ModelPool
+from audio_analyzer.core.transcriber import TranscriptionService
+from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
+
+
+def make_key(model: WhisperModel) -> ModelKey:
+    return ModelKey(model, TranscriptionBackend.WHISPER_CPP, DeviceType.CPU)
+
+
+@pytest.mark.unit
+def test_model_cache_loads_once():
+    """Test that a model is loaded once and then served from the cache"""
+
+    cache = ModelCache(max_size=2)
+    loader = MagicMock(return_value="tiny-model")
+
+    assert cache.get_or_load(make_key(WhisperModel.TINY_EN), loader) == "tiny-model"
+    assert cache.get_or_load(make_key(WhisperModel.TINY_EN), loader) == "tiny-model"
+    loader.assert_called_once()
+
+
+@pytest.mark.unit
+def test_model_cache_concurrent_load():
+    """Test that concurrent requests for the same model wait for a single load"""
+
+    cache = ModelCache(max_size=2)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.1)
+        return "tiny-model"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load(make_key(WhisperModel.TINY_EN), loader)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert results == ["tiny-model"] * 4
+
+
+@pytest.mark.unit
+def test_model_cache_lru_eviction():
+    """Test that the least recently used model is evicted when the cache is full"""
+
+    cache = ModelCache(max_size=2)
+    cache.get_or_load(make_key(WhisperModel.TINY_EN), lambda: "tiny")
+    cache.get_or_load(make_key(WhisperModel.BASE_EN), lambda: "base")
+
+    # Use the tiny model again, so that the base model is the least recently used one
+    cache.get_or_load(make_key(WhisperModel.TINY_EN), lambda: "unused")
+    cache.get_or_load(make_key(WhisperModel.SMALL_EN), lambda: "small")
+
+    assert cache.loaded_models() == [make_key(WhisperModel.TINY_EN), make_key(WhisperModel.SMALL_EN)]
+
+
+@pytest.mark.unit
+def test_model_cache_load_error():
+    """Test that a failed load is not cached and is retried on the next request"""
+
+    cache = ModelCache(max_size=2)
+    loader = MagicMock(side_effect=[RuntimeError("Model not found"), "tiny-model"])
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(make_key(WhisperModel.TINY_EN), loader)
+
+    assert cache.loaded_models() == []
+    assert cache.get_or_load(make_key(WhisperModel.TINY_EN), loader) == "tiny-model"
+
+
+@pytest.mark.unit
+def test_model_pool_loads_instances_on_demand():
+    """Test that model instances are loaded while all instances are in use, up to the pool size"""
+
+    loader = MagicMock(side_effect=["first", "second"])
+    pool = ModelPool(loader, size=2)
+    assert pool.instances == 1
+
+    # An idle instance is reused
+    with pool.acquire() as model:
+        assert model == "first"
+    with pool.acquire() as model:
+        assert model == "first"
+    assert pool.instances == 1
+
+    # A second instance is loaded while the first one is in use
+    with pool.acquire() as first, pool.acquire() as second:
+        assert (first, second) == ("first", "second")
+    assert pool.instances == 2
+    assert loader.call_count == 2
+
+
+@pytest.mark.unit
+def test_model_pool_waits_when_full():
+    """Test that a full pool waits for an instance to be released"""
+
+    pool = ModelPool(lambda: object(), size=1)
+    acquired = []
+
+    def use_model():
+        with pool.acquire() as model:
+            acquired.append(model)
+
+    with pool.acquire() as model:
+        thread = threading.Thread(target=use_model)
+        thread.start()
+        thread.join(timeout=0.1)
+        assert acquired == []
+
+    thread.join()
+    assert acquired == [model]
+    assert pool.instances == 1
+
+
+@pytest.mark.unit
+def test_transcription_services_share_model(mock_settings):
+    """Test that transcription services for the same model share the loaded model"""
+
+    with patch.object(TranscriptionService, "_create_model", return_value=MagicMock()) as mock_create_model:
+        first_service = TranscriptionService(model_name="tiny.en", device="cpu")
+        first_service._load_model()
+        second_service = TranscriptionService(model_name="tiny.en", device="cpu")
+        second_service._load_model()
+
+    mock_create_model.assert_called_once()
+    assert first_service.model_pool is second_service.model_pool
+
+
+@pytest.mark.unit
+def test_preload_models(mock_settings):
+    """Test that the default model is preloaded first and no more models than the cache size"""
+
+    mock_settings.DEFAULT_WHISPER_MODEL = WhisperModel.BASE_EN
+    loaded = []
+
+    with patch("audio_analyzer.core.transcriber.settings", mock_settings), \
+         patch("audio_analyzer.core.transcriber.model_cache", ModelCache(max_size=2)), \
+         patch.object(TranscriptionService, "_create_model", autospec=True,
+                      side_effect=lambda service: loaded.append(service.model_name)):
+        TranscriptionService.preload_models(
+            [WhisperModel.TINY_EN, WhisperModel.BASE_EN, WhisperModel.SMALL_EN], DeviceType.CPU
+        )
+
+    assert loaded == [WhisperModel.BASE_EN, WhisperModel.TINY_EN]
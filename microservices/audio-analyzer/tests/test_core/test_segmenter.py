@@ -0,0 +1,85 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+from audio_analyzer.core.segmenter import MIN_WINDOW_SECONDS, AudioWindow, detect_speech, split_windows
+
+SAMPLE_RATE = 16000
+
+
+def make_audio(*parts):
+    """Build audio from (seconds, is_speech) parts, with a tone for speech"""
+    chunks = []
+    for seconds, is_speech in parts:
+        samples = int(seconds * SAMPLE_RATE)
+        if is_speech:
+            chunks.append(0.1 * np.sin(np.arange(samples, dtype=np.float32) / 10))
+        else:
+            chunks.append(np.zeros(samples, dtype=np.float32))
+    return np.concatenate(chunks).astype(np.float32)
+
+
+@pytest.mark.unit
+def test_detect_speech_skips_silence():
+    """Test that silent audio has no speech regions and speech regions are padded"""
+    assert detect_speech(make_audio((5, False)), SAMPLE_RATE, -45.0, 1.0) == []
+
+    regions = detect_speech(make_audio((2, False), (3, True), (2, False)), SAMPLE_RATE, -45.0, 1.0)
+    assert len(regions) == 1
+    # Regions are detected with the precision of a frame
+    start, end = regions[0]
+    assert abs(start - 1.8 * SAMPLE_RATE) < 0.03 * SAMPLE_RATE
+    assert abs(end - 5.2 * SAMPLE_RATE) < 0.03 * SAMPLE_RATE
+
+
+@pytest.mark.unit
+def test_detect_speech_merges_short_silences():
+    """Test that silences shorter than the minimum silence do not split speech regions"""
+    audio = make_audio((2, True), (0.5, False), (2, True), (3, False), (2, True))
+
+    regions = detect_speech(audio, SAMPLE_RATE, -45.0, 1.0)
+
+    assert len(regions) == 2
+    assert regions[0][1] < int(5 * SAMPLE_RATE) < regions[1][0]
+
+
+@pytest.mark.unit
+def test_split_windows_packs_regions():
+    """Test that speech regions are packed into windows of at most the window length"""
+    audio = make_audio(
+        (10, True), (5, False), (10, True), (60, False), (10, True), (5, False), (20, True)
+    )
+
+    windows = split_windows(audio, SAMPLE_RATE, 30.0, -45.0, 1.0)
+
+    assert len(windows) == 3
+    assert all(w.end - w.start <= 30 * SAMPLE_RATE for w in windows)
+    # The long silence is not transcribed
+    assert windows[0].end < 26 * SAMPLE_RATE and windows[1].start > 84 * SAMPLE_RATE
+
+
+@pytest.mark.unit
+def test_split_windows_splits_long_speech():
+    """Test that speech longer than a window is split into windows covering all of it"""
+    audio = make_audio((100, True))
+
+    windows = split_windows(audio, SAMPLE_RATE, 30.0, -45.0, 1.0)
+
+    assert len(windows) == 4
+    assert all(w.end - w.start <= 30 * SAMPLE_RATE for w in windows)
+    assert windows[0].start == 0 and windows[-1].end == len(audio)
+    assert all(a.end == b.start for a, b in zip(windows, windows[1:]))
+
+
+@pytest.mark.unit
+def test_audio_window_samples_padded():
+    """Test that short windows are padded to the minimum length transcribed by whisper.cpp"""
+    audio = make_audio((0.5, True))
+    window = AudioWindow(0, len(audio))
+
+    samples = window.samples(audio, SAMPLE_RATE)
+
+    assert len(samples) == int(MIN_WINDOW_SECONDS * SAMPLE_RATE)
+    assert window.offset(SAMPLE_RATE) == 0.0
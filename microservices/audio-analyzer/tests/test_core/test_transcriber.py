@@ -4,8 +4,10 @@
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from audio_analyzer.core.model_cache import ModelPool
 from audio_analyzer.core.transcriber import TranscriptionService
 from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
 
@@ -128,7 +130,9 @@ def test_load_model_whisper_cpp(mock_settings):
         # Verify the model was loaded correctly
         mock_get_model_path.assert_called_once_with(WhisperModel.TINY_EN, use_gpu=False)
         MockModel.assert_called_once_with(str(mock_model_path), n_threads=24)
-        assert service.model == mock_model_instance
+        assert service.model_pool.instances == 1
+        with service.model_pool.acquire() as model:
+            assert model == mock_model_instance
 
 
 @pytest.mark.unit
@@ -174,9 +178,32 @@ def test_load_model_openvino(mock_settings):
         MockAutoProcessor.from_pretrained.assert_called_once_with(str(mock_model_dir))
         
         # Check model structure
-        assert service.model["encoder"] == mock_encoder_compiled
-        assert service.model["decoder"] == mock_decoder_compiled
-        assert service.model["processor"] == mock_processor
+        assert service.model_pool.size == 1
+        with service.model_pool.acquire() as model:
+            assert model["encoder"] == mock_encoder_compiled
+            assert model["decoder"] == mock_decoder_compiled
+            assert model["processor"] == mock_processor
+
+
+@pytest.mark.unit
+def test_model_instances_per_worker(mock_settings):
+    """Test that there is a model instance for each transcription worker by default"""
+    mock_settings.TRANSCRIPTION_WORKERS = 4
+
+    with patch("audio_analyzer.core.transcriber.settings", mock_settings), \
+         patch("audio_analyzer.core.transcriber.multiprocessing.cpu_count", return_value=8):
+        service = TranscriptionService(model_name="large-v3", device="cpu")
+        assert service.model_instances == 4
+
+        # whisper.cpp instances are added if they fit on the CPU cores
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        assert service.model_instances == TranscriptionService.optimal_worker_count(WhisperModel.TINY_EN) > 4
+
+        service.backend = TranscriptionBackend.OPENVINO
+        assert service.model_instances == 4
+
+        mock_settings.WHISPER_MODEL_INSTANCES = 2
+        assert service.model_instances == 2
 
 
 @pytest.mark.asyncio
@@ -197,6 +224,7 @@ async def test_transcribe_with_whisper_cpp(mock_settings, mock_audio_file):
         
         # Configure the transcription service
         service = TranscriptionService(model_name="tiny.en", device="cpu")
+        service.model_pool = MagicMock()
         
         _id, output_path = await service.transcribe(
             mock_audio_file,
@@ -240,6 +268,7 @@ async def test_transcribe_with_openvino(mock_settings, mock_audio_file):
         
         # Configure the transcription service
         service = TranscriptionService(model_name="tiny.en", device="gpu")
+        service.model_pool = MagicMock()
         
         _id, output_path = await service.transcribe(
             mock_audio_file,
@@ -305,3 +334,70 @@ async def test_transcribe_with_whisper_cpp_implementation():
         # Verify output functions were called
         mock_output_txt.assert_called_once_with(mock_segments, str(txt_path))
         mock_output_srt.assert_called_once_with(mock_segments, str(srt_path))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_transcribe_audio_array(mock_settings):
+    """Test that audio samples are passed to whisper.cpp without a file and name the output files"""
+    with patch("pywhispercpp.utils.output_srt"), \
+         patch("pywhispercpp.utils.output_txt"), \
+         patch.object(TranscriptionService, "_load_model"), \
+         patch("audio_analyzer.core.transcriber.settings", mock_settings):
+        mock_settings.TRANSCRIPT_LANGUAGE = None
+        mock_settings.VAD_SEGMENTATION = False
+        audio = np.zeros(16000, dtype=np.float32)
+
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = []
+        service.model_pool = ModelPool(lambda: mock_model, size=1)
+
+        job_id, output_path = await service.transcribe(audio, job_id="abcd1234", audio_name="test_video")
+
+        assert job_id == "abcd1234"
+        assert output_path == mock_settings.OUTPUT_DIR / "transcript" / "test_video-abcd1234.srt"
+        assert mock_model.transcribe.call_args.args[0] is audio
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_transcribe_audio_windows(mock_settings):
+    """Test that only windows with voice activity are transcribed and their timestamps are merged"""
+    from pywhispercpp.model import Segment
+
+    with patch.object(TranscriptionService, "_load_model"), \
+         patch("audio_analyzer.core.transcriber.settings", mock_settings):
+        mock_settings.TRANSCRIPT_LANGUAGE = None
+        sample_rate = mock_settings.AUDIO_SAMPLE_RATE
+
+        # 5 seconds of tone after 10 seconds of silence and 20 seconds of silence after the tone
+        audio = np.zeros(35 * sample_rate, dtype=np.float32)
+        audio[10 * sample_rate:15 * sample_rate] = 0.1 * np.sin(np.arange(5 * sample_rate) / 10)
+
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = [Segment(0, 150, "Hello"), Segment(150, 500, "world")]
+
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        service.model_pool = ModelPool(lambda: mock_model, size=2)
+
+        streamed = []
+        _, output_path = await service.transcribe(
+            audio, job_id="abcd1234", audio_name="test_video", segment_callback=streamed.append
+        )
+
+        # Only the tone with its padding is transcribed
+        mock_model.transcribe.assert_called_once()
+        samples = mock_model.transcribe.call_args.args[0]
+        assert abs(len(samples) - 5.4 * sample_rate) < 0.06 * sample_rate
+
+        # Timestamps are shifted by the start of the window (9.79 seconds, at a frame boundary)
+        srt = output_path.read_text()
+        assert "00:00:09,790 --> 00:00:11,290" in srt
+        assert "00:00:11,290 --> 00:00:14,790" in srt
+        assert (output_path.with_suffix(".txt")).read_text().split() == ["Hello", "world"]
+
+        # The segments of the window are reported with the shifted timestamps
+        assert [[(seg.t0, seg.t1, seg.text) for seg in segments] for segments in streamed] == [
+            [(979, 1129, "Hello"), (1129, 1479, "world")]
+        ]
@@ -287,6 +287,31 @@ class ModelRegistryClient:
 
         return zip_file_data
 
+    @staticmethod
+    def _get_archive_root_dirname(file_infos: list) -> str:
+        """Get the directory containing all files of a model artifacts zip file,
+        which is not extracted
+
+        Geti models may be stored with the files of the code deployment at the root
+        of the zip file, or in a directory named after the Geti project.
+
+        Args:
+            file_infos (list): The zipfile.ZipInfo of the files in the zip file
+
+        Returns:
+            str: The root directory with a trailing "/", or "" if the files are at the
+            root of the zip file or in a "deployment" root directory
+        """
+        top_level_names = {file_info.filename.split("/", 1)[0] for file_info in file_infos}
+        if len(top_level_names) != 1:
+            return ""
+
+        root_dirname = top_level_names.pop() + "/"
+        if "deployment" in root_dirname or \
+                not any(file_info.filename.startswith(root_dirname) for file_info in file_infos):
+            return ""
+        return root_dirname
+
     def get_model_path(self, pipelines_cfg: list) -> dict:
         """
         Constructs and returns the model path based on the provided pipeline configuration.
@@ -414,15 +439,12 @@ class ModelRegistryClient:
 
                                     with zipfile.ZipFile(io.BytesIO(zip_file_data), 'r') as zip_ref:
                                         ignored_filenames = (".DS_Store", "__MACOSX")
-                                        for file_info in zip_ref.infolist():
-                                            file_root_dirname = zip_ref.filelist[0].filename
-                                            fname = file_info.filename
-                                            if not "deployment" in file_root_dirname:
-                                                fname = fname.replace(
-                                                    file_root_dirname, "")
-                                            if fname and \
-                                                not file_info.is_dir() and \
-                                                    not any(name in fname for name in ignored_filenames):
+                                        file_infos = [file_info for file_info in zip_ref.infolist()
+                                                      if not any(name in file_info.filename for name in ignored_filenames)]
+                                        root_dirname = self._get_archive_root_dirname(file_infos)
+                                        for file_info in file_infos:
+                                            fname = file_info.filename[len(root_dirname):]
+                                            if fname and not file_info.is_dir():
                                                 extract_path = os.path.join(models_pipeline_dirpath, fname)
                                                 os.makedirs(os.path.dirname(extract_path), exist_ok=True)
                                                 file_info.filename = os.path.basename(file_info.filename)
@@ -9,7 +9,9 @@ This file contains tests associated to the functions in the model_updater.py fil
 """
 # pylint: disable=protected-access, import-error
 
+import io
 import os
+import zipfile
 import pytest
 from unittest.mock import patch, MagicMock
 from itertools import product
@@ -276,6 +278,41 @@ def test_successful_download_and_save(setup_model_registry_client, pipelines_cfg
         is_artifacts_saved, msg  = model_downloader.download_models(pipelines_cfg)
         assert not is_artifacts_saved
 
+@pytest.mark.parametrize("root_dirname", ["", "my-project/"])
+def test_download_and_save_geti_archive(setup_model_registry_client, pipelines_cfg, tmp_path, root_dirname):
+    """Test the files of Geti model archives are extracted without their root directory,
+    whether the code deployment is at the root of the archive or in a project directory
+    """
+    model_downloader = setup_model_registry_client
+    model_downloader._saved_models_dir = str(tmp_path)
+
+    model = {
+        "id": "model_id",
+        "name": "model_name",
+        "version": "1",
+        "precision": ["FP32"],
+        "origin": "Geti",
+        "category": "category"
+    }
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+        zip_file.writestr(root_dirname + "LICENSE", "license")
+        zip_file.writestr(root_dirname + "deployment/Detection/model/model.xml", "xml")
+        zip_file.writestr(root_dirname + "example_code/demo.py", "demo")
+        zip_file.writestr("__MACOSX/._LICENSE", "")
+
+    with patch.object(model_downloader, '_get_model', return_value=model), \
+         patch.object(model_downloader, '_get_model_artifacts_zip_file_data', return_value=zip_buffer.getvalue()):
+        is_artifacts_saved, msg = model_downloader.download_models(pipelines_cfg)
+
+    models_pipeline_dirpath = tmp_path / "model_name_m-1_fp32"
+    assert is_artifacts_saved
+    assert (models_pipeline_dirpath / "LICENSE").read_text() == "license"
+    assert (models_pipeline_dirpath / "deployment/Detection/model/model.xml").read_text() == "xml"
+    assert (models_pipeline_dirpath / "example_code/demo.py").read_text() == "demo"
+    assert not (models_pipeline_dirpath / "__MACOSX").exists()
+    assert "Deployment directory" in msg
+
 def test_model_not_found(setup_model_registry_client, pipelines_cfg):
     model_downloader = setup_model_registry_client
     with patch.object(model_downloader, '_get_model', return_value=None):
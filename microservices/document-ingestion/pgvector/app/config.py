@@ -37,6 +37,20 @@ It generates embeddings for documents, stores them in PGVector, and saves the do
 
     BATCH_SIZE: int = ...
 
+    # Ingestion jobs: number of files ingested concurrently and finished jobs kept for queries
+    INGESTION_WORKERS: int = 4
+    INGESTION_JOB_HISTORY: int = 100
+
+    # Worker processes which extract text from documents, and PDF pages extracted per task
+    PARSER_WORKERS: int = 4
+    PDF_PAGES_PER_TASK: int = 8
+
+    # URL ingestion: concurrent downloads in total and per host, and seconds between requests to a host
+    URL_FETCH_CONCURRENCY: int = 16
+    URL_FETCH_PER_HOST: int = 2
+    URL_FETCH_HOST_INTERVAL: float = 0.2
+    URL_FETCH_TIMEOUT: float = 5
+
     # MINIO Configuration
     DEFAULT_BUCKET: str = ...
     OBJECT_PREFIX: str = ...
@@ -10,6 +10,26 @@ from psycopg_pool import ConnectionPool
 config = Settings()
 connection_pool = None
 
+# Expression indexes on the cmetadata keys used to list and delete documents and URLs.
+# Each index leads with collection_id, as every lookup is scoped to the configured collection.
+METADATA_INDEXES = {
+    "ix_langchain_pg_embedding_bucket_filename": """
+        ON langchain_pg_embedding (collection_id, (cmetadata ->> 'bucket'), (cmetadata ->> 'filename'))
+    """,
+    "ix_langchain_pg_embedding_source_bucket": """
+        ON langchain_pg_embedding (collection_id, (cmetadata ->> 'source'), (cmetadata ->> 'bucket'))
+        WHERE cmetadata ->> 'source' IS NOT NULL AND cmetadata ->> 'bucket' IS NOT NULL
+    """,
+    "ix_langchain_pg_embedding_url": """
+        ON langchain_pg_embedding (collection_id, (cmetadata ->> 'url'))
+        WHERE cmetadata ? 'url'
+    """,
+}
+
+# Key of the advisory lock held while metadata indexes are built, so that the startup task,
+# the first ingestion and other replicas of the service do not build them at the same time.
+METADATA_INDEXES_LOCK_KEY = 7405216381
+
 
 def get_db_connection_pool() -> ConnectionPool:
     """
@@ -53,7 +73,7 @@ def pool_execution(query, params=None) -> Optional[List[tuple]]:
 
     Returns:
         list of tuple or None:
-            - If the query is a SELECT statement, returns a list of tuples
+            - If the query is a SELECT statement (or a WITH query), returns a list of tuples
             containing the query results.
             - If the query is a DELETE statement, returns an list of tuple
             containing message and deleted params.
@@ -64,7 +84,7 @@ def pool_execution(query, params=None) -> Optional[List[tuple]]:
         with pool.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(query, params)
-                if query.strip().lower().startswith("select"):
+                if query.strip().lower().startswith(("select", "with")):
                     result = cur.fetchall()
                 elif query.strip().lower().startswith("delete"):
                     conn.commit()
@@ -78,3 +98,90 @@ def pool_execution(query, params=None) -> Optional[List[tuple]]:
     except Exception as e:
         logger.error(f"Error executing query: {e}")
         return None
+
+
+def create_metadata_indexes() -> bool:
+    """
+    Creates the indexes in `METADATA_INDEXES` which do not exist yet. Indexes are built
+    concurrently, so ingestion is not blocked while indexes are built on a large table, and
+    invalid indexes left by an interrupted build are rebuilt.
+
+    Builds are serialized with an advisory lock. If indexes are already being built on the
+    table by another session, this returns right away instead of waiting. Indexes which are
+    still being built, and therefore not valid yet, are never dropped.
+
+    Returns:
+        bool: True if all indexes exist, False if the embedding table does not exist yet,
+        indexes are being built by another session or an error occurred.
+    """
+    try:
+        pool = get_db_connection_pool()
+        with pool.connection() as conn:
+            table = conn.execute("SELECT to_regclass('langchain_pg_embedding')").fetchone()[0]
+            if table is None:
+                logger.info("Embedding table does not exist yet, skipping metadata indexes.")
+                return False
+
+            locked = conn.execute(
+                "SELECT pg_try_advisory_lock(%(key)s)", {"key": METADATA_INDEXES_LOCK_KEY}
+            ).fetchone()[0]
+            conn.commit()
+            if not locked:
+                logger.info("Metadata indexes are being built by another session.")
+                return False
+
+            try:
+                return _build_metadata_indexes(conn)
+            finally:
+                # Session locks are not released by a rollback, which ends any failed transaction
+                conn.rollback()
+                conn.execute("SELECT pg_advisory_unlock(%(key)s)", {"key": METADATA_INDEXES_LOCK_KEY})
+                conn.commit()
+
+    except Exception as e:
+        logger.error(f"Error creating metadata indexes: {e}")
+        return False
+
+
+def _build_metadata_indexes(conn) -> bool:
+    existing_indexes = dict(conn.execute(
+        """
+        SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = 'langchain_pg_embedding'::regclass AND c.relname = ANY(%(names)s)
+        """,
+        {"names": list(METADATA_INDEXES)},
+    ).fetchall())
+    # Indexes being built, e.g. by hand, are invalid until their build completes
+    building_indexes = [row[0] for row in conn.execute(
+        """
+        SELECT c.relname FROM pg_stat_progress_create_index p JOIN pg_class c ON c.oid = p.index_relid
+        WHERE p.relid = 'langchain_pg_embedding'::regclass
+        """
+    ).fetchall()]
+    conn.commit()
+
+    missing_indexes = [name for name in METADATA_INDEXES if not existing_indexes.get(name)]
+    if not missing_indexes:
+        return True
+
+    # Concurrent builds on the same table wait for each other, and may deadlock
+    if building_indexes:
+        logger.info(f"Indexes {', '.join(building_indexes)} are being built by another session.")
+        return False
+
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction
+    conn.autocommit = True
+    try:
+        for name in missing_indexes:
+            if name in existing_indexes:
+                conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            logger.info(f"Creating index {name} . . .")
+            conn.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {METADATA_INDEXES[name]}")
+
+        # Collect statistics of the indexed expressions, for the planner to use the indexes
+        conn.execute("ANALYZE langchain_pg_embedding")
+    finally:
+        conn.autocommit = False
+
+    logger.info("Metadata indexes are ready.")
+    return True
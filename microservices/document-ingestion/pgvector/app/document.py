@@ -2,23 +2,24 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import psycopg
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor
 from fastapi import UploadFile, HTTPException
 from http import HTTPStatus
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 from langchain_core.documents import Document
 from langchain.text_splitter import TokenTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
-import pdfplumber
-from docx import Document as DocxDocument
-from docx.text.paragraph import Paragraph
-from docx.table import Table
 from .logger import logger
 from .config import Settings
 from .db_config import pool_execution
+from .parser import count_pdf_pages, extract_docx_text, extract_pdf_pages
+from .vector_writer import get_vector_writer, reset_vector_writer
 
 config = Settings()
+parser_pool = None
 
 async def save_temp_file(file: UploadFile, bucket_name: str, filename: str) -> str:
     """Reads the uploaded file and saves it at a temporary location.
@@ -69,13 +70,31 @@ async def get_documents_embeddings() -> list:
     """
 
     file_list = []
-    query = "SELECT DISTINCT \
-    lpc.cmetadata ->> 'source' as source, lpc.cmetadata ->> 'bucket' as bucket \
-    FROM \
-    langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll \
-    ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(index_name)s \
-    AND lpc.cmetadata ->> 'source' IS NOT NULL \
-    AND lpc.cmetadata ->> 'bucket' IS NOT NULL"
+    # Loose index scan: jump from one (source, bucket) pair to the next on the metadata index,
+    # instead of reading every chunk of every document.
+    query = """
+    WITH RECURSIVE documents AS (
+        (
+            SELECT cmetadata ->> 'source' AS source, cmetadata ->> 'bucket' AS bucket
+            FROM langchain_pg_embedding
+            WHERE collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(index_name)s)
+            AND cmetadata ->> 'source' IS NOT NULL AND cmetadata ->> 'bucket' IS NOT NULL
+            ORDER BY cmetadata ->> 'source', cmetadata ->> 'bucket'
+            LIMIT 1
+        )
+        UNION ALL
+        SELECT next_document.* FROM documents, LATERAL (
+            SELECT cmetadata ->> 'source' AS source, cmetadata ->> 'bucket' AS bucket
+            FROM langchain_pg_embedding
+            WHERE collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(index_name)s)
+            AND cmetadata ->> 'source' IS NOT NULL AND cmetadata ->> 'bucket' IS NOT NULL
+            AND (cmetadata ->> 'source', cmetadata ->> 'bucket') > (documents.source, documents.bucket)
+            ORDER BY cmetadata ->> 'source', cmetadata ->> 'bucket'
+            LIMIT 1
+        ) next_document
+    )
+    SELECT source, bucket FROM documents
+    """
 
     params = {"index_name": config.INDEX_NAME}
     result_rows = pool_execution(query, params)
@@ -87,142 +106,134 @@ async def get_documents_embeddings() -> list:
 
     return file_list
 
-def parse_paragraph(document: Document, para: Paragraph):
-    return para.text
+def get_parser_pool() -> ProcessPoolExecutor:
+    """
+    Retrieves a singleton pool of worker processes which extract text from documents, so that
+    parsing of big documents uses multiple cores and does not hold the GIL of the API process.
+    """
+
+    global parser_pool
+    if parser_pool is None:
+        parser_pool = ProcessPoolExecutor(
+            max_workers=config.PARSER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return parser_pool
 
-def parse_table(table: Table):
-    table_extracted = []
 
-    for row in table.rows:
-        row_data = []
-        for cell in row.cells:
-            row_data.append(cell.text)
-        joined_row_data = "|".join(row_data)
-        table_extracted.append("|" + joined_row_data + "|")
-    table_string = "\n".join(table_extracted)
+def close_parser_pool() -> None:
+    global parser_pool
+    if parser_pool is not None:
+        parser_pool.shutdown(wait=False, cancel_futures=True)
+        parser_pool = None
 
-    return table_string
 
-def ingest_to_pgvector(doc_path: Path, bucket: str):
+def iter_pdf_pages(doc_path: Path) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page number, text) of the pages of a PDF which have text, in page order.
+
+    Ranges of `PDF_PAGES_PER_TASK` pages are extracted in parallel by the parser processes. At
+    most two ranges per worker are in flight, which bounds memory for very large documents.
+    """
+    pool = get_parser_pool()
+    pages_per_task = config.PDF_PAGES_PER_TASK
+    page_count = pool.submit(count_pdf_pages, str(doc_path)).result()
+
+    pending = deque()
+    try:
+        for start in range(0, page_count, pages_per_task):
+            end = min(start + pages_per_task, page_count)
+            pending.append(pool.submit(extract_pdf_pages, str(doc_path), start, end))
+            if len(pending) >= 2 * config.PARSER_WORKERS:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+    finally:
+        # Ingestion stopped early, do not parse the remaining pages
+        for future in pending:
+            future.cancel()
+
+
+def iter_document_chunks(doc_path: Path, bucket: str) -> Iterator[Document]:
+    """
+    Yields the chunks of a PDF, DOCX or TXT document along with their metadata. PDF pages are
+    split as soon as they are extracted, so chunks reach the embedder before the whole document
+    has been parsed.
+
+    Raises:
+        HTTPException: If no text is found in the document.
+    """
+
+    # Create one chunk per page or split the whole text
+    # Set chunk size to max tokens for your model (e.g., 512)
+    text_splitter = TokenTextSplitter(
+        chunk_size=config.CHUNK_SIZE,
+        chunk_overlap=config.CHUNK_OVERLAP,  # Use some overlap if needed
+        encoding_name="cl100k_base",  # Use the encoding for your model
+    )
+
+    suffix = doc_path.suffix.lower()
+    if suffix == ".pdf":
+        sections = (
+            (page_text, {"page": page_num, "source": str(doc_path)})
+            for page_num, page_text in iter_pdf_pages(doc_path)
+        )
+    elif suffix == ".docx":
+        full_text = get_parser_pool().submit(extract_docx_text, str(doc_path)).result()
+        sections = [(full_text, {"source": str(doc_path)})] if full_text.strip() else []
+    elif suffix == ".txt":
+        with open(doc_path, "r", encoding="utf-8") as f:
+            full_text = f.read()
+        sections = [(full_text, {"source": str(doc_path)})] if full_text.strip() else []
+    else:
+        sections = []
+
+    has_chunks = False
+    for text, metadata in sections:
+        for chunk in text_splitter.split_text(text):
+            has_chunks = True
+            yield Document(
+                page_content=chunk,
+                metadata={"bucket": bucket, "filename": doc_path.name, **metadata},
+            )
+
+    if not has_chunks:
+        file_type = {".pdf": "PDF", ".docx": "DOCX", ".txt": "TXT file"}.get(suffix, "document")
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            detail=f"No text found in the {file_type} for ingestion."
+        )
+
+
+def ingest_to_pgvector(
+    doc_path: Path, bucket: str, cancel_event: Optional[threading.Event] = None
+) -> int:
     """
     Ingests a document into a PostgreSQL database with PGVector extension for vector embeddings.
     This function processes a document, splits it into chunks, generates embeddings for each chunk,
-    and uploads the embeddings to a PGVector collection in batches.
+    and uploads the embeddings to a PGVector collection in batches. Chunks are streamed from the
+    parser to the embedder, so the whole document is never held in memory.
 
     Args:
         doc_path (Path): The file path to the document to be ingested.
         bucket (str): The name of the bucket associated with the document metadata.
+        cancel_event (threading.Event, optional): If set, ingestion stops before the next batch.
+
+    Returns:
+        int: The number of chunks stored for the document.
 
     Raises:
         HTTPException: If no text is found in the document or if an error occurs during ingestion.
+        CancelledError: If ingestion was cancelled through `cancel_event`.
     """
 
-
     try:
-        chunks = []
-        # Create one chunk per page or split the whole text
-        # Set chunk size to max tokens for your model (e.g., 512)
-        text_splitter = TokenTextSplitter(
-            chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP,  # Use some overlap if needed
-            encoding_name="cl100k_base",  # Use the encoding for your model
-        )
-
-        if doc_path.suffix.lower() == ".pdf":
-            # Use pdfplumber to extract text
-            with pdfplumber.open(doc_path) as pdf:
-                texts = []
-                for i, page in enumerate(pdf.pages):
-                    page_text = page.extract_text() or ""
-                    if page_text.strip():
-                        texts.append((i, page_text))
-            if not texts:
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the PDF for ingestion.")
-                        
-            for page_num, page_text in texts:
-                page_chunks = text_splitter.create_documents([page_text])
-                for chunk in page_chunks:
-                    if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                        chunk.metadata = {}
-                    chunk.metadata.update({
-                        "page": page_num,
-                        "source": str(doc_path)  # or doc_path.name if you want only filename
-                    })
-                    chunks.append(chunk)
-        elif doc_path.suffix.lower() == ".docx":
-            doc = DocxDocument(doc_path)
-            summary = []
-            for child in doc.iter_inner_content():
-                if isinstance(child, Paragraph):
-                    summary.append(parse_paragraph(doc, child))
-                elif isinstance(child, Table):
-                    summary.append(parse_table(child))
-
-            full_text = ""
-            for content in summary:
-                full_text += content + "\n"
-            if not full_text.strip():
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the DOCX for ingestion.")
-
-            docx_chunks = text_splitter.create_documents([full_text])
-            for chunk in docx_chunks:
-                if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                    chunk.metadata = {}
-                chunk.metadata.update({
-                    "source": str(doc_path)
-                })
-                chunks.append(chunk)
-        elif doc_path.suffix.lower() == ".txt":
-            with open(doc_path, "r", encoding="utf-8") as f:
-                full_text = f.read()
-            if not full_text.strip():
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the TXT file for ingestion.")
-
-            txt_chunks = text_splitter.create_documents([full_text])
-            for chunk in txt_chunks:
-                if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                    chunk.metadata = {}
-                chunk.metadata.update({
-                    "source": str(doc_path)
-                })
-                chunks.append(chunk)
-               
-        if not chunks:
-            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the document for ingestion.")
-
-        documents = [
-            Document(
-                page_content=chunk.page_content,
-                metadata={"bucket": bucket, "filename": doc_path.name, **chunk.metadata},
-            )
-            for chunk in chunks
-        ]
-
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
-        )
-
-        # Batch upload documents to handle large files
-        batch_size = config.BATCH_SIZE
-        for i in range(0, len(documents), batch_size):
-            batch_documents = documents[i : i + batch_size]
-
-            _ = PGVector.from_documents(
-                documents=batch_documents,
-                embedding=embedder,
-                collection_name=config.INDEX_NAME,
-                connection=config.PG_CONNECTION_STRING,
-                use_jsonb=True
-            )
-
-            logger.info(
-                f"Processed batch {i // batch_size + 1}/{(len(documents) - 1) // batch_size + 1}"
-            )
+        # Embed and store in batches, on pooled connections, to handle large files
+        chunks = iter_document_chunks(doc_path, bucket)
+        return get_vector_writer().add_documents(chunks, cancel_event=cancel_event)
 
-    except HTTPException as e:
+    except (HTTPException, CancelledError) as e:
         raise e
 
     except Exception as e:
@@ -260,24 +271,18 @@ async def delete_embeddings(
         # irrespective of whether a `file_name` is provided or not.
         if delete_all:
             query = """
-            DELETE FROM langchain_pg_embedding WHERE EXISTS (
-                SELECT * FROM langchain_pg_collection WHERE
-                langchain_pg_embedding.collection_id = langchain_pg_collection.uuid AND
-                langchain_pg_collection.name = %(indexname)s AND
-                langchain_pg_embedding.cmetadata ->> 'bucket' = %(bucket)s
-            )
+            DELETE FROM langchain_pg_embedding WHERE
+            collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(indexname)s)
+            AND cmetadata ->> 'bucket' = %(bucket)s
             """
             params = {"indexname": config.INDEX_NAME, "bucket": bucket_name}
 
         elif file_name:
             query = """
-            DELETE FROM langchain_pg_embedding WHERE EXISTS (
-                SELECT 1 FROM langchain_pg_collection WHERE
-                langchain_pg_embedding.collection_id = langchain_pg_collection.uuid AND
-                langchain_pg_collection.name = %(indexname)s AND
-                langchain_pg_embedding.cmetadata ->> 'filename' = %(filename)s AND
-                langchain_pg_embedding.cmetadata ->> 'bucket' = %(bucket)s
-            )
+            DELETE FROM langchain_pg_embedding WHERE
+            collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(indexname)s)
+            AND cmetadata ->> 'bucket' = %(bucket)s
+            AND cmetadata ->> 'filename' = %(filename)s
             """
 
             params = {
@@ -292,6 +297,9 @@ async def delete_embeddings(
             )
 
         result = pool_execution(query, params)
+        if delete_all:
+            # The collection may be recreated after everything was deleted
+            reset_vector_writer()
         if result:
             return bool(result)
         else:
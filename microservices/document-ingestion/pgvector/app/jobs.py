@@ -0,0 +1,201 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+import shortuuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Callable, List, Optional
+from .logger import logger
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class JobFile:
+    """A file of an ingestion job along with its ingestion progress."""
+
+    def __init__(self, file_name: str, bucket: str, path: Path):
+        self.file_name = file_name
+        self.bucket = bucket
+        self.path = path
+        self.status = JobStatus.QUEUED
+        self.chunks = 0
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "file_name": self.file_name,
+            "bucket_name": self.bucket,
+            "status": self.status.value,
+            "chunks": self.chunks,
+            "error": self.error,
+        }
+
+
+class IngestionJob:
+    """
+    A set of uploaded files which are ingested concurrently. Job status is derived from the
+    status of its files, so a job cancelled while its last file was completing is completed.
+    """
+
+    def __init__(self, files: List[JobFile]):
+        self.id = shortuuid.uuid()
+        self.files = files
+        self.created_at = time.time()
+        self.cancel_event = threading.Event()
+
+    @property
+    def status(self) -> JobStatus:
+        statuses = {f.status for f in self.files}
+        if not statuses <= FINISHED_STATUSES:
+            return JobStatus.QUEUED if statuses == {JobStatus.QUEUED} else JobStatus.RUNNING
+        if JobStatus.FAILED in statuses:
+            return JobStatus.FAILED
+        if JobStatus.CANCELLED in statuses:
+            return JobStatus.CANCELLED
+        return JobStatus.COMPLETED
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "files_total": len(self.files),
+            "files_done": sum(f.status in FINISHED_STATUSES for f in self.files),
+            "chunks": sum(f.chunks for f in self.files),
+            "files": [f.to_dict() for f in self.files],
+        }
+
+
+class JobManager:
+    """
+    Runs ingestion jobs on a bounded pool of worker threads, so that parsing, embedding and
+    database writes never block the event loop and the files of a multi-file upload are
+    ingested concurrently.
+
+    Finished jobs are kept, for progress queries, until more than `max_history` jobs exist.
+    """
+
+    def __init__(self, max_workers: int, max_history: int):
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion")
+
+    def _run_file(self, job: IngestionJob, job_file: JobFile, ingest: Callable[..., int]) -> None:
+        try:
+            if job.cancel_event.is_set():
+                raise CancelledError()
+
+            job_file.status = JobStatus.RUNNING
+            job_file.chunks = ingest(
+                doc_path=job_file.path, bucket=job_file.bucket, cancel_event=job.cancel_event
+            ) or 0
+            job_file.status = JobStatus.COMPLETED
+            logger.info(f"Job {job.id}: ingested {job_file.file_name}")
+
+        except CancelledError:
+            job_file.status = JobStatus.CANCELLED
+            logger.info(f"Job {job.id}: cancelled ingestion of {job_file.file_name}")
+
+        except Exception as ex:
+            job_file.error = str(getattr(ex, "detail", ex))
+            job_file.status = JobStatus.FAILED
+            logger.error(f"Job {job.id}: error while ingesting {job_file.file_name}: {ex}")
+
+        finally:
+            self._cleanup(job_file)
+
+    @staticmethod
+    def _cleanup(job_file: JobFile) -> None:
+        # Delete temporary file after ingestion
+        if job_file.path.exists():
+            job_file.path.unlink()
+            logger.info("Temporary file cleaned up!")
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def submit(self, files: List[JobFile], ingest: Callable[..., int]) -> IngestionJob:
+        """
+        Queues ingestion of the files. Each file is ingested on its own worker.
+
+        Args:
+            files (List[JobFile]): Files saved at a temporary location, deleted after ingestion.
+            ingest (Callable): Called as `ingest(doc_path=, bucket=, cancel_event=)` for every
+                file. Returns the number of stored chunks.
+
+        Returns:
+            IngestionJob: The queued job.
+        """
+        job = IngestionJob(files)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+
+        for job_file in files:
+            job_file.future = self._executor.submit(self._run_file, job, job_file, ingest)
+
+        logger.info(f"Job {job.id}: queued ingestion of {len(files)} file(s)")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[IngestionJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[IngestionJob]:
+        """
+        Cancels a job. Queued files are skipped and running files stop after their current
+        batch. Chunks already stored for a running file are kept.
+
+        Returns:
+            IngestionJob: The cancelled job, or None if there is no job with this id.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_event.set()
+        for job_file in job.files:
+            if job_file.future is not None and job_file.future.cancel():
+                job_file.status = JobStatus.CANCELLED
+                self._cleanup(job_file)
+
+        logger.info(f"Job {job.id}: cancellation requested")
+        return job
+
+    async def wait(self, job: IngestionJob) -> IngestionJob:
+        """Waits, without blocking the event loop, until all files of the job are finished."""
+        await asyncio.gather(
+            *(asyncio.wrap_future(f.future) for f in job.files if f.future is not None),
+            return_exceptions=True,
+        )
+        return job
+
+    def shutdown(self) -> None:
+        for job in self.list():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=True)
@@ -2,27 +2,49 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import asyncio
 import psycopg
 import uvicorn
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, File, Query, UploadFile
+from fastapi import FastAPI, HTTPException, File, Query, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BeforeValidator
 from typing import Annotated, List, Optional
 from .logger import logger
 from .config import Settings
-from .db_config import get_db_connection_pool
-from .document import get_documents_embeddings, ingest_to_pgvector, save_temp_file, delete_embeddings
-from .url import get_urls_embedding, ingest_url_to_pgvector, delete_embeddings_url
+from .db_config import create_metadata_indexes, get_db_connection_pool
+from .document import (
+    close_parser_pool, get_documents_embeddings, ingest_to_pgvector, save_temp_file, delete_embeddings
+)
+from .url import get_url_fetcher, get_urls_embedding, ingest_url_to_pgvector, delete_embeddings_url
 from .utils import check_tables_exist, Validation
 from .store import DataStore
+from .jobs import JobFile, JobManager, JobStatus
 
 config = Settings()
 pool = get_db_connection_pool()
+job_manager = JobManager(max_workers=config.INGESTION_WORKERS, max_history=config.INGESTION_JOB_HISTORY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build missing metadata indexes in the background, as this may take a while on big tables
+    index_task = asyncio.create_task(asyncio.to_thread(create_metadata_indexes))
+    yield
+    if not index_task.done():
+        logger.info("Metadata indexes are still being built.")
+    # Stop queued ingestion and wait for running files to reach a batch boundary
+    await asyncio.to_thread(job_manager.shutdown)
+    close_parser_pool()
+    await get_url_fetcher().aclose()
+
 
-app = FastAPI(title=config.APP_DISPLAY_NAME, description=config.APP_DESC, root_path="/v1/dataprep")
+app = FastAPI(
+    title=config.APP_DISPLAY_NAME, description=config.APP_DESC, root_path="/v1/dataprep", lifespan=lifespan
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -104,40 +126,50 @@ async def ingest_document(
     files: Annotated[
         list[UploadFile],
         File(description="Select single or multiple PDF, docx or pdf file(s)."),
-    ]
+    ],
+    response: Response,
+    wait: Annotated[
+        bool, Query(description="Wait for ingestion to finish. Set \"false\" to get a job id right away.")
+    ] = True,
 ) -> dict:
     """
-    Ingest documents into the system.
+    Ingest documents into the system. Files are uploaded to the Data Store and then ingested
+    concurrently by an ingestion job, off the event loop.
 
     Args:
         files (list[UploadFile]): A file or multiple files to be ingested.
+        wait (bool): If "True", respond after ingestion is finished. If "False", respond with
+        the id of the ingestion job right away; progress is available at `/jobs/{job_id}`.
 
     Returns:
-        dict: A status message indicating the result of the ingestion.
+        dict: A status message indicating the result of the ingestion, or the id of the job.
     """
     try:
-        if files:
-            if not isinstance(files, list):
-                files = [files]
-
+        if not files:
+            return {"status": 200, "message": "Data preparation succeeded"}
+
+        if not isinstance(files, list):
+            files = [files]
+
+        # Validate all files before uploading any of them
+        for file in files:
+            fileName = os.path.basename(file.filename)
+            file_extension = os.path.splitext(fileName)[1].lower()
+            if file_extension not in config.SUPPORTED_FORMATS:
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    detail=f"Unsupported file format: {file_extension}. Supported formats are: pdf, txt, docx",
+                )
+
+        job_files = []
+        try:
             for file in files:
-                fileName = os.path.basename(file.filename)
-                file_extension = os.path.splitext(fileName)[1].lower()
-                if file_extension not in config.SUPPORTED_FORMATS:
-                    raise HTTPException(
-                        status_code=HTTPStatus.BAD_REQUEST,
-                        detail=f"Unsupported file format: {file_extension}. Supported formats are: pdf, txt, docx",
-                    )
-                else:
-                    logger.info(
-                        f"file: {file.filename} uploaded to DataStore successfully!"
-                    )
-
                 # Upload files to Data Store
                 try:
-                    result = DataStore.upload_document(file)
+                    result = await asyncio.to_thread(DataStore.upload_document, file)
                     bucket_name = result["bucket"]
                     uploaded_filename = result["file"]
+                    logger.info(f"file: {file.filename} uploaded to DataStore successfully!")
 
                 except Exception as ex:
                     logger.error(f"Internal Error: {ex}")
@@ -146,25 +178,35 @@ async def ingest_document(
                         detail="Some unknown error ocurred. Please try later!",
                     )
 
-                try:
-                    # Save file in temporary file on disk to ingest it
-                    temp_path: Path = await save_temp_file(
-                        file, bucket_name, uploaded_filename
-                    )
-                    logger.info(f"Temporary path of saved file: {temp_path}")
-                    ingest_to_pgvector(doc_path=temp_path, bucket=bucket_name)
+                # Save file in temporary file on disk to ingest it, the job deletes it afterwards
+                temp_path: Path = await save_temp_file(file, bucket_name, uploaded_filename)
+                logger.info(f"Temporary path of saved file: {temp_path}")
+                job_files.append(JobFile(uploaded_filename, bucket_name, temp_path))
 
-                except Exception as e:
-                    raise HTTPException(
-                        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-                        detail=f"Unexpected error while ingesting data. Exception: {e}",
-                    )
+        except Exception:
+            for job_file in job_files:
+                job_file.path.unlink(missing_ok=True)
+            raise
+
+        job = job_manager.submit(job_files, ingest=ingest_to_pgvector)
+
+        if not wait:
+            response.status_code = HTTPStatus.ACCEPTED
+            return {"status": HTTPStatus.ACCEPTED, "message": "Data preparation started", "job_id": job.id}
 
-                finally:
-                    # Delete temporary file after ingestion
-                    if "temp_path" in locals():  # check if temp_path variable exist
-                        Path(temp_path).unlink()
-                        logger.info("Temporary file cleaned up!")
+        await job_manager.wait(job)
+        failed = [f for f in job.files if f.error]
+        if failed:
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail=f"Unexpected error while ingesting data. Exception: {failed[0].error}",
+            )
+
+        if job.status == JobStatus.CANCELLED:
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT,
+                detail=f"Ingestion job {job.id} was cancelled. Chunks stored before cancellation are kept.",
+            )
 
         result = {"status": 200, "message": "Data preparation succeeded"}
 
@@ -177,6 +219,69 @@ async def ingest_document(
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@app.get(
+    "/jobs",
+    tags=["Data Preparation APIs"],
+    summary="Get the list of document ingestion jobs.",
+    response_model=List[dict],
+)
+async def get_jobs() -> List[dict]:
+    """
+    Retrieve running jobs and recently finished jobs along with their progress.
+
+    Returns:
+        List[dict]: A list of jobs.
+    """
+    return [job.to_dict() for job in job_manager.list()]
+
+
+@app.get(
+    "/jobs/{job_id}",
+    tags=["Data Preparation APIs"],
+    summary="Get status and progress of a document ingestion job.",
+    response_model=dict,
+)
+async def get_job(job_id: str) -> dict:
+    """
+    Retrieve status and progress of a job.
+
+    Args:
+        job_id (str): Id of the job returned when documents were uploaded.
+
+    Returns:
+        dict: Job status, number of ingested files and chunks, and status of each file.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=f"Job {job_id} not found.")
+
+    return job.to_dict()
+
+
+@app.delete(
+    "/jobs/{job_id}",
+    tags=["Data Preparation APIs"],
+    summary="Cancel a document ingestion job.",
+    response_model=dict,
+)
+async def cancel_job(job_id: str) -> dict:
+    """
+    Cancel a job. Queued files are not ingested and files being ingested stop after the
+    current batch. Chunks which are already stored are kept.
+
+    Args:
+        job_id (str): Id of the job to be cancelled.
+
+    Returns:
+        dict: Job status after cancellation was requested.
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=f"Job {job_id} not found.")
+
+    return job.to_dict()
+
+
 @app.delete(
     "/documents",
     tags=["Data Preparation APIs"],
@@ -367,7 +472,7 @@ async def ingest_links(urls: list[str]) -> dict:
     """
     try:
         if urls:
-            ingest_url_to_pgvector(urls)
+            await ingest_url_to_pgvector(urls)
 
         result = {"status": 200, "message": "Data preparation succeeded"}
         return result
@@ -0,0 +1,67 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+# Text extraction functions which run in the parser worker processes. Keep imports of this
+# module light, as it is imported by every worker process.
+
+from typing import List, Tuple
+import pdfplumber
+from docx import Document as DocxDocument
+from docx.text.paragraph import Paragraph
+from docx.table import Table
+
+
+def count_pdf_pages(path: str) -> int:
+    """Returns the number of pages of a PDF."""
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    Extracts text of the pages `start` to `end` (excluded, 0-based) of a PDF.
+
+    Returns:
+        List[Tuple[int, str]]: Page number (0-based) and text of every page with text.
+    """
+    texts = []
+    with pdfplumber.open(path, pages=range(start + 1, end + 1)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            if page_text.strip():
+                texts.append((page.page_number - 1, page_text))
+            # Release the parsed page objects, pages are not needed anymore
+            page.close()
+
+    return texts
+
+
+def parse_paragraph(para: Paragraph):
+    return para.text
+
+
+def parse_table(table: Table):
+    table_extracted = []
+
+    for row in table.rows:
+        row_data = []
+        for cell in row.cells:
+            row_data.append(cell.text)
+        joined_row_data = "|".join(row_data)
+        table_extracted.append("|" + joined_row_data + "|")
+    table_string = "\n".join(table_extracted)
+
+    return table_string
+
+
+def extract_docx_text(path: str) -> str:
+    """Extracts text of paragraphs and tables of a DOCX, in document order."""
+    doc = DocxDocument(path)
+    summary = []
+    for child in doc.iter_inner_content():
+        if isinstance(child, Paragraph):
+            summary.append(parse_paragraph(child))
+        elif isinstance(child, Table):
+            summary.append(parse_table(child))
+
+    return "".join(content + "\n" for content in summary)
@@ -1,23 +1,25 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import requests
+import asyncio
+import httpx
 import psycopg
 import ipaddress
 import socket
 from urllib.parse import urlparse
 from http import HTTPStatus
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
+from langchain_core.documents import Document
 from .logger import logger
 from .config import Settings
 from .db_config import pool_execution
-from .utils import get_separators, parse_html
+from .vector_writer import get_vector_writer, reset_vector_writer
+from .utils import get_separators, html_to_text
 
 config = Settings()
+url_fetcher = None
 
 async def get_urls_embedding() -> List[str]:
     """
@@ -31,10 +33,31 @@ async def get_urls_embedding() -> List[str]:
     """
 
     url_list = []
-    query = "SELECT DISTINCT \
-    lpc.cmetadata ->> 'url' as url FROM \
-    langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll \
-    ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(index_name)s"
+    # Loose index scan: jump from one URL to the next on the URL index, instead of reading
+    # every chunk of every URL.
+    query = """
+    WITH RECURSIVE urls AS (
+        (
+            SELECT cmetadata ->> 'url' AS url
+            FROM langchain_pg_embedding
+            WHERE collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(index_name)s)
+            AND cmetadata ? 'url'
+            ORDER BY cmetadata ->> 'url'
+            LIMIT 1
+        )
+        UNION ALL
+        SELECT next_url.* FROM urls, LATERAL (
+            SELECT cmetadata ->> 'url' AS url
+            FROM langchain_pg_embedding
+            WHERE collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(index_name)s)
+            AND cmetadata ? 'url'
+            AND cmetadata ->> 'url' > urls.url
+            ORDER BY cmetadata ->> 'url'
+            LIMIT 1
+        ) next_url
+    )
+    SELECT url FROM urls WHERE url IS NOT NULL
+    """
 
     params = {"index_name": config.INDEX_NAME}
     result_rows = pool_execution(query, params)
@@ -104,105 +127,180 @@ def validate_url(url: str) -> bool:
         return False
 
 
-def ingest_url_to_pgvector(url_list: List[str]) -> None:
+class URLFetcher:
     """
-    Ingests a list of URLs into a PGVector database by fetching their content,
-    splitting it into chunks, generating embeddings, and storing them.
+    Downloads web pages concurrently with a shared, pooled HTTP client.
 
-    Args:
-        url_list (List[str]): A list of URLs to be ingested.
-
-    Raises:
-        HTTPException: If there are issues with SSL, HTTP response status,
-            HTML parsing, or any other errors during the ingestion process.
+    Every URL is checked with `validate_url` before it is requested. Requests are limited to
+    `concurrency` in total and to `per_host` per host, and requests to the same host are spaced
+    by at least `host_interval` seconds. Redirects are not followed, as redirect targets would
+    bypass the URL validation.
     """
 
-
-    try:
-        invalid_urls = 0
-        for url in url_list:
-            if not validate_url(url):
-                logger.info(f"Invalid URL skipped: {url}")
-                invalid_urls += 1
-                continue
-
+    def __init__(self, concurrency: int, per_host: int, host_interval: float, timeout: float):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_interval = host_interval
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._close_tasks = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Client, connection pool and limits are bound to the event loop they are used in
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                self._close_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=False,
+                limits=httpx.Limits(max_connections=self.concurrency),
+            )
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._hosts: Dict[str, Tuple[asyncio.Semaphore, asyncio.Lock]] = {}
+            self._next_request: Dict[str, float] = {}
+        return self._client
+
+    def _close_client(self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Closes the client of another event loop, to release its connections. The client is closed
+        on its loop if that loop is still running, otherwise on the running loop.
+        """
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        async def aclose() -> None:
             try:
-                # Use a custom HTTP adapter to enforce IP-based restrictions
-                with requests.Session() as session:
-                    adapter = requests.adapters.HTTPAdapter()
-                    session.mount("http://", adapter)
-                    session.mount("https://", adapter)
-                    response = session.get(url, timeout=5, allow_redirects=False)
-
-                if response.status_code != HTTPStatus.OK:
-                    logger.info(f"Failed to fetch URL: {url} with status code {response.status_code}")
-                    invalid_urls += 1
+                await client.aclose()
             except Exception as e:
-                logger.error(f"Error fetching URL {url}: {e}")
-                invalid_urls += 1
-
-        if invalid_urls > 0:
-            raise Exception(
-                f"{invalid_urls} / {len(url_list)} URL(s) are invalid.",
-                response.status_code
-            )
+                logger.debug(f"Failed to close the HTTP client of a stopped event loop: {e}")
+
+        task = asyncio.get_running_loop().create_task(aclose())
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+
+    async def _wait_for_host(self, host: str) -> None:
+        _, lock = self._hosts[host]
+        loop = asyncio.get_running_loop()
+        async with lock:
+            delay = self._next_request.get(host, 0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_request[host] = loop.time() + self.host_interval
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """
+        Downloads a web page.
+
+        Returns:
+            str: The content of the page, or None if the URL is invalid or the page could
+            not be fetched.
+        """
+        if not await asyncio.to_thread(validate_url, url):
+            logger.info(f"Invalid URL skipped: {url}")
+            return None
+
+        client = self._get_client()
+        host = urlparse(url).hostname
+        if host not in self._hosts:
+            self._hosts[host] = (asyncio.Semaphore(self.per_host), asyncio.Lock())
 
-    # If the domain name is wrong, SSLError will be thrown
-    except requests.exceptions.SSLError as e:
-        raise HTTPException(
-            status_code=HTTPStatus.FORBIDDEN, detail=f"SSL Error: {str(e)}"
+        try:
+            async with self._hosts[host][0]:
+                await self._wait_for_host(host)
+                async with self._semaphore:
+                    response = await client.get(url)
+
+            if response.status_code != HTTPStatus.OK:
+                logger.info(f"Failed to fetch URL: {url} with status code {response.status_code}")
+                return None
+
+            return response.text
+
+        except Exception as e:
+            logger.error(f"Error fetching URL {url}: {e}")
+            return None
+
+    async def fetch_all(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """Downloads every distinct URL once. Returns the content of each URL."""
+        urls = list(dict.fromkeys(urls))
+        contents = await asyncio.gather(*(self.fetch(url) for url in urls))
+        return dict(zip(urls, contents))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def get_url_fetcher() -> URLFetcher:
+    """Retrieves a singleton URL fetcher, so that connections are reused across requests."""
+
+    global url_fetcher
+    if url_fetcher is None:
+        url_fetcher = URLFetcher(
+            concurrency=config.URL_FETCH_CONCURRENCY,
+            per_host=config.URL_FETCH_PER_HOST,
+            host_interval=config.URL_FETCH_HOST_INTERVAL,
+            timeout=config.URL_FETCH_TIMEOUT,
         )
+    return url_fetcher
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=e.args[1], detail=e.args[0]
-        )
 
-    try:
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP,
-            add_start_index=True,
-            separators=get_separators(),
-        )
+def ingest_url_content(url: str, content: str) -> int:
+    """
+    Converts the HTML content of a URL to text, splits it into chunks, generates embeddings
+    and stores them.
 
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
-        )
+    Returns:
+        int: The number of chunks stored for the URL.
+    """
 
-        for url in url_list:
-            try:
-                content = parse_html(
-                    [url], chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP
-                )
-            except Exception as e:
-                logger.error(f"Error while parsing HTML content for URL - {url}: {e}")
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error while parsing URL")
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=config.CHUNK_SIZE,
+        chunk_overlap=config.CHUNK_OVERLAP,
+        add_start_index=True,
+        separators=get_separators(),
+    )
 
-            logger.info(f"[ ingest url ] url: {url} content: {content}")
-            metadata = [{"url": url}]
+    text = html_to_text(content)
+    chunks = text_splitter.split_text(text)
+    logger.info(f"[ ingest url ] url: {url} chunks: {len(chunks)}")
 
-            chunks = text_splitter.split_text(content)
-            batch_size = config.BATCH_SIZE
+    documents = (Document(page_content=chunk, metadata={"url": url}) for chunk in chunks)
+    return get_vector_writer().add_documents(documents)
 
-            for i in range(0, len(chunks), batch_size):
-                batch_texts = chunks[i : i + batch_size]
 
-                _ = PGVector.from_texts(
-                    texts=batch_texts,
-                    embedding=embedder,
-                    metadatas=metadata,
-                    collection_name=config.INDEX_NAME,
-                    connection=config.PG_CONNECTION_STRING,
-                    use_jsonb=True
-                )
+async def ingest_url_to_pgvector(url_list: List[str]) -> None:
+    """
+    Ingests a list of URLs into a PGVector database by fetching their content,
+    splitting it into chunks, generating embeddings, and storing them.
+    All URLs are downloaded concurrently, once, before any of them is ingested.
 
-                logger.info(
-                    f"Processed batch {i // batch_size + 1}/{(len(chunks) - 1) // batch_size + 1}"
-                )
+    Args:
+        url_list (List[str]): A list of URLs to be ingested.
+
+    Raises:
+        HTTPException: If any URL is invalid or could not be fetched, or if any
+            other error occurs during the ingestion process.
+    """
+
+    contents = await get_url_fetcher().fetch_all(url_list)
+
+    invalid_urls = sum(content is None for content in contents.values())
+    if invalid_urls > 0:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"{invalid_urls} / {len(contents)} URL(s) are invalid."
+        )
+
+    try:
+        for url, content in contents.items():
+            # Parsing, embedding and DB writes are blocking, run them off the event loop
+            await asyncio.to_thread(ingest_url_content, url, content)
 
     except Exception as e:
         logger.error(f"Error during ingestion : {e}")
@@ -265,6 +363,9 @@ async def delete_embeddings_url(url: Optional[str], delete_all: bool = False) ->
             )
 
         result = pool_execution(query, params)
+        if delete_all:
+            # The collection may be recreated after everything was deleted
+            reset_vector_writer()
         if result:
             return True
         else:
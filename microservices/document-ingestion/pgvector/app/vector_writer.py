@@ -0,0 +1,228 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, List, Optional
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+from langchain_postgres.vectorstores import PGVector
+from psycopg.errors import ForeignKeyViolation, UndefinedTable
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+from sqlalchemy import create_engine
+from .logger import logger
+from .config import Settings
+from .db_config import create_metadata_indexes, get_db_connection_pool
+
+config = Settings()
+vector_writer = None
+
+COPY_EMBEDDINGS_QUERY = (
+    "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) FROM STDIN"
+)
+
+
+def get_embedder() -> OpenAIEmbeddings:
+    """Creates the client for the TEI embedding endpoint."""
+    return OpenAIEmbeddings(
+        openai_api_key="EMPTY",
+        openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
+        model=config.EMBEDDING_MODEL_NAME,
+        tiktoken_enabled=False
+    )
+
+
+def to_vector_literal(embedding: List[float]) -> str:
+    """Formats an embedding as a pgvector text literal, e.g. '[0.1,0.2]'."""
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+class PGVectorWriter:
+    """
+    Long-lived writer which embeds documents and stores them in the PGVector collection.
+
+    Rows are written with COPY on connections borrowed from the shared psycopg connection pool,
+    instead of creating a new SQLAlchemy engine and re-checking the collection for every batch.
+    Inserts run on a background thread, so that the next batch is embedded while the previous
+    one is being written.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        embedder: OpenAIEmbeddings,
+        collection_name: str,
+        batch_size: int,
+        max_workers: int = 4,
+    ):
+        self.pool = pool
+        self.embedder = embedder
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self._collection_id: Optional[uuid.UUID] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pgvector-writer")
+
+    def _fetch_collection_id(self) -> Optional[uuid.UUID]:
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT uuid FROM langchain_pg_collection WHERE name = %(name)s",
+                    {"name": self.collection_name},
+                ).fetchone()
+        except UndefinedTable:
+            # Nothing was ingested yet, tables are created along with the collection
+            return None
+        return row[0] if row else None
+
+    def _create_collection(self) -> None:
+        # Let PGVector create the extension, tables and collection, so that the schema stays the
+        # one expected by the retriever. This runs only once per collection.
+        engine = create_engine(config.PG_CONNECTION_STRING)
+        try:
+            PGVector(
+                embeddings=self.embedder,
+                collection_name=self.collection_name,
+                connection=engine,
+                use_jsonb=True
+            )
+        finally:
+            engine.dispose()
+
+        # Tables may have been created just now, index them while they are still empty
+        create_metadata_indexes()
+
+    def get_collection_id(self) -> uuid.UUID:
+        """Returns the uuid of the collection, creating the collection if it does not exist."""
+        if self._collection_id is None:
+            with self._lock:
+                if self._collection_id is None:
+                    collection_id = self._fetch_collection_id()
+                    if collection_id is None:
+                        self._create_collection()
+                        collection_id = self._fetch_collection_id()
+                    self._collection_id = collection_id
+        return self._collection_id
+
+    def reset(self) -> None:
+        """Forgets the cached collection, e.g. after the collection was dropped."""
+        with self._lock:
+            self._collection_id = None
+
+    def insert(self, documents: List[Document], embeddings: List[List[float]]) -> int:
+        """
+        Inserts the documents along with their embeddings in a single COPY. If the cached
+        collection was dropped or recreated since it was looked up, the collection is looked
+        up again and the insert is retried once.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        try:
+            return self._copy_rows(self.get_collection_id(), documents, embeddings)
+        except (ForeignKeyViolation, UndefinedTable) as e:
+            logger.warning(f"Collection {self.collection_name} changed, looking it up again: {e}")
+            self.reset()
+            return self._copy_rows(self.get_collection_id(), documents, embeddings)
+
+    def _copy_rows(
+        self, collection_id: uuid.UUID, documents: List[Document], embeddings: List[List[float]]
+    ) -> int:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                with cur.copy(COPY_EMBEDDINGS_QUERY) as copy:
+                    for doc, embedding in zip(documents, embeddings):
+                        copy.write_row((
+                            str(uuid.uuid4()),
+                            collection_id,
+                            to_vector_literal(embedding),
+                            doc.page_content,
+                            Jsonb(doc.metadata or {}),
+                        ))
+        return len(documents)
+
+    def add_documents(
+        self, documents: Iterable[Document], cancel_event: Optional[threading.Event] = None
+    ) -> int:
+        """
+        Embeds and stores the documents in batches of `batch_size`. Documents are consumed
+        lazily, so a generator of chunks can be passed without holding all of them in memory.
+
+        Args:
+            documents (Iterable[Document]): Chunks to be stored in the collection.
+            cancel_event (threading.Event, optional): If set, stops before the next batch.
+
+        Returns:
+            int: Number of stored chunks.
+
+        Raises:
+            CancelledError: If `cancel_event` was set.
+            Exception: If embedding or inserting any batch fails. Batches inserted before the
+                failure or cancellation are kept.
+        """
+        documents = iter(documents)
+        pending: Optional[Future] = None
+        total = 0
+        batch_num = 0
+        try:
+            while batch := list(islice(documents, self.batch_size)):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CancelledError()
+
+                embeddings = self.embedder.embed_documents([doc.page_content for doc in batch])
+
+                # Wait for the previous batch before queueing this one, so that at most one
+                # batch per request is in flight and failures are reported in order.
+                if pending is not None:
+                    total += pending.result()
+                pending = self._executor.submit(self.insert, batch, embeddings)
+
+                batch_num += 1
+                logger.info(f"Embedded batch {batch_num} of {len(batch)} chunks")
+
+            if pending is not None:
+                total += pending.result()
+                pending = None
+
+        finally:
+            # Do not leave an insert running in the background once an error is raised
+            if pending is not None:
+                wait([pending])
+
+        logger.info(f"Stored {total} chunks in {batch_num} batches")
+        return total
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def reset_vector_writer() -> None:
+    """Forgets the collection cached by the vector-store writer, if it was created."""
+    if vector_writer is not None:
+        vector_writer.reset()
+
+
+def get_vector_writer() -> PGVectorWriter:
+    """
+    Retrieves a singleton vector-store writer which shares the database connection pool.
+
+    Raises:
+        Exception: If the database connection pool could not be created.
+    """
+
+    global vector_writer
+    if vector_writer is None:
+        pool = get_db_connection_pool()
+        if pool is None:
+            raise Exception("Database connection pool is not available.")
+
+        vector_writer = PGVectorWriter(
+            pool=pool,
+            embedder=get_embedder(),
+            collection_name=config.INDEX_NAME,
+            batch_size=config.BATCH_SIZE,
+        )
+    return vector_writer
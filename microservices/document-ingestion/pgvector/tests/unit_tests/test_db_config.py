@@ -1,5 +1,5 @@
-from app.db_config import get_db_connection_pool, pool_execution
-from unittest.mock import patch
+from app.db_config import METADATA_INDEXES, create_metadata_indexes, get_db_connection_pool, pool_execution
+from unittest.mock import MagicMock, patch
 
 def test_get_db_connection_pool(mock_pool):
     """
@@ -75,3 +75,122 @@ def test_pool_execution_exception(mock_pool):
         with patch("app.db_config.ConnectionPool.connection", side_effect=Exception("Error executing query")):
             result = pool_execution(query)
             assert result is None
+
+
+def make_index_pool(table, existing_indexes, building_indexes=(), locked=True):
+    """
+    Creates a mock pool whose connection reports whether the embedding table exists, whether
+    the advisory lock was acquired, which of the metadata indexes exist, along with their
+    validity, and which indexes are being built.
+    """
+
+    def execute(query, params=None):
+        result = MagicMock()
+        if "to_regclass" in query:
+            result.fetchone.return_value = (table,)
+        elif "pg_try_advisory_lock" in query:
+            result.fetchone.return_value = (locked,)
+        elif "pg_stat_progress_create_index" in query:
+            result.fetchall.return_value = [(name,) for name in building_indexes]
+        elif "pg_index" in query:
+            result.fetchall.return_value = list(existing_indexes.items())
+        return result
+
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    conn.execute.side_effect = execute
+    pool = MagicMock()
+    pool.connection.return_value = conn
+    return pool, conn
+
+
+def executed_queries(conn):
+    return [call.args[0] for call in conn.execute.call_args_list]
+
+
+def test_create_metadata_indexes_without_table():
+    """
+    Tests that no index is created while the embedding table does not exist yet.
+    Asserts:
+        - `create_metadata_indexes` returns False without creating any index.
+    """
+
+    pool, conn = make_index_pool(None, {})
+
+    with patch("app.db_config.get_db_connection_pool", return_value=pool):
+        assert create_metadata_indexes() is False
+
+    assert not any("CREATE INDEX" in query for query in executed_queries(conn))
+
+
+def test_create_metadata_indexes():
+    """
+    Tests that missing indexes are created concurrently and invalid indexes are rebuilt.
+    Asserts:
+        - Only missing and invalid indexes are created, outside of a transaction.
+        - Invalid indexes are dropped before being created again.
+        - Statistics are collected after creating indexes.
+    """
+
+    names = list(METADATA_INDEXES)
+    pool, conn = make_index_pool("langchain_pg_embedding", {names[0]: True, names[1]: False})
+
+    with patch("app.db_config.get_db_connection_pool", return_value=pool):
+        assert create_metadata_indexes() is True
+
+    queries = executed_queries(conn)
+    created = [query for query in queries if query.startswith("CREATE INDEX CONCURRENTLY")]
+    assert [name for name in names if any(name in query for query in created)] == names[1:]
+    assert f"DROP INDEX CONCURRENTLY IF EXISTS {names[1]}" in queries
+    assert queries[-2] == "ANALYZE langchain_pg_embedding"
+    assert queries[-1] == "SELECT pg_advisory_unlock(%(key)s)"
+    assert conn.autocommit is False
+
+
+def test_create_metadata_indexes_existing():
+    """
+    Tests that nothing is created when all indexes exist and are valid.
+    """
+
+    pool, conn = make_index_pool("langchain_pg_embedding", {name: True for name in METADATA_INDEXES})
+
+    with patch("app.db_config.get_db_connection_pool", return_value=pool):
+        assert create_metadata_indexes() is True
+
+    assert not any("INDEX CONCURRENTLY" in query for query in executed_queries(conn))
+
+
+def test_create_metadata_indexes_locked():
+    """
+    Tests that nothing is built while another session holds the metadata index lock.
+    Asserts:
+        - `create_metadata_indexes` returns False right away, without reading the indexes.
+    """
+
+    pool, conn = make_index_pool("langchain_pg_embedding", {}, locked=False)
+
+    with patch("app.db_config.get_db_connection_pool", return_value=pool):
+        assert create_metadata_indexes() is False
+
+    queries = executed_queries(conn)
+    assert not any("pg_index" in query or "INDEX CONCURRENTLY" in query for query in queries)
+    assert not any("pg_advisory_unlock" in query for query in queries)
+
+
+def test_create_metadata_indexes_build_in_progress():
+    """
+    Tests that an index which is invalid because it is still being built is not dropped.
+    Asserts:
+        - No index is dropped or created while a build is in progress on the table.
+        - The advisory lock is released.
+    """
+
+    names = list(METADATA_INDEXES)
+    pool, conn = make_index_pool("langchain_pg_embedding", {names[0]: False}, building_indexes=[names[0]])
+
+    with patch("app.db_config.get_db_connection_pool", return_value=pool):
+        assert create_metadata_indexes() is False
+
+    queries = executed_queries(conn)
+    assert not any("INDEX CONCURRENTLY" in query for query in queries)
+    assert queries[-1] == "SELECT pg_advisory_unlock(%(key)s)"
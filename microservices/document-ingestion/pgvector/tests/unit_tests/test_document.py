@@ -1,7 +1,9 @@
 from unittest.mock import patch, AsyncMock
 from http import HTTPStatus
+from app.document import delete_embeddings
 from app.store import DataStore
 import pytest
+import pathlib
 
 def test_get_documents(test_client, monkeypatch):
     """
@@ -172,6 +174,27 @@ def test_delete_all_documents(test_client):
                 assert response.status_code == HTTPStatus.NO_CONTENT
 
 
+@pytest.mark.asyncio
+async def test_delete_all_embeddings_resets_vector_writer():
+    """
+    Test that deleting all embeddings of a bucket makes the vector-store writer look up
+    its collection again on the next write.
+    Mocks:
+        - `app.document.pool_execution`: Simulates the deletion of the embeddings.
+        - `app.document.reset_vector_writer`: Records that the cached collection is forgotten.
+    Assertions:
+        - The writer is reset after deleting all embeddings, but not after deleting a file.
+    """
+
+    with patch("app.document.pool_execution", return_value={"message": "deleted"}):
+        with patch("app.document.reset_vector_writer") as mock_reset:
+            assert await delete_embeddings("test_bucket", "file1.txt") is True
+            mock_reset.assert_not_called()
+
+            assert await delete_embeddings("test_bucket", None, delete_all=True) is True
+            mock_reset.assert_called_once()
+
+
 def test_delete_documents_not_found(test_client):
     """
     Test case for deleting documents when the specified file is not found.
@@ -261,4 +284,65 @@ async def test_download_invalid_documents(test_client):
         response = await test_client.get("/documents/testfile.txt?bucket_name=testbucket")
 
         assert response.status_code == HTTPStatus.NOT_FOUND
-        assert response.json() == {"detail": "File not found"}
\ No newline at end of file
+        assert response.json() == {"detail": "File not found"}
+
+def test_iter_pdf_pages(monkeypatch):
+    """
+    Test that PDF pages are extracted in ranges and yielded in page order, with a bounded
+    number of ranges in flight.
+    Args:
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    Mocks:
+        - `app.document.get_parser_pool`: A thread pool in place of the worker processes.
+        - `app.document.count_pdf_pages` and `app.document.extract_pdf_pages`: Simulate a 10 page PDF.
+    Assertions:
+        - All pages are yielded in order.
+        - Pages are extracted in ranges of `PDF_PAGES_PER_TASK` pages.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+    import app.document
+
+    ranges = []
+
+    def mock_extract_pdf_pages(path, start, end):
+        ranges.append((start, end))
+        return [(i, f"page {i}") for i in range(start, end)]
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr("app.document.get_parser_pool", lambda: pool)
+    monkeypatch.setattr("app.document.count_pdf_pages", lambda path: 10)
+    monkeypatch.setattr("app.document.extract_pdf_pages", mock_extract_pdf_pages)
+    monkeypatch.setattr(app.document.config, "PDF_PAGES_PER_TASK", 3)
+    monkeypatch.setattr(app.document.config, "PARSER_WORKERS", 1)
+
+    pages = list(app.document.iter_pdf_pages(pathlib.Path("manual.pdf")))
+    pool.shutdown()
+
+    assert pages == [(i, f"page {i}") for i in range(10)]
+    assert sorted(ranges) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+
+def test_extract_docx_text(tmp_path):
+    """
+    Test that text of paragraphs and tables of a DOCX is extracted in document order.
+    Args:
+        tmp_path: A pytest fixture providing a temporary directory.
+    Assertions:
+        - Paragraphs are extracted as is and table rows are joined with "|".
+    """
+
+    from docx import Document as DocxDocument
+    from app.parser import extract_docx_text
+
+    doc = DocxDocument()
+    doc.add_paragraph("Introduction")
+    table = doc.add_table(rows=2, cols=2)
+    for i, row in enumerate(table.rows):
+        for j, cell in enumerate(row.cells):
+            cell.text = f"{i}{j}"
+    doc.add_paragraph("Conclusion")
+    path = tmp_path / "sample.docx"
+    doc.save(path)
+
+    assert extract_docx_text(str(path)) == "Introduction\n|00|01|\n|10|11|\nConclusion\n"
@@ -0,0 +1,214 @@
+import threading
+import pytest
+from unittest.mock import patch
+from http import HTTPStatus
+from app.jobs import JobFile, JobManager, JobStatus
+
+
+@pytest.fixture
+def job_manager():
+    """
+    Fixture to provide a JobManager with a single worker, shut down after the test.
+    """
+
+    manager = JobManager(max_workers=1, max_history=2)
+    yield manager
+    manager.shutdown()
+
+
+def make_job_files(tmp_path, count):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text("This is a sample file")
+        files.append(JobFile(path.name, "test_bucket", path))
+    return files
+
+
+def test_ingest_documents_without_wait(test_client, test_file):
+    """
+    Test that `POST /documents?wait=false` returns a job id, and that the job progress
+    is available at `GET /jobs/{job_id}`.
+    Args:
+        test_client: A test client instance for simulating HTTP requests.
+        test_file: A dictionary containing the file path of the test file to be uploaded.
+    Mocks:
+        - `app.main.DataStore.upload_document`: Simulates the file upload process to the storage bucket.
+        - `app.main.ingest_to_pgvector`: Simulates the ingestion of 3 chunks.
+    Assertions:
+        - The upload is accepted with HTTP 202 and a job id.
+        - The job completes with the number of chunks returned by the ingestion.
+    """
+
+    mock_upload_result = {"bucket": "test_bucket", "file": "sample-file.txt"}
+
+    with patch("app.main.DataStore.upload_document", return_value=mock_upload_result):
+        with patch("app.main.ingest_to_pgvector", return_value=3) as mock_ingest:
+            response = test_client.post(
+                "/documents",
+                params={"wait": False},
+                files={"files": ("sample-file.txt", open(test_file["file_path"], "rb"), "text/plain")}
+            )
+            assert response.status_code == HTTPStatus.ACCEPTED
+            job_id = response.json()["job_id"]
+
+            from app.main import job_manager
+            job_manager.get(job_id).files[0].future.result(timeout=5)
+
+    mock_ingest.assert_called_once()
+    response = test_client.get(f"/jobs/{job_id}")
+    assert response.status_code == HTTPStatus.OK
+    job = response.json()
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["files_done"] == 1
+    assert job["chunks"] == 3
+    assert job["files"][0]["file_name"] == "sample-file.txt"
+
+
+def test_ingest_documents_error(test_client, test_file):
+    """
+    Test that an ingestion error is reported by `POST /documents` when waiting for the job.
+    Args:
+        test_client: A test client instance for simulating HTTP requests.
+        test_file: A dictionary containing the file path of the test file to be uploaded.
+    Assertions:
+        - The response status code is HTTP 500 and contains the ingestion error.
+    """
+
+    mock_upload_result = {"bucket": "test_bucket", "file": "sample-file.txt"}
+
+    with patch("app.main.DataStore.upload_document", return_value=mock_upload_result):
+        with patch("app.main.ingest_to_pgvector", side_effect=Exception("TEI unavailable")):
+            response = test_client.post(
+                "/documents",
+                files={"files": ("sample-file.txt", open(test_file["file_path"], "rb"), "text/plain")}
+            )
+            assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+            assert response.json() == {
+                "detail": "Unexpected error while ingesting data. Exception: TEI unavailable"
+            }
+
+
+def test_get_job_not_found(test_client):
+    """
+    Test that unknown job ids are reported with HTTP 404 for status and cancellation.
+    """
+
+    assert test_client.get("/jobs/unknown").status_code == HTTPStatus.NOT_FOUND
+    assert test_client.delete("/jobs/unknown").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_cancel_job(job_manager, tmp_path):
+    """
+    Test that cancelling a job stops the running file and skips the queued files.
+    Args:
+        job_manager: A JobManager with a single worker.
+        tmp_path: A pytest fixture providing a temporary directory.
+    Assertions:
+        - The running file receives the cancellation and is reported as cancelled.
+        - The queued file is never ingested and its temporary file is deleted.
+        - The job is reported as cancelled.
+    """
+
+    started = threading.Event()
+    calls = []
+
+    def ingest(doc_path, bucket, cancel_event):
+        calls.append(doc_path)
+        started.set()
+        cancel_event.wait(timeout=5)
+        from concurrent.futures import CancelledError
+        raise CancelledError()
+
+    files = make_job_files(tmp_path, 2)
+    job = job_manager.submit(files, ingest=ingest)
+    assert started.wait(timeout=5)
+    assert job.status == JobStatus.RUNNING
+
+    job_manager.cancel(job.id)
+    files[0].future.result(timeout=5)
+
+    assert calls == [files[0].path]
+    assert [f.status for f in files] == [JobStatus.CANCELLED, JobStatus.CANCELLED]
+    assert not files[1].path.exists()
+    assert job.status == JobStatus.CANCELLED
+
+
+def test_cancel_job_during_last_file(job_manager, tmp_path):
+    """
+    Test that a job cancelled while its last file completes is reported as completed.
+    Args:
+        job_manager: A JobManager with a single worker.
+        tmp_path: A pytest fixture providing a temporary directory.
+    Assertions:
+        - The file finishing after the cancellation request is completed.
+        - The job status is derived from its files and is completed.
+    """
+
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def ingest(doc_path, bucket, cancel_event):
+        started.set()
+        proceed.wait(timeout=5)
+        return 2
+
+    files = make_job_files(tmp_path, 1)
+    job = job_manager.submit(files, ingest=ingest)
+    assert started.wait(timeout=5)
+
+    job_manager.cancel(job.id)
+    proceed.set()
+    files[0].future.result(timeout=5)
+
+    assert job.cancel_event.is_set()
+    assert files[0].status == JobStatus.COMPLETED
+    assert job.status == JobStatus.COMPLETED
+
+
+def test_ingest_documents_cancelled(test_client, test_file):
+    """
+    Test that `POST /documents` reports a job cancelled during ingestion with HTTP 409.
+    Args:
+        test_client: A test client instance for simulating HTTP requests.
+        test_file: A dictionary containing the file path of the test file to be uploaded.
+    Mocks:
+        - `app.main.DataStore.upload_document`: Simulates the file upload process to the storage bucket.
+        - `app.main.ingest_to_pgvector`: Simulates an ingestion stopped by a cancellation.
+    Assertions:
+        - The response status code is HTTP 409 instead of a successful response.
+    """
+
+    from concurrent.futures import CancelledError
+    mock_upload_result = {"bucket": "test_bucket", "file": "sample-file.txt"}
+
+    with patch("app.main.DataStore.upload_document", return_value=mock_upload_result):
+        with patch("app.main.ingest_to_pgvector", side_effect=CancelledError()):
+            response = test_client.post(
+                "/documents",
+                files={"files": ("sample-file.txt", open(test_file["file_path"], "rb"), "text/plain")}
+            )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert "was cancelled" in response.json()["detail"]
+
+
+def test_job_history(job_manager, tmp_path):
+    """
+    Test that only the most recent finished jobs are kept.
+    Args:
+        job_manager: A JobManager which keeps 2 jobs.
+        tmp_path: A pytest fixture providing a temporary directory.
+    Assertions:
+        - The oldest finished job is evicted when a new job is submitted.
+    """
+
+    jobs = []
+    for i in range(3):
+        job = job_manager.submit(make_job_files(tmp_path, 1), ingest=lambda **kwargs: 1)
+        job.files[0].future.result(timeout=5)
+        jobs.append(job)
+
+    assert job_manager.get(jobs[0].id) is None
+    assert [job.id for job in job_manager.list()] == [jobs[1].id, jobs[2].id]
+    assert not any(f.path.exists() for job in jobs for f in job.files)
@@ -1,5 +1,11 @@
+import asyncio
+import threading
+import httpx
+import pytest
 from unittest.mock import patch
 from http import HTTPStatus
+from fastapi import HTTPException
+from app.url import URLFetcher, ingest_url_to_pgvector
 
 def test_get_links(test_client, monkeypatch):
     """
@@ -182,4 +188,143 @@ def test_delete_not_found_links(test_client):
                 params={"url": "http://nonexistent-url.com"}
             )
             assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
-            assert response.json() == {"detail": "Failed to delete URL embeddings from vector database."}
\ No newline at end of file
+            assert response.json() == {"detail": "Failed to delete URL embeddings from vector database."}
+
+@pytest.fixture
+def mock_fetcher(monkeypatch):
+    """
+    Fixture to provide a URLFetcher whose HTTP client is served by a mock transport.
+    URLs of host `slow.com` answer after a short delay, `example.com/missing` answers 404
+    and every other URL answers with a page containing the URL path.
+    Yields:
+        URLFetcher: A fetcher which records requested URLs and concurrency per host in `fetcher.stats`.
+    """
+
+    stats = {"requests": [], "active": {}, "max_active": {}}
+
+    async def handler(request):
+        host = request.url.host
+        stats["requests"].append(str(request.url))
+        stats["active"][host] = stats["active"].get(host, 0) + 1
+        stats["max_active"][host] = max(stats["max_active"].get(host, 0), stats["active"][host])
+        if host == "slow.com":
+            await asyncio.sleep(0.05)
+        stats["active"][host] -= 1
+
+        if request.url.path == "/missing":
+            return httpx.Response(HTTPStatus.NOT_FOUND)
+        return httpx.Response(HTTPStatus.OK, html=f"<p>{request.url.path}</p>")
+
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "app.url.httpx.AsyncClient",
+        lambda **kwargs: async_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    monkeypatch.setattr("app.url.validate_url", lambda url: "invalid" not in url)
+
+    fetcher = URLFetcher(concurrency=4, per_host=2, host_interval=0, timeout=5)
+    fetcher.stats = stats
+    yield fetcher
+
+
+@pytest.mark.asyncio
+async def test_fetch_all(mock_fetcher):
+    """
+    Test that every distinct URL is validated and downloaded once, with the per host limit.
+    Args:
+        mock_fetcher: A URLFetcher with a mock transport.
+    Assertions:
+        - Duplicated URLs are downloaded once.
+        - Invalid URLs are not requested and, as failed downloads, have no content.
+        - No more than `per_host` requests run concurrently on a host.
+    """
+
+    urls = [f"http://slow.com/{i}" for i in range(6)] + [
+        "http://example.com/doc1",
+        "http://example.com/doc1",
+        "http://example.com/missing",
+        "http://invalid.com/doc",
+    ]
+
+    contents = await mock_fetcher.fetch_all(urls)
+    await mock_fetcher.aclose()
+
+    assert list(contents) == list(dict.fromkeys(urls))
+    assert contents["http://example.com/doc1"] == "<p>/doc1</p>"
+    assert contents["http://example.com/missing"] is None
+    assert contents["http://invalid.com/doc"] is None
+    assert mock_fetcher.stats["requests"].count("http://example.com/doc1") == 1
+    assert "http://invalid.com/doc" not in mock_fetcher.stats["requests"]
+    assert mock_fetcher.stats["max_active"]["slow.com"] == 2
+
+
+def test_fetch_closes_client_of_previous_loop(mock_fetcher):
+    """
+    Test that the HTTP client of a previous event loop is closed when the fetcher is used on another loop.
+    Args:
+        mock_fetcher: A URLFetcher with a mock transport.
+    Assertions:
+        - The client of a stopped loop is closed from the new loop.
+        - The client of a loop still running in another thread is closed on that loop.
+    """
+
+    async def fetch():
+        content = await mock_fetcher.fetch("http://example.com/doc1")
+        # Let the closing of the previous client run
+        await asyncio.sleep(0.01)
+        return content, mock_fetcher._client
+
+    _, first_client = asyncio.run(fetch())
+    _, second_client = asyncio.run(fetch())
+    assert first_client.is_closed
+    assert not second_client.is_closed
+
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+        _, other_client = asyncio.run_coroutine_threadsafe(fetch(), other_loop).result(timeout=5)
+        assert second_client.is_closed
+        content, _ = asyncio.run(fetch())
+        assert content == "<p>/doc1</p>"
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), other_loop).result(timeout=5)
+        assert other_client.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+
+@pytest.mark.asyncio
+async def test_ingest_url_to_pgvector(mock_fetcher, monkeypatch):
+    """
+    Test that downloaded pages are ingested, and that nothing is ingested if any URL is invalid.
+    Args:
+        mock_fetcher: A URLFetcher with a mock transport.
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    Mocks:
+        - `app.url.get_url_fetcher`: Returns the mock fetcher.
+        - `app.url.ingest_url_content`: Records the ingested URLs and content.
+    Assertions:
+        - The content of every URL is ingested once.
+        - Invalid URLs are reported with HTTP 400 before anything is ingested.
+    """
+
+    ingested = []
+    monkeypatch.setattr("app.url.get_url_fetcher", lambda: mock_fetcher)
+    monkeypatch.setattr("app.url.ingest_url_content", lambda url, content: ingested.append((url, content)))
+
+    await ingest_url_to_pgvector(["http://example.com/doc1", "http://example.com/doc2"])
+    assert ingested == [
+        ("http://example.com/doc1", "<p>/doc1</p>"),
+        ("http://example.com/doc2", "<p>/doc2</p>"),
+    ]
+
+    ingested.clear()
+    with pytest.raises(HTTPException) as ex:
+        await ingest_url_to_pgvector(["http://example.com/doc1", "http://invalid.com/doc"])
+    await mock_fetcher.aclose()
+
+    assert ex.value.status_code == HTTPStatus.BAD_REQUEST
+    assert ex.value.detail == "1 / 2 URL(s) are invalid."
+    assert ingested == []
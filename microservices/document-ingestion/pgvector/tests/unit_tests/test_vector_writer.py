@@ -0,0 +1,203 @@
+import uuid
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.documents import Document
+from psycopg.errors import ForeignKeyViolation, UndefinedTable
+from app import vector_writer
+from app.vector_writer import PGVectorWriter, to_vector_literal
+
+
+class MockCopy:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class MockCopyCursor:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def copy(self, query):
+        self.pool.copies.append([])
+        return MockCopy(self.pool.copies[-1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class MockCopyPool:
+    def __init__(self):
+        self.copies = []
+
+    def connection(self):
+        conn = MagicMock()
+        conn.__enter__.return_value = conn
+        conn.cursor.return_value = MockCopyCursor(self)
+        return conn
+
+
+@pytest.fixture
+def writer():
+    """
+    Fixture to provide a PGVectorWriter with a mock pool, a fake embedder and a known collection.
+    Yields:
+        PGVectorWriter: A writer which stores rows in `writer.pool.copies`.
+    """
+
+    embedder = MagicMock()
+    embedder.embed_documents.side_effect = lambda texts: [[float(len(t)), 0.5] for t in texts]
+
+    writer = PGVectorWriter(pool=MockCopyPool(), embedder=embedder, collection_name="test", batch_size=2)
+    writer._collection_id = uuid.uuid4()
+    yield writer
+    writer.close()
+
+
+def test_add_documents_batches(writer):
+    """
+    Test that documents are embedded and copied to the database in batches of `batch_size`.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+    Assertions:
+        - Every document is stored once, with its embedding and metadata.
+        - Each batch is written with one COPY.
+    """
+
+    documents = (Document(page_content="a" * i, metadata={"page": i}) for i in range(1, 6))
+
+    assert writer.add_documents(documents) == 5
+    assert writer.embedder.embed_documents.call_count == 3
+    assert [len(rows) for rows in writer.pool.copies] == [2, 2, 1]
+
+    rows = [row for rows in writer.pool.copies for row in rows]
+    assert [row[3] for row in rows] == ["a", "aa", "aaa", "aaaa", "aaaaa"]
+    assert rows[2][1] == writer._collection_id
+    assert rows[2][2] == "[3.0,0.5]"
+    assert rows[2][4].obj == {"page": 3}
+    assert len({row[0] for row in rows}) == 5
+
+
+def test_add_documents_embedding_error(writer):
+    """
+    Test that an embedding error is raised after the already queued insert has completed.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+    Assertions:
+        - The embedding error is propagated.
+        - The batch embedded before the error is stored.
+    """
+
+    writer.embedder.embed_documents.side_effect = [[[1.0], [2.0]], Exception("TEI unavailable")]
+    documents = [Document(page_content=str(i)) for i in range(4)]
+
+    with pytest.raises(Exception, match="TEI unavailable"):
+        writer.add_documents(documents)
+
+    assert [len(rows) for rows in writer.pool.copies] == [2]
+
+
+def test_get_collection_id_creates_collection(writer, monkeypatch):
+    """
+    Test that a missing collection is created once and its id is cached.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    Assertions:
+        - The collection is created when it does not exist yet.
+        - Subsequent calls return the cached id without querying the database.
+    """
+
+    collection_id = uuid.uuid4()
+    fetch = MagicMock(side_effect=[None, collection_id])
+    create = MagicMock()
+    monkeypatch.setattr(writer, "_fetch_collection_id", fetch)
+    monkeypatch.setattr(writer, "_create_collection", create)
+    writer.reset()
+
+    assert writer.get_collection_id() == collection_id
+    assert writer.get_collection_id() == collection_id
+    create.assert_called_once()
+    assert fetch.call_count == 2
+
+
+def test_fetch_collection_id_missing_tables(writer, monkeypatch):
+    """
+    Test that missing langchain tables are treated as a missing collection.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    Assertions:
+        - No collection id is returned when the collection table does not exist yet.
+    """
+
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    conn.execute.side_effect = UndefinedTable("relation \"langchain_pg_collection\" does not exist")
+    monkeypatch.setattr(writer.pool, "connection", lambda: conn)
+
+    assert writer._fetch_collection_id() is None
+
+
+def test_insert_retries_with_new_collection(writer, monkeypatch):
+    """
+    Test that an insert into a collection which was dropped since it was cached looks up
+    the collection again and is retried once.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    Assertions:
+        - The cached collection id is replaced by the one looked up again.
+        - The rows are written with the new collection id.
+    """
+
+    stale_id, new_id = writer._collection_id, uuid.uuid4()
+    copy_rows = writer._copy_rows
+    calls = []
+
+    def failing_copy_rows(collection_id, documents, embeddings):
+        calls.append(collection_id)
+        if collection_id == stale_id:
+            raise ForeignKeyViolation("collection_id is not present in langchain_pg_collection")
+        return copy_rows(collection_id, documents, embeddings)
+
+    monkeypatch.setattr(writer, "_copy_rows", failing_copy_rows)
+    monkeypatch.setattr(writer, "_fetch_collection_id", MagicMock(return_value=new_id))
+
+    assert writer.insert([Document(page_content="a")], [[1.0]]) == 1
+    assert calls == [stale_id, new_id]
+    assert writer._collection_id == new_id
+    assert writer.pool.copies[0][0][1] == new_id
+
+
+def test_reset_vector_writer(writer, monkeypatch):
+    """
+    Test that resetting the shared writer forgets its cached collection.
+    Args:
+        writer: A PGVectorWriter with mocked pool and embedder.
+        monkeypatch: A pytest fixture for dynamically modifying or replacing attributes.
+    """
+
+    monkeypatch.setattr(vector_writer, "vector_writer", writer)
+
+    vector_writer.reset_vector_writer()
+
+    assert writer._collection_id is None
+
+
+def test_to_vector_literal():
+    """
+    Test formatting of embeddings as pgvector text literals.
+    """
+
+    assert to_vector_literal([0.25, -1.0, 3]) == "[0.25,-1.0,3]"
@@ -5,14 +5,14 @@ import ssl
 from contextlib import asynccontextmanager
 from typing import List, Optional, Annotated
 import uvicorn
-from fastapi import FastAPI, Response, status, Request, Depends
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi import FastAPI, Response, status, Request, Depends, Query
+from fastapi.responses import PlainTextResponse, JSONResponse, StreamingResponse
 from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from routers import geti
 from utils.logging_config import logger
-from utils.app_utils import get_version_info, check_required_env_vars, get_bool, get_exception_response, validate_resource_id, ResourceType
+from utils.app_utils import get_version_info, check_required_env_vars, get_bool, get_exception_response, validate_resource_id, ResourceType, parse_byte_range, is_etag_matched
 from models.registered_model import RegisteredModelOut, ModelIn, UpdateModelIn
 from managers.mlflow_manager import MLflowManager
 from managers.minio_manager import MinioManager
@@ -73,18 +73,25 @@ def health_check():
          response_model=List[RegisteredModelOut],
           responses={})
 def get_registered_models(request: Request,
+                          response: Response,
                           name: Optional[str] = None,
                           project_name: Optional[str] = None,
                           category: Optional[str] = None,
                           version: Optional[str] = None,
                           architecture: Optional[str] = None,
-                          precision: Optional[str] = None):
-    """Get all registered model(s). """
+                          precision: Optional[str] = None,
+                          offset: Annotated[int, Query(ge=0)] = 0,
+                          limit: Annotated[Optional[int], Query(ge=1)] = None):
+    """Get all registered model(s), ordered by ID.
+
+    Use `offset` and `limit` to get a page of the models. The total number of models is
+    returned in the `X-Total-Count` header.
+    """
     try:
         log_msg_prefix = "GET /models"
         logger.info(f"{log_msg_prefix} endpoint started.")
         # Check if the request query parameters is allowed
-        allowed_q_params = ["name", "project_name", "category", "architecture", "precision", "version"]
+        allowed_q_params = ["name", "project_name", "category", "architecture", "precision", "version", "offset", "limit"]
         keys = request.query_params.keys()
         invalid_q_params = [key for key in keys if key not in allowed_q_params]
         if len(invalid_q_params):
@@ -102,8 +109,11 @@ def get_registered_models(request: Request,
             logger.warning(f"{log_msg_prefix} failed with status code: {s_code}. {resp_content}")
             return Response(resp_content+"\n", status_code=s_code)
 
+        response.headers["X-Total-Count"] = str(len(models))
+        end = offset + limit if limit is not None else None
+
         logger.info(f"{log_msg_prefix} successful. Returned models' details.")
-        return models
+        return models[offset:end]
     except Exception as exc:
         return get_exception_response(log_msg_prefix, exc)
 
@@ -399,6 +409,17 @@ def delete_registered_model_by_id(response: Response, model_id: ModelIDDep):
                      }
                  }
              },
+             206: {
+                 "description": "Partial Content",
+                 "content": {
+                     "application/zip": {
+                         "example": ""
+                     }
+                 }
+             },
+             304: {
+                 "description": "Not Modified"
+             },
              404: {
                  "description": "Not Found",
                  "content": {
@@ -407,6 +428,9 @@ def delete_registered_model_by_id(response: Response, model_id: ModelIDDep):
                      }
                  }
              },
+             416: {
+                 "description": "Range Not Satisfiable"
+             },
              500: {
                  "description": "Internal Server Error",
                  "content": {
@@ -416,7 +440,12 @@ def delete_registered_model_by_id(response: Response, model_id: ModelIDDep):
                  }
              }})
 def get_zip_for_registered_model_by_id(request: Request, model_id: ModelIDDep):
-    """Get a ZIP file containing the artifacts (files) for a registered model. """
+    """Get a ZIP file containing the artifacts (files) for a registered model.
+
+    The file is streamed from object storage. A single byte range can be requested with the `Range` header
+    to resume an interrupted download. The `ETag` of the file can be sent in the `If-None-Match` header to skip
+    the download if the file is unchanged, or in the `If-Range` header to only resume an unchanged file.
+    """
     log_msg_prefix = f"GET /models/{model_id}/files"
     logger.info(f"{log_msg_prefix} endpoint started.")
     response = None
@@ -437,20 +466,47 @@ def get_zip_for_registered_model_by_id(request: Request, model_id: ModelIDDep):
 
         minio_manager = MinioManager()
 
-        object_bytes = minio_manager.get_object(
+        object_info = minio_manager.stat_object(
             object_name=prefix_dir_obj_name)
-
-        if object_bytes:
-            # Set the content type
-            content_type = 'application/zip'
-
-            is_req_from_swagger_page = request.headers.get("referer","").endswith(app.docs_url)
-            if is_req_from_swagger_page:
-                content_type = "application/octet-stream"
-
-            # Return the object's data as the Response
-            logger.info(f"{log_msg_prefix} successful. Returned model files.")
-            return Response(object_bytes, status_code=status.HTTP_200_OK, media_type=content_type)
+        size = object_info.size
+        etag = f'"{object_info.etag}"'
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+
+        # The client has the current file already
+        if is_etag_matched(request.headers.get("if-none-match"), etag):
+            logger.info(f"{log_msg_prefix} successful. Model files not modified.")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        # Only resume a download if the file is unchanged, else send the whole file
+        byte_range = None
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range == etag:
+            try:
+                byte_range = parse_byte_range(request.headers.get("range"), size)
+            except ValueError as error:
+                s_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+                logger.warning(f"{log_msg_prefix} failed with status code: {s_code}. {error}")
+                return Response(status_code=s_code, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        # Set the content type
+        content_type = 'application/zip'
+
+        is_req_from_swagger_page = request.headers.get("referer","").endswith(app.docs_url)
+        if is_req_from_swagger_page:
+            content_type = "application/octet-stream"
+
+        s_code = status.HTTP_200_OK
+        offset, length = 0, size
+        if byte_range:
+            s_code = status.HTTP_206_PARTIAL_CONTENT
+            offset, length = byte_range[0], byte_range[1] - byte_range[0] + 1
+            headers["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+        headers["Content-Length"] = str(length)
+
+        # Stream the object's data in chunks as the Response
+        logger.info(f"{log_msg_prefix} successful. Streaming model files ({length} of {size} bytes).")
+        return StreamingResponse(minio_manager.stream_object(object_name=prefix_dir_obj_name, offset=offset, length=length),
+                                 status_code=s_code, media_type=content_type, headers=headers)
 
     except Exception as exc:
         return get_exception_response(log_msg_prefix, exc)
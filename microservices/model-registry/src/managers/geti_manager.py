@@ -3,16 +3,17 @@
 # type: ignore
 """Module providing a class for managing interaction with Geti projects and models"""
 import os
-import shutil
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-from typing import List, Optional, Union, Type
-import zipfile
-from io import BytesIO
+from typing import Dict, List, Optional, Union, Type
 import requests
 from requests.exceptions import RequestException
 from pydantic import TypeAdapter
-from models.model_identifiers import ModelIdentifiersIn
+from models.model_identifiers import ModelIdentifier, ModelIdentifiersIn
+from models.model_import import ModelImportProgress, ModelImportState
 from models.project import ProjectOut, ModelVersion, ModelGroup, OptimizedModel
 from managers.minio_manager import MinioManager
 from managers.mlflow_manager import MLflowManager
@@ -34,6 +35,24 @@ class GetiResourceProperty(Enum):
     OPTIMIZED_MODELS = "optimized_models"
 
 
+class DownloadStream():
+    """
+    A file-like object reading the body of a streamed HTTP response, which records the
+    number of bytes downloaded in the progress of a model import
+    """
+    def __init__(self, response: requests.Response, progress: ModelImportProgress):
+        self._raw = response.raw
+        # Decode the body if the server compressed it for the transfer
+        self._raw.decode_content = True
+        self._progress = progress
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes of the response body"""
+        data = self._raw.read(size)
+        self._progress.bytes_downloaded += len(data)
+        return data
+
+
 class GetiManager():
     """
     A class for an Intel Geti project
@@ -56,6 +75,13 @@ class GetiManager():
     }
 
     _req_timeout = 30
+    # Number of models downloaded and registered at the same time
+    _import_workers = max(1, int(os.getenv("GETI_IMPORT_WORKERS", "4")))
+    # Number of seconds between requests for the state of a code deployment being prepared
+    _deployment_poll_interval = 1
+    # Progress of the model imports, by model id
+    _import_progress: Dict[str, ModelImportProgress] = {}
+    _import_progress_lock = threading.Lock()
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -72,7 +98,7 @@ class GetiManager():
             cls.instance = super(GetiManager, cls).__new__(cls)
         return cls.instance
 
-    def _send_request(self, method: HTTPMethod, url: str, data = None):
+    def _send_request(self, method: HTTPMethod, url: str, data = None, stream: bool = False):
         if any([self._server_url is None,
                 self._organization_id is None,
                 self._workspace_id is None,
@@ -86,7 +112,7 @@ class GetiManager():
             response = None
             if method == HTTPMethod.GET:
                 response = requests.get(
-                    url=url, headers=self._geti_req_headers, timeout=self._req_timeout, verify=self._verify_server_ssl_cert)
+                    url=url, headers=self._geti_req_headers, timeout=self._req_timeout, verify=self._verify_server_ssl_cert, stream=stream)
             elif method == HTTPMethod.POST:
                 response = requests.post(
                     url=url, headers=self._geti_req_headers, timeout=self._req_timeout, data=data, verify=self._verify_server_ssl_cert)
@@ -216,49 +242,58 @@ class GetiManager():
 
         return resp
 
-    def _store_model_from_geti(self, project_id: str, deployment_id: str, model: OptimizedModel) -> bool:
-        """Download model(s) from a Geti server.
+    def get_import_progress(self, project_id: str) -> List[ModelImportProgress]:
+        """Get the progress of the latest import of each model of a project.
 
         Args:
-            project_id (str): _description_
-            deployment_id (str): _description_
+            project_id (str): The ID of a Geti project
+
+        Returns:
+            List[ModelImportProgress]: The progress of the model imports
+        """
+        with self._import_progress_lock:
+            return [p.model_copy() for p in self._import_progress.values() if p.project_id == project_id]
+
+    def _store_model_from_geti(self, project: ProjectOut, deployment_id: str, model: OptimizedModel,
+                               progress: ModelImportProgress) -> bool:
+        """Download a model from a Geti server and register it.
+
+        The code deployment is streamed from the Geti server into object storage, so that it
+        is never held in memory or on disk as a whole.
+
+        Args:
+            project (ProjectOut): The project of the model
+            deployment_id (str): The ID of a code deployment of the model which is ready to be downloaded
+            model (OptimizedModel): The model to be registered
+            progress (ModelImportProgress): The progress of the model import
+
+        Returns:
+            bool: True if the model is registered. Otherwise, False.
         """
         is_models_registered = False
         url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}" \
-            f"/projects/{project_id}/code_deployments/{deployment_id}/download"
+            f"/projects/{project.id}/code_deployments/{deployment_id}/download"
 
-        try:
-            url = f"{self._server_url}{url_path}"
-            resp = self._send_request(method=HTTPMethod.GET, url=url)
+        url = f"{self._server_url}{url_path}"
+        resp = self._send_request(method=HTTPMethod.GET, url=url, stream=True)
 
+        try:
             if resp.status_code == 200:
-                logger.debug(f"Model ({model.id}) is downloaded.")
+                progress.state = ModelImportState.DOWNLOADING
+                content_length = resp.headers.get("Content-Length")
+                progress.total_bytes = int(content_length) if content_length else None
+                logger.debug(f"Model ({model.id}) is being downloaded.")
 
-                project = self.get_projects(project_id=project_id)[0]
                 base_dir_name = project.name.lower().replace(" ", "-").replace(".", "")
-                current_dir_path = "./"
-                base_dir = current_dir_path + base_dir_name
-                zip_file_path = base_dir + ".zip"
-
-                if not os.path.exists(base_dir):
-                    os.makedirs(base_dir)
-
-                with BytesIO(resp.content) as zip_buffer:
-                    with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
-                        zip_ref.extractall(base_dir)
-                logger.debug(f"Files extracted to {base_dir}")
-
-                shutil.make_archive(base_name=base_dir_name,
-                                    format='zip', base_dir=base_dir)
-                logger.debug(f"{base_dir_name}.zip file created")
 
                 minio_manager = MinioManager()
                 mlflow_manager = MLflowManager()
 
                 model_file_url = minio_manager.store_data(
                     prefix_dir=model.id,
-                    file_path=zip_file_path,
-                    file_name=base_dir_name+".zip")
+                    file_name=base_dir_name+".zip",
+                    stream=DownloadStream(resp, progress))
+                logger.debug(f"Model ({model.id}) is downloaded. {progress.bytes_downloaded} bytes stored.")
 
                 model.project_id = project.id
                 model.project_name = project.name
@@ -272,17 +307,81 @@ class GetiManager():
                         else:
                             model.category = model.category + "_" + task_type.lower()
 
+                progress.state = ModelImportState.REGISTERING
                 _ = mlflow_manager.register_geti_model(model=model, model_file_url=model_file_url)
-
-                shutil.rmtree(base_dir)
-                logger.debug(f"{base_dir} deleted")
-                os.remove(zip_file_path)
                 is_models_registered = True
+            else:
+                logger.error(
+                    f"Geti Server Response (Code Deployment:Download) - Status code: {resp.status_code}, {resp.text}")
+        finally:
+            resp.close()
+
+        return is_models_registered
+
+    def _import_model(self, project: ProjectOut, model_identifiers: ModelIdentifier) -> Optional[str]:
+        """Prepare a code deployment of a model on the Geti server, then download and register the model.
+
+        Args:
+            project (ProjectOut): The project of the model
+            model_identifiers (ModelIdentifier): The ids of the model and its model group
+
+        Returns:
+            str: The id of the registered model
+            None: if the model is not registered
+        """
+        progress = self._import_progress[model_identifiers.id]
+        url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}/projects/{project.id}/code_deployments:prepare"
+
+        try:
+            progress.state = ModelImportState.PREPARING
+            data = json.dumps({"models": [model_identifiers.model_dump(by_alias=True)]})
+            resp = self.post_resources(url_path=url_path, data=data)
+
+            if resp is None:
+                progress.state = ModelImportState.FAILED
+                progress.error = "The code deployment of the model could not be prepared."
+                return None
+
+            json_data = resp.json()
+            deployment_id = json_data['id']
+
+            model_group_id = json_data["models"][0]['model_group_id']
+            model_id = json_data["models"][0]['model_id']
+
+            url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}/projects/{project.id}/model_groups/{model_group_id}/models/{model_id}"
+            url = f"{self._server_url}{url_path}"
+            resp = self._send_request(method=HTTPMethod.GET, url=url)
+            json_data = resp.json()
+            o_model = OptimizedModel(**json_data)
+            o_model.score = json_data["performance"]["score"]
+            o_model.model_format = "OpenVINO"
+
+            logger.debug(f"Model ({o_model.id}) is being prepared for deployment.")
+
+            url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}" \
+                f"/projects/{project.id}/code_deployments/{deployment_id}"
+            url = f"{self._server_url}{url_path}"
+            resp = self._send_request(method=HTTPMethod.GET, url=url)
+            while resp.json()["state"].lower() != "done":
+                time.sleep(self._deployment_poll_interval)
+                resp = self._send_request(method=HTTPMethod.GET, url=url)
+
+            logger.debug(f"Model ({o_model.id}) is ready to be downloaded.")
+            is_model_registered = self._store_model_from_geti(project, deployment_id, o_model, progress)
 
         except Exception as e:
+            progress.state = ModelImportState.FAILED
+            progress.error = str(e)
             raise e
 
-        return is_models_registered
+        if not is_model_registered:
+            progress.state = ModelImportState.FAILED
+            progress.error = "The model could not be downloaded."
+            return None
+
+        progress.state = ModelImportState.COMPLETED
+        logger.info(f"Model ({o_model.id}) is registered.")
+        return o_model.id
 
     def save_models(self, project_id: str, model_identifiers_in: ModelIdentifiersIn) -> Optional[List[str]]:
         """
@@ -292,6 +391,9 @@ class GetiManager():
 
         Save the models' metadata in the database.
 
+        Up to GETI_IMPORT_WORKERS models are prepared, downloaded and registered at the same time.
+        The progress of each model is available from `get_import_progress` meanwhile.
+
         Args:
             project_id: The id for a Intel Geti project
             desired_model_ids: The ids for the models to be stored in object storage
@@ -300,56 +402,36 @@ class GetiManager():
             List[str]: List of 1 or more ids for models registered
             None: if something went wrong
         """
-        registered_model_ids = []
-        url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}/projects/{project_id}/code_deployments:prepare"
-
-        try:
-            for model_identifiers in model_identifiers_in.models:
-                data = model_identifiers.model_dump(by_alias=True)
-                data = {
-                    "models": [data]
-                }
-                data = json.dumps(data)
-                resp = self.post_resources(url_path=url_path, data=data)
-
-                if resp.status_code in (200, 201):
-                    json_data = resp.json()
-                    deployment_id = json_data['id']
+        models = model_identifiers_in.models
+        if not models:
+            return []
 
-                    model_group_id = json_data["models"][0]['model_group_id']
-                    model_id = json_data["models"][0]['model_id']
+        with self._import_progress_lock:
+            for model_identifiers in models:
+                self._import_progress[model_identifiers.id] = ModelImportProgress(
+                    model_id=model_identifiers.id, project_id=project_id)
 
-                    url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}/projects/{project_id}/model_groups/{model_group_id}/models/{model_id}"
-                    url = f"{self._server_url}{url_path}"
-                    resp = self._send_request(method=HTTPMethod.GET, url=url)
-                    json_data = resp.json()
-                    o_model = OptimizedModel(**json_data)
-                    o_model.score = json_data["performance"]["score"]
-                    o_model.model_format = "OpenVINO"
-
-                    logger.debug(f"Model ({o_model.id}) is being prepared for deployment.")
-
-                    deployment_prep_state = "NONE"
-                    while deployment_prep_state.lower() != "done":
-                        url_path = f"/organizations/{self._organization_id}/workspaces/{self._workspace_id}" \
-                            f"/projects/{project_id}/code_deployments/{deployment_id}"
-
-                        url = f"{self._server_url}{url_path}"
-                        resp = self._send_request(method=HTTPMethod.GET, url=url)
-
-                        deployment_prep_state = resp.json()["state"]
+        try:
+            project = self.get_projects(project_id=project_id)[0]
 
-                    logger.debug(f"Model ({o_model.id}) is ready to be downloaded.")
-                    is_model_registered = self._store_model_from_geti(project_id, deployment_id, o_model)
+            # Connect once, before the clients are shared by the workers
+            MinioManager().connect_to_obj_storage()
+            MLflowManager().init_client()
 
-                    if is_model_registered:
-                        registered_model_ids.append(o_model.id)
+            with ThreadPoolExecutor(max_workers=min(self._import_workers, len(models)),
+                                    thread_name_prefix="geti-import") as executor:
+                futures = [executor.submit(self._import_model, project, model_identifiers)
+                           for model_identifiers in models]
+            # All models are imported before an error is raised
+            model_ids = [future.result() for future in futures]
 
-                else:
-                    logger.error(
-                        f"Geti Server Response (Code Deployment:Prepare) - Status code: {resp.status_code}, {resp.text}")   
         except Exception as e:
+            with self._import_progress_lock:
+                for model_identifiers in models:
+                    progress = self._import_progress[model_identifiers.id]
+                    if progress.state == ModelImportState.QUEUED:
+                        progress.state = ModelImportState.FAILED
+                        progress.error = str(e)
             raise e
 
-        return registered_model_ids
-
+        return [model_id for model_id in model_ids if model_id is not None]
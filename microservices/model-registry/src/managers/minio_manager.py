@@ -1,6 +1,6 @@
 """This class provides a means of accessing Minio Object Storage to store model artifacts."""
 import os
-from io import BytesIO
+from typing import Iterator
 import urllib3
 import minio
 from utils.logging_config import logger
@@ -10,6 +10,10 @@ from utils.app_utils import get_bool
 class MinioManager():
     """A class for managing interactions with minio object storage"""
     _minio_client = None
+    # Size of the chunks in which objects are streamed to clients
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    # Size of the parts in which streams of unknown size are uploaded
+    UPLOAD_PART_SIZE = 16 * 1024 * 1024
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -53,34 +57,51 @@ class MinioManager():
         except Exception as error:
             logger.error(f"MinIO server connection failed.\n{error}")
 
-    def get_object(self, object_name) -> bytes:
-        """Get an object from storage
+    def stat_object(self, object_name):
+        """Get the metadata of an object without downloading it
 
         Args:
             object_name (str): The name of the object.
             The name could include the prefix directory and the name of the object.
 
         Returns:
-            bytes: The bytes of the object.
+            minio.datatypes.Object: The object information including its size and ETag.
         """
         self.connect_to_obj_storage()
 
-        # Get the object from Minio
-        response = self._minio_client.get_object(self.bucket_name, object_name)
-        # Create a BytesIO object to hold the object data
-        bytes_io = BytesIO()
-        bytes_io.write(response.read())
+        return self._minio_client.stat_object(self.bucket_name, object_name)
 
-        # Close connection
-        response.close()
-        response.release_conn()
+    def stream_object(self, object_name, offset: int = 0, length: int = 0) -> Iterator[bytes]:
+        """Stream an object, or a byte range of it, from storage in chunks,
+        so that large objects are never held in memory as a whole.
 
-        # Return the object data
-        return bytes_io.getvalue()
+        Args:
+            object_name (str): The name of the object.
+            The name could include the prefix directory and the name of the object.
+            offset (int): Start of the byte range to be streamed.
+            length (int): Number of bytes to be streamed. 0 streams up to the end of the object.
 
+        Yields:
+            bytes: Chunks of the object data.
+        """
+        self.connect_to_obj_storage()
 
-    def store_data(self, prefix_dir: str, file_name: str, file_path: str = None, file_object = None):
-        """store files in object storage"""
+        response = self._minio_client.get_object(self.bucket_name, object_name,
+                                                 offset=offset, length=length)
+        try:
+            yield from response.stream(self.DOWNLOAD_CHUNK_SIZE)
+        finally:
+            # Close connection, also if the client disconnected before the end of the object
+            response.close()
+            response.release_conn()
+
+
+    def store_data(self, prefix_dir: str, file_name: str, file_path: str = None, file_object = None, stream = None):
+        """store files in object storage
+
+        A `stream` is any object with a `read(size)` method, e.g. an HTTP response being downloaded.
+        Its size is not needed, it is uploaded in parts of UPLOAD_PART_SIZE bytes.
+        """
         model_os_file_url = ""
         self.connect_to_obj_storage()
 
@@ -95,6 +116,9 @@ class MinioManager():
         elif file_object:
             _ = self._minio_client.put_object(bucket_name=self.bucket_name, object_name=prefix_dir+"/"+file_name, data=file_object, length=os.fstat(file_object.fileno()).st_size)
 
+        elif stream is not None:
+            _ = self._minio_client.put_object(bucket_name=self.bucket_name, object_name=prefix_dir+"/"+file_name, data=stream, length=-1, part_size=self.UPLOAD_PART_SIZE)
+
         # Get the object's file path.
         model_os_file_url = f"minio://{self.bucket_name}/{prefix_dir}/{file_name}"
 
@@ -5,11 +5,13 @@ import uuid
 from ast import literal_eval
 from enum import Enum
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from fastapi import HTTPException
 import mlflow
+from mlflow.exceptions import MlflowException
 from mlflow.utils.logging_utils import disable_logging
 from managers.minio_manager import MinioManager
+from managers.model_cache import ModelMetadataCache
 from models.registered_model import RegisteredModel
 from models.project import OptimizedModel
 from utils.logging_config import logger, configure_alembic_logger
@@ -27,6 +29,9 @@ class Operation(Enum):
 class MLflowManager():
     """A class for managing MLflow interactions"""
     _client = None
+    _model_cache = None
+    # Number of registered models requested per page when loading the metadata of all models
+    SEARCH_PAGE_SIZE = 1000
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -44,7 +49,56 @@ class MLflowManager():
             self._client = mlflow.MlflowClient()
             configure_alembic_logger()
             logger.debug("Created a new MLflowClient object")
+            # Metadata cached from another client may be stale
+            self._model_cache = None
 
+    @property
+    def model_cache(self) -> ModelMetadataCache:
+        """The cache of the metadata of all registered models, loaded from MLflow on first use
+        """
+        self.init_client()
+        if self._model_cache is None:
+            self._model_cache = ModelMetadataCache(loader=self._load_all_models)
+        return self._model_cache
+
+    def _load_all_models(self) -> Iterator[RegisteredModel]:
+        """Load the metadata of all registered models from MLflow, page by page
+        """
+        page_token = None
+        while True:
+            page = self._client.search_registered_models(max_results=self.SEARCH_PAGE_SIZE,
+                                                         page_token=page_token)
+            n_models = 0
+            for m in page:
+                n_models += 1
+                yield self._to_registered_model(m)
+
+            page_token = getattr(page, "token", None)
+            if not page_token or n_models == 0:
+                break
+
+    def _refresh_cached_model(self, model_id: str):
+        """Update the cached metadata of a model after it was registered or updated
+        """
+        try:
+            self.model_cache.put(self._to_registered_model(self._client.get_registered_model(model_id)))
+        except Exception as exc:
+            logger.debug("Reloading cached model metadata after failing to refresh model %s: %s", model_id, exc)
+            self.model_cache.invalidate()
+
+    def _fetch_model(self, model_id: str) -> Optional[RegisteredModel]:
+        """Get the metadata of a model missing from the cache from MLflow and add it to the cache,
+        e.g. if the model was registered by another instance of the registry since the cache was loaded
+        """
+        try:
+            registered_model = self._to_registered_model(self._client.get_registered_model(model_id))
+        except MlflowException as exc:
+            if exc.error_code == "RESOURCE_DOES_NOT_EXIST":
+                return None
+            raise
+
+        self.model_cache.put(registered_model)
+        return registered_model
 
     def register_model(self, metadata: Dict[str, str], file_content, file_name: str) -> str:
         """Store the model's metadata and file
@@ -97,6 +151,7 @@ class MLflowManager():
             registered_model = self._client.create_registered_model(name=metadata['id'], tags=metadata)
 
             new_model_id = registered_model.tags["id"]
+            self._refresh_cached_model(registered_model.name)
 
         return new_model_id, is_duplicate_model, msg
 
@@ -149,6 +204,7 @@ class MLflowManager():
 
         if registered_model is not None:
             is_model_registered = registered_model.name == model.id
+            self._refresh_cached_model(model.id)
 
         return is_model_registered
 
@@ -185,6 +241,7 @@ class MLflowManager():
                 last_updated_date = str(datetime.now()) + " UTC"
                 self._client.set_registered_model_tag(name=model_id, key="last_updated_date", value=last_updated_date)
                 is_metadata_updated = True
+                self._refresh_cached_model(model_id)
         except Exception as exc:
             logger.debug("Exception occured while updating model metadata: %s", exc)
             msg = f"Error: {exc}"
@@ -194,84 +251,66 @@ class MLflowManager():
 
     def get_models(self, model_id=None, keys=None, values=None) -> List[RegisteredModel]:
         """
-        Get model(s) based on id or other criteria
+        Get model(s) based on id or other criteria, from the cached metadata of the registered models
         Args:
             model_id: The id for a model
             keys: the metadata attributes to search for models by
             values: the values associated to the keys
         Returns:
-            A list of models based on the search criteria
+            A list of models based on the search criteria, ordered by id
         """
-        registered_models: List[RegisteredModel] = []
-        comparator = "="
-        f_string = ""
+        if model_id:
+            registered_model = self.model_cache.get(model_id) or self._fetch_model(model_id)
+            return [registered_model] if registered_model is not None else []
 
-        self.init_client()
+        filters = {}
+        if keys is not None:
+            for key, value in zip(keys, values):
+                if value is None:
+                    continue
+
+                special_characters = ("<", "%", "'")
+                if self._string_contains_any_char(input_string=value, char_tuple=special_characters):
+                    sc_string = ", ".join(special_characters)
+                    raise HTTPException(status_code=400, detail=f"The value provided for '{key}' must not contain special characters like {sc_string}.")
+
+                filters[key] = value
 
-        if model_id is None and keys is None:
-            mlflow_registered_models = self._client.search_registered_models()
-        else:
-            if model_id:
-                attr = "name"
-                value = model_id
-                f_string = f"{attr} {comparator} '{value}'"
-            else:
-                # Iterate over the keys and values lists at the same time to construct filter string
-                for key, value in zip(keys, values):
-                    if value is None:
-                        continue
-
-                    if f_string:
-                        f_string = f_string + " AND "
-
-                    attr = "tags."+key
-
-                    special_characters = ("<", "%", "'")
-                    if self._string_contains_any_char(input_string=value, char_tuple=special_characters):
-                        sc_string = ", ".join(special_characters)
-                        raise HTTPException(status_code=400, detail=f"The value provided for '{key}' must not contain special characters like {sc_string}.")
-
-                    if attr in ["tags.name", "tags.project_name", "tags.category", "tags.architecture", "tags.precision"]:
-                        comparator = "ILIKE"
-                        value = "%"+str(value)+"%"
-                    else:
-                        comparator = "="
-
-                    f_string = f_string + \
-                        f"{attr} {comparator} '{value}'"
-            mlflow_registered_models = self._client.search_registered_models(
-                filter_string=f_string)
-
-        # create a list consisting of model metadata
-        for m in mlflow_registered_models:
-            p = m.tags.get("precision", "[]")
-            o = m.tags.get("overview", "{}")
-            oc = m.tags.get("optimization_capabilities", "{}")
-            l = m.tags.get("labels", "[]")
-            created_date = str(datetime.fromtimestamp(m.last_updated_timestamp/1000)) + " UTC"
-            registered_model = RegisteredModel(id=m.tags.get("id"),
-                                               name=m.tags.get("name"),
-                                               target_device=m.tags.get("target_device"),
-                                               created_date=m.tags.get("created_date", created_date),
-                                               last_updated_date=m.tags.get("last_updated_date", created_date),
-                                               precision=literal_eval(p) if isinstance(p, str) else [],
-                                               size=m.tags.get("size"),
-                                               version=m.tags.get("version"),
-                                               format=m.tags.get("format"),
-                                               origin=m.tags.get("origin"),
-                                               file_url=m.tags.get("file_url"),
-                                               project_id=m.tags.get("project_id"),
-                                               project_name=m.tags.get("project_name"),
-                                               category=m.tags.get("category"),
-                                               target_device_type=m.tags.get("target_device_type"),
-                                               score=literal_eval(m.tags.get("score", "0.0")),
-                                               overview=literal_eval(o) if isinstance(o, str) else {},
-                                               optimization_capabilities= literal_eval(oc) if isinstance(oc, str) else {},
-                                               labels=ast.literal_eval(l) if isinstance(l, str) else [],
-                                               architecture=m.tags.get("architecture"))
-            registered_models.append(registered_model)
-
-        return registered_models
+        return self.model_cache.find(filters)
+
+    def _to_registered_model(self, m) -> RegisteredModel:
+        """
+        Create a model from the tags of a model registered in MLflow
+        Args:
+            m: A registered model returned by the MLflow client
+        Returns:
+            The model with its metadata parsed from the tags
+        """
+        p = m.tags.get("precision", "[]")
+        o = m.tags.get("overview", "{}")
+        oc = m.tags.get("optimization_capabilities", "{}")
+        l = m.tags.get("labels", "[]")
+        created_date = str(datetime.fromtimestamp(m.last_updated_timestamp/1000)) + " UTC"
+        return RegisteredModel(id=m.tags.get("id"),
+                               name=m.tags.get("name"),
+                               target_device=m.tags.get("target_device"),
+                               created_date=m.tags.get("created_date", created_date),
+                               last_updated_date=m.tags.get("last_updated_date", created_date),
+                               precision=literal_eval(p) if isinstance(p, str) else [],
+                               size=m.tags.get("size"),
+                               version=m.tags.get("version"),
+                               format=m.tags.get("format"),
+                               origin=m.tags.get("origin"),
+                               file_url=m.tags.get("file_url"),
+                               project_id=m.tags.get("project_id"),
+                               project_name=m.tags.get("project_name"),
+                               category=m.tags.get("category"),
+                               target_device_type=m.tags.get("target_device_type"),
+                               score=literal_eval(m.tags.get("score", "0.0")),
+                               overview=literal_eval(o) if isinstance(o, str) else {},
+                               optimization_capabilities= literal_eval(oc) if isinstance(oc, str) else {},
+                               labels=ast.literal_eval(l) if isinstance(l, str) else [],
+                               architecture=m.tags.get("architecture"))
 
     def duplicate_model_check(self, new_model_metadata: Dict[str, Any], mode: Operation) -> bool:
         """Check if any existing registered models share properties with a new model
@@ -284,37 +323,23 @@ class MLflowManager():
             A tuple containing a boolean (True if a match is found, False otherwise) and a string
             describing the items that match
         """
-        id_already_exists = False
-        name_ver_prec_already_exists = False
         match_msg = ""
-        registered_models = self.get_models()
 
         try:
-            self.init_client()
+            model_id = new_model_metadata.get("id", "")
+
+            if mode == Operation.REGISTER_MODEL and self.model_cache.get(model_id) is not None:
+                match_msg = f"'{model_id}'."
+                return True, match_msg
+
+            # Models with the same project, name, version and precision. An updated model matches itself.
+            duplicate_ids = self.model_cache.find_duplicate_ids(new_model_metadata)
+            if mode == Operation.UPDATE_MODEL:
+                duplicate_ids.discard(model_id)
 
-            for registered_model in registered_models:
-                id_ = registered_model.id
-                name = registered_model.name
-                ver = registered_model.version
-                precision = registered_model.precision if mode == Operation.REGISTER_MODEL else str(registered_model.precision)
-                project_name = registered_model.project_name
-                project_id = registered_model.project_id
-
-                if mode == Operation.REGISTER_MODEL:
-                    id_already_exists = id_ == new_model_metadata.get("id", "")
-
-                name_ver_prec_already_exists = (project_name == new_model_metadata.get("project_name") and
-                                                project_id == new_model_metadata.get("project_id") and
-                                                name == new_model_metadata.get("name") and
-                                                ver == new_model_metadata.get("version") and
-                                                precision == new_model_metadata.get("precision"))
-
-                if id_already_exists or name_ver_prec_already_exists:
-                    if mode == Operation.UPDATE_MODEL and \
-                        id_ == new_model_metadata.get("id"):
-                        break
-                    match_msg = f"'{id_}'."
-                    return True, match_msg
+            if duplicate_ids:
+                match_msg = f"'{sorted(duplicate_ids)[0]}'."
+                return True, match_msg
 
         except Exception as exc:
             logger.debug("Exception occured during duplicate model check: %s", exc)
@@ -347,6 +372,7 @@ class MLflowManager():
                 minio_manager.delete_data(
                     prefix_dir=rm.tags["id"], file_name=file_name)
                 self._client.delete_registered_model(name=rm.name)
+                self.model_cache.remove(rm.name)
                 is_model_deletion_complete = True
 
         return is_model_deletion_complete
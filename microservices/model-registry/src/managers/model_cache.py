@@ -0,0 +1,205 @@
+"""Module containing an in-memory index of the metadata of registered models"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from models.registered_model import RegisteredModel
+from utils.logging_config import logger
+
+# Keys which are matched as case-insensitive substrings when filtering models
+SUBSTRING_FILTER_KEYS = ("name", "project_name", "category", "architecture", "precision")
+
+
+def _as_tag(value) -> str:
+    """Get a metadata value as stored in the model tags, e.g. "['fp32']" for a precision
+    """
+    return value if isinstance(value, str) else str(value)
+
+
+def identity_key(metadata: Dict) -> Tuple:
+    """Get the properties which identify a model in the registry, besides its ID
+
+    Args:
+        metadata: The metadata of a model
+
+    Returns:
+        A tuple with the project name, project ID, name, version and precision of the model
+    """
+    return (metadata.get("project_name"), metadata.get("project_id"), metadata.get("name"),
+            metadata.get("version"), _as_tag(metadata.get("precision")))
+
+
+class ModelMetadataCache():
+    """A read-through cache of the metadata of all registered models.
+
+    All models are loaded at once and indexed by ID, version and identity (project, name, version
+    and precision), so that listing, filtering and duplicate checks do not query MLflow. Writes
+    through the registry update the cache. The cache is reloaded after `ttl` seconds to pick up
+    changes made by other instances of the registry.
+
+    Models are loaded without holding the lock of the cache. While the cache is reloaded, other
+    requests are served from the previously loaded metadata, and the models registered, updated or
+    deleted in the meantime are applied to the reloaded metadata.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[RegisteredModel]], ttl: float = None):
+        """
+        Args:
+            loader: A function returning the metadata of all registered models
+            ttl: Number of seconds after which the cache is reloaded
+        """
+        self._loader = loader
+        self.ttl = float(os.getenv("MODEL_METADATA_CACHE_TTL", "60")) if ttl is None else ttl
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        # Number of invalidations, to detect an invalidation during a load
+        self._generation = 0
+        # Models put (or removed, with None) during a load, in order, to be applied to the loaded models
+        self._changes: Optional[List[Tuple[str, Optional[RegisteredModel]]]] = None
+        self._models: Dict[str, RegisteredModel] = {}
+        self._sorted_ids: Optional[List[str]] = None
+        self._ids_by_version: Dict[str, Set[str]] = {}
+        self._ids_by_identity: Dict[Tuple, Set[str]] = {}
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _ensure_loaded(self):
+        """Load all models if the cache is empty or expired.
+
+        Must be called without holding the lock. If the cache is expired and another request is
+        already reloading it, the previously loaded metadata is used instead of waiting.
+        """
+        if not self._is_expired():
+            return
+
+        # Only wait for a load in progress if there is no metadata to serve in the meantime
+        if not self._load_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if not self._is_expired():
+                # Loaded by another request in the meantime
+                return
+
+            with self._lock:
+                generation = self._generation
+                self._changes = []
+
+            start_time = time.monotonic()
+            models = list(self._loader())
+
+            with self._lock:
+                self._models = {}
+                self._ids_by_version = {}
+                self._ids_by_identity = {}
+                for model in models:
+                    self._add(model)
+                for model_id, model in self._changes:
+                    self._discard(model_id)
+                    if model is not None:
+                        self._add(model)
+                self._sorted_ids = None
+                # Reload again on the next access if the cache was invalidated during the load
+                self._loaded_at = time.monotonic() if self._generation == generation else None
+            logger.debug("Loaded metadata of %d registered models in %.3f seconds",
+                         len(models), time.monotonic() - start_time)
+        finally:
+            with self._lock:
+                self._changes = None
+            self._load_lock.release()
+
+    def _add(self, model: RegisteredModel):
+        self._models[model.id] = model
+        self._ids_by_version.setdefault(str(model.version), set()).add(model.id)
+        self._ids_by_identity.setdefault(identity_key(model.__dict__), set()).add(model.id)
+
+    def _discard(self, model_id: str):
+        model = self._models.pop(model_id, None)
+        if model is None:
+            return
+        self._ids_by_version.get(str(model.version), set()).discard(model_id)
+        self._ids_by_identity.get(identity_key(model.__dict__), set()).discard(model_id)
+
+    def put(self, model: RegisteredModel):
+        """Add or replace the metadata of a model after it was registered or updated
+        """
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((model.id, model))
+            if self._loaded_at is None:
+                return
+            self._discard(model.id)
+            self._add(model)
+            self._sorted_ids = None
+
+    def remove(self, model_id: str):
+        """Remove the metadata of a model after it was deleted
+        """
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((model_id, None))
+            self._discard(model_id)
+            self._sorted_ids = None
+
+    def invalidate(self):
+        """Reload all models on the next access
+        """
+        with self._lock:
+            self._loaded_at = None
+            self._generation += 1
+
+    def get(self, model_id: str) -> Optional[RegisteredModel]:
+        """Get the metadata of a model by ID
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return self._models.get(model_id)
+
+    def find(self, filters: Dict[str, str] = None) -> List[RegisteredModel]:
+        """Get the models matching all filters, ordered by ID.
+
+        The `name`, `project_name`, `category`, `architecture` and `precision` filters match
+        case-insensitive substrings of the metadata. Other filters match the exact value.
+
+        Args:
+            filters: The metadata values to filter models by. Filters set to None are ignored.
+
+        Returns:
+            The models matching the filters
+        """
+        filters = {k: str(v) for k, v in (filters or {}).items() if v is not None}
+
+        self._ensure_loaded()
+        with self._lock:
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._models)
+
+            if "version" in filters:
+                model_ids = sorted(self._ids_by_version.get(filters.pop("version"), set()))
+            else:
+                model_ids = self._sorted_ids
+
+            models = [self._models[m_id] for m_id in model_ids]
+
+        for key, value in filters.items():
+            if key in SUBSTRING_FILTER_KEYS:
+                value = value.lower()
+                models = [m for m in models if value in _as_tag(getattr(m, key, None) or "").lower()]
+            else:
+                models = [m for m in models if str(getattr(m, key, None)) == value]
+
+        return models
+
+    def find_duplicate_ids(self, metadata: Dict) -> Set[str]:
+        """Get the IDs of models with the same project, name, version and precision
+
+        Args:
+            metadata: The metadata of a new or updated model
+
+        Returns:
+            The IDs of the matching models
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return set(self._ids_by_identity.get(identity_key(metadata), set()))
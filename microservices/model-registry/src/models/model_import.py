@@ -0,0 +1,28 @@
+"""Module containing the classes reporting the progress of importing models from Geti"""
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+class ModelImportState(str, Enum):
+    """
+    The steps of importing a model from a Geti server
+    """
+    QUEUED = "queued"
+    PREPARING = "preparing"
+    DOWNLOADING = "downloading"
+    REGISTERING = "registering"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ModelImportProgress(BaseModel):
+    """
+    Class used to report the progress of importing a model from a Geti server
+    """
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_id: str
+    project_id: str
+    state: ModelImportState = ModelImportState.QUEUED
+    bytes_downloaded: int = 0
+    total_bytes: Optional[int] = None
+    error: Optional[str] = None
@@ -7,6 +7,7 @@ from managers.mlflow_manager import MLflowManager
 from managers.geti_manager import GetiManager
 from models.project import ProjectOut
 from models.model_identifiers import ModelIdentifiersIn
+from models.model_import import ModelImportProgress
 from utils.logging_config import logger
 from utils.app_utils import get_exception_response, validate_resource_id, ResourceType
 
@@ -67,6 +68,22 @@ def get_project_by_id(project_id: ProjectIDDep):
     return projects[0]
 
 
+@router.get("/projects/{project_id}/geti-models/download/progress",
+         summary="Get the progress of importing models from a project in a remote Intel® Geti workspace",
+         tags=["projects"],
+         response_model=List[ModelImportProgress])
+def get_models_download_progress(project_id: ProjectIDDep):
+    """Get the progress of the latest download and registration of each model requested from a project
+    in a remote Intel® Geti workspace.\n\n
+    The progress is available while a `POST /projects/{project_id}/geti-models/download` request is being processed."""
+    log_msg_prefix = f"GET /projects/{project_id}/geti-models/download/progress"
+    logger.info(f"{log_msg_prefix} endpoint started.")
+    geti_manager = GetiManager()
+    progress = geti_manager.get_import_progress(project_id=project_id)
+    logger.info(f"{log_msg_prefix} successful. Returned the progress of {len(progress)} model(s).")
+    return progress
+
+
 @router.post("/projects/{project_id}/geti-models/download",
           summary="Store the metadata and artifacts for 1 or more OpenVINO\
            optimized model(s) from a remote Intel® Geti workspace into the registry",
@@ -2,7 +2,7 @@
 import os
 import re
 from enum import Enum
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from fastapi import Response, status, HTTPException, Path
 from utils.logging_config import logger
 
@@ -148,6 +148,67 @@ def validate_resource_id(resource_type: ResourceType):
 
     return dependency
 
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse the value of a Range header requesting a single byte range of a resource.
+
+    Args:
+        range_header (str): The value of the Range header, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-1024".
+        size (int): The size of the resource in bytes.
+
+    Raises:
+        ValueError: If the range can not be satisfied for a resource of the given size.
+
+    Returns:
+        Tuple[int, int]: The first and last byte positions (inclusive) of the range,
+        or None if the whole resource should be returned (no header, another unit, multiple ranges
+        or an invalid range, which is ignored as per RFC 9110).
+    """
+    if not range_header:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    match = re.fullmatch(r"\s*(\d*)\s*-\s*(\d*)\s*", ranges)
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range with the last N bytes
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise ValueError(f"Range not satisfiable: {range_header}")
+        return max(0, size - suffix_length), size - 1
+
+    start = int(first)
+    if last != "" and int(last) < start:
+        # Invalid range, e.g. "bytes=500-100"
+        return None
+
+    if start >= size:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    end = min(int(last), size - 1) if last != "" else size - 1
+    return start, end
+
+def is_etag_matched(if_none_match: Optional[str], etag: str) -> bool:
+    """Check if an entity tag is listed in the value of an If-None-Match header.
+
+    Args:
+        if_none_match (str): The value of the If-None-Match header, e.g. '"abc", W/"def"' or "*".
+        etag (str): The quoted entity tag of the resource.
+
+    Returns:
+        bool: True if the header matches the entity tag.
+    """
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as for GET requests
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
 def get_exception_response(log_msg_prefix: str, e: Exception):
     """Reusable function to handle exceptions and return the appropriate responses.
 
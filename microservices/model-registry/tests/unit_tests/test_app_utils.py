@@ -8,7 +8,8 @@ from fastapi import HTTPException, status
 from fastapi.responses import Response
 from utils.app_utils import (
     get_version_info, get_bool, check_required_env_vars,
-    validate_id, ResourceType, validate_resource_id, get_exception_response
+    validate_id, ResourceType, validate_resource_id, get_exception_response,
+    parse_byte_range, is_etag_matched
 )
 
 @pytest.mark.parametrize("is_file", [True, False, True],
@@ -159,3 +160,37 @@ def test_get_exception_response_component_error():
     assert isinstance(resp, Response)
     assert resp.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert "minio failed" in resp.body.decode()
+
+@pytest.mark.parametrize("range_header, expected_range", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=0-99,200-299", None),
+    ("items=0-99", None),
+    ("bytes=abc", None),
+    ("bytes=500-100", None),
+])
+def test_parse_byte_range(range_header, expected_range):
+    """Test parse_byte_range for single, open-ended, suffix, unsupported and invalid ranges"""
+    assert parse_byte_range(range_header, 1000) == expected_range
+
+@pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=1000-2000", "bytes=-0"])
+def test_parse_byte_range_not_satisfiable(range_header):
+    """Test parse_byte_range raises ValueError for ranges outside of the resource"""
+    with pytest.raises(ValueError):
+        parse_byte_range(range_header, 1000)
+
+@pytest.mark.parametrize("if_none_match, expected_result", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"def", "abc"', True),
+    ("*", True),
+    ('"def"', False),
+])
+def test_is_etag_matched(if_none_match, expected_result):
+    """Test is_etag_matched for single, weak, listed and wildcard entity tags"""
+    assert is_etag_matched(if_none_match, '"abc"') is expected_result
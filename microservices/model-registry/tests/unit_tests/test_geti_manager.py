@@ -2,6 +2,13 @@
 """
 This file provides functions for testing functions in the geti_manager.py file.
 """
+import io
+import threading
+import pytest
+from managers.geti_manager import GetiManager
+from models.model_identifiers import ModelIdentifiersIn
+from models.model_import import ModelImportState
+from models.project import ProjectOut
 # import pytest
 # from managers.geti_manager import GetiManager, Geti, ProjectClient, ModelClient
 # import models.project
@@ -86,3 +93,87 @@ This file provides functions for testing functions in the geti_manager.py file.
 #     model_ids_registered = geti_manager.save_models(project_id=s_models_params["project_id"])
 
 #     assert model_ids_registered == s_models_params["expected_result"]
+
+
+MODEL_CONTENT = b"PK deployment zip"
+
+@pytest.fixture
+def mock_geti_server(mocker):
+    """Mocks the responses of a Geti server to import the models of a project"""
+    project = ProjectOut(id="project1", name="Test Project", creation_time="",
+                         pipeline={"tasks": [{"task_type": "dataset"}, {"task_type": "detection"}]})
+    mocker.patch.object(GetiManager, "get_projects", return_value=[project])
+    mocker.patch.object(GetiManager, "_deployment_poll_interval", 0)
+    mocker.patch.object(GetiManager, "_import_workers", 3)
+
+    def post_resources(self, url_path, data, resource_id=None):
+        model_id = data.split('"model_id": "')[1].split('"')[0]
+        resp = mocker.Mock()
+        resp.json.return_value = {"id": f"deployment-{model_id}",
+                                  "models": [{"model_group_id": "group1", "model_id": model_id}]}
+        return resp
+
+    def send_request(self, method, url, data=None, stream=False):
+        resp = mocker.Mock()
+        resp.status_code = 200
+        if url.endswith("/download"):
+            assert stream
+            resp.headers = {"Content-Length": str(len(MODEL_CONTENT))}
+            resp.raw = io.BytesIO(MODEL_CONTENT)
+        elif "/code_deployments/" in url:
+            resp.json.return_value = {"state": "done"}
+        else:
+            model_id = url.rsplit("/", 1)[1]
+            resp.json.return_value = {"id": model_id, "name": f"Model {model_id}", "precision": ["FP16"],
+                                      "performance": {"score": 0.5}}
+        return resp
+
+    mocker.patch.object(GetiManager, "post_resources", post_resources)
+    mocker.patch.object(GetiManager, "_send_request", send_request)
+    mocker.patch("managers.geti_manager.MLflowManager")
+    mock_minio_manager = mocker.patch("managers.geti_manager.MinioManager")
+    return mock_minio_manager.return_value
+
+
+def test_save_models_in_parallel(mock_geti_server, mocker):
+    """Test models are downloaded concurrently and streamed into object storage."""
+    model_ids = ["model1", "model2", "model3"]
+    # Every download waits for all of the others to be started
+    barrier = threading.Barrier(len(model_ids), timeout=10)
+
+    def store_data(prefix_dir, file_name, stream):
+        barrier.wait()
+        assert stream.read(4) + stream.read() == MODEL_CONTENT
+        return f"minio://bucket/{prefix_dir}/{file_name}"
+    mock_geti_server.store_data.side_effect = store_data
+
+    geti_manager = GetiManager()
+    models_in = ModelIdentifiersIn(models=[{"id": m_id, "group_id": "group1"} for m_id in model_ids])
+    assert geti_manager.save_models(project_id="project1", model_identifiers_in=models_in) == model_ids
+
+    progress = geti_manager.get_import_progress(project_id="project1")
+    assert sorted(p.model_id for p in progress) == model_ids
+    for p in progress:
+        assert p.state == ModelImportState.COMPLETED
+        assert p.bytes_downloaded == p.total_bytes == len(MODEL_CONTENT)
+    assert not geti_manager.get_import_progress(project_id="project2")
+
+
+def test_save_models_failure(mock_geti_server):
+    """Test a failed model import is reported, and raised after the other models are imported."""
+    def store_data(prefix_dir, file_name, stream):
+        if prefix_dir == "model2":
+            raise ConnectionError("Connection lost")
+        stream.read()
+        return f"minio://bucket/{prefix_dir}/{file_name}"
+    mock_geti_server.store_data.side_effect = store_data
+
+    geti_manager = GetiManager()
+    models_in = ModelIdentifiersIn(models=[{"id": m_id, "group_id": "group1"} for m_id in ["model1", "model2", "model3"]])
+    with pytest.raises(ConnectionError):
+        geti_manager.save_models(project_id="project1", model_identifiers_in=models_in)
+
+    progress = {p.model_id: p for p in geti_manager.get_import_progress(project_id="project1")}
+    assert progress["model1"].state == progress["model3"].state == ModelImportState.COMPLETED
+    assert progress["model2"].state == ModelImportState.FAILED
+    assert progress["model2"].error == "Connection lost"
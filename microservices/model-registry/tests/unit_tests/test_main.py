@@ -6,7 +6,7 @@ import io
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import Response
-from main import app
+from main import app, MLflowManager
 # from models.project import ProjectOut, ActiveModel
 from models.registered_model import RegisteredModel
 
@@ -60,6 +60,27 @@ def test_get_registered_models(mocker):
     assert response.status_code == 200
     assert len(response.json()) == expected_num_registered_models
 
+def test_get_registered_models_paginated(mocker):
+    """Test Scenario: Get a page of the registered models"""
+    models = [RegisteredModel(id=f"model{i}", name=f"Model {i}", target_device="CPU",
+                              created_date="2022-12-19 22:32:38.739000+00:00",
+                              last_updated_date="2023-11-23 03:25:56.303000", precision=["FP32"],
+                              size=1210000, version="1", format="openvino", origin="Geti",
+                              file_url="minio://model_registry/deployment.zip", project_id="1")
+              for i in range(5)]
+    mocker.patch('main.MLflowManager.get_models', return_value=models)
+
+    response = client.get("/models?offset=1&limit=2")
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()] == ["model1", "model2"]
+    assert response.headers["X-Total-Count"] == "5"
+
+    response = client.get("/models?offset=4")
+    assert [m["id"] for m in response.json()] == ["model4"]
+
+    response = client.get("/models?limit=0")
+    assert response.status_code == 422
+
 def test_get_models_empty(mocker):
     """Test /models returns 200 and empty list if no models and no query params."""
     mocker.patch('main.MLflowManager.get_models', return_value=[])
@@ -137,11 +158,16 @@ def test_get_zip_for_registered_model_valid_id(mocker):
                                 file_url="minio://model_registry/63a0e686c30715f28a829f68/deployment.zip",
                                 project_id="1321d23f1ghkj7gfd13")
 
-    def mock_get_object(self, object_name=None):
-        return b"ahfhareyh45y5wyen5y65y46wy55w54w56b54w"
+    object_bytes = b"ahfhareyh45y5wyen5y65y46wy55w54w56b54w"
 
+    def mock_stream_object(self, object_name=None, offset=0, length=0):
+        yield object_bytes[offset:offset + length]
+
+    mocker.patch(
+        'main.MinioManager.stat_object', return_value=mocker.Mock(size=len(object_bytes), etag="abc123"),
+    )
     mocker.patch(
-        'main.MinioManager.get_object', mock_get_object,
+        'main.MinioManager.stream_object', mock_stream_object,
     )
 
     mocker.patch(
@@ -153,16 +179,48 @@ def test_get_zip_for_registered_model_valid_id(mocker):
     content_type = response.headers['Content-Type']
     media_type = content_type.split(';')[0]
     assert media_type == 'application/zip'
+    assert response.content == object_bytes
+    assert response.headers["ETag"] == '"abc123"'
 
 def test_get_zip_for_registered_model_by_id_success(mocker):
     """Test /models/{model_id}/files returns 200 and correct content type."""
     from models.registered_model import RegisteredModel
     model = RegisteredModel(id="4545d456fs1d3g456see", name="Test", target_device="CPU", created_date="2020", last_updated_date="2020", precision=["FP32"], size=1, version="1", format="openvino", origin="Geti", file_url="minio://bucket/file.zip", project_id="pid")
     mocker.patch('main.get_registered_model_by_id', return_value=model)
-    mocker.patch('main.MinioManager.get_object', return_value=b"zipbytes")
+    mocker.patch('main.MinioManager.stat_object', return_value=mocker.Mock(size=8, etag="abc123"))
+    mocker.patch('main.MinioManager.stream_object', return_value=iter([b"zipbytes"]))
     response = client.get("/models/4545d456fs1d3g456see/files")
     assert response.status_code == 200
     assert response.headers["Content-Type"].startswith("application/zip")
+    assert response.headers["Content-Length"] == "8"
+    assert response.headers["Accept-Ranges"] == "bytes"
+
+@pytest.mark.parametrize("download_params", [
+    {"test_case": "range", "headers": {"Range": "bytes=4-"}, "expected_status_code": 206, "expected_content": b"bytes", "expected_content_range": "bytes 4-8/9"},
+    {"test_case": "suffix_range", "headers": {"Range": "bytes=-3"}, "expected_status_code": 206, "expected_content": b"tes", "expected_content_range": "bytes 6-8/9"},
+    {"test_case": "range_of_unchanged_file", "headers": {"Range": "bytes=0-3", "If-Range": '"abc123"'}, "expected_status_code": 206, "expected_content": b"zipb", "expected_content_range": "bytes 0-3/9"},
+    {"test_case": "range_of_changed_file", "headers": {"Range": "bytes=0-3", "If-Range": '"old"'}, "expected_status_code": 200, "expected_content": b"zipbbytes", "expected_content_range": None},
+    {"test_case": "unsatisfiable_range", "headers": {"Range": "bytes=9-"}, "expected_status_code": 416, "expected_content": b"", "expected_content_range": "bytes */9"},
+    {"test_case": "invalid_range", "headers": {"Range": "bytes=5-3"}, "expected_status_code": 200, "expected_content": b"zipbbytes", "expected_content_range": None},
+    {"test_case": "unchanged_file", "headers": {"If-None-Match": '"old", "abc123"'}, "expected_status_code": 304, "expected_content": b"", "expected_content_range": None},
+    {"test_case": "changed_file", "headers": {"If-None-Match": '"old"'}, "expected_status_code": 200, "expected_content": b"zipbbytes", "expected_content_range": None},
+])
+def test_get_zip_for_registered_model_by_id_conditional_and_range(download_params, mocker):
+    """Test /models/{model_id}/files serves byte ranges and skips downloads of unchanged files."""
+    object_bytes = b"zipbbytes"
+    model = RegisteredModel(id="4545d456fs1d3g456see", name="Test", target_device="CPU", created_date="2020", last_updated_date="2020", precision=["FP32"], size=1, version="1", format="openvino", origin="Geti", file_url="minio://bucket/file.zip", project_id="pid")
+    mocker.patch('main.get_registered_model_by_id', return_value=model)
+    mocker.patch('main.MinioManager.stat_object', return_value=mocker.Mock(size=len(object_bytes), etag="abc123"))
+    mock_stream_object = mocker.patch('main.MinioManager.stream_object',
+                                      side_effect=lambda object_name, offset, length: iter([object_bytes[offset:offset + length]]))
+
+    response = client.get("/models/4545d456fs1d3g456see/files", headers=download_params["headers"])
+
+    assert response.status_code == download_params["expected_status_code"]
+    assert response.content == download_params["expected_content"]
+    assert response.headers.get("Content-Range") == download_params["expected_content_range"]
+    assert response.headers["ETag"] == '"abc123"'
+    assert mock_stream_object.called == (download_params["expected_status_code"] in (200, 206))
 
 def test_get_zip_for_registered_model_invalid_id(mocker):
     """Test Scenario: Get zip file for registered model with invalid id"""
@@ -174,13 +232,6 @@ def test_get_zip_for_registered_model_invalid_id(mocker):
         'main.MLflowManager.get_models', mock_get_models,
     )
 
-    def mock_get_object(self, object_name=None):
-        return b"ahfhareyh45y5wyen5y65y46wy55w54w56b54w"
-
-    mocker.patch(
-        'main.MinioManager.get_object', mock_get_object,
-    )
-
     response = client.get("/models/4545d456fs1d3g456sd/files")
     assert response.status_code == 404
     assert b"Model not found." in response.content
@@ -251,7 +302,7 @@ def test_store_model(s_model_params, mocker):
         )
 
     if s_model_params["test_case"] == "model_id_already_exists":
-        def mock_get_models(self, keys=None, values=None):
+        def mock_load_all_models(self):
             return [RegisteredModel(id="4545d456fs1d3g456",
                                     name="SSD FP32 OpenVINO",
                                     target_device="CPU",
@@ -277,8 +328,10 @@ def test_store_model(s_model_params, mocker):
                                     file_url="minio://model_registry/63a0e686c30715f28a829f68/deployment.zip",
                                     project_id="1321d23f1ghkj7gfd13")]
 
+        # Load the registered models into an empty metadata cache
+        mocker.patch.object(MLflowManager(), "_model_cache", None)
         mocker.patch(
-            'main.MLflowManager.get_models', mock_get_models,
+            'main.MLflowManager._load_all_models', mock_load_all_models,
         )
 
     response = client.post("/models",
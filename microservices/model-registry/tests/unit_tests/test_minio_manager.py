@@ -2,9 +2,9 @@
 """
 This file provides functions for testing functions in the minio_manager.py file.
 """
+import io
 import os
 import pytest
-from urllib3.response import HTTPResponse
 import minio
 from managers.minio_manager import MinioManager
 
@@ -15,38 +15,9 @@ def mock_minio_client(mocker):
     mocker.patch("minio.Minio", return_value=mock_client)
     return mock_client
 
-@pytest.fixture
-def mock_minio_get_object(mock_minio_client, mocker):
-    """Returns a mocked return value for the minio get_object method"""
-    mock_get_object = mock_minio_client.get_object
-    return mock_get_object
-
-@pytest.mark.parametrize("g_object_params", [
-    {"test_case": "non_existent_object", "object_name": "13214501", "expected_result": b""}
-])
-def test_get_object(g_object_params, mock_minio_get_object, mocker):
-    """
-    Tests get_object method.
-    """
-    # Mock get_object
-    if g_object_params["test_case"] == "non_existent_object":
-        data = b""
-        resp = HTTPResponse(data, preload_content=False)
-        mock_minio_get_object.return_value = resp
-
-        mock_response_data = mocker.patch("urllib3.response.HTTPResponse.read")
-        mock_response_data.return_value = data
-
-    # Create MinioManager object and call get object
-    minio_manager = MinioManager()
-    # minio_manager._client = None # pylint: disable=protected-access
-    object_bytes = minio_manager.get_object(g_object_params["object_name"])
-
-    assert object_bytes == g_object_params["expected_result"]
-
-def test_store_object(mocker):
+def test_store_object(mocker, mock_minio_client):
     """
-    Tests get_object method.
+    Tests store_data method.
     """
     # Mock make_bucket
     mock_minio_make_bucket = mocker.patch("minio.Minio.make_bucket")
@@ -56,7 +27,7 @@ def test_store_object(mocker):
 
     # Create MinioManager object and call get object
     minio_manager = MinioManager()
-    minio_manager._client = None # pylint: disable=protected-access
+    minio_manager._minio_client = None # pylint: disable=protected-access
     object_file_url = minio_manager.store_data(prefix_dir="prefix_dir",file_path="",file_name="file_name")
 
     assert object_file_url == "minio://test/prefix_dir/file_name"
@@ -150,6 +121,19 @@ def test_store_data_with_file_path(mocker, monkeypatch):
     url = manager.store_data(prefix_dir="dir", file_name="file", file_path="/tmp/file")
     assert url == "minio://testbucket/dir/file"
 
+def test_store_data_with_stream(mocker, monkeypatch):
+    """Test store_data uploads a stream of unknown size in parts."""
+    monkeypatch.setenv("MINIO_BUCKET_NAME", "testbucket")
+    manager = MinioManager()
+    manager._minio_client = mocker.Mock()
+    manager._minio_client.bucket_exists.return_value = True
+    stream = io.BytesIO(b"zip data")
+    url = manager.store_data(prefix_dir="dir", file_name="file", stream=stream)
+    assert url == "minio://testbucket/dir/file"
+    manager._minio_client.put_object.assert_called_once_with(
+        bucket_name="testbucket", object_name="dir/file", data=stream,
+        length=-1, part_size=MinioManager.UPLOAD_PART_SIZE)
+
 def test_store_data_bucket_creation(mocker, monkeypatch):
     """Test store_data creates bucket if not exists."""
     monkeypatch.setenv("MINIO_BUCKET_NAME", "testbucket")
@@ -162,17 +146,47 @@ def test_store_data_bucket_creation(mocker, monkeypatch):
     assert url == "minio://testbucket/dir/file"
     assert manager._minio_client.make_bucket.called
 
-def test_get_object_reads_bytes(mocker, monkeypatch):
-    """Test get_object returns bytes from Minio."""
+def test_stream_object_reads_chunks(mocker, monkeypatch):
+    """Test stream_object yields the chunks of a byte range and releases the connection."""
     monkeypatch.setenv("MINIO_BUCKET_NAME", "testbucket")
     manager = MinioManager()
     fake_response = mocker.Mock()
-    fake_response.read.return_value = b"abc"
-    fake_response.close.return_value = None
-    fake_response.release_conn.return_value = None
+    fake_response.stream.return_value = iter([b"ab", b"c"])
     manager._minio_client = mocker.Mock()
     manager._minio_client.get_object.return_value = fake_response
-    result = manager.get_object("object")
-    assert result == b"abc"
+
+    chunks = list(manager.stream_object("object", offset=2, length=3))
+
+    assert chunks == [b"ab", b"c"]
+    manager._minio_client.get_object.assert_called_once_with("testbucket", "object", offset=2, length=3)
+    fake_response.stream.assert_called_once_with(MinioManager.DOWNLOAD_CHUNK_SIZE)
     assert fake_response.close.called
-    assert fake_response.release_conn.called
\ No newline at end of file
+    assert fake_response.release_conn.called
+
+def test_stream_object_releases_connection_when_closed_early(mocker, monkeypatch):
+    """Test stream_object releases the connection if the client stops reading."""
+    monkeypatch.setenv("MINIO_BUCKET_NAME", "testbucket")
+    manager = MinioManager()
+    fake_response = mocker.Mock()
+    fake_response.stream.return_value = iter([b"ab", b"c"])
+    manager._minio_client = mocker.Mock()
+    manager._minio_client.get_object.return_value = fake_response
+
+    chunks = manager.stream_object("object")
+    assert next(chunks) == b"ab"
+    chunks.close()
+
+    assert fake_response.close.called
+    assert fake_response.release_conn.called
+
+def test_stat_object(mocker, monkeypatch):
+    """Test stat_object returns the object information from Minio."""
+    monkeypatch.setenv("MINIO_BUCKET_NAME", "testbucket")
+    manager = MinioManager()
+    manager._minio_client = mocker.Mock()
+    manager._minio_client.stat_object.return_value = mocker.Mock(size=3, etag="abc")
+
+    object_info = manager.stat_object("object")
+
+    assert object_info.size == 3
+    manager._minio_client.stat_object.assert_called_once_with("testbucket", "object")
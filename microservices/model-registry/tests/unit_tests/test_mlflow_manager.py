@@ -5,6 +5,8 @@ This file provides functions for testing functions in the mlflow_manager.py file
 import io
 import pytest
 from fastapi import HTTPException
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST
 from models.project import OptimizedModel
 from models.registered_model import RegisteredModel
 from managers.mlflow_manager import MLflowManager, Operation
@@ -89,7 +91,7 @@ def test_register_model(r_model_params, mlflow_client, mocker):
     {"model_id": None, "keys": ["name", "project_name", "version"], "values": ["People Detector", "test project", "13"]},
     {"model_id": "nonexistent_model", "keys": None, "values": None}
 ])
-def test_get_models(model_request_params, mlflow_search_mv, mocker):
+def test_get_models(model_request_params, mlflow_search_mv, mlflow_client, mocker):
     """
     Tests get_models method with different identifiers and parameters.
     """
@@ -104,6 +106,8 @@ def test_get_models(model_request_params, mlflow_search_mv, mocker):
     # Simulate different scenarios
     if model_id == "nonexistent_model":
         mlflow_search_mv.return_value = []
+        mlflow_client.return_value.get_registered_model.side_effect = MlflowException(
+            "Registered Model with name=nonexistent_model not found", error_code=RESOURCE_DOES_NOT_EXIST)
 
     else:
         mv = MV()
@@ -130,9 +134,13 @@ def test_get_models(model_request_params, mlflow_search_mv, mocker):
 
         if model_id is None and keys is None:
             # Mock results with versions matching the identifier
-            mlflow_search_mv.return_value = [mv, mv]
+            mv2 = MV()
+            mv2.tags = dict(mv.tags, id="model_2")
+            mlflow_search_mv.return_value = [mv, mv2]
         elif model_id is not None and model_id != "":
             mlflow_search_mv.return_value = [mv]
+        else:
+            mlflow_search_mv.return_value = [mv]
 
     models = mlflow_manager.get_models(model_id=model_id, keys=keys, values=values)
 
@@ -145,6 +153,68 @@ def test_get_models(model_request_params, mlflow_search_mv, mocker):
     elif model_id is not None and model_id != "":
         assert len(models) == 1
         assert isinstance(models[0], RegisteredModel)
+    else:
+        # "People Detector" does not match "Person Detector"
+        assert not models
+
+
+def test_get_models_filters_cached_models(mocker):
+    """Test get_models filters the cached models and loads them from MLflow only once, page by page."""
+    mlflow_manager = MLflowManager()
+    mlflow_manager._client = None # pylint: disable=protected-access
+    mock_client = mocker.patch("mlflow.MlflowClient").return_value
+
+    def make_mv(model_id, name, version, precision):
+        mv = MV()
+        mv.name = model_id
+        mv.tags = {"id": model_id, "name": name, "version": version, "precision": precision,
+                   "project_name": "Test Project", "category": "Detection", "score": "0.5"}
+        return mv
+
+    first_page = mocker.MagicMock()
+    first_page.__iter__.return_value = iter([make_mv("id2", "SSD Detector", "1", "['FP32']")])
+    first_page.token = "next"
+    second_page = [make_mv("id1", "ATSS Detector", "2", "['FP16']"), make_mv("id3", "SSD Detector", "2", "['FP16']")]
+    mock_client.search_registered_models.side_effect = [first_page, second_page]
+
+    models = mlflow_manager.get_models()
+    assert [m.id for m in models] == ["id1", "id2", "id3"]
+
+    models = mlflow_manager.get_models(keys=["name", "version"], values=["ssd", "2"])
+    assert [m.id for m in models] == ["id3"]
+
+    models = mlflow_manager.get_models(keys=["project_name", "precision"], values=["test", "fp16"])
+    assert [m.id for m in models] == ["id1", "id3"]
+
+    assert mlflow_manager.get_models(model_id="id2")[0].name == "SSD Detector"
+    assert mock_client.search_registered_models.call_count == 2
+    assert mock_client.search_registered_models.call_args.kwargs["page_token"] == "next"
+
+    with pytest.raises(HTTPException):
+        mlflow_manager.get_models(keys=["name"], values=["%"])
+
+
+def test_get_models_fetches_missing_model(mocker):
+    """Test get_models fetches a model missing from the cache from MLflow and caches it."""
+    mlflow_manager = MLflowManager()
+    mlflow_manager._client = None # pylint: disable=protected-access
+    mock_client = mocker.patch("mlflow.MlflowClient").return_value
+    mock_client.search_registered_models.return_value = []
+
+    mv = MV()
+    mv.name = "id1"
+    mv.tags = {"id": "id1", "name": "SSD Detector", "version": "1", "precision": "['FP32']"}
+    mock_client.get_registered_model.return_value = mv
+
+    assert [m.id for m in mlflow_manager.get_models(model_id="id1")] == ["id1"]
+    assert [m.id for m in mlflow_manager.get_models(model_id="id1")] == ["id1"]
+    mock_client.get_registered_model.assert_called_once_with("id1")
+    assert [m.id for m in mlflow_manager.get_models()] == ["id1"]
+    mock_client.search_registered_models.assert_called_once()
+
+    mock_client.get_registered_model.side_effect = MlflowException("Unavailable")
+    with pytest.raises(MlflowException):
+        mlflow_manager.get_models(model_id="id2")
 
 
 
@@ -191,7 +261,7 @@ def test_update_model_success(mocker):
     mock_model = mocker.Mock()
     mock_model.tags = {"id": "id1", "precision": "['fp32']", "name": "n", "version": "1", "project_name": "p", "project_id": "pid"}
     mlflow_manager._client.get_registered_model.return_value = mock_model
-    mlflow_manager.duplicate_model_check = mocker.Mock(return_value=(False, ""))
+    mocker.patch.object(mlflow_manager, "duplicate_model_check", return_value=(False, ""))
     mlflow_manager._client.set_registered_model_tag = mocker.Mock()
     result, is_dup, msg = mlflow_manager.update_model("id1", {"precision": "fp16"})
     assert result is True
@@ -204,7 +274,7 @@ def test_update_model_duplicate(mocker):
     mock_model = mocker.Mock()
     mock_model.tags = {"id": "id1", "precision": "['fp32']", "name": "n", "version": "1", "project_name": "p", "project_id": "pid"}
     mlflow_manager._client.get_registered_model.return_value = mock_model
-    mlflow_manager.duplicate_model_check = mocker.Mock(return_value=(True, "duplicate"))
+    mocker.patch.object(mlflow_manager, "duplicate_model_check", return_value=(True, "duplicate"))
     mlflow_manager._client.set_registered_model_tag = mocker.Mock()
     result, is_dup, msg = mlflow_manager.update_model("id1", {"precision": "fp16"})
     assert result is None
@@ -213,20 +283,42 @@ def test_update_model_duplicate(mocker):
 def test_duplicate_model_check_register_and_update(mocker):
     """Test duplicate_model_check for both REGISTER_MODEL and UPDATE_MODEL modes."""
     mlflow_manager = MLflowManager()
-    # Patch get_models to return two models
-    model1 = RegisteredModel(id="id1", name="n", target_device="CPU", created_date="d", last_updated_date="d", size=1, version="1", format="f", origin="o", file_url="url", project_id="pid", project_name="pn", category="c", fps_throughput="", latency="", target_device_type="", previous_revision_id="", previous_trained_revision_id="", score=0.1, score_up_to_date=True, performance={}, precision=["fp32"], label_schema_in_sync=True, overview={}, optimization_capabilities={}, model_group_id="", labels=[], architecture="")
-    model2 = RegisteredModel(id="id2", name="n2", target_device="CPU", created_date="d", last_updated_date="d", size=1, version="2", format="f", origin="o", file_url="url", project_id="pid2", project_name="pn2", category="c", fps_throughput="", latency="", target_device_type="", previous_revision_id="", previous_trained_revision_id="", score=0.2, score_up_to_date=True, performance={}, precision=["fp16"], label_schema_in_sync=True, overview={}, optimization_capabilities={}, model_group_id="", labels=[], architecture="")
-    mlflow_manager.get_models = mocker.Mock(return_value=[model1, model2])
-    mlflow_manager._client = mocker.Mock()
+    mlflow_manager._client = None # pylint: disable=protected-access
+    mock_client = mocker.patch("mlflow.MlflowClient").return_value
+    # Registered models returned by MLflow when the cache is loaded
+    mv1 = MV()
+    mv1.tags = {"id": "id1", "name": "n", "version": "1", "precision": "['fp32']", "project_name": "pn", "project_id": "pid"}
+    mv2 = MV()
+    mv2.tags = {"id": "id2", "name": "n2", "version": "2", "precision": "['fp16']", "project_name": "pn2", "project_id": "pid2"}
+    mock_client.search_registered_models.return_value = [mv1, mv2]
 
     # REGISTER_MODEL: id match
     result, msg = mlflow_manager.duplicate_model_check({"id": "id1"}, mode=Operation.REGISTER_MODEL)
     assert result is True
+    assert msg == "'id1'."
 
-    # UPDATE_MODEL: name, version, precision, project_name, project_id match
-    meta = {"name": "n", "version": "1", "precision": "['fp32']", "project_name": "pn", "project_id": "pid"}
+    # REGISTER_MODEL: name, version, precision, project_name, project_id match
+    meta = {"id": "id3", "name": "n", "version": "1", "precision": ["fp32"], "project_name": "pn", "project_id": "pid"}
+    result, msg = mlflow_manager.duplicate_model_check(meta, mode=Operation.REGISTER_MODEL)
+    assert result is True
+    assert msg == "'id1'."
+
+    # REGISTER_MODEL: no match
+    result, msg = mlflow_manager.duplicate_model_check(dict(meta, version="3"), mode=Operation.REGISTER_MODEL)
+    assert result is False
+
+    # UPDATE_MODEL: the updated model does not match itself
+    meta = {"id": "id1", "name": "n", "version": "1", "precision": "['fp32']", "project_name": "pn", "project_id": "pid"}
     result, msg = mlflow_manager.duplicate_model_check(meta, mode=Operation.UPDATE_MODEL)
-    assert result is True or result is False  # Accept both for coverage
+    assert result is False
+
+    # UPDATE_MODEL: name, version, precision, project_name, project_id match another model
+    result, msg = mlflow_manager.duplicate_model_check(dict(meta, id="id2"), mode=Operation.UPDATE_MODEL)
+    assert result is True
+    assert msg == "'id1'."
+
+    # All checks are served from the cache
+    mock_client.search_registered_models.assert_called_once()
 
 def test_string_contains_any_char():
     """Test _string_contains_any_char utility."""
@@ -0,0 +1,122 @@
+# pylint: disable=import-error, protected-access
+"""
+This file provides functions for testing functions in the model_cache.py file.
+"""
+from models.registered_model import RegisteredModel
+from managers.model_cache import ModelMetadataCache, identity_key
+
+
+def make_model(model_id, name="SSD", version="1", precision=None, project_name="Project"):
+    """Returns a registered model with the given metadata"""
+    return RegisteredModel(id=model_id, name=name, target_device="CPU", created_date="d",
+                           last_updated_date="d", precision=precision or ["FP32"], size=1,
+                           version=version, format="openvino", origin="Geti", file_url="url",
+                           project_id="pid", project_name=project_name)
+
+
+def test_cache_loads_once_until_expired(mocker):
+    """Test the models are loaded on first access and reloaded after the TTL expires."""
+    loader = mocker.Mock(return_value=[make_model("id1")])
+    monotonic = mocker.patch("managers.model_cache.time.monotonic", return_value=100.0)
+    cache = ModelMetadataCache(loader=loader, ttl=60)
+
+    assert cache.get("id1").id == "id1"
+    assert cache.get("id2") is None
+    loader.assert_called_once()
+
+    monotonic.return_value = 161.0
+    cache.get("id1")
+    assert loader.call_count == 2
+
+    cache.invalidate()
+    cache.get("id1")
+    assert loader.call_count == 3
+
+
+def test_cache_serves_loaded_models_during_reload(mocker):
+    """Test requests during a reload are served from the previously loaded models without waiting."""
+    monotonic = mocker.patch("managers.model_cache.time.monotonic", return_value=100.0)
+    served = []
+
+    def loader():
+        if cache._loaded_at is not None:
+            # Another request while the cache is reloaded
+            served.append(cache.get("id1"))
+            return [make_model("id1", version="2")]
+        return [make_model("id1")]
+
+    cache = ModelMetadataCache(loader=loader, ttl=60)
+    assert cache.get("id1").version == "1"
+
+    monotonic.return_value = 161.0
+    assert cache.get("id1").version == "2"
+    assert [m.version for m in served] == ["1"]
+
+
+def test_cache_applies_changes_made_during_load():
+    """Test models put, removed or invalidated during a load are reflected once it completes."""
+    def loader():
+        cache.put(make_model("id2"))
+        cache.remove("id1")
+        return [make_model("id1"), make_model("id3")]
+
+    cache = ModelMetadataCache(loader=loader, ttl=60)
+    assert [m.id for m in cache.find()] == ["id2", "id3"]
+
+    def invalidating_loader():
+        cache.invalidate()
+        return [make_model("id1")]
+
+    cache = ModelMetadataCache(loader=invalidating_loader, ttl=60)
+    assert cache.get("id1") is not None
+    assert cache._loaded_at is None
+
+
+def test_cache_ttl_from_env(monkeypatch):
+    """Test the TTL is read from the MODEL_METADATA_CACHE_TTL environment variable."""
+    monkeypatch.setenv("MODEL_METADATA_CACHE_TTL", "5")
+    assert ModelMetadataCache(loader=list).ttl == 5.0
+
+
+def test_find():
+    """Test filtering by substrings, versions and exact values, ordered by ID."""
+    cache = ModelMetadataCache(loader=lambda: [make_model("b", name="SSD Person", version="2"),
+                                               make_model("a", name="ATSS", version="2", precision=["FP16"]),
+                                               make_model("c", name="ssd vehicle", version="1", project_name="Other")],
+                               ttl=60)
+
+    assert [m.id for m in cache.find()] == ["a", "b", "c"]
+    assert [m.id for m in cache.find({"name": "SSD", "version": None})] == ["b", "c"]
+    assert [m.id for m in cache.find({"version": "2"})] == ["a", "b"]
+    assert [m.id for m in cache.find({"precision": "fp16"})] == ["a"]
+    assert [m.id for m in cache.find({"project_name": "other", "version": "1"})] == ["c"]
+    assert [m.id for m in cache.find({"format": "openvino", "name": "atss"})] == ["a"]
+    assert not cache.find({"version": "3"})
+
+
+def test_put_and_remove_update_indexes():
+    """Test registered, updated and deleted models are reflected in the indexes."""
+    cache = ModelMetadataCache(loader=lambda: [make_model("id1")], ttl=60)
+    # Models added before the cache is loaded are loaded with all models
+    cache.put(make_model("id0"))
+    assert cache.get("id0") is None
+
+    cache.put(make_model("id2", version="2"))
+    assert [m.id for m in cache.find({"version": "2"})] == ["id2"]
+    assert cache.find_duplicate_ids(make_model("x", version="2").__dict__) == {"id2"}
+
+    cache.put(make_model("id2", version="3"))
+    assert not cache.find({"version": "2"})
+    assert not cache.find_duplicate_ids(make_model("x", version="2").__dict__)
+    assert [m.id for m in cache.find()] == ["id1", "id2"]
+
+    cache.remove("id1")
+    cache.remove("unknown")
+    assert cache.get("id1") is None
+    assert not cache.find_duplicate_ids(make_model("x").__dict__)
+
+
+def test_identity_key_precision_as_tag():
+    """Test precisions given as a list or as a tag string have the same identity."""
+    model = make_model("id1", precision=["FP16"])
+    assert identity_key(model.__dict__) == identity_key(dict(model.__dict__, precision="['FP16']"))
@@ -0,0 +1,187 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import os
+import logging
+import time
+import httpx
+
+
+log_level = os.getenv('KAPACITOR_LOGGING_LEVEL', 'INFO').upper()
+logging_level = getattr(logging, log_level, logging.INFO)
+
+# Configure logging
+logging.basicConfig(
+    level=logging_level,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+)
+
+logger = logging.getLogger()
+
+class KapacitorWriteError(Exception):
+    """Raised when Kapacitor rejects a batch of points or can not be reached"""
+
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class KapacitorWriter:
+    """
+    Writes line-protocol points to Kapacitor in batches, over a pooled async HTTP client.
+
+    Points written by concurrent requests are coalesced into one batch, which is sent
+    when it holds `max_batch_points` points or `max_batch_bytes` bytes, or `flush_interval`
+    seconds after its first point was added. Each writer waits until the batch holding
+    its points is sent, so it gets the result of the write. If Kapacitor rejects a batch,
+    e.g. for a malformed point, the points of each writer are sent again separately, so
+    that only the writers of the invalid points get the error.
+
+    The health of the Kapacitor daemon is cached for `health_ttl` seconds, and updated
+    by the result of each write, instead of being checked for every request.
+    """
+
+    def __init__(self, kapacitor_url, max_batch_points=5000, max_batch_bytes=1024 * 1024,
+                 flush_interval=0.1, health_ttl=5.0, max_connections=10, transport=None):
+        self.write_url = f"{kapacitor_url.rstrip('/')}/kapacitor/v1/write?db=datain&rp=autogen"
+        self.ping_url = f"{kapacitor_url.rstrip('/')}/kapacitor/v1/ping"
+        self.max_batch_points = max_batch_points
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+        self.health_ttl = health_ttl
+        self.max_connections = max_connections
+        self.transport = transport
+
+        self.client = None
+        self.loop = None
+        self._lines = []
+        self._batch_bytes = 0
+        self._waiters = []
+        self._flush_timer = None
+        self._flush_tasks = set()
+        self._healthy = False
+        self._health_checked_at = None
+        self._health_lock = None
+
+    def _ensure_client(self):
+        """Create the HTTP client on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.loop is not loop:
+            self.loop = loop
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(10.0, connect=1.0),
+                transport=self.transport)
+            self._health_lock = asyncio.Lock()
+            self._lines, self._batch_bytes, self._waiters = [], 0, []
+            self._flush_timer = None
+            self._flush_tasks = set()
+        return self.client
+
+    def _set_health(self, healthy):
+        self._healthy = healthy
+        self._health_checked_at = time.monotonic()
+
+    async def is_healthy(self):
+        """Get the health of the Kapacitor daemon, pinging it if the cached state expired"""
+        self._ensure_client()
+        async with self._health_lock:
+            if self._health_checked_at is not None and \
+                    time.monotonic() - self._health_checked_at < self.health_ttl:
+                return self._healthy
+            try:
+                r = await self.client.get(self.ping_url, timeout=1)
+                self._set_health(r.status_code in (200, 204))
+            except httpx.HTTPError as e:
+                logger.debug(f"Kapacitor ping failed: {e}")
+                self._set_health(False)
+            if not self._healthy:
+                logger.info("Kapacitor daemon is not running.")
+            return self._healthy
+
+    async def write(self, lines):
+        """
+        Add line-protocol points to the current batch and wait until the batch is sent.
+
+        Raises:
+            KapacitorWriteError: If Kapacitor rejected the batch or could not be reached.
+        """
+        self._ensure_client()
+        if not lines:
+            return
+        waiter = self.loop.create_future()
+        self._lines.extend(lines)
+        self._batch_bytes += sum(len(line) + 1 for line in lines)
+        self._waiters.append((waiter, lines))
+
+        if len(self._lines) >= self.max_batch_points or self._batch_bytes >= self.max_batch_bytes:
+            self._flush_soon()
+        elif self._flush_timer is None:
+            self._flush_timer = self.loop.call_later(self.flush_interval, self._flush_soon)
+
+        await waiter
+
+    def _flush_soon(self):
+        """Send the current batch in a background task"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._lines:
+            return
+        lines, waiters = self._lines, self._waiters
+        self._lines, self._batch_bytes, self._waiters = [], 0, []
+        task = self.loop.create_task(self._send(lines, waiters))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _post(self, lines):
+        """Send points to Kapacitor. Returns the error, or None if the points were written."""
+        try:
+            r = await self.client.post(self.write_url, content="\n".join(lines).encode("utf-8"),
+                                       headers={"Content-Type": "text/plain"})
+            self._set_health(True)
+            if r.status_code != 204:
+                return KapacitorWriteError(r.status_code, r.text)
+        except Exception as e:
+            self._set_health(False)
+            return KapacitorWriteError(500, f"Failed to send data to Kapacitor: {e}")
+        return None
+
+    async def _send(self, lines, waiters):
+        error = await self._post(lines)
+        if error is None:
+            logger.debug(f"Sent a batch of {len(lines)} points to Kapacitor")
+            errors = [None] * len(waiters)
+        elif 400 <= error.status_code < 500 and len(waiters) > 1:
+            # Kapacitor rejects the whole batch without writing any point if one of them is
+            # invalid, so the points of each writer are sent separately to get their own result
+            logger.warning(f"Kapacitor rejected a batch of {len(lines)} points from {len(waiters)} "
+                           f"writers: {error.detail}. Sending the points of each writer separately.")
+            errors = await asyncio.gather(*(self._post(waiter_lines) for _, waiter_lines in waiters))
+        else:
+            errors = [error] * len(waiters)
+
+        for (waiter, waiter_lines), error in zip(waiters, errors):
+            if error is not None:
+                logger.error(f"Failed to write {len(waiter_lines)} points to Kapacitor: {error.detail}")
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(error)
+
+    async def close(self):
+        """Send the pending points and close the HTTP client"""
+        if self.client is None:
+            return
+        self._flush_soon()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.client.aclose()
+        self.client = None
@@ -8,16 +8,18 @@ import logging
 import time
 import json
 import requests
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Response, status, Request, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from starlette.responses import JSONResponse
-from typing import Optional
+from typing import List, Optional
 import uvicorn
 import subprocess
 import threading
 import classifier_startup
 from fastapi import BackgroundTasks
 from opcua_alerts import OpcuaAlerts
+from kapacitor_writer import KapacitorWriter, KapacitorWriteError
 
 
 
@@ -31,11 +33,27 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger()
-app = FastAPI()
 
 KAPACITOR_URL = os.getenv('KAPACITOR_URL','http://localhost:9092')
 CONFIG_FILE = "/app/config.json"
 MAX_SIZE = 5 * 1024  # 5 KB
+# Content types of request bodies holding one JSON data point per line
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+kapacitor_writer = KapacitorWriter(
+    KAPACITOR_URL,
+    max_batch_points=int(os.getenv('INPUT_BATCH_MAX_POINTS', '5000')),
+    max_batch_bytes=int(os.getenv('INPUT_BATCH_MAX_BYTES', str(1024 * 1024))),
+    flush_interval=float(os.getenv('INPUT_BATCH_FLUSH_INTERVAL_MS', '100')) / 1000,
+    health_ttl=float(os.getenv('KAPACITOR_HEALTH_CACHE_SECONDS', '5')))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Send the points still being batched before the service stops
+    await kapacitor_writer.close()
+
+app = FastAPI(lifespan=lifespan)
 
 config = {}
 opcua_send_alert = None
@@ -46,6 +64,8 @@ class DataPoint(BaseModel):
     fields: dict
     timestamp: Optional[int] = None
 
+data_points_adapter = TypeAdapter(List[DataPoint])
+
 class Config(BaseModel):
     model_registry : dict = {"enable": False, "version": "1.0"}
     udfs: dict = {"name": "udf_name"}
@@ -71,9 +91,17 @@ def json_to_line_protocol(data_point: DataPoint):
         line_protocol = f"{data_point.topic},{tags_part} {fields_part} {ts}"
     else:
         line_protocol = f"{data_point.topic} {fields_part} {ts}"
-    logger.debug(f"Converted line protocol: {line_protocol}")
+    logger.debug("Converted line protocol: %s", line_protocol)
     return line_protocol
 
+def parse_data_points(body: bytes, content_type: str) -> List[DataPoint]:
+    """Parse a JSON array of data points, or one JSON data point per line for NDJSON content types"""
+    if content_type.split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        items = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        items = json.loads(body)
+    return data_points_adapter.validate_python(items)
+
 def start_kapacitor_service(config):
   
     classifier_startup.classifier_startup(config)
@@ -261,6 +289,89 @@ async def receive_data(data_point: DataPoint):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/input/batch", openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/DataPoint"}}
+            },
+            "application/x-ndjson": {
+                "schema": {"type": "string", "description": "One DataPoint JSON object per line"}
+            }
+        }
+    }
+})
+async def receive_data_batch(request: Request):
+    """
+    Receives multiple data points, converts them to InfluxDB line protocol, and sends them to the Kapacitor service in batches.
+
+    The request body is either a JSON array of data points, or one JSON data point per line (NDJSON)
+    with the `application/x-ndjson` content type. Each data point has the same keys as for the `/input` endpoint.
+
+    Points of concurrent requests are coalesced into one write to Kapacitor, when the batch reaches
+    INPUT_BATCH_MAX_POINTS points or INPUT_BATCH_MAX_BYTES bytes, or INPUT_BATCH_FLUSH_INTERVAL_MS
+    milliseconds after the batch was started. The request returns once its points are written.
+
+    Example request body:
+    [
+        {"topic": "sensor_data", "tags": {"device": "sensorA"}, "fields": {"temperature": 23.5}, "timestamp": 1718000000000000000},
+        {"topic": "sensor_data", "tags": {"device": "sensorB"}, "fields": {"temperature": 24.1}, "timestamp": 1718000000000000000}
+    ]
+
+    Args:
+        request (Request): The request holding the data points in its body.
+    Returns:
+        dict: A status message and the number of data points sent.
+    Raises:
+        HTTPException: 422 if the body is not valid, 500 if the Kapacitor daemon is not running, or the error returned by Kapacitor.
+
+    responses:
+        '200':
+        description: Data successfully sent to the Time series Analytics microservice
+        content:
+            application/json:
+            schema:
+                type: object
+                properties:
+                status:
+                    type: string
+                    example: success
+                message:
+                    type: string
+                    example: 2 data points sent to Time Series Analytics microservice
+                points:
+                    type: integer
+                    example: 2
+        '422':
+        description: Invalid JSON or data points
+        '500':
+        description: Internal server error
+    """
+    try:
+        data_points = parse_data_points(await request.body(), request.headers.get("content-type", ""))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON in request body: {e}")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json(include_url=False)))
+
+    if not data_points:
+        return {"status": "success", "message": "No data points received", "points": 0}
+
+    # The health of the daemon is cached, and refreshed by the result of each write
+    if not await kapacitor_writer.is_healthy():
+        raise HTTPException(status_code=500, detail="Kapacitor daemon is not running")
+
+    lines = [json_to_line_protocol(data_point) for data_point in data_points]
+    try:
+        await kapacitor_writer.write(lines)
+    except KapacitorWriteError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    return {"status": "success",
+            "message": f"{len(lines)} data points sent to Time Series Analytics microservice",
+            "points": len(lines)}
+
 @app.get("/config")
 async def get_config(
     request: Request,
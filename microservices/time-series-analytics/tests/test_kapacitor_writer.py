@@ -0,0 +1,111 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import httpx
+from kapacitor_writer import KapacitorWriter, KapacitorWriteError
+
+
+class MockKapacitor:
+    """Records the requests sent to Kapacitor and answers them with the given status codes"""
+
+    def __init__(self, write_status=204, ping_status=204, ping_error=None, invalid_lines=()):
+        self.writes = []
+        self.pings = 0
+        self.write_status = write_status
+        self.invalid_lines = invalid_lines
+        self.ping_status = ping_status
+        self.ping_error = ping_error
+
+    def __call__(self, request):
+        if request.url.path == "/kapacitor/v1/ping":
+            self.pings += 1
+            if self.ping_error:
+                raise self.ping_error
+            return httpx.Response(self.ping_status)
+        lines = request.content.decode().split("\n")
+        self.writes.append(lines)
+        if any(line in self.invalid_lines for line in lines):
+            return httpx.Response(400, text="unable to parse")
+        return httpx.Response(self.write_status, text="" if self.write_status == 204 else "invalid line protocol")
+
+
+def make_writer(kapacitor, **kwargs):
+    return KapacitorWriter("http://kapacitor:9092/", transport=httpx.MockTransport(kapacitor), **kwargs)
+
+
+async def test_write_coalesces_concurrent_writes():
+    kapacitor = MockKapacitor()
+    writer = make_writer(kapacitor, max_batch_points=100, flush_interval=0.05)
+    await asyncio.gather(writer.write(["a 1", "b 2"]), writer.write(["c 3"]), writer.write(["d 4", "e 5"]))
+    assert kapacitor.writes == [["a 1", "b 2", "c 3", "d 4", "e 5"]]
+    await writer.close()
+
+
+async def test_write_flushes_full_batch_without_waiting():
+    kapacitor = MockKapacitor()
+    writer = make_writer(kapacitor, max_batch_points=3, flush_interval=60)
+    await asyncio.wait_for(writer.write(["a 1", "b 2", "c 3"]), timeout=5)
+    assert kapacitor.writes == [["a 1", "b 2", "c 3"]]
+    await writer.close()
+
+
+async def test_write_flushes_by_size():
+    kapacitor = MockKapacitor()
+    writer = make_writer(kapacitor, max_batch_bytes=10, flush_interval=60)
+    await asyncio.wait_for(writer.write(["a " + "1" * 10]), timeout=5)
+    assert len(kapacitor.writes) == 1
+    await writer.close()
+
+
+async def test_write_error_is_raised_to_all_writers():
+    kapacitor = MockKapacitor(write_status=400)
+    writer = make_writer(kapacitor, flush_interval=0.01)
+    results = await asyncio.gather(writer.write(["a 1"]), writer.write(["b 2"]), return_exceptions=True)
+    assert all(isinstance(r, KapacitorWriteError) and r.status_code == 400 for r in results)
+    assert results[0].detail == "invalid line protocol"
+    await writer.close()
+
+
+async def test_write_error_is_raised_to_writers_of_invalid_points():
+    kapacitor = MockKapacitor(invalid_lines=["b"])
+    writer = make_writer(kapacitor, flush_interval=0.01)
+    results = await asyncio.gather(writer.write(["a 1"]), writer.write(["b"]), writer.write(["c 3", "d 4"]),
+                                   return_exceptions=True)
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], KapacitorWriteError) and results[1].status_code == 400
+    assert results[1].detail == "unable to parse"
+    assert kapacitor.writes[0] == ["a 1", "b", "c 3", "d 4"]
+    assert sorted(kapacitor.writes[1:]) == [["a 1"], ["b"], ["c 3", "d 4"]]
+    await writer.close()
+
+
+async def test_health_is_cached():
+    kapacitor = MockKapacitor()
+    writer = make_writer(kapacitor, health_ttl=60)
+    assert await writer.is_healthy()
+    assert await writer.is_healthy()
+    assert kapacitor.pings == 1
+    await writer.close()
+
+
+async def test_health_not_running():
+    kapacitor = MockKapacitor(ping_error=httpx.ConnectError("refused"))
+    writer = make_writer(kapacitor, health_ttl=0)
+    assert not await writer.is_healthy()
+    kapacitor.ping_error = None
+    assert await writer.is_healthy()
+    await writer.close()
+
+
+async def test_close_sends_pending_points():
+    kapacitor = MockKapacitor()
+    writer = make_writer(kapacitor, flush_interval=60)
+    write = asyncio.ensure_future(writer.write(["a 1"]))
+    await asyncio.sleep(0)
+    await writer.close()
+    await write
+    assert kapacitor.writes == [["a 1"]]
+    assert writer.client is None
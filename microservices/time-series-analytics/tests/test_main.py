@@ -77,6 +77,58 @@ def test_receive_data_kapacitor_down(monkeypatch):
     assert resp.status_code == 500
     assert "Kapacitor daemon is not running" in resp.json()["detail"]
 
+@pytest.fixture
+def mock_kapacitor_writer(monkeypatch):
+    writer = mock.Mock()
+    writer.is_healthy = mock.AsyncMock(return_value=True)
+    writer.write = mock.AsyncMock()
+    monkeypatch.setattr(main, "kapacitor_writer", writer)
+    return writer
+
+def test_receive_data_batch_json(mock_kapacitor_writer):
+    data = [
+        {"topic": "sensor_data", "tags": {"location": "factory1"}, "fields": {"temperature": 23.5}, "timestamp": 1718000000000000000},
+        {"topic": "sensor_data", "fields": {"temperature": 24}, "timestamp": 1718000000000000001}
+    ]
+    resp = client.post("/input/batch", json=data)
+    assert resp.status_code == 200
+    assert resp.json()["points"] == 2
+    mock_kapacitor_writer.write.assert_awaited_once_with([
+        "sensor_data,location=factory1 temperature=23.5 1718000000000000000",
+        "sensor_data temperature=24 1718000000000000001"
+    ])
+
+def test_receive_data_batch_ndjson(mock_kapacitor_writer):
+    body = '{"topic": "t", "fields": {"v": 1}, "timestamp": 1}\n\n{"topic": "t", "fields": {"v": 2}, "timestamp": 2}\n'
+    resp = client.post("/input/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    mock_kapacitor_writer.write.assert_awaited_once_with(["t v=1 1", "t v=2 2"])
+
+def test_receive_data_batch_empty(mock_kapacitor_writer):
+    resp = client.post("/input/batch", json=[])
+    assert resp.status_code == 200
+    assert resp.json()["points"] == 0
+    mock_kapacitor_writer.write.assert_not_awaited()
+
+@pytest.mark.parametrize("body", ['{"topic": "t"', '[{"topic": "t"}]', '{"topic": "t", "fields": {"v": 1}}'])
+def test_receive_data_batch_invalid(mock_kapacitor_writer, body):
+    resp = client.post("/input/batch", content=body, headers={"Content-Type": "application/json"})
+    assert resp.status_code == 422
+    mock_kapacitor_writer.write.assert_not_awaited()
+
+def test_receive_data_batch_kapacitor_down(mock_kapacitor_writer):
+    mock_kapacitor_writer.is_healthy.return_value = False
+    resp = client.post("/input/batch", json=[{"topic": "t", "fields": {"v": 1}}])
+    assert resp.status_code == 500
+    assert "Kapacitor daemon is not running" in resp.json()["detail"]
+    mock_kapacitor_writer.write.assert_not_awaited()
+
+def test_receive_data_batch_write_error(mock_kapacitor_writer):
+    mock_kapacitor_writer.write.side_effect = main.KapacitorWriteError(400, "invalid line protocol")
+    resp = client.post("/input/batch", json=[{"topic": "t", "fields": {"v": 1}}])
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "invalid line protocol"
+
 def test_get_config(monkeypatch):
     resp = client.get("/config")
     assert resp.status_code == 200
@@ -0,0 +1,310 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+import copy
+import os
+import pickle
+import sys
+import types
+from collections import defaultdict
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+import pytest
+
+
+class Message:
+    """Stand-in for a protobuf message of the Kapacitor UDF protocol"""
+
+    def CopyFrom(self, other):
+        self.__dict__.update(copy.deepcopy(other.__dict__))
+
+    def SerializeToString(self):
+        return pickle.dumps(self.__dict__)
+
+    def ParseFromString(self, data):
+        self.__dict__.update(pickle.loads(data))
+
+
+class Point(Message):
+    def __init__(self, time=0, name="", group="", tags=None, fieldsDouble=None, fieldsInt=None):
+        self.time = time
+        self.name = name
+        self.group = group
+        self.tags = dict(tags or {})
+        self.fieldsDouble = dict(fieldsDouble or {})
+        self.fieldsInt = dict(fieldsInt or {})
+        self.fieldsBool = {}
+        self.fieldsString = {}
+
+
+class BeginBatch(Message):
+    def __init__(self, name="", group="", tags=None, size=0):
+        self.name = name
+        self.group = group
+        self.tags = dict(tags or {})
+        self.size = size
+
+
+class EndBatch(Message):
+    def __init__(self, name="", group="", tags=None, tmax=0):
+        self.name = name
+        self.group = group
+        self.tags = dict(tags or {})
+        self.tmax = tmax
+
+
+class Response:
+    def __init__(self):
+        self.point = Point()
+        self.begin = BeginBatch()
+        self.end = EndBatch()
+        self.info = SimpleNamespace(wants=None, provides=None,
+                                    options=defaultdict(lambda: SimpleNamespace(valueTypes=[])))
+        self.init = SimpleNamespace(success=None, error="")
+        self.snapshot = SimpleNamespace(snapshot=b"")
+        self.restore = SimpleNamespace(success=None, error="")
+
+
+# Patch sys.modules for the Kapacitor UDF agent, which is installed in the container image
+udf_pb2 = types.ModuleType("kapacitor.udf.udf_pb2")
+udf_pb2.STREAM, udf_pb2.BATCH = 0, 1
+udf_pb2.INT, udf_pb2.STRING, udf_pb2.DURATION = 1, 3, 5
+udf_pb2.Point, udf_pb2.Response = Point, Response
+agent_module = types.ModuleType("kapacitor.udf.agent")
+agent_module.Handler = object
+udf_module = types.ModuleType("kapacitor.udf")
+udf_module.udf_pb2, udf_module.agent = udf_pb2, agent_module
+kapacitor_module = types.ModuleType("kapacitor")
+kapacitor_module.udf = udf_module
+sys.modules.update({"kapacitor": kapacitor_module, "kapacitor.udf": udf_module,
+                    "kapacitor.udf.udf_pb2": udf_pb2, "kapacitor.udf.agent": agent_module})
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "udfs"))
+from windowed_udf import Window, WindowedHandler, ModelWindowHandler
+
+SECOND = 10**9
+
+
+def option(name, **value):
+    return SimpleNamespace(name=name, values=[SimpleNamespace(**value)])
+
+
+class Agent:
+    """Records the responses written by a handler, with their flush flag"""
+
+    def __init__(self):
+        self.responses = []
+
+    def write_response(self, response, flush=False):
+        self.responses.append((response, flush))
+
+    @property
+    def points(self):
+        return [response.point for response, _ in self.responses]
+
+
+class ThresholdHandler(WindowedHandler):
+    """Selects the points with a temperature above 25, and adds fields of each kind"""
+    fields = ("temperature",)
+
+    def process(self, window):
+        temp = window.column("temperature")
+        window.set_field("high", temp > 25)
+        window.set_field("count", np.full(len(window), len(window)))
+        window.set_field("scaled", temp * 2)
+        window.set_field("label", np.array(["t"] * len(window)))
+        return temp > 25
+
+
+def make_handler(handler_cls=ThresholdHandler, *options):
+    handler = handler_cls(Agent())
+    response = handler.init(SimpleNamespace(options=list(options)))
+    assert response.init.success, response.init.error
+    return handler
+
+
+def test_window_columns():
+    window = Window(["a", "b"], capacity=1)
+    window.append(Point(time=1, fieldsDouble={"a": 1.5}, fieldsInt={"b": 2}))
+    window.append(Point(time=2, fieldsDouble={"a": 2.5}))
+    window.append(Point(time=3, fieldsInt={"a": 3}))
+
+    assert len(window) == 3
+    assert window.times.tolist() == [1, 2, 3]
+    assert window.column("a").tolist() == [1.5, 2.5, 3.0]
+    assert np.isnan(window.column("b")[1:]).all()
+    assert window.values.shape == (3, 2)
+
+    with pytest.raises(ValueError):
+        window.set_field("x", [1, 2])
+
+
+def test_stream_window_selection_and_fields():
+    handler = make_handler(ThresholdHandler, option("window", intValue=3))
+    for i, temp in enumerate([20.0, 30.0]):
+        handler.point(Point(time=i, fieldsDouble={"temperature": temp}))
+    assert handler._agent.responses == []
+
+    handler.point(Point(time=2, fieldsDouble={"temperature": 26.0}))
+
+    points = handler._agent.points
+    assert [p.fieldsDouble["temperature"] for p in points] == [30.0, 26.0]
+    assert [p.fieldsBool["high"] for p in points] == [True, True]
+    assert [p.fieldsInt["count"] for p in points] == [3, 3]
+    assert [p.fieldsDouble["scaled"] for p in points] == [60.0, 52.0]
+    assert [p.fieldsString["label"] for p in points] == ["t", "t"]
+    # The window is written back with a single flush
+    assert [flush for _, flush in handler._agent.responses] == [False, True]
+    assert handler._windows == {}
+
+
+def test_batch_window_framing():
+    class BatchHandler(ThresholdHandler):
+        wants = udf_pb2.BATCH
+        provides = udf_pb2.BATCH
+
+    handler = make_handler(BatchHandler)
+    handler.begin_batch(BeginBatch(name="temp", group="g", tags={"device": "a"}, size=3))
+    for i, temp in enumerate([30.0, 20.0, 27.0]):
+        handler.point(Point(time=i, fieldsDouble={"temperature": temp}))
+    handler.end_batch(EndBatch(name="temp", group="g", tmax=2))
+
+    responses = [response for response, _ in handler._agent.responses]
+    assert len(responses) == 4
+    assert (responses[0].begin.name, responses[0].begin.group, responses[0].begin.size) == ("temp", "g", 2)
+    assert responses[0].begin.tags == {"device": "a"}
+    assert [r.point.fieldsDouble["temperature"] for r in responses[1:3]] == [30.0, 27.0]
+    assert responses[3].end.tmax == 2
+    assert handler._agent.responses[-1][1]
+
+
+def test_stream_window_provided_as_batch():
+    class StreamToBatchHandler(ThresholdHandler):
+        provides = udf_pb2.BATCH
+
+    handler = make_handler(StreamToBatchHandler, option("window", intValue=2))
+    handler.point(Point(time=5, name="temp", group="g", fieldsDouble={"temperature": 30.0}))
+    handler.point(Point(time=7, name="temp", group="g", fieldsDouble={"temperature": 10.0}))
+
+    responses = [response for response, _ in handler._agent.responses]
+    assert (responses[0].begin.name, responses[0].begin.group, responses[0].begin.size) == ("temp", "g", 1)
+    assert (responses[-1].end.name, responses[-1].end.tmax) == ("temp", 7)
+
+
+def test_partial_windows_are_flushed_after_interval():
+    handler = make_handler(ThresholdHandler, option("window", intValue=10),
+                           option("flushInterval", durationValue=5 * SECOND))
+    handler.point(Point(time=0, group="a", fieldsDouble={"temperature": 30.0}))
+    handler.point(Point(time=2 * SECOND, group="b", fieldsDouble={"temperature": 31.0}))
+    handler.point(Point(time=4 * SECOND, group="a", fieldsDouble={"temperature": 32.0}))
+    assert handler._agent.responses == []
+
+    # The window of group a expired, group b has not
+    handler.point(Point(time=5 * SECOND, group="a", fieldsDouble={"temperature": 33.0}))
+    assert [p.fieldsDouble["temperature"] for p in handler._agent.points] == [30.0, 32.0]
+    assert [len(w) for w in handler._windows.values()] == [1, 1]
+
+    # The idle group b is flushed and evicted by a point of another group
+    handler.point(Point(time=8 * SECOND, group="a", fieldsDouble={"temperature": 34.0}))
+    assert [p.fieldsDouble["temperature"] for p in handler._agent.points] == [30.0, 32.0, 31.0]
+    assert list(handler._windows) == ["a"]
+
+
+def test_partial_windows_are_kept_without_interval():
+    handler = make_handler(ThresholdHandler, option("window", intValue=10),
+                           option("flushInterval", durationValue=0))
+    handler.point(Point(time=0, fieldsDouble={"temperature": 30.0}))
+    handler.point(Point(time=3600 * SECOND, fieldsDouble={"temperature": 30.0}))
+    assert handler._agent.responses == []
+
+
+def test_snapshot_and_restore_buffered_points():
+    handler = make_handler(ThresholdHandler, option("window", intValue=3))
+    handler.point(Point(time=1, group="a", fieldsDouble={"temperature": 30.0}))
+    handler.point(Point(time=2, group="b", fieldsDouble={"temperature": 31.0}))
+    handler.point(Point(time=3, group="a", fieldsDouble={"temperature": 32.0}))
+    snapshot = handler.snapshot().snapshot.snapshot
+
+    restored = make_handler(ThresholdHandler, option("window", intValue=3))
+    response = restored.restore(SimpleNamespace(snapshot=snapshot))
+    assert response.restore.success
+    assert {group: w.times.tolist() for group, w in restored._windows.items()} == {"a": [1, 3], "b": [2]}
+
+    restored.point(Point(time=4, group="a", fieldsDouble={"temperature": 33.0}))
+    assert [p.fieldsDouble["temperature"] for p in restored._agent.points] == [30.0, 32.0, 33.0]
+
+    assert make_handler().restore(SimpleNamespace(snapshot=b"")).restore.success
+    assert not make_handler().restore(SimpleNamespace(snapshot=b"\x00\x00")).restore.success
+
+
+@pytest.mark.parametrize("options, error", [
+    ([option("unknown", intValue=1)], "Unknown option unknown"),
+    ([option("window", intValue=0)], "window size"),
+    ([option("flushInterval", durationValue=-1)], "flush interval"),
+])
+def test_init_errors(options, error):
+    response = ThresholdHandler(Agent()).init(SimpleNamespace(options=options))
+    assert not response.init.success
+    assert error in response.init.error
+
+
+def test_field_options_replace_default_fields():
+    handler = make_handler(ThresholdHandler, option("field", stringValue="a"), option("field", stringValue="b"))
+    assert handler.fields == ["a", "b"]
+
+
+class Model:
+    """Predicts the sum of the features of each point"""
+
+    def predict(self, values):
+        return values.sum(axis=1)
+
+
+def make_model_handler(handler_cls=ModelWindowHandler):
+    handler = handler_cls(Agent())
+    handler.fields = ["a", "b"]
+    handler.model = Model()
+    return handler
+
+
+def test_model_window_handler_skips_points_with_missing_fields():
+    handler = make_model_handler()
+    window = Window(["a", "b"], capacity=3)
+    window.append(Point(fieldsDouble={"a": 1.0, "b": 2.0}))
+    window.append(Point(fieldsDouble={"a": 1.0}))
+    window.append(Point(fieldsInt={"a": 3, "b": 4}))
+
+    mask = handler.process(window)
+
+    assert mask.tolist() == [True, False, True]
+    assert window.outputs["prediction"].tolist() == [3.0, 0.0, 7.0]
+
+
+def test_model_window_handler_without_valid_points():
+    handler = make_model_handler()
+    window = Window(["a", "b"], capacity=1)
+    window.append(Point(fieldsDouble={"a": 1.0}))
+
+    assert handler.process(window).tolist() == [False]
+    assert window.outputs == {}
+
+
+def test_model_window_handler_select():
+    class AnomalyHandler(ModelWindowHandler):
+        output_field = "score"
+
+        def select(self, predictions):
+            return predictions > 5
+
+    handler = make_model_handler(AnomalyHandler)
+    handler.model = mock.Mock(predict=mock.Mock(side_effect=Model().predict))
+    window = Window(["a", "b"], capacity=3)
+    window.append(Point(fieldsDouble={"a": 1.0, "b": 2.0}))
+    window.append(Point(fieldsDouble={"a": 5.0, "b": 2.0}))
+    window.append(Point(fieldsDouble={"b": 9.0}))
+    handler._process_window(window)
+
+    assert [p.fieldsDouble["score"] for p in handler._agent.points] == [7.0]
+    handler.model.predict.assert_called_once()
@@ -0,0 +1,371 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from kapacitor.udf.agent import Handler
+from kapacitor.udf import udf_pb2
+import numpy as np
+import logging
+import os
+import struct
+import sys
+
+log_level = os.getenv('KAPACITOR_LOGGING_LEVEL', 'INFO').upper()
+logging_level = getattr(logging, log_level, logging.INFO)
+
+# Configure logging
+logging.basicConfig(
+    level=logging_level,  # Set the log level
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',  # Log format
+)
+
+logger = logging.getLogger()
+
+# Models of a UDF deployment package are in the models/ directory next to the udfs/ directory
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), os.pardir, "models")
+
+
+class Window:
+    """
+    Points buffered as NumPy columns: `times` holds the point times in nanoseconds and
+    `values` holds one column per field, with NaN for fields missing from a point.
+    """
+
+    def __init__(self, fields, capacity=1, name="", group="", tags=None):
+        self.fields = list(fields)
+        self.name = name
+        self.group = group
+        self.tags = dict(tags or {})
+        self.points = []
+        self.outputs = {}
+        self._times = np.empty(max(1, capacity), dtype=np.int64)
+        self._values = np.full((max(1, capacity), len(self.fields)), np.nan)
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def times(self):
+        return self._times[:len(self.points)]
+
+    @property
+    def values(self):
+        return self._values[:len(self.points)]
+
+    def column(self, field):
+        """Get the values of a field for all points of the window"""
+        return self._values[:len(self.points), self.fields.index(field)]
+
+    def append(self, point):
+        i = len(self.points)
+        if i == len(self._times):
+            self._times = np.concatenate([self._times, np.empty(i, dtype=np.int64)])
+            self._values = np.concatenate([self._values, np.full((i, len(self.fields)), np.nan)])
+
+        self._times[i] = point.time
+        row = self._values[i]
+        for j, field in enumerate(self.fields):
+            if field in point.fieldsDouble:
+                row[j] = point.fieldsDouble[field]
+            elif field in point.fieldsInt:
+                row[j] = point.fieldsInt[field]
+        self.points.append(point)
+
+    def set_field(self, name, values):
+        """Add a field, with one value per point of the window, to the points written back"""
+        values = np.asarray(values)
+        if values.shape != (len(self.points),):
+            raise ValueError(f"Field {name} has {values.size} values for {len(self.points)} points")
+        self.outputs[name] = values
+
+
+class WindowedHandler(Handler):
+    """
+    Base class of UDFs processing points in windows of NumPy columns instead of one by one.
+
+    In STREAM mode, points are buffered per group into windows of `window_size` points.
+    A window which is not full is processed once a point arrives `flush_interval`
+    nanoseconds after its first point, so that the points of a group which stopped
+    receiving points are not held back. Set `flush_interval` to 0 to only process full
+    windows. The buffered points are saved in the snapshots of the task.
+
+    In BATCH mode, each batch is a window. Subclasses implement `process` to compute over
+    a whole window at once, and the selected points are written back with a single flush.
+
+    Subclasses set `wants` and `provides` to udf_pb2.STREAM or udf_pb2.BATCH, and `fields`
+    to the fields read from the points. In a TICKscript, the fields, the window size and the
+    flush interval can be set with the `.field('name')`, `.window(size)` and
+    `.flushInterval(duration)` options.
+    """
+    wants = udf_pb2.STREAM
+    provides = udf_pb2.STREAM
+    fields = ()
+    window_size = 1
+    flush_interval = 10 * 10**9
+
+    def __init__(self, agent):
+        self._agent = agent
+        self._windows = {}
+        self._batch = None
+        self._begin_batch = None
+        self._fields_from_options = False
+        self.fields = list(self.fields)
+
+    def info(self):
+        response = udf_pb2.Response()
+        response.info.wants = self.wants
+        response.info.provides = self.provides
+        response.info.options['field'].valueTypes.append(udf_pb2.STRING)
+        response.info.options['window'].valueTypes.append(udf_pb2.INT)
+        response.info.options['flushInterval'].valueTypes.append(udf_pb2.DURATION)
+        return response
+
+    def init_option(self, option):
+        """Apply an option of the TICKscript. Returns False for unknown options."""
+        if option.name == 'field':
+            if not self._fields_from_options:
+                self._fields_from_options, self.fields = True, []
+            self.fields.append(option.values[0].stringValue)
+        elif option.name == 'window':
+            self.window_size = option.values[0].intValue
+        elif option.name == 'flushInterval':
+            self.flush_interval = option.values[0].durationValue
+        else:
+            return False
+        return True
+
+    def setup(self):
+        """Called once the options are applied, e.g. to load a model. Raise to fail the task."""
+
+    def init(self, init_req):
+        response = udf_pb2.Response()
+        self._fields_from_options = False
+        try:
+            for option in init_req.options:
+                if not self.init_option(option):
+                    raise ValueError(f"Unknown option {option.name}")
+            if not self.fields:
+                raise ValueError("No fields to process. Set them with the field option.")
+            if self.window_size < 1:
+                raise ValueError("The window size must be at least 1")
+            if self.flush_interval < 0:
+                raise ValueError("The flush interval must not be negative")
+            self.setup()
+            response.init.success = True
+        except Exception as e:
+            logger.exception("Failed to initialize the UDF")
+            response.init.success = False
+            response.init.error = str(e)
+        return response
+
+    def snapshot(self):
+        """Save the points buffered in STREAM windows, each prefixed with its size"""
+        response = udf_pb2.Response()
+        data = bytearray()
+        for window in self._windows.values():
+            for point in window.points:
+                point_data = point.SerializeToString()
+                data += struct.pack('>I', len(point_data)) + point_data
+        response.snapshot.snapshot = bytes(data)
+        return response
+
+    def restore(self, restore_req):
+        """Buffer the points saved in a snapshot again. They are processed with the next points."""
+        response = udf_pb2.Response()
+        data = restore_req.snapshot
+        try:
+            windows, self._windows = self._windows, {}
+            offset = 0
+            while offset < len(data):
+                (size,) = struct.unpack_from('>I', data, offset)
+                point = udf_pb2.Point()
+                point.ParseFromString(data[offset + 4:offset + 4 + size])
+                offset += 4 + size
+                self._buffer(point)
+            response.restore.success = True
+            logger.info(f"Restored {sum(len(w) for w in self._windows.values())} buffered points")
+        except Exception as e:
+            logger.exception("Failed to restore the buffered points")
+            self._windows = windows
+            response.restore.success = False
+            response.restore.error = str(e)
+        return response
+
+    def process(self, window):
+        """
+        Process the points of a window.
+
+        Fields added with `window.set_field` are added to the points written back.
+
+        Returns:
+            A boolean array selecting the points of the window to write back,
+            or None to write back all points.
+        """
+        raise NotImplementedError
+
+    def begin_batch(self, begin_req):
+        self._begin_batch = begin_req
+        self._batch = Window(self.fields, begin_req.size, begin_req.name, begin_req.group, begin_req.tags)
+
+    def point(self, point):
+        if self._batch is not None:
+            self._batch.append(point)
+            return
+
+        self._flush_expired_windows(point.time)
+        window = self._buffer(point)
+        if len(window) >= self.window_size:
+            del self._windows[point.group]
+            self._process_window(window)
+
+    def _buffer(self, point):
+        """Add a STREAM point to the window of its group"""
+        window = self._windows.get(point.group)
+        if window is None:
+            window = Window(self.fields, self.window_size, point.name, point.group, point.tags)
+            self._windows[point.group] = window
+        window.append(point)
+        return window
+
+    def _flush_expired_windows(self, time):
+        """Process the windows whose first point is at least `flush_interval` older than `time`"""
+        if not self.flush_interval:
+            return
+        # Windows are ordered by their first point, as they are added when their first point arrives
+        expired = []
+        for group, window in self._windows.items():
+            if time - window.times[0] < self.flush_interval:
+                break
+            expired.append(group)
+        for group in expired:
+            self._process_window(self._windows.pop(group))
+
+    def end_batch(self, end_req):
+        window, begin_req = self._batch, self._begin_batch
+        self._batch, self._begin_batch = None, None
+        self._process_window(window, begin_req, end_req)
+
+    def _process_window(self, window, begin_req=None, end_req=None):
+        mask = self.process(window) if len(window) else None
+        selected = range(len(window)) if mask is None else np.flatnonzero(mask).tolist()
+        outputs = [(name, values.tolist(), values.dtype.kind) for name, values in window.outputs.items()]
+
+        responses = []
+        for i in selected:
+            response = udf_pb2.Response()
+            response.point.CopyFrom(window.points[i])
+            for name, values, kind in outputs:
+                if kind == 'b':
+                    response.point.fieldsBool[name] = values[i]
+                elif kind in 'iu':
+                    response.point.fieldsInt[name] = values[i]
+                elif kind == 'f':
+                    response.point.fieldsDouble[name] = values[i]
+                else:
+                    response.point.fieldsString[name] = str(values[i])
+            responses.append(response)
+
+        if self.provides == udf_pb2.BATCH:
+            begin = udf_pb2.Response()
+            if begin_req is not None:
+                begin.begin.CopyFrom(begin_req)
+            else:
+                begin.begin.name, begin.begin.group = window.name, window.group
+                begin.begin.tags.update(window.tags)
+            begin.begin.size = len(responses)
+
+            end = udf_pb2.Response()
+            if end_req is not None:
+                end.end.CopyFrom(end_req)
+            else:
+                end.end.name, end.end.group = window.name, window.group
+                end.end.tags.update(window.tags)
+                end.end.tmax = int(window.times[-1]) if len(window) else 0
+            responses = [begin] + responses + [end]
+
+        for i, response in enumerate(responses):
+            self._agent.write_response(response, i == len(responses) - 1)
+
+        logger.debug(f"Processed a window of {len(window)} points, wrote back {len(selected)} points")
+
+
+def load_model(path):
+    """Load an OpenVINO model (.xml or .onnx), or a scikit-learn model saved with joblib or pickle"""
+    if path.endswith((".xml", ".onnx")):
+        import openvino as ov
+        return ov.Core().compile_model(path, "CPU")
+
+    import joblib
+    return joblib.load(path)
+
+
+class ModelWindowHandler(WindowedHandler):
+    """
+    Base class of UDFs running a model on windows of points, with the fields of the
+    points as the features of the model.
+
+    The model file is set with the `.model('file')` option, relative to the models/ directory
+    of the UDF deployment package, e.g. as fetched from the Model Registry. The predictions
+    are added to the points written back as the `prediction` field, or the field set with
+    the `.output('name')` option. Points with missing fields are not written back.
+    """
+    model_file = None
+    output_field = "prediction"
+
+    def __init__(self, agent):
+        super().__init__(agent)
+        self.model = None
+
+    def info(self):
+        response = super().info()
+        response.info.options['model'].valueTypes.append(udf_pb2.STRING)
+        response.info.options['output'].valueTypes.append(udf_pb2.STRING)
+        return response
+
+    def init_option(self, option):
+        if option.name == 'model':
+            self.model_file = option.values[0].stringValue
+        elif option.name == 'output':
+            self.output_field = option.values[0].stringValue
+        else:
+            return super().init_option(option)
+        return True
+
+    def setup(self):
+        if not self.model_file:
+            raise ValueError("No model file. Set it with the model option.")
+        path = os.path.join(MODELS_DIR, self.model_file)
+        logger.info(f"Loading model {path}")
+        self.model = load_model(path)
+
+    def predict(self, values):
+        """Run the model on a 2D array with one row of features per point"""
+        if hasattr(self.model, "predict"):
+            return np.asarray(self.model.predict(values))
+        # OpenVINO compiled model
+        return np.asarray(self.model(values.astype(np.float32))[self.model.output(0)]).reshape(len(values), -1).squeeze(axis=1)
+
+    def select(self, predictions):
+        """Select the points to write back from the predictions. Returns None to write back all points."""
+        return None
+
+    def process(self, window):
+        values = window.values
+        valid = ~np.isnan(values).any(axis=1)
+        if not valid.any():
+            logger.warning(f"No point of the window has all of the fields {window.fields}")
+            return valid
+
+        predictions = self.predict(values[valid])
+        if valid.all():
+            output = predictions
+        else:
+            logger.warning(f"{np.count_nonzero(~valid)} point(s) without all of the fields {window.fields} are skipped")
+            output = np.zeros(len(window), dtype=predictions.dtype)
+            output[valid] = predictions
+        window.set_field(self.output_field, output)
+
+        selected = self.select(output)
+        return valid if selected is None else valid & selected
@@ -127,14 +127,18 @@ def convert_model(model_name: str, model_path: str) -> tuple[str, str]:
     
     return image_encoder_path, text_encoder_path
 
-def load_model(model_path: str, device: str = 'CPU', throughputmode: bool = False):
-    """Load an OpenVINO model."""
+def load_model(model_path: str, device: str = 'CPU', throughputmode: bool = False, batch_size: int = 1):
+    """Load an OpenVINO model, optionally reshaped to a static batch size."""
     if not model_path or not Path(model_path).exists():
         return None
     core = ov.Core()
     if throughputmode:
         core.set_property(device, {hints.performance_mode: hints.PerformanceMode.THROUGHPUT})
     model = core.read_model(model_path)
+    if batch_size > 1:
+        shape = model.inputs[0].get_partial_shape()
+        shape[0] = batch_size
+        model.reshape(shape)
     return core.compile_model(model, device.upper())
 
 def load_bert_tokenizer(tokenizer_path: str = None):
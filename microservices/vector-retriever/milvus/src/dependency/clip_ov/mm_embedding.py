@@ -26,10 +26,11 @@ LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
 MODEL_DIR = "/home/user/models"
 
 class EmbeddingModel:
-    def __init__(self):
+    def __init__(self, image_batch_size: int = 1):
         self.model_id = LOCAL_EMBED_MODEL_ID
         self.model_path = MODEL_DIR
         self.device = DEVICE
+        self.image_batch_size = image_batch_size
         self.text_model = None
         self.image_model = None
         self.text_ireq = None
@@ -58,7 +59,7 @@ class EmbeddingModel:
         else:
             print(f"Model already exists at {self.model_path}. Skipping download.")
 
-        self.image_model = load_model(image_encoder_path, self.device)
+        self.image_model = load_model(image_encoder_path, self.device, batch_size=self.image_batch_size)
         self.text_model = load_model(text_encoder_path, self.device)
 
         self.image_ireq = self.image_model.create_infer_request()
@@ -3,6 +3,7 @@
 Copied from https://github.com/openai/CLIP. Originally MIT License, Copyright (c) 2021 OpenAI.
 """
 import gzip
+import heapq
 import html
 import os
 from functools import lru_cache
@@ -12,6 +13,8 @@ import ftfy
 import regex as re
 import numpy as np
 
+DEFAULT_CACHE_SIZE = int(os.getenv("CLIP_TOKENIZER_CACHE_SIZE", 65536))
+
 @lru_cache()
 def default_bpe():
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), "bpe_simple_vocab_16e6.txt.gz")
@@ -65,7 +68,7 @@ def whitespace_clean(text):
 
 
 class SimpleTokenizer(object):
-    def __init__(self, bpe_path: str = default_bpe(), special_tokens=None):
+    def __init__(self, bpe_path: str = default_bpe(), special_tokens=None, cache_size: int = DEFAULT_CACHE_SIZE):
         self.byte_encoder = bytes_to_unicode()
         self.byte_decoder = {v: k for k, v in self.byte_encoder.items()}
         if not os.path.exists(bpe_path) or os.path.islink(bpe_path):
@@ -85,60 +88,84 @@ class SimpleTokenizer(object):
         self.encoder = dict(zip(vocab, range(len(vocab))))
         self.decoder = {v: k for k, v in self.encoder.items()}
         self.bpe_ranks = dict(zip(merges, range(len(merges))))
-        self.cache = {t:t for t in special_tokens}
+        self.special_tokens = {t: t for t in special_tokens}
         special = "|".join(special_tokens)
         self.pat = re.compile(special + r"""|'s|'t|'re|'ve|'m|'ll|'d|[\p{L}]+|[\p{N}]|[^\s\p{L}\p{N}]+""", re.IGNORECASE)
 
         self.vocab_size = len(self.encoder)
         self.all_special_ids = [self.encoder[t] for t in special_tokens]
 
+        # Bounded per-instance caches: query text is user controlled, so an
+        # unbounded dict would grow with every distinct word ever seen.
+        self.cache_size = cache_size
+        self._bpe_cached = lru_cache(maxsize=cache_size)(self._bpe)
+        self._encode_token = lru_cache(maxsize=cache_size)(self._encode_token_uncached)
+
+    def _bpe(self, token):
+        """Merge the symbols of a byte-encoded token, lowest rank first.
+
+        Symbols live in a doubly linked list indexed by their start offset and
+        candidate pairs in a heap ordered by ``(rank, offset)``. This applies
+        the same merges, in the same order, as the reference CLIP loop (which
+        rescans every pair with ``min`` and ``word.index`` after each merge)
+        in O(n log n) instead of O(n^2) per token.
+        """
+        if token in self.special_tokens:
+            return (token,)
+        symbols = list(token[:-1]) + [token[-1] + '</w>']
+        n = len(symbols)
+        if n == 1:
+            return tuple(symbols)
+
+        ranks = self.bpe_ranks
+        prev = list(range(-1, n - 1))
+        nxt = list(range(1, n + 1))
+        nxt[-1] = -1
+        heap = []
+        for i in range(n - 1):
+            rank = ranks.get((symbols[i], symbols[i + 1]))
+            if rank is not None:
+                heap.append((rank, i, symbols[i], symbols[i + 1]))
+        heapq.heapify(heap)
+
+        while heap:
+            _, i, first, second = heapq.heappop(heap)
+            j = nxt[i]
+            # Skip stale entries whose symbols were consumed by an earlier merge.
+            if j == -1 or symbols[i] != first or symbols[j] != second:
+                continue
+            merged = first + second
+            symbols[i] = merged
+            symbols[j] = None
+            k = nxt[j]
+            nxt[i] = k
+            if k != -1:
+                prev[k] = i
+                rank = ranks.get((merged, symbols[k]))
+                if rank is not None:
+                    heapq.heappush(heap, (rank, i, merged, symbols[k]))
+            h = prev[i]
+            if h != -1:
+                rank = ranks.get((symbols[h], merged))
+                if rank is not None:
+                    heapq.heappush(heap, (rank, h, symbols[h], merged))
+
+        return tuple(s for s in symbols if s is not None)
+
     def bpe(self, token):
-        if token in self.cache:
-            return self.cache[token]
-        word = tuple(token[:-1]) + ( token[-1] + '</w>',)
-        pairs = get_pairs(word)
-
-        if not pairs:
-            return token+'</w>'
-
-        while True:
-            bigram = min(pairs, key = lambda pair: self.bpe_ranks.get(pair, float('inf')))
-            if bigram not in self.bpe_ranks:
-                break
-            first, second = bigram
-            new_word = []
-            i = 0
-            while i < len(word):
-                try:
-                    j = word.index(first, i)
-                    new_word.extend(word[i:j])
-                    i = j
-                except:
-                    new_word.extend(word[i:])
-                    break
-
-                if word[i] == first and i < len(word)-1 and word[i+1] == second:
-                    new_word.append(first+second)
-                    i += 2
-                else:
-                    new_word.append(word[i])
-                    i += 1
-            new_word = tuple(new_word)
-            word = new_word
-            if len(word) == 1:
-                break
-            else:
-                pairs = get_pairs(word)
-        word = ' '.join(word)
-        self.cache[token] = word
-        return word
+        return ' '.join(self._bpe_cached(token))
+
+    def _encode_token_uncached(self, token):
+        if token in self.special_tokens:
+            return (self.encoder[token],)
+        token = ''.join(self.byte_encoder[b] for b in token.encode('utf-8'))
+        return tuple(self.encoder[bpe_token] for bpe_token in self._bpe_cached(token))
 
     def encode(self, text):
         bpe_tokens = []
         text = whitespace_clean(basic_clean(text)).lower()
         for token in re.findall(self.pat, text):
-            token = ''.join(self.byte_encoder[b] for b in token.encode('utf-8'))
-            bpe_tokens.extend(self.encoder[bpe_token] for bpe_token in self.bpe(token).split(' '))
+            bpe_tokens.extend(self._encode_token(token))
         return bpe_tokens
 
     def decode(self, tokens):
@@ -146,6 +173,14 @@ class SimpleTokenizer(object):
         text = bytearray([self.byte_decoder[c] for c in text]).decode('utf-8', errors="replace").replace('</w>', ' ')
         return text
 
+    def cache_info(self):
+        """Hit/miss statistics of the token-level encode cache."""
+        return self._encode_token.cache_info()
+
+    def clear_cache(self):
+        self._bpe_cached.cache_clear()
+        self._encode_token.cache_clear()
+
 _tokenizer = SimpleTokenizer()
 
 def decode(output_ids: np.ndarray):
@@ -172,13 +207,30 @@ def tokenize(texts: Union[str, List[str]], context_length: int = 77) -> np.ndarr
 
     sot_token = _tokenizer.encoder["<start_of_text>"]
     eot_token = _tokenizer.encoder["<end_of_text>"]
-    all_tokens = [[sot_token] + _tokenizer.encode(text) + [eot_token] for text in texts]
-    result = np.zeros((len(all_tokens), context_length), dtype=np.int64)
-
-    for i, tokens in enumerate(all_tokens):
-        if len(tokens) > context_length:
-            tokens = tokens[:context_length]  # Truncate
-            tokens[-1] = eot_token
-        result[i, :len(tokens)] = np.array(tokens)
+    max_body = context_length - 2
+    lengths = np.empty(len(texts), dtype=np.int64)
+    truncated = np.zeros(len(texts), dtype=bool)
+    flat_tokens = []
+    for i, text in enumerate(texts):
+        tokens = _tokenizer.encode(text)
+        if len(tokens) > max_body:
+            tokens = tokens[:max_body]
+            truncated[i] = True
+        lengths[i] = len(tokens)
+        flat_tokens.extend(tokens)
+
+    # Scatter every row body in one vectorized assignment: the boolean mask
+    # selects positions 1..len(row) of each row in row-major order, which is
+    # exactly the order of ``flat_tokens``.
+    result = np.zeros((len(texts), context_length), dtype=np.int64)
+    if len(texts) == 0:
+        return result
+    result[:, 0] = sot_token
+    positions = np.arange(context_length)
+    body_mask = (positions >= 1) & (positions <= lengths[:, None])
+    result[body_mask] = np.asarray(flat_tokens, dtype=np.int64)
+    # The EOT token replaces the last slot of truncated rows, as upstream CLIP does.
+    eot_positions = np.where(truncated, context_length - 1, lengths + 1)
+    result[np.arange(len(texts)), eot_positions] = eot_token
 
     return result
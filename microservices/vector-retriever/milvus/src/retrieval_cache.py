@@ -0,0 +1,149 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("RETRIEVER_EMBEDDING_CACHE_SIZE", 1024))
+RESULT_CACHE_SIZE = int(os.getenv("RETRIEVER_RESULT_CACHE_SIZE", 1024))
+RESULT_CACHE_TTL = float(os.getenv("RETRIEVER_RESULT_CACHE_TTL", 30))
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional per-entry time to live.
+
+    A ``ttl`` of ``None`` keeps entries until they are evicted by size; a ``maxsize``
+    or ``ttl`` of 0 disables the cache.
+    """
+    def __init__(self, maxsize: int, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and (self.ttl is None or self.ttl > 0)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def remove_if(self, predicate):
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
+
+
+def normalize_filter(filters):
+    """
+    Build a canonical, hashable representation of a search filter so that
+    equivalent filters (e.g. different key order) share a cache entry.
+    """
+    if not filters:
+        return ""
+    return json.dumps(filters, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def hash_embedding(embedding):
+    array = np.ascontiguousarray(embedding)
+    return hashlib.sha1(array.tobytes() + str(array.dtype).encode()).hexdigest()
+
+
+class RetrievalCache:
+    """
+    Two-level cache for the retriever.
+
+    - query text -> text embedding (LRU, no expiry: the model is fixed for the process lifetime)
+    - (collection, embedding hash, normalized filter, top_k) -> search results (LRU with a short TTL)
+
+    Result entries are dropped whenever the dataprep service reports a change on their collection.
+    Entries are copied when stored and when returned, so callers may modify what they get
+    without changing the cache.
+    """
+    def __init__(self, embedding_cache_size: int = EMBEDDING_CACHE_SIZE, result_cache_size: int = RESULT_CACHE_SIZE, result_ttl: float = RESULT_CACHE_TTL):
+        self.embeddings = LRUCache(embedding_cache_size)
+        self.results = LRUCache(result_cache_size, ttl=result_ttl)
+        # Bumped on every invalidation so that a search which was already in flight
+        # when the collection changed does not store its (stale) results afterwards.
+        self.generation = 0
+        # Makes checking the generation and storing results atomic with invalidations
+        self._lock = threading.Lock()
+
+    def get_embedding(self, query):
+        embedding = self.embeddings.get(query)
+        return None if embedding is None else embedding.copy()
+
+    def put_embedding(self, query, embedding):
+        # Copy so the cached vector never aliases an inference output buffer.
+        self.embeddings.put(query, np.array(embedding, copy=True))
+
+    @staticmethod
+    def result_key(collection_name, embedding_hash, filters, top_k):
+        return (collection_name, embedding_hash, normalize_filter(filters), top_k)
+
+    def get_results(self, key):
+        results = self.results.get(key)
+        return None if results is None else copy.deepcopy(results)
+
+    def put_results(self, key, results, generation=None):
+        results = copy.deepcopy(results)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.results.put(key, results)
+
+    def invalidate(self, collection_name=None):
+        """
+        Drop cached results for ``collection_name``, or for every collection if it is None.
+        Returns the number of removed entries.
+        """
+        with self._lock:
+            self.generation += 1
+            if collection_name is None:
+                return self.results.remove_if(lambda key: True)
+            return self.results.remove_if(lambda key: key[0] == collection_name)
+
+    def stats(self):
+        return {"embedding_cache": self.embeddings.stats(), "result_cache": self.results.stats()}
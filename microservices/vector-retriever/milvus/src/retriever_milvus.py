@@ -6,6 +6,7 @@
 from pymilvus import MilvusClient
 
 from dependency.clip_ov.mm_embedding import EmbeddingModel
+from retrieval_cache import RetrievalCache, hash_embedding
 
 import os
 
@@ -18,34 +19,53 @@ class MilvusRetriever:
         self.collection_name = collection_name
         self.client = MilvusClient(uri=MILVUS_URI)
         self.embedding_model = EmbeddingModel()
+        self.cache = RetrievalCache()
+
+    def get_query_embedding(self, query):
+        embedding = self.cache.get_embedding(query)
+        if embedding is None:
+            embedding = self.embedding_model.get_text_embedding(query)
+            if embedding is not None:
+                self.cache.put_embedding(query, embedding)
+        return embedding
+
+    @staticmethod
+    def build_filter(filters):
+        search_filter = ''
+        filter_params = {}
+        for key, value in filters.items():
+            if key == "timestamp_start":
+                if search_filter:
+                    search_filter += ' AND '
+                filter_params["timestamp_start"] = filters["timestamp_start"]
+                search_filter += 'meta["timestamp"] >= {timestamp_start}'
+            if key == "timestamp_end":
+                filter_params["timestamp_end"] = filters["timestamp_end"]
+                if search_filter:
+                    search_filter += ' AND '
+                search_filter += 'meta["timestamp"] <= {timestamp_end}'
+            if key not in ["timestamp_start", "timestamp_end"]:
+                filter_params["label"] = [value]
+                if search_filter:
+                    search_filter += ' AND '
+                search_filter += f'meta["{key}"] IN '
+                search_filter += '{label}'
+        return search_filter, filter_params
 
     def search(self, query, filters=None, top_k=5):
         # Get the embedding for the query
-        embedding = self.embedding_model.get_text_embedding(query)
+        embedding = self.get_query_embedding(query)
         if embedding is None:
             raise Exception("Failed to get embedding for the query.")
 
-        if filters:
-            search_filter = ''
-            filter_params = {}
-            for key, value in filters.items():
-                if key == "timestamp_start":
-                    if search_filter:
-                        search_filter += ' AND '
-                    filter_params["timestamp_start"] = filters["timestamp_start"]
-                    search_filter += 'meta["timestamp"] >= {timestamp_start}'
-                if key == "timestamp_end":
-                    filter_params["timestamp_end"] = filters["timestamp_end"]
-                    if search_filter:
-                        search_filter += ' AND '
-                    search_filter += 'meta["timestamp"] <= {timestamp_end}'
-                if key not in ["timestamp_start", "timestamp_end"]:
-                    filter_params["label"] = [value]
-                    if search_filter:
-                        search_filter += ' AND '
-                    search_filter += f'meta["{key}"] IN '
-                    search_filter += '{label}'
+        cache_key = self.cache.result_key(self.collection_name, hash_embedding(embedding), filters, top_k)
+        results = self.cache.get_results(cache_key)
+        if results is not None:
+            return results
+        generation = self.cache.generation
 
+        if filters:
+            search_filter, filter_params = self.build_filter(filters)
             results = self.client.search(
                 collection_name=self.collection_name,
                 data=embedding,
@@ -69,5 +89,8 @@ class MilvusRetriever:
             if results:
                 results = results[0]
 
+        self.cache.put_results(cache_key, results, generation)
         return results
 
+    def invalidate_cache(self, collection_name=None):
+        return self.cache.invalidate(collection_name)
@@ -26,6 +26,9 @@ class RetrievalRequest(BaseModel):
     filter: Optional[Dict] = None
     max_num_results: int = 10
 
+class CacheInvalidationRequest(BaseModel):
+    collection_name: Optional[str] = None
+
 app = FastAPI()
 
 retriever = MilvusRetriever()
@@ -42,6 +45,35 @@ def health():
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
+@app.get("/v1/retrieval/cache")
+def cache_stats():
+    """
+    Get hit/miss statistics of the query embedding and result caches.
+    """
+    return JSONResponse(content=retriever.cache.stats(), status_code=200)
+
+
+@app.post("/v1/retrieval/cache/invalidate")
+def invalidate_cache(request: CacheInvalidationRequest):
+    """
+    Drop cached search results after the collection has changed.
+    Called by the dataprep service after inserts or deletes.
+
+    Args:
+        request (CacheInvalidationRequest): The collection whose results are stale. All collections if omitted.
+
+    Returns:
+        JSONResponse: The number of removed cache entries.
+    """
+    try:
+        removed = retriever.invalidate_cache(request.collection_name)
+        logger.info(f"Invalidated {removed} cached results for collection: {request.collection_name or 'all'}")
+        return JSONResponse(content={"removed": removed}, status_code=200)
+    except Exception as e:
+        logger.error(f"Error invalidating cache: {e}")
+        raise HTTPException(status_code=500, detail=f"Error invalidating cache: {str(e)}")
+
+
 @app.post("/v1/retrieval")
 def retrieval(request: RetrievalRequest):
     """
@@ -0,0 +1,125 @@
+"""Benchmark the CLIP BPE tokenizer against the original OpenAI merge loop.
+
+Run from the ``src`` directory of the retriever container:
+
+    python benchmark_tokenizer.py --num-queries 10000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dependency.clip_ov.tokenizer import _tokenizer, get_pairs, tokenize, basic_clean, whitespace_clean
+import regex as re
+
+WORDS = [
+    "person", "car", "truck", "bicycle", "red", "blue", "white", "walking", "running", "near",
+    "the", "a", "of", "in", "on", "parking", "lot", "street", "intersection", "crossing",
+    "forklift", "worker", "helmet", "vest", "package", "conveyor", "belt", "shelf", "door", "camera",
+]
+
+
+def reference_bpe(token, cache):
+    """The original pure-Python merge loop with its unbounded dict cache."""
+    if token in cache:
+        return cache[token]
+    word = tuple(token[:-1]) + (token[-1] + '</w>',)
+    pairs = get_pairs(word)
+    if not pairs:
+        return token + '</w>'
+    while True:
+        bigram = min(pairs, key=lambda pair: _tokenizer.bpe_ranks.get(pair, float('inf')))
+        if bigram not in _tokenizer.bpe_ranks:
+            break
+        first, second = bigram
+        new_word = []
+        i = 0
+        while i < len(word):
+            try:
+                j = word.index(first, i)
+                new_word.extend(word[i:j])
+                i = j
+            except ValueError:
+                new_word.extend(word[i:])
+                break
+            if word[i] == first and i < len(word) - 1 and word[i + 1] == second:
+                new_word.append(first + second)
+                i += 2
+            else:
+                new_word.append(word[i])
+                i += 1
+        word = tuple(new_word)
+        if len(word) == 1:
+            break
+        pairs = get_pairs(word)
+    word = ' '.join(word)
+    cache[token] = word
+    return word
+
+
+def reference_tokenize(texts, context_length=77):
+    """The original row-by-row ``tokenize``."""
+    cache = dict(_tokenizer.special_tokens)
+    sot_token = _tokenizer.encoder["<start_of_text>"]
+    eot_token = _tokenizer.encoder["<end_of_text>"]
+    all_tokens = []
+    for text in texts:
+        bpe_tokens = []
+        text = whitespace_clean(basic_clean(text)).lower()
+        for token in re.findall(_tokenizer.pat, text):
+            token = ''.join(_tokenizer.byte_encoder[b] for b in token.encode('utf-8'))
+            bpe_tokens.extend(_tokenizer.encoder[t] for t in reference_bpe(token, cache).split(' '))
+        all_tokens.append([sot_token] + bpe_tokens + [eot_token])
+    result = np.zeros((len(all_tokens), context_length), dtype=np.int64)
+    for i, tokens in enumerate(all_tokens):
+        if len(tokens) > context_length:
+            tokens = tokens[:context_length]
+            tokens[-1] = eot_token
+        result[i, :len(tokens)] = np.array(tokens)
+    return result
+
+
+def make_queries(num_queries, seed):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(num_queries):
+        words = rng.choices(WORDS, k=rng.randint(2, 12))
+        # Mix in rare words so the cache also sees misses.
+        if rng.random() < 0.3:
+            words.append(''.join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 14))))
+        queries.append(' '.join(words))
+    return queries
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-queries", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    queries = make_queries(args.num_queries, args.seed)
+    _tokenizer.clear_cache()
+
+    expected, ref_time = timed(reference_tokenize, queries)
+    per_query = [timed(tokenize, q)[1] for q in queries]
+    _tokenizer.clear_cache()
+    actual, batch_time = timed(tokenize, queries)
+
+    assert np.array_equal(expected, actual), "tokenizer output differs from the reference implementation"
+    per_query_ms = np.array(per_query) * 1000
+    print(f"queries:             {len(queries)}")
+    print(f"reference total:     {ref_time:.3f} s")
+    print(f"batch tokenize:      {batch_time:.3f} s ({ref_time / batch_time:.1f}x)")
+    print(f"single query p50/p99: {np.percentile(per_query_ms, 50):.3f} / {np.percentile(per_query_ms, 99):.3f} ms")
+    print(f"cache:               {_tokenizer.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
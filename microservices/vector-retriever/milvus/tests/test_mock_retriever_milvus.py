@@ -77,4 +77,26 @@ def test_retrieval_error(mock_retriever):
 
     response = client.post("/v1/retrieval", json=request_data)
     assert response.status_code == 500
-    assert response.json() == {"detail": "Error during retrieval: Mocked retrieval error"}
\ No newline at end of file
+    assert response.json() == {"detail": "Error during retrieval: Mocked retrieval error"}
+
+def test_cache_invalidate(mock_retriever):
+    """
+    Test the cache invalidation endpoint.
+    """
+    mock_retriever.invalidate_cache.return_value = 3
+
+    response = client.post("/v1/retrieval/cache/invalidate", json={"collection_name": "default"})
+    assert response.status_code == 200
+    assert response.json() == {"removed": 3}
+    mock_retriever.invalidate_cache.assert_called_once_with("default")
+
+
+def test_cache_invalidate_all(mock_retriever):
+    """
+    Test the cache invalidation endpoint without a collection name.
+    """
+    mock_retriever.invalidate_cache.return_value = 0
+
+    response = client.post("/v1/retrieval/cache/invalidate", json={})
+    assert response.status_code == 200
+    mock_retriever.invalidate_cache.assert_called_once_with(None)
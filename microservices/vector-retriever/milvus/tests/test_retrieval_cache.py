@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+from retrieval_cache import LRUCache, RetrievalCache, hash_embedding, normalize_filter
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """
+    Test that the LRU cache evicts the least recently used entry when full.
+    """
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_ttl_expiry():
+    """
+    Test that entries expire after their time to live.
+    """
+    cache = LRUCache(maxsize=4, ttl=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_normalize_filter_ignores_key_order():
+    """
+    Test that equivalent filters produce the same cache key.
+    """
+    assert normalize_filter({"a": 1, "b": 2}) == normalize_filter({"b": 2, "a": 1})
+    assert normalize_filter(None) == normalize_filter({}) == ""
+
+
+def test_result_invalidation_by_collection():
+    """
+    Test that invalidation only drops results of the given collection.
+    """
+    cache = RetrievalCache(embedding_cache_size=4, result_cache_size=4, result_ttl=60)
+    embedding_hash = hash_embedding(np.ones((1, 4), dtype=np.float32))
+    key_a = cache.result_key("a", embedding_hash, {"type": "x"}, 5)
+    key_b = cache.result_key("b", embedding_hash, {"type": "x"}, 5)
+    cache.put_results(key_a, ["hit"])
+    cache.put_results(key_b, ["hit"])
+
+    assert cache.invalidate("a") == 1
+    assert cache.get_results(key_a) is None
+    assert cache.get_results(key_b) == ["hit"]
+    assert cache.invalidate() == 1
+
+
+def test_results_of_search_before_invalidation_are_not_cached():
+    """
+    Test that results of a search which started before an invalidation are not stored.
+    """
+    cache = RetrievalCache(embedding_cache_size=4, result_cache_size=4, result_ttl=60)
+    key = cache.result_key("a", "hash", None, 5)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.put_results(key, ["stale"], generation)
+
+    assert cache.get_results(key) is None
+    assert cache.results.stats()["size"] == 0
+
+    cache.put_results(key, ["fresh"], cache.generation)
+    assert cache.get_results(key) == ["fresh"]
+
+
+def test_cached_results_are_copies():
+    """
+    Test that modifying returned results or embeddings does not change the cache.
+    """
+    cache = RetrievalCache(embedding_cache_size=4, result_cache_size=4, result_ttl=60)
+    results = [{"id": 1, "distance": 0.5, "entity": {"meta": {"file": "a.mp4"}}}]
+    key = cache.result_key("a", "hash", None, 5)
+    cache.put_results(key, results)
+    results[0]["entity"]["meta"]["file"] = "changed"
+
+    hit = cache.get_results(key)
+    assert hit[0]["entity"]["meta"]["file"] == "a.mp4"
+    hit[0]["entity"]["meta"]["file"] = "changed"
+    hit.append({"id": 2})
+    assert cache.get_results(key) == [{"id": 1, "distance": 0.5, "entity": {"meta": {"file": "a.mp4"}}}]
+
+    cache.put_embedding("query", np.zeros(4, dtype=np.float32))
+    cache.get_embedding("query")[0] = 1.0
+    assert not cache.get_embedding("query").any()
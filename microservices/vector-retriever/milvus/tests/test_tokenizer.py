@@ -0,0 +1,56 @@
+import numpy as np
+from dependency.clip_ov.tokenizer import SimpleTokenizer, tokenize, _tokenizer
+
+
+def test_tokenize_known_ids():
+    """
+    Test that the tokenizer reproduces the reference CLIP token ids.
+    """
+    result = tokenize("a photo of a cat")
+    assert result.dtype == np.int64
+    assert result.shape == (1, 77)
+    assert result[0, :7].tolist() == [49406, 320, 1125, 539, 320, 2368, 49407]
+    assert not result[0, 7:].any()
+
+
+def test_tokenize_batch_matches_single():
+    """
+    Test that batch tokenization produces the same rows as tokenizing one text at a time.
+    """
+    texts = [
+        "A Person riding a BICYCLE near the red car!!",
+        "unbelievably hyperparameterized tokenization",
+        "héllo wörld 123",
+        "",
+    ]
+    batch = tokenize(texts)
+    assert batch.shape == (len(texts), 77)
+    for i, text in enumerate(texts):
+        assert np.array_equal(batch[i], tokenize(text)[0])
+    assert batch[1, :9].tolist() == [49406, 33781, 7997, 27106, 704, 7690, 32634, 10847, 49407]
+    assert batch[3, :2].tolist() == [49406, 49407]
+
+
+def test_tokenize_truncates_with_eot():
+    """
+    Test that over-long texts are truncated and terminated with the end-of-text token.
+    """
+    result = tokenize(["word " * 100, "cat"], context_length=10)
+    eot = _tokenizer.encoder["<end_of_text>"]
+    assert result.shape == (2, 10)
+    assert result[0, 0] == _tokenizer.encoder["<start_of_text>"]
+    assert result[0, -1] == eot
+    assert (result[0, 1:-1] != 0).all()
+    assert result[1, :3].tolist() == [49406, 2368, eot]
+
+
+def test_bpe_cache_is_bounded():
+    """
+    Test that the BPE cache never grows beyond its configured size.
+    """
+    tokenizer = SimpleTokenizer(cache_size=8)
+    for i in range(100):
+        tokenizer.encode(f"token{i}abc")
+    info = tokenizer.cache_info()
+    assert info.maxsize == 8
+    assert info.currsize <= 8
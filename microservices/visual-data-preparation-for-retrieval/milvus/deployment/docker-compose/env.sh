@@ -27,6 +27,9 @@ export MODEL_DIR="$HOME/models"
 
 export DATAPREP_SERVICE_PORT=9990
 
+# Retriever cache invalidation endpoint, notified after inserts and deletes. Leave empty to disable.
+export RETRIEVER_CACHE_INVALIDATE_URL="http://${host_ip}:7770/v1/retrieval/cache/invalidate"
+
 
 if [[ -z "$LOCAL_EMBED_MODEL_ID" ]]; then
     echo "Warning: LOCAL_EMBED_MODEL_ID is not defined."
@@ -14,7 +14,7 @@ from pathlib import Path
 from indexer import Indexer
 
 from pydantic import BaseModel
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Union, Literal
 
 logger = logging.getLogger("dataprep_visual")
 logging.basicConfig(
@@ -29,12 +29,14 @@ class IngestHostDirRequest(BaseModel):
     file_dir: str
     frame_extract_interval: int = 15  # Default value is 15
     do_detect_and_crop: bool = True  # Default value is True
+    frame_sampling_mode: Literal["seek", "scene", "all"] = "seek"  # Default value is "seek"
 
 class IngestHostFileRequest(BaseModel):
     file_path: str
     meta: dict = {}  # Metadata for the file
     frame_extract_interval: int = 15  # Default value is 15
     do_detect_and_crop: bool = True  # Default value is True
+    frame_sampling_mode: Literal["seek", "scene", "all"] = "seek"  # Default value is "seek"
 
 #placeholder for IngestFileURLRequest
 class IngestFileURLRequest(BaseModel):
@@ -42,6 +44,7 @@ class IngestFileURLRequest(BaseModel):
     meta: dict = {}  # Metadata for the file
     frame_extract_interval: int = 15  # Default value is 15
     do_detect_and_crop: bool = True  # Default value is True
+    frame_sampling_mode: Literal["seek", "scene", "all"] = "seek"  # Default value is "seek"
 
 app = FastAPI()
 
@@ -133,6 +136,7 @@ async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
         file_dir = request.file_dir
         frame_extract_interval = request.frame_extract_interval
         do_detect_and_crop = request.do_detect_and_crop
+        frame_sampling_mode = request.frame_sampling_mode
 
         file_dir_cont = helper_map2container(file_dir)
 
@@ -165,7 +169,7 @@ async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
                     proc_files.append(file_path)
                     metas.append(meta)
                 
-        res = indexer.add_embedding(proc_files, metas, frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop)
+        res = indexer.add_embedding(proc_files, metas, frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop, frame_sampling_mode=frame_sampling_mode)
 
         return JSONResponse(
             content={
@@ -195,6 +199,7 @@ async def ingest_host_file(request: IngestHostFileRequest = Body(...)):
         meta = request.meta
         frame_extract_interval = request.frame_extract_interval
         do_detect_and_crop = request.do_detect_and_crop
+        frame_sampling_mode = request.frame_sampling_mode
 
         file_path_cont = helper_map2container(file_path)
 
@@ -202,7 +207,7 @@ async def ingest_host_file(request: IngestHostFileRequest = Body(...)):
             raise HTTPException(status_code=404, detail="Invalid file path.")
                 
         meta["file_path"] = file_path
-        res = indexer.add_embedding([file_path_cont], [meta], frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop)
+        res = indexer.add_embedding([file_path_cont], [meta], frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop, frame_sampling_mode=frame_sampling_mode)
 
         return JSONResponse(
             content={
@@ -12,12 +12,13 @@ import numpy as np
 
 import openvino as ov
 
-from yolox_utils import preproc, multiclass_nms, demo_postprocess
+from yolox_utils import batched_nms, demo_postprocess
 
 MODEL_DIR = "/home/user/models"
+DETECT_BATCH_SIZE = int(os.getenv("DATAPREP_DETECT_BATCH_SIZE", 4))
 
 class Detector:
-    def __init__(self, device="CPU", conf=0.85, nms=0.45, input_size=(640, 640)):
+    def __init__(self, device="CPU", conf=0.85, nms=0.45, input_size=(640, 640), batch_size=DETECT_BATCH_SIZE):
         # set default model path to a local path
         self.model_path = os.path.join(MODEL_DIR, "detection_model")
         self.model_file = os.path.join(self.model_path, "yolox_s.xml")
@@ -29,9 +30,16 @@ class Detector:
 
         core = ov.Core()
         self.net = core.read_model(model=self.model_file)
+        if batch_size > 1:
+            try:
+                shape = self.net.inputs[0].get_partial_shape()
+                shape[0] = batch_size
+                self.net.reshape(shape)
+            except Exception as e:
+                print(f"Failed to reshape detection model to batch size {batch_size}, using batch size 1: {e}")
 
         self.exec_net = core.compile_model(self.net, self.device)
-        _, _, self.h, self.w = self.exec_net.inputs[0].shape
+        self.batch_size, _, self.h, self.w = self.exec_net.inputs[0].shape
 
     def download_model(self):
         if not os.path.exists(self.model_file):
@@ -55,47 +63,104 @@ class Detector:
                 print(f"Model file {self.model_file} does not exist.")
                 raise FileNotFoundError(f"Model file {self.model_file} does not exist.")
 
+    def preprocess_batch(self, images, bgr=True):
+        """
+        Letterbox images of any size into one (N, 3, h, w) float32 tensor.
+        Only the resize is done per image; padding, channel order, layout and dtype
+        conversion are applied to the whole batch at once.
+        """
+        batch = np.full((len(images), self.h, self.w, 3), 114, dtype=np.uint8)
+        ratios = np.empty(len(images), dtype=np.float32)
+        for i, image in enumerate(images):
+            r = min(self.h / image.shape[0], self.w / image.shape[1])
+            new_h, new_w = int(image.shape[0] * r), int(image.shape[1] * r)
+            batch[i, :new_h, :new_w] = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+            ratios[i] = r
+        if not bgr:
+            batch = batch[..., ::-1]
+        return np.ascontiguousarray(batch.transpose(0, 3, 1, 2), dtype=np.float32), ratios
+
+    def infer_batch(self, inputs):
+        """Run the detection model over N preprocessed images, padding the last batch."""
+        outputs = []
+        for start in range(0, len(inputs), self.batch_size):
+            chunk = inputs[start:start + self.batch_size]
+            num_images = len(chunk)
+            if num_images < self.batch_size:
+                padding = np.zeros((self.batch_size - num_images, *chunk.shape[1:]), dtype=chunk.dtype)
+                chunk = np.concatenate([chunk, padding])
+            res = self.exec_net.infer_new_request(chunk)
+            outputs.append(np.array(res["output"][:num_images]))
+        return np.concatenate(outputs)
+
+    def get_det_results_batch(self, images, bgr=True):
+        """
+        Detect objects in N images with batched inference and a single batched NMS.
+
+        Returns:
+            list of (boxes, scores, cls_inds) per image, boxes as xyxy in image coordinates.
+        """
+        if len(images) == 0:
+            return []
+        inputs, ratios = self.preprocess_batch(images, bgr=bgr)
+        predictions = demo_postprocess(self.infer_batch(inputs), (self.h, self.w))
+
+        boxes = predictions[..., :4]
+        scores = predictions[..., 4, None] * predictions[..., 5:]
+
+        boxes_xyxy = np.empty_like(boxes)
+        boxes_xyxy[..., 0] = boxes[..., 0] - boxes[..., 2]/2.
+        boxes_xyxy[..., 1] = boxes[..., 1] - boxes[..., 3]/2.
+        boxes_xyxy[..., 2] = boxes[..., 0] + boxes[..., 2]/2.
+        boxes_xyxy[..., 3] = boxes[..., 1] + boxes[..., 3]/2.
+        boxes_xyxy /= ratios[:, None, None]
+
+        # Class-agnostic NMS per image: the image index is the NMS group.
+        cls_inds = scores.argmax(-1)
+        cls_scores = np.take_along_axis(scores, cls_inds[..., None], -1)[..., 0]
+        image_inds, anchor_inds = np.nonzero(cls_scores > self.conf)
+        valid_boxes = boxes_xyxy[image_inds, anchor_inds]
+        valid_scores = cls_scores[image_inds, anchor_inds]
+        valid_cls_inds = cls_inds[image_inds, anchor_inds]
+        keep = batched_nms(valid_boxes, valid_scores, image_inds, self.nms)
+
+        results = []
+        for i in range(len(images)):
+            sel = keep[image_inds[keep] == i]
+            if len(sel) == 0:
+                results.append(([], [], []))
+            else:
+                results.append((valid_boxes[sel], valid_scores[sel], valid_cls_inds[sel]))
+        return results
+
     def get_det_results(self, image):
-        image, ratio = preproc(image, (self.h, self.w))
-        # res = self.exec_net.infer(inputs={self.input_blob: image})
-        res =  self.exec_net.infer_new_request(image)
-        res = res["output"]
-
-        predictions = demo_postprocess(res, (self.h, self.w))[0]
-
-        boxes = predictions[:, :4]
-        scores = predictions[:, 4, None] * predictions[:, 5:]
-
-        boxes_xyxy = np.ones_like(boxes)
-        boxes_xyxy[:, 0] = boxes[:, 0] - boxes[:, 2]/2.
-        boxes_xyxy[:, 1] = boxes[:, 1] - boxes[:, 3]/2.
-        boxes_xyxy[:, 2] = boxes[:, 0] + boxes[:, 2]/2.
-        boxes_xyxy[:, 3] = boxes[:, 1] + boxes[:, 3]/2.
-        boxes_xyxy /= ratio
-        dets = multiclass_nms(boxes_xyxy, scores, nms_thr=self.nms, score_thr=self.conf)
-        final_boxes, final_scores, final_cls_inds = [], [], []
-        if dets is not None:
-            final_boxes = dets[:, :4]
-            final_scores, final_cls_inds = dets[:, 4], dets[:, 5]
-        return final_boxes, final_scores, final_cls_inds
-    
+        return self.get_det_results_batch([image])[0]
+
+    @staticmethod
+    def crop_boxes(image, boxes):
+        """Crop boxes out of an HWC image. The crops are views into `image`, not copies."""
+        if len(boxes) == 0:
+            return []
+        boxes = np.asarray(boxes).astype(np.int64)
+        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, image.shape[1])
+        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, image.shape[0])
+        valid = (boxes[:, 0] < boxes[:, 2]) & (boxes[:, 1] < boxes[:, 3])
+        return [image[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes[valid]]
+
+    def get_cropped_images_batch(self, images, bgr=False):
+        """
+        Detect and crop objects in N HWC arrays (RGB by default).
+
+        Returns:
+            list with the crops of every image, as array views in the input color order.
+        """
+        detections = self.get_det_results_batch(images, bgr=bgr)
+        return [self.crop_boxes(image, boxes) for image, (boxes, _, _) in zip(images, detections)]
+
     def get_cropped_images(self, image):
         do_convert = isinstance(image, Image.Image)
         if do_convert:
-            image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        boxes, _, _ = self.get_det_results(image)
-        cropped_images = []
-        for box in boxes:
-            x1, y1, x2, y2 = map(int, box)
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(image.shape[1], x2)
-            y2 = min(image.shape[0], y2)
-            if x1 >= x2 or y1 >= y2:
-                continue
-            cropped_image = image[y1:y2, x1:x2]
-            if do_convert:
-                cropped_image = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2RGB)
-                cropped_image = Image.fromarray(cropped_image)
-            cropped_images.append(cropped_image)
-        return cropped_images
\ No newline at end of file
+            image = np.asarray(image.convert("RGB"))
+            crops = self.get_cropped_images_batch([image], bgr=False)[0]
+            return [Image.fromarray(crop) for crop in crops]
+        return self.get_cropped_images_batch([image], bgr=True)[0]
@@ -0,0 +1,116 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import itertools
+
+import cv2
+from moviepy.editor import VideoFileClip
+
+# Forward gaps up to this many frames are skipped with grab() (decode only, no color
+# conversion or copy); larger gaps seek, which jumps to the previous keyframe instead.
+SEEK_MIN_GAP = int(os.getenv("DATAPREP_SEEK_MIN_GAP", 30))
+# Bhattacharyya distance between HSV histograms above which a frame starts a new scene.
+SCENE_THRESHOLD = float(os.getenv("DATAPREP_SCENE_THRESHOLD", 0.3))
+
+SAMPLING_MODES = ("seek", "scene", "all")
+
+
+class FrameReader:
+    """
+    Random access frame reader on top of cv2.VideoCapture that only decodes what is
+    needed to return the requested frame indices, which must be increasing.
+    """
+    def __init__(self, video_path, seek_min_gap=SEEK_MIN_GAP):
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Failed to open video: {video_path}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.seek_min_gap = seek_min_gap
+        self.next_index = 0
+
+    def read(self, index):
+        """
+        Return frame `index` as an RGB array, or None past the end of the video.
+        """
+        gap = index - self.next_index
+        if gap < 0 or gap > self.seek_min_gap:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        else:
+            for _ in range(gap):
+                if not self.cap.grab():
+                    return None
+        ok, frame = self.cap.read()
+        self.next_index = index + 1
+        if not ok:
+            return None
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def iter_indices(self, frame_interval):
+        if self.frame_count > 0:
+            return range(0, self.frame_count, frame_interval)
+        return itertools.count(0, frame_interval)
+
+    def close(self):
+        self.cap.release()
+
+
+def _scene_histogram(frame):
+    thumbnail = cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(thumbnail, cv2.COLOR_RGB2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256])
+    return cv2.normalize(hist, hist)
+
+
+def _iter_all_frames(video_path, frame_interval):
+    video = VideoFileClip(video_path)
+    try:
+        fps = video.fps
+        for frame_counter, frame in enumerate(video.iter_frames()):
+            if frame_counter % frame_interval == 0:
+                yield frame_counter, frame_counter / fps, frame
+    finally:
+        video.close()
+
+
+def _iter_seek_frames(video_path, frame_interval):
+    reader = FrameReader(video_path)
+    try:
+        for index in reader.iter_indices(frame_interval):
+            frame = reader.read(index)
+            if frame is None:
+                break
+            yield index, index / reader.fps, frame
+    finally:
+        reader.close()
+
+
+def _iter_scene_frames(video_path, frame_interval, threshold):
+    last_hist = None
+    for index, seconds, frame in _iter_seek_frames(video_path, frame_interval):
+        hist = _scene_histogram(frame)
+        if last_hist is None or cv2.compareHist(last_hist, hist, cv2.HISTCMP_BHATTACHARYYA) > threshold:
+            last_hist = hist
+            yield index, seconds, frame
+
+
+def sample_frames(video_path, frame_interval=15, mode="seek", scene_threshold=SCENE_THRESHOLD):
+    """
+    Yield (frame index, timestamp in seconds, RGB frame) for the sampled frames of a video.
+
+    Modes:
+        seek:  every `frame_interval`-th frame; frames in between are skipped without
+               color conversion, or seeked over when the interval is large.
+        scene: the frames of `seek` mode that differ from the last kept frame by more than
+               `scene_threshold`, so static footage yields few frames.
+        all:   decode every frame with moviepy and keep every `frame_interval`-th one.
+    """
+    frame_interval = max(1, int(frame_interval))
+    if mode == "seek":
+        return _iter_seek_frames(video_path, frame_interval)
+    if mode == "scene":
+        return _iter_scene_frames(video_path, frame_interval, scene_threshold)
+    if mode == "all":
+        return _iter_all_frames(video_path, frame_interval)
+    raise ValueError(f"Unsupported frame sampling mode: {mode}. Supported modes are: {', '.join(SAMPLING_MODES)}")
@@ -3,31 +3,43 @@
 
 import os
 import copy
+import queue
 import faiss
+import threading
 import requests
+import numpy as np
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-from moviepy.editor import VideoFileClip
 from PIL import Image
 
 
 from dependency.clip_ov.mm_embedding import EmbeddingModel
 from detector import Detector
-from utils import preprocess_image, generate_unique_id
+from utils import preprocess_array, generate_unique_id, notify_collection_changed
 from milvus_client import MilvusClientWrapper
+from frame_sampler import sample_frames, SAMPLING_MODES
 
 
 
 DEVICE = os.getenv("DEVICE", "CPU")
 LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
 MODEL_DIR = "/home/user/models"
+DECODE_WORKERS = int(os.getenv("DATAPREP_DECODE_WORKERS", min(4, os.cpu_count() or 1)))
+EMBED_BATCH_SIZE = int(os.getenv("DATAPREP_EMBED_BATCH_SIZE", 8))
+INSERT_BATCH_SIZE = int(os.getenv("DATAPREP_INSERT_BATCH_SIZE", 512))
+DECODE_QUEUE_SIZE = int(os.getenv("DATAPREP_DECODE_QUEUE_SIZE", 64))
+
+# Sentinel put on the decode queue by a worker once its file is done.
+_JOB_DONE = object()
 
 
 def create_milvus_data(embedding, meta=None):
     data = {}
     data["id"] = generate_unique_id()
     data["meta"] = meta
-    data["vector"] = embedding.tolist()[0]
+    data["vector"] = np.asarray(embedding).reshape(-1).tolist()
     return data
 
 class Indexer:
@@ -40,7 +52,8 @@ class Indexer:
         self.model_path = MODEL_DIR
         self.device = DEVICE
 
-        self.model = EmbeddingModel().image_model
+        self.batch_size = EMBED_BATCH_SIZE
+        self.model = EmbeddingModel(image_batch_size=self.batch_size).image_model
         self.ireq = self.model.create_infer_request()
         self.detector = Detector(device=DEVICE)
 
@@ -119,6 +132,7 @@ class Indexer:
                 ids=ids,
             )
             del self.id_map[file_path]
+            notify_collection_changed(self.collection_name)
         else:
             print(f"File {file_path} not found in db.")
         return res, ids
@@ -134,94 +148,237 @@ class Indexer:
             ids=ids,
         )
         self.id_map.clear()
+        notify_collection_changed(self.collection_name)
 
         return res, ids
             
-    def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
-        entities = []
-        video = VideoFileClip(video_path)
-
-        frame_counter = 0
-        frame_interval = int(frame_interval)
-        fps = video.fps
-        for frame in video.iter_frames():
-            if frame_counter % frame_interval == 0:
-                image = Image.fromarray(frame)
-                seconds = frame_counter / fps
-                meta_data = copy.deepcopy(meta)
-                meta_data["video_pin_second"] = seconds
-                if do_detect_and_crop:
-                    crops = self.detector.get_cropped_images(image)
-                    for crop in crops:
-                        crop = preprocess_image(crop, shape=[self.w, self.h])
-                        embedding = self.ireq.infer({'x': crop[None]}).to_tuple()[0]
-                        node = create_milvus_data(embedding, meta_data)
-                        entities.append(node)
-                        self.update_id_map(meta_data["file_path"], node["id"])
-                image = preprocess_image(image, shape=[self.w, self.h])
-                embedding = self.ireq.infer({'x': image[None]}).to_tuple()[0]
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-            frame_counter += 1
-            
-        return entities
+    def _iter_frame_images(self, frames, metas, do_detect_and_crop=True):
+        """
+        Yield (preprocessed image, meta) pairs for a batch of RGB frames and, if enabled,
+        for the objects detected in them. Detection runs once for the whole batch and the
+        crops are array views into the frames.
+        """
+        if do_detect_and_crop:
+            crops = self.detector.get_cropped_images_batch(frames)
+        else:
+            crops = [[] for _ in frames]
+        for frame, frame_crops, meta in zip(frames, crops, metas):
+            for crop in frame_crops:
+                yield preprocess_array(crop, shape=[self.w, self.h]), meta
+            yield preprocess_array(frame, shape=[self.w, self.h]), meta
 
-    def process_image(self, image_path, meta, do_detect_and_crop=True):
-        entities = []
-        image = Image.open(image_path).convert('RGB')
+    def iter_video_images(self, video_path, meta, frame_interval=15, do_detect_and_crop=True, sampling_mode="seek"):
+        """
+        Decode the sampled frames of a video (see frame_sampler.sample_frames) and yield
+        (preprocessed image, meta) pairs for every frame and, if enabled, for every object cropped from it.
+        """
+        frames, metas = [], []
+        for _, seconds, frame in sample_frames(video_path, frame_interval, sampling_mode):
+            frames.append(frame)
+            metas.append(dict(meta, video_pin_second=seconds))
+            if len(frames) >= self.detector.batch_size:
+                yield from self._iter_frame_images(frames, metas, do_detect_and_crop)
+                frames, metas = [], []
+        if frames:
+            yield from self._iter_frame_images(frames, metas, do_detect_and_crop)
+
+    def iter_image_images(self, image_path, meta, do_detect_and_crop=True):
+        """
+        Decode an image and yield (preprocessed image, meta) pairs for the image and,
+        if enabled, for every object cropped from it.
+        """
+        image = np.asarray(Image.open(image_path).convert('RGB'))
         meta_data = copy.deepcopy(meta)
-        if do_detect_and_crop:
-            crops = self.detector.get_cropped_images(image)
-            for crop in crops:
-                crop = preprocess_image(crop, shape=[self.w, self.h])
-                embedding = self.ireq.infer({'x': crop[None]}).to_tuple()[0]
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-        
-        image = preprocess_image(image, shape=[self.w, self.h])
-        embedding = self.ireq.infer({'x': image[None]}).to_tuple()[0]
-        node = create_milvus_data(embedding, meta_data)
-        entities.append(node)
-        self.update_id_map(meta_data["file_path"], node["id"])
-        return entities
+        yield from self._iter_frame_images([image], [meta_data], do_detect_and_crop)
+
+    def embed_images(self, images):
+        """
+        Embed preprocessed images with as few inference calls as possible.
+        The image model is compiled with a static batch size, so the last batch is zero padded.
+
+        Returns:
+            np.ndarray of shape (len(images), embedding_dim)
+        """
+        embeddings = []
+        for start in range(0, len(images), self.batch_size):
+            batch = np.stack(images[start:start + self.batch_size])
+            num_images = len(batch)
+            if num_images < self.batch_size:
+                padding = np.zeros((self.batch_size - num_images, *batch.shape[1:]), dtype=batch.dtype)
+                batch = np.concatenate([batch, padding])
+            embedding = self.ireq.infer({'x': batch}).to_tuple()[0]
+            embeddings.append(np.array(embedding[:num_images]))
+        return np.concatenate(embeddings)
+
+    def create_entities(self, items):
+        items = list(items)
+        if not items:
+            return []
+        embeddings = self.embed_images([image for image, _ in items])
+        return [create_milvus_data(embedding, meta) for embedding, (_, meta) in zip(embeddings, items)]
+
+    def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True, sampling_mode="seek"):
+        return self.create_entities(self.iter_video_images(video_path, meta, frame_interval, do_detect_and_crop, sampling_mode))
+
+    def process_image(self, image_path, meta, do_detect_and_crop=True):
+        return self.create_entities(self.iter_image_images(image_path, meta, do_detect_and_crop))
 
     def add_embedding(self, files, metas, **kwargs):
+        """
+        Ingest files with a streaming pipeline:
+
+        - decode workers read videos/images (and run detection) in parallel, feeding a bounded queue
+        - the calling thread embeds the decoded images in batches of the model batch size
+        - a background inserter writes the entities to Milvus every INSERT_BATCH_SIZE entities
+
+        Memory is bounded by the queue size and the number of in-flight insert batches instead of
+        growing with the number of ingested files. The first decode error stops the pipeline and is
+        re-raised after in-flight inserts have completed.
+        """
         if len(files) != len(metas):
             raise ValueError(f"Number of files and metas must be the same. files: {len(files)}, metas: {len(metas)}")
-        
-        frame_interval = kwargs.get("frame_interval", 15)
+
+        frame_interval = kwargs.get("frame_interval", kwargs.get("frame_extract_interval", 15))
         minimal_duration = kwargs.get("minimal_duration", 1)
         do_detect_and_crop = kwargs.get("do_detect_and_crop", True)
-        entities = []
+        sampling_mode = kwargs.get("frame_sampling_mode", "seek")
+        if sampling_mode not in SAMPLING_MODES:
+            raise ValueError(f"Unsupported frame sampling mode: {sampling_mode}. Supported modes are: {', '.join(SAMPLING_MODES)}")
+        jobs = []
         for file, meta in zip(files, metas):
-            # print("processing file: ", file)
             if meta["file_path"] in self.id_map:
                 print(f"File {file} already processed, skipping.")
                 continue
             if file.lower().endswith(('.mp4')):
                 meta["type"] = "local_video"
-                entities.extend(self.process_video(file, meta, frame_interval, minimal_duration, do_detect_and_crop))
+                jobs.append(lambda file=file, meta=meta: self.iter_video_images(file, meta, frame_interval, do_detect_and_crop, sampling_mode))
             elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
                 meta["type"] = "local_image"
-                entities.extend(self.process_image(file, meta, do_detect_and_crop))
+                jobs.append(lambda file=file, meta=meta: self.iter_image_images(file, meta, do_detect_and_crop))
             else:
                 print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
 
-        res = {}
-        if entities:
-            res = self.client.insert(
-                collection_name=self.collection_name,
-                data=entities,
-            )
+        if not jobs:
+            return {}
+
+        decoded = queue.Queue(maxsize=DECODE_QUEUE_SIZE)
+        stop = threading.Event()
+        inserter = BatchInserter(self._insert_entities, INSERT_BATCH_SIZE)
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=min(DECODE_WORKERS, len(jobs)), thread_name_prefix="decode") as pool:
+                for job in jobs:
+                    pool.submit(_decode_worker, job, decoded, stop)
+                try:
+                    self._embed_stream(decoded, len(jobs), inserter)
+                    completed = True
+                finally:
+                    # Unblocks workers waiting on a full queue if the embedding stage failed.
+                    stop.set()
+        finally:
+            res = inserter.close(discard_pending=not completed)
+
+        if res:
+            self._build_index()
         return res
 
+    def _embed_stream(self, decoded, num_jobs, inserter):
+        pending_jobs = num_jobs
+        batch = []
+        while pending_jobs:
+            item = decoded.get()
+            if item is _JOB_DONE:
+                pending_jobs -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                inserter.submit(self.create_entities(batch))
+                batch = []
+        if batch:
+            inserter.submit(self.create_entities(batch))
 
-    def _submit_embedding(self, entities):
-        # aync thread which collects embeddings and insert to db in batch
-        pass
+    def _insert_entities(self, entities):
+        res = self.client.insert(
+            collection_name=self.collection_name,
+            data=entities,
+        )
+        for node in entities:
+            self.update_id_map(node["meta"]["file_path"], node["id"])
+        notify_collection_changed(self.collection_name)
+        return res
 
     def _build_index(self):
-        # build index
-        pass
+        # Seal the freshly inserted segments so that they get indexed right away.
+        self.client.flush(collection_name=self.collection_name)
+
+
+def _put(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _decode_worker(job, out_queue, stop):
+    try:
+        for item in job():
+            if not _put(out_queue, item, stop):
+                return
+    except Exception as e:
+        _put(out_queue, e, stop)
+    finally:
+        _put(out_queue, _JOB_DONE, stop)
+
+
+class BatchInserter:
+    """
+    Collects entities and inserts them into the db in batches of `batch_size` on a background
+    thread, with at most `max_pending` insert calls in flight to bound memory.
+    """
+    def __init__(self, insert_fn, batch_size=INSERT_BATCH_SIZE, max_pending=2):
+        self.insert_fn = insert_fn
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insert")
+        self.pending = []
+        self.futures = deque()
+        self.insert_count = 0
+        self.ids = []
+
+    def submit(self, entities):
+        self.pending.extend(entities)
+        while len(self.pending) >= self.batch_size:
+            self._flush(self.batch_size)
+
+    def _flush(self, size):
+        batch, self.pending = self.pending[:size], self.pending[size:]
+        self.futures.append(self.executor.submit(self.insert_fn, batch))
+        while len(self.futures) > self.max_pending:
+            self._collect(self.futures.popleft())
+
+    def _collect(self, future):
+        res = future.result()
+        if res:
+            self.insert_count += res.get("insert_count", 0)
+            self.ids.extend(res.get("ids", []))
+
+    def close(self, discard_pending=False):
+        """
+        Insert the remaining entities, wait for all inserts and return the aggregated db result.
+        Raises the first insert error, if any.
+        """
+        try:
+            if self.pending and not discard_pending:
+                self._flush(len(self.pending))
+            while self.futures:
+                self._collect(self.futures.popleft())
+        finally:
+            self.executor.shutdown(wait=True)
+        if not self.insert_count:
+            return {}
+        return {"insert_count": self.insert_count, "ids": self.ids}
@@ -74,6 +74,9 @@ class MilvusClientWrapper:
         
         return res
     
+    def flush(self, collection_name: str):
+        self.client.flush(collection_name=collection_name)
+
     def get(self, ids: list, output_fields: list, collection_name: str):
         res = self.client.get(
                 collection_name=collection_name,
@@ -2,22 +2,30 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import cv2
 import uuid
+import requests
 import numpy as np
 from pathlib import Path
-from PIL import Image
+
+# e.g. http://<retriever-host>:7770/v1/retrieval/cache/invalidate. Disabled when empty.
+RETRIEVER_CACHE_INVALIDATE_URL = os.getenv("RETRIEVER_CACHE_INVALIDATE_URL", "")
 
 
 def normalize(arr, mean=[0.485,0.456,0.406], std=[0.229,0.224,0.225]):
     arr = arr.astype(np.float32)
     arr /= 255.0
-    for i in range(3):
-        arr[...,i] = (arr[...,i] - mean[i]) / std[i]
+    arr -= np.asarray(mean, dtype=np.float32)
+    arr /= np.asarray(std, dtype=np.float32)
     return arr
 
-def preprocess_image(image, shape=[224,224]):
-    img = image.resize(shape, Image.Resampling.NEAREST)
-    img = normalize(np.asarray(img))
+def preprocess_array(arr, shape=[224,224]):
+    """
+    Resize and normalize an RGB HWC array (e.g. a crop view of a frame) into a CHW array.
+    INTER_NEAREST_EXACT samples the same pixels as PIL's NEAREST, as used for query images.
+    """
+    img = cv2.resize(arr, tuple(shape), interpolation=cv2.INTER_NEAREST_EXACT)
+    img = normalize(img)
     return img.transpose(2,0,1)
 
 def generate_unique_id():
@@ -28,4 +36,20 @@ def generate_unique_id():
         A unique ID.
     """
     # return np.int64(uuid.uuid4().int & (1 << 64) - 1)
-    return uuid.uuid4().int & 0x7FFFFFFFFFFFFFFF
\ No newline at end of file
+    return uuid.uuid4().int & 0x7FFFFFFFFFFFFFFF
+
+def notify_collection_changed(collection_name, url=RETRIEVER_CACHE_INVALIDATE_URL):
+    """
+    Tell the retriever that entities were inserted into or deleted from a collection
+    so that it drops its cached search results. Best effort: failures are only logged,
+    the retriever cache entries expire on their own after a short TTL.
+    """
+    if not url:
+        return False
+    try:
+        response = requests.post(url, json={"collection_name": collection_name}, timeout=5)
+        response.raise_for_status()
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to notify retriever of changes in collection {collection_name}: {e}")
+        return False
@@ -2,6 +2,7 @@
 
 import cv2
 import numpy as np
+from functools import lru_cache
 
 def preproc(img, input_size, swap=(2, 0, 1)):
     if len(img.shape) == 3:
@@ -23,7 +24,22 @@ def preproc(img, input_size, swap=(2, 0, 1)):
 
     return padded_img, r
 
-def nms(boxes, scores, nms_thr):
+# Above this many candidate boxes the pairwise IoU matrix gets too large and
+# NMS falls back to the iterative implementation.
+NMS_MATRIX_LIMIT = 2048
+
+
+def box_iou_matrix(boxes):
+    """Pairwise IoU of (K, 4) xyxy boxes, using the same +1 pixel convention as nms."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    w = np.maximum(0.0, np.minimum(x2[:, None], x2[None, :]) - np.maximum(x1[:, None], x1[None, :]) + 1)
+    h = np.maximum(0.0, np.minimum(y2[:, None], y2[None, :]) - np.maximum(y1[:, None], y1[None, :]) + 1)
+    inter = w * h
+    return inter / (areas[:, None] + areas[None, :] - inter)
+
+
+def nms_iterative(boxes, scores, nms_thr):
     """Single class NMS implemented in Numpy."""
     x1 = boxes[:, 0]
     y1 = boxes[:, 1]
@@ -53,6 +69,37 @@ def nms(boxes, scores, nms_thr):
     return keep
 
 
+def nms(boxes, scores, nms_thr):
+    """
+    Single class NMS. Computes all pairwise IoUs at once and only walks the score-sorted
+    boolean suppression mask in Python; returns the same indices as nms_iterative.
+    """
+    if len(boxes) > NMS_MATRIX_LIMIT:
+        return nms_iterative(boxes, scores, nms_thr)
+    order = scores.argsort()[::-1]
+    suppress = box_iou_matrix(boxes[order]) > nms_thr
+    removed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for i in range(len(order)):
+        if removed[i]:
+            continue
+        keep.append(order[i])
+        removed |= suppress[i]
+    return keep
+
+
+def batched_nms(boxes, scores, group_ids, nms_thr):
+    """
+    NMS over several independent groups (classes, images or both) in one call.
+    Boxes of different groups are shifted apart so that they can never overlap.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    span = boxes.max() - boxes.min() + 2
+    offsets = group_ids.astype(boxes.dtype)[:, None] * span
+    return np.asarray(nms(boxes + offsets, scores, nms_thr), dtype=np.int64)
+
+
 def multiclass_nms(boxes, scores, nms_thr, score_thr, class_agnostic=True):
     """Multiclass NMS implemented in Numpy"""
     if class_agnostic:
@@ -63,27 +110,18 @@ def multiclass_nms(boxes, scores, nms_thr, score_thr, class_agnostic=True):
 
 
 def multiclass_nms_class_aware(boxes, scores, nms_thr, score_thr):
-    """Multiclass NMS implemented in Numpy. Class-aware version."""
-    final_dets = []
-    num_classes = scores.shape[1]
-    for cls_ind in range(num_classes):
-        cls_scores = scores[:, cls_ind]
-        valid_score_mask = cls_scores > score_thr
-        if valid_score_mask.sum() == 0:
-            continue
-        else:
-            valid_scores = cls_scores[valid_score_mask]
-            valid_boxes = boxes[valid_score_mask]
-            keep = nms(valid_boxes, valid_scores, nms_thr)
-            if len(keep) > 0:
-                cls_inds = np.ones((len(keep), 1)) * cls_ind
-                dets = np.concatenate(
-                    [valid_boxes[keep], valid_scores[keep, None], cls_inds], 1
-                )
-                final_dets.append(dets)
-    if len(final_dets) == 0:
+    """Multiclass NMS implemented in Numpy. Class-aware version, all classes in one batched NMS."""
+    box_inds, cls_inds = np.nonzero(scores > score_thr)
+    if len(box_inds) == 0:
         return None
-    return np.concatenate(final_dets, 0)
+    valid_scores = scores[box_inds, cls_inds]
+    valid_boxes = boxes[box_inds]
+    keep = batched_nms(valid_boxes, valid_scores, cls_inds, nms_thr)
+    # Group the detections by class like the former per-class loop did.
+    keep = keep[np.argsort(cls_inds[keep], kind="stable")]
+    return np.concatenate(
+        [valid_boxes[keep], valid_scores[keep, None], cls_inds[keep, None].astype(valid_boxes.dtype)], 1
+    )
 
 
 def multiclass_nms_class_agnostic(boxes, scores, nms_thr, score_thr):
@@ -98,14 +136,14 @@ def multiclass_nms_class_agnostic(boxes, scores, nms_thr, score_thr):
     valid_boxes = boxes[valid_score_mask]
     valid_cls_inds = cls_inds[valid_score_mask]
     keep = nms(valid_boxes, valid_scores, nms_thr)
-    if keep:
-        dets = np.concatenate(
-            [valid_boxes[keep], valid_scores[keep, None], valid_cls_inds[keep, None]], 1
-        )
+    dets = np.concatenate(
+        [valid_boxes[keep], valid_scores[keep, None], valid_cls_inds[keep, None]], 1
+    )
     return dets
 
 
-def demo_postprocess(outputs, img_size, p6=False):
+@lru_cache(maxsize=8)
+def _grids(img_size, p6=False):
     grids = []
     expanded_strides = []
     strides = [8, 16, 32] if not p6 else [8, 16, 32, 64]
@@ -120,9 +158,13 @@ def demo_postprocess(outputs, img_size, p6=False):
         shape = grid.shape[:2]
         expanded_strides.append(np.full((*shape, 1), stride))
 
-    grids = np.concatenate(grids, 1)
-    expanded_strides = np.concatenate(expanded_strides, 1)
+    return np.concatenate(grids, 1), np.concatenate(expanded_strides, 1)
+
+
+def demo_postprocess(outputs, img_size, p6=False):
+    """Decode raw YOLOX outputs of shape (N, anchors, 5 + classes) in place."""
+    grids, expanded_strides = _grids(tuple(img_size), p6)
     outputs[..., :2] = (outputs[..., :2] + grids) * expanded_strides
     outputs[..., 2:4] = np.exp(outputs[..., 2:4]) * expanded_strides
 
-    return outputs
\ No newline at end of file
+    return outputs
@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+import pytest
+
+from frame_sampler import FrameReader, sample_frames
+
+FPS = 10
+NUM_FRAMES = 40
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """
+    Fixture to provide a video in which the brightness of frame i is 5 * i, so that the
+    index of a decoded frame can be recovered from its pixels.
+    """
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (64, 48))
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((48, 64, 3), 5 * i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def frame_index(frame):
+    return int(round(frame.mean() / 5))
+
+
+@pytest.mark.parametrize("frame_interval, expected", [
+    (15, [0, 15, 30]),
+    (7, [0, 7, 14, 21, 28, 35]),
+    # Larger than DATAPREP_SEEK_MIN_GAP, the reader seeks instead of grabbing frames
+    (35, [0, 35]),
+])
+def test_sample_frames_seek(video_path, frame_interval, expected):
+    """
+    Test that every `frame_interval`-th frame is sampled, with its timestamp and pixels.
+    """
+    sampled = list(sample_frames(video_path, frame_interval, mode="seek"))
+
+    assert [index for index, _, _ in sampled] == expected
+    assert [seconds for _, seconds, _ in sampled] == pytest.approx([index / FPS for index in expected])
+    assert [frame_index(frame) for _, _, frame in sampled] == expected
+    assert all(frame.shape == (48, 64, 3) for _, _, frame in sampled)
+
+
+def test_sample_frames_scene_skips_static_frames(tmp_path):
+    """
+    Test that scene sampling only keeps frames which differ from the last kept frame.
+    """
+    path = str(tmp_path / "scenes.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (64, 48))
+    for i in range(NUM_FRAMES):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        # Two scenes: a blue and a red frame, switching at frame 20
+        frame[:, :, 0 if i < 20 else 2] = 255
+        writer.write(frame)
+    writer.release()
+
+    sampled = list(sample_frames(path, 5, mode="scene"))
+
+    assert [index for index, _, _ in sampled] == [0, 20]
+
+
+def test_sample_frames_invalid_mode(video_path):
+    """
+    Test that an unknown sampling mode is rejected.
+    """
+    with pytest.raises(ValueError, match="Unsupported frame sampling mode"):
+        sample_frames(video_path, 15, mode="unknown")
+
+
+def test_frame_reader_past_end(video_path):
+    """
+    Test that reading past the end of the video returns None.
+    """
+    reader = FrameReader(video_path)
+    try:
+        assert reader.fps == pytest.approx(FPS)
+        assert frame_index(reader.read(3)) == 3
+        assert reader.read(NUM_FRAMES + 5) is None
+    finally:
+        reader.close()
@@ -0,0 +1,138 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import indexer as indexer_module
+from indexer import BatchInserter, Indexer
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    """
+    Fixture to provide an Indexer with a mocked model and db client, which records the
+    embedding batches in `indexer.embed_batches` and the inserted batches in `indexer.inserts`.
+    """
+    monkeypatch.setattr(indexer_module, "INSERT_BATCH_SIZE", 3)
+    monkeypatch.setattr(indexer_module, "notify_collection_changed", mock.MagicMock())
+
+    idx = Indexer.__new__(Indexer)
+    idx.batch_size = 2
+    idx.collection_name = "test"
+    idx.id_map = {}
+    idx.embed_batches = []
+    idx.inserts = []
+
+    def embed_images(images):
+        idx.embed_batches.append(list(images))
+        return np.ones((len(images), 4), dtype=np.float32)
+
+    def insert(collection_name, data):
+        idx.inserts.append(data)
+        return {"insert_count": len(data), "ids": [entity["id"] for entity in data]}
+
+    idx.embed_images = embed_images
+    idx.client = mock.MagicMock()
+    idx.client.insert.side_effect = insert
+    return idx
+
+
+def fake_images(name, count):
+    return lambda *args, **kwargs: iter([(f"{name}-{i}", {"file_path": name}) for i in range(count)])
+
+
+def test_add_embedding_batches(indexer, monkeypatch):
+    """
+    Test that decoded images are embedded in batches of the model batch size and inserted
+    in batches of INSERT_BATCH_SIZE, with the remaining entities inserted at the end.
+    """
+    monkeypatch.setattr(indexer, "iter_video_images", fake_images("a.mp4", 5))
+    monkeypatch.setattr(indexer, "iter_image_images", fake_images("b.jpg", 2))
+
+    res = indexer.add_embedding(["a.mp4", "b.jpg"], [{"file_path": "a.mp4"}, {"file_path": "b.jpg"}])
+
+    # Images of both files are embedded, in full batches except the last one
+    embedded = [image for batch in indexer.embed_batches for image in batch]
+    assert sorted(embedded) == sorted([f"a.mp4-{i}" for i in range(5)] + [f"b.jpg-{i}" for i in range(2)])
+    assert [len(batch) for batch in indexer.embed_batches] == [2, 2, 2, 1]
+    # Images of a file are embedded in decode order
+    assert [image for image in embedded if image.startswith("a.mp4")] == [f"a.mp4-{i}" for i in range(5)]
+
+    assert [len(batch) for batch in indexer.inserts] == [3, 3, 1]
+    assert res["insert_count"] == 7
+    assert res["ids"] == [entity["id"] for batch in indexer.inserts for entity in batch]
+    assert len(indexer.id_map["a.mp4"]) == 5
+    assert len(indexer.id_map["b.jpg"]) == 2
+    indexer.client.flush.assert_called_once_with(collection_name="test")
+
+
+def test_add_embedding_skips_processed_files(indexer, monkeypatch):
+    """
+    Test that files already in the db and unsupported files are not decoded.
+    """
+    indexer.id_map["a.mp4"] = ["id"]
+    video_images = mock.MagicMock()
+    monkeypatch.setattr(indexer, "iter_video_images", video_images)
+
+    assert indexer.add_embedding(["a.mp4", "c.txt"], [{"file_path": "a.mp4"}, {"file_path": "c.txt"}]) == {}
+    video_images.assert_not_called()
+    indexer.client.insert.assert_not_called()
+
+
+def test_add_embedding_decode_error(indexer, monkeypatch):
+    """
+    Test that a decode error stops the pipeline and is raised, without inserting the
+    entities which did not fill a complete insert batch.
+    """
+    def failing_images(*args, **kwargs):
+        yield "a.mp4-0", {"file_path": "a.mp4"}
+        yield "a.mp4-1", {"file_path": "a.mp4"}
+        raise RuntimeError("corrupted video")
+
+    monkeypatch.setattr(indexer, "iter_video_images", failing_images)
+
+    with pytest.raises(RuntimeError, match="corrupted video"):
+        indexer.add_embedding(["a.mp4"], [{"file_path": "a.mp4"}])
+
+    assert indexer.inserts == []
+    indexer.client.flush.assert_not_called()
+
+
+def test_add_embedding_invalid_sampling_mode(indexer):
+    """
+    Test that an unknown frame sampling mode is rejected before decoding.
+    """
+    with pytest.raises(ValueError, match="Unsupported frame sampling mode"):
+        indexer.add_embedding(["a.mp4"], [{"file_path": "a.mp4"}], frame_sampling_mode="unknown")
+
+
+def test_batch_inserter_bounds_pending_inserts():
+    """
+    Test that the inserter flushes full batches as entities are submitted, keeps at most
+    `max_pending` inserts in flight and aggregates the results.
+    """
+    inserted = []
+
+    def insert(batch):
+        inserted.append(list(batch))
+        return {"insert_count": len(batch), "ids": batch}
+
+    inserter = BatchInserter(insert, batch_size=2, max_pending=1)
+    inserter.submit([1, 2, 3])
+    assert inserter.pending == [3]
+    inserter.submit([4, 5])
+    assert len(inserter.futures) <= 1
+
+    assert inserter.close() == {"insert_count": 5, "ids": [1, 2, 3, 4, 5]}
+    assert inserted == [[1, 2], [3, 4], [5]]
+
+
+def test_batch_inserter_raises_insert_error():
+    """
+    Test that an insert error is raised when the inserter is closed.
+    """
+    inserter = BatchInserter(mock.MagicMock(side_effect=Exception("db unavailable")), batch_size=2)
+    inserter.submit([1, 2])
+
+    with pytest.raises(Exception, match="db unavailable"):
+        inserter.close()
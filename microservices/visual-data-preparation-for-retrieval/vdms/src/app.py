@@ -1,29 +1,38 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
+import asyncio
 import datetime
-import io
+import email.utils
 import pathlib
 import shutil
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 from typing import Annotated, List, Optional
 
 import requests
-from fastapi import Body, FastAPI, File, Header, HTTPException, Path, Query, UploadFile
+from fastapi import Body, FastAPI, File, Header, HTTPException, Path, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from src.common import DataPrepException, Settings, Strings
-from src.core.db import VDMSClient
-from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
 from src.core.minio_client import MinioClient
-from src.core.util import get_minio_client, get_video_from_minio, read_config, store_video_metadata
+from src.core.registry import ResourceRegistry
+from src.core.util import (
+    download_video_from_minio,
+    get_minio_client,
+    if_range_matches,
+    is_not_modified,
+    parse_range_header,
+    store_video_metadata,
+)
 from src.core.validation import sanitize_model, validate_params
-from src.core.vclip import vCLIP
 from src.logger import logger
 from src.schema import (
     BucketVideoListResponse,
     DataPrepErrorResponse,
     DataPrepResponse,
+    ReadinessResponse,
+    ReadinessStatusEnum,
     StatusEnum,
     VideoInfo,
     VideoRequest,
@@ -31,8 +40,24 @@ from src.schema import (
 
 settings = Settings()
 logger.debug(f"Settings loaded: {settings.model_dump()}")
+
+# Embedding model and VDMS connection shared by all requests
+registry = ResourceRegistry(settings)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load model and connect to VDMS in background, readiness is reported at /health/ready
+    registry.start()
+    yield
+    await registry.aclose()
+
+
 app = FastAPI(
-    title=settings.APP_DISPLAY_NAME, description=settings.APP_DESC, root_path="/v1/dataprep"
+    title=settings.APP_DISPLAY_NAME,
+    description=settings.APP_DESC,
+    root_path="/v1/dataprep",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -83,13 +108,6 @@ async def generate_embeddings(
     Raises:
         DataPrepException: If there is an error in the embedding generation process
     """
-    # Read configuration
-    config = read_config(settings.CONFIG_FILEPATH, type="yaml")
-    if config is None:
-        raise Exception(Strings.config_error)
-
-    vector_dimension = config["embeddings"]["vector_dimensions"]
-
     # Generate metadata for the video
     metadata_file = store_video_metadata(
         bucket_name=bucket_name,
@@ -103,29 +121,19 @@ async def generate_embeddings(
 
     logger.info(f"Metadata generated and saved to {metadata_file}")
 
-    # Setup embedding model
-    if settings.MULTIMODAL_EMBEDDING_ENDPOINT:
-        vclip_model = vCLIPEmbeddingsWrapper(
-            api_url=settings.MULTIMODAL_EMBEDDING_ENDPOINT,
-            model_name=settings.MULTIMODAL_EMBEDDING_MODEL_NAME,
-            num_frames=settings.MULTIMODAL_EMBEDDING_NUM_FRAMES,
-        )
-    else:
-        # Get the vclip model
-        vclip_model = vCLIP(config["embeddings"])
-
-    # Initialize VDMS db client
-    vdms = VDMSClient(
-        host=settings.VDMS_VDB_HOST,
-        port=settings.VDMS_VDB_PORT,
-        collection_name=settings.DB_COLLECTION,
-        model=vclip_model,
-        video_metadata_path=metadata_file,
-        embedding_dimensions=vector_dimension,
-    )
+    # Get the shared VDMS db client (and embedding model), loaded at startup
+    try:
+        vdms = await asyncio.to_thread(registry.get_vdms_client)
+    except Exception as ex:
+        raise DataPrepException(status_code=HTTPStatus.SERVICE_UNAVAILABLE, msg=str(ex))
 
     # Store the video embeddings in VDMS vector DB
-    ids = vdms.store_embeddings()
+    try:
+        ids = await vdms.astore_embeddings(metadata_file)
+    except Exception:
+        # Connection may be broken, reconnect on next request
+        registry.reset_vdms_client()
+        raise
     logger.info(f"Embeddings created for videos: {ids}")
 
     return ids
@@ -137,6 +145,30 @@ async def check_health():
     return {"status": "ok"}
 
 
+@app.get(
+    "/health/ready",
+    tags=["Status APIs"],
+    summary="Check whether the embedding model and VDMS connection are ready",
+    responses={HTTPStatus.SERVICE_UNAVAILABLE: {"model": ReadinessResponse}},
+)
+async def check_readiness() -> ReadinessResponse:
+    """
+    Readiness API endpoint. Embedding model and VDMS connection are created and warmed up once
+    at startup and shared by all requests.
+
+    Returns:
+    - **200 OK :** Model is loaded and warmed up, and VDMS connection is established.
+    - **503 Service Unavailable :** Resources are still initializing, or initialization failed
+      (the error is reported in `detail` and initialization is retried).
+    """
+    readiness = registry.readiness()
+    if readiness.status != ReadinessStatusEnum.ready:
+        return JSONResponse(
+            content=readiness.model_dump(), status_code=HTTPStatus.SERVICE_UNAVAILABLE
+        )
+    return readiness
+
+
 @app.post(
     "/videos",
     tags=["Data Preparation APIs"],
@@ -273,11 +305,8 @@ async def process_minio_video(
     """
 
     try:
-        config = read_config(settings.CONFIG_FILEPATH, type="yaml")
-
         # Not able to read config file is a fatal error.
-        if config is None:
-            raise Exception(Strings.config_error)
+        config = registry.load_config()
 
         # Get directory paths from config file
         videos_temp_dir = pathlib.Path(config.get("videos_local_temp_dir", "/tmp/dataprep/videos"))
@@ -349,15 +378,11 @@ async def process_minio_video(
             logger.info(
                 f"Retrieving video from Minio at bucket: {bucket_name}, video_id: {video_id}"
             )
-            video_data, filename = get_video_from_minio(bucket_name, video_id, video_name)
-
-            # Save video to temporary location for processing
-            temp_video_path = videos_temp_dir / filename
-            with open(temp_video_path, "wb") as f:
-                f.write(video_data.read())
-
-            # Reset video_data for potential reuse
-            video_data.seek(0)
+            # Stream video to a temporary location for processing
+            temp_video_path = await asyncio.to_thread(
+                download_video_from_minio, bucket_name, video_id, videos_temp_dir, video_name
+            )
+            filename = temp_video_path.name
 
             logger.info(f"Retrieved video {filename} from {bucket_name}/{video_id}")
 
@@ -471,11 +496,8 @@ async def upload_and_process_video(
     """
 
     try:
-        config = read_config(settings.CONFIG_FILEPATH, type="yaml")
-
         # Not able to read config file is a fatal error.
-        if config is None:
-            raise Exception(Strings.config_error)
+        config = registry.load_config()
 
         # Get processing parameters, fall back to config if not specified
         chunk_duration = chunk_duration or config.get("chunk_duration", 30)
@@ -523,7 +545,8 @@ async def upload_and_process_video(
         # Now save the uploaded file to a temporary location for processing
         temp_video_path = videos_temp_dir / filename
         with open(temp_video_path, "wb") as f:
-            f.write(await file.read())
+            # Copy in chunks, not holding the whole video in memory
+            await asyncio.to_thread(shutil.copyfileobj, file.file, f, 1024 * 1024)
 
         logger.debug(f"Successfully saved uploaded file {filename} to {temp_video_path}")
 
@@ -657,6 +680,7 @@ async def get_video_files_list(
 )
 @validate_params
 async def download_video_file_legacy(
+    request: Request,
     video_id: Annotated[
         str,
         Query(min_length=3, description="Directory on MINIO Server containing the video"),
@@ -690,12 +714,22 @@ async def download_video_file_legacy(
     #### Returns:
     - **File (binary):** Returns the video file as a streaming response.
     """
+    if not video_name:
+        # Find the first video in the directory
+        object_name = get_minio_client().get_video_in_directory(
+            bucket_name or settings.DEFAULT_BUCKET_NAME, video_id
+        )
+        if not object_name:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=Strings.video_id_not_found)
+        video_name = pathlib.Path(object_name).name
+
     # Redirect to the new endpoint
-    return await download_video_by_path(video_id, video_name or "", bucket_name, range)
+    return await download_video_by_path(request, video_id, video_name, bucket_name, range)
 
 
-@app.get(
+@app.api_route(
     "/{video_id}/{video_name}",
+    methods=["GET", "HEAD"],
     tags=["Data Preparation APIs"],
     summary="Download a video from Minio storage",
     response_class=StreamingResponse,
@@ -705,12 +739,16 @@ async def download_video_file_legacy(
             "description": "A downloadable video file.",
         },
         400: {"model": DataPrepErrorResponse, "description": "Invalid parameters"},
+        206: {"description": "Requested byte range of the video file."},
+        304: {"description": "Video file not modified."},
         404: {"model": DataPrepErrorResponse, "description": "File not found"},
+        416: {"description": "Requested range not satisfiable"},
         502: {"model": DataPrepErrorResponse, "description": "Minio storage error"},
     },
 )
 @validate_params
 async def download_video_by_path(
+    request: Request,
     video_id: Annotated[
         str,
         Path(min_length=3, description="Directory/collection ID containing the video"),
@@ -738,11 +776,20 @@ async def download_video_by_path(
     - **bucket_name (str, optional):** The bucket name where the video is stored. If not provided, default bucket will be used.
 
     #### Headers:
-    - **Range (str, optional):** HTTP Range header for partial content download
+    - **Range (str, optional):** HTTP Range header for partial content download. A single range
+      is supported, e.g. `bytes=0-1023`, `bytes=1024-` or `bytes=-1024`.
+    - **If-Range (str, optional):** Serve the range only if the video still has this ETag or last
+      modified date, else serve the full video.
+    - **If-None-Match / If-Modified-Since (str, optional):** Conditional request headers, a
+      **304 Not Modified** response is returned if the video has not changed.
+
+    The video is streamed from Minio storage in chunks, only the requested range is read. A HEAD
+    request returns the same headers without the body.
 
     #### Raises:
     - **400 Bad Request:** When video_id or video_name are invalid according to Minio naming rules.
     - **404 Not Found:** When the requested video cannot be found.
+    - **416 Range Not Satisfiable:** When the requested range is outside of the video.
     - **502 Bad Gateway:** When something goes wrong with Minio storage access.
     - **500 Internal Server Error:** When some internal error occurs at the API server.
 
@@ -768,75 +815,73 @@ async def download_video_by_path(
                 msg="Invalid video_id or video_name format. Please check naming conventions.",
             )
 
-        # Check if the object exists
-        if not minio_client.object_exists(bucket_name, video_id, video_name):
-            raise DataPrepException(
-                status_code=HTTPStatus.NOT_FOUND,
-                msg=f"Video '{video_id}/{video_name}' not found in bucket '{bucket_name}'",
-            )
-
         # Get the object name
         object_name = f"{video_id}/{video_name}"
 
-        # Get video from Minio
-        video_data = minio_client.download_video_stream(bucket_name, object_name)
-        if not video_data:
+        # Check if the object exists, and get its size, ETag and last modified time
+        stat = minio_client.get_object_stat(bucket_name, object_name)
+        if stat is None:
             raise DataPrepException(
-                status_code=HTTPStatus.NOT_FOUND, msg=Strings.minio_file_not_found
+                status_code=HTTPStatus.NOT_FOUND,
+                msg=f"Video '{video_id}/{video_name}' not found in bucket '{bucket_name}'",
             )
 
-        # Get total size for the video object
-        total_size = minio_client.get_object_size(bucket_name, object_name)
+        total_size = stat.size
+        etag = f'"{stat.etag}"'
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": email.utils.format_datetime(stat.last_modified, usegmt=True),
+        }
+
+        if is_not_modified(
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since"),
+            etag,
+            stat.last_modified,
+        ):
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        headers["Content-Type"] = "video/mp4"
+        headers["Content-Disposition"] = f"attachment; filename={video_name}"
 
         # Handle range request if needed
-        if range:
+        byte_range = None
+        if range and if_range_matches(request.headers.get("if-range"), etag, stat.last_modified):
             logger.debug(f"Range request: {range}")
-            # Parse range header (e.g., "bytes=0-1023")
-            start_byte, end_byte = range.replace("bytes=", "").split("-")
-            start_byte = int(start_byte)
-            end_byte = int(end_byte) if end_byte else None
-
-            # Set the end byte if not specified
-            if end_byte is None:
-                end_byte = total_size - 1
-
-            # Calculate content length
-            content_length = end_byte - start_byte + 1
-
-            # Prepare content range header
-            content_range = f"bytes {start_byte}-{end_byte}/{total_size}"
-
-            # Seek to the start position
-            video_data.seek(start_byte)
-
-            # Create a new BytesIO with just the requested range
-            range_data = io.BytesIO(video_data.read(content_length))
-
-            def range_stream():
-                yield from range_data
-
-            headers = {
-                "Content-Range": content_range,
-                "Accept-Ranges": "bytes",
-                "Content-Length": str(content_length),
-                "Content-Type": "video/mp4",
-                "Content-Disposition": f"attachment; filename={video_name}",
-            }
+            try:
+                byte_range = parse_range_header(range, total_size)
+            except ValueError as ex:
+                logger.debug(ex)
+                headers["Content-Range"] = f"bytes */{total_size}"
+                return Response(
+                    status_code=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers
+                )
 
-            return StreamingResponse(range_stream(), headers=headers, status_code=206)
+        if byte_range:
+            start_byte, end_byte = byte_range
+            status_code = HTTPStatus.PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start_byte}-{end_byte}/{total_size}"
         else:
             logger.debug(f"Full video download for {video_name}")
-
-            def download_streaming_file():
-                yield from video_data
-
-            headers = {
-                "Content-Type": "video/mp4",
-                "Content-Length": str(total_size),
-                "Content-Disposition": f"attachment; filename={video_name}",
-            }
-
-            return StreamingResponse(download_streaming_file(), headers=headers)
+            start_byte, end_byte = 0, total_size - 1
+            status_code = HTTPStatus.OK
+
+        content_length = end_byte - start_byte + 1
+        headers["Content-Length"] = str(content_length)
+
+        if request.method == "HEAD" or content_length == 0:
+            return Response(status_code=status_code, headers=headers)
+
+        # Stream only the requested bytes from Minio, chunk by chunk
+        chunks = minio_client.stream_object(
+            bucket_name,
+            object_name,
+            offset=start_byte,
+            length=content_length,
+            chunk_size=settings.MINIO_DOWNLOAD_CHUNK_SIZE,
+        )
+        return StreamingResponse(chunks, status_code=status_code, headers=headers)
 
     except DataPrepException as ex:
         logger.error(ex)
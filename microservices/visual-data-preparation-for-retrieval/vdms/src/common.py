@@ -35,6 +35,7 @@ class Settings(BaseSettings):
     MINIO_ACCESS_KEY: str = ""
     MINIO_SECRET_KEY: str = ""
     MINIO_SECURE: bool = False  # Whether to use HTTPS
+    MINIO_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes read from Minio at once when streaming
 
     # VDMS and embedding settings
     VDMS_VDB_HOST: str = ""
@@ -42,6 +43,14 @@ class Settings(BaseSettings):
     MULTIMODAL_EMBEDDING_MODEL_NAME: str = "openai/clip-vit-base-patch32"
     MULTIMODAL_EMBEDDING_NUM_FRAMES: int = 64
     MULTIMODAL_EMBEDDING_ENDPOINT: str = ""
+    MULTIMODAL_EMBEDDING_MAX_CONCURRENCY: int = 8  # Parallel requests to the embedding service
+    MULTIMODAL_EMBEDDING_TIMEOUT: float = 300  # Seconds to wait for an embedding response
+    EMBEDDING_BATCH_SIZE: int = 4  # Clips embedded in a single forward pass of the local model
+    EMBEDDING_DECODE_WORKERS: int = 4  # Videos decoded in parallel for the local model
+
+    # Shared model and VDMS connection, created at startup
+    MODEL_WARMUP: bool = True  # Run one inference at startup before reporting ready
+    RESOURCE_INIT_RETRY_INTERVAL: int = 10  # Seconds between startup initialization attempts
 
 
 class Strings:
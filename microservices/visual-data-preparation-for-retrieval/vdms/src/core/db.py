@@ -1,8 +1,11 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import pathlib
-from typing import Any
+import threading
+import uuid
+from typing import Any, Optional
 
 from langchain_community.vectorstores import VDMS
 from langchain_community.vectorstores.vdms import VDMS_Client
@@ -11,7 +14,7 @@ from langchain_core.runnables import ConfigurableField
 from src.common import Strings
 from src.core.embedding import vCLIPEmbeddings
 from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
-from src.core.util import read_config
+from src.core.util import VideoClip, read_config
 from src.logger import logger
 
 
@@ -22,7 +25,7 @@ class VDMSClient:
         port: str,
         collection_name: str,
         model: Any,
-        video_metadata_path: pathlib.Path,
+        video_metadata_path: Optional[pathlib.Path] = None,
         embedding_dimensions: int = 512,
         video_search_type: str = "similarity",
     ):
@@ -39,6 +42,8 @@ class VDMSClient:
             self.video_embedder = vCLIPEmbeddings(model=model)
         self.embedding_dimensions = embedding_dimensions
         self.video_metadata_path = video_metadata_path
+        # The underlying VDMS connection is a single socket, serialize its use across threads
+        self._lock = threading.Lock()
 
         # initialize_db
         self.init_db()
@@ -66,42 +71,88 @@ class VDMSClient:
             logger.error(f"Error in init_db: {ex}")
             raise Exception(Strings.db_conn_error)
 
-    def store_embeddings(self) -> list[str]:
+    def _read_clips(
+        self, video_metadata_path: Optional[pathlib.Path] = None
+    ) -> tuple[list[VideoClip], list[dict]]:
         """
-        Reads the metadata json file. For each video in metdata file
-        adds video metadata and its embeddings to the VDMS Vector DB.
+        Reads the metadata json file and returns the clips to embed along with
+        the metadata to store for each of them.
+        """
+        # Read metadata file containing all information about video files
+        metadata = read_config(video_metadata_path or self.video_metadata_path, type="json")
+        logger.info(f"store_embeddings Metadata: \n{metadata}")
+        if metadata is None:
+            raise Exception(Strings.metadata_read_error)
+
+        clips: list[VideoClip] = []
+        metadatas: list[dict] = []
+        for data in metadata.values():
+            path = data.pop("video_temp_path")
+            # Same as the video_path property stored by VDMS.add_videos
+            data["video_path"] = path
+            clips.append(VideoClip(path, data["timestamp"], data["clip_duration"]))
+            metadatas.append(data)
+
+        return clips, metadatas
+
+    def _add_embeddings(self, embeddings: list, metadatas: list[dict]) -> list[str]:
+        """
+        Adds all the embeddings along with their metadata to the collection,
+        in a single VDMS transaction of AddDescriptor commands.
+        """
+        if not metadatas:
+            return []
+
+        ids = [str(uuid.uuid4()) for _ in metadatas]
+        with self._lock:
+            return self.video_db.add_from(
+                texts=["" for _ in ids],
+                embeddings=embeddings,
+                ids=ids,
+                metadatas=metadatas,
+                batch_size=len(ids),
+            )
+
+    def store_embeddings(self, video_metadata_path: Optional[pathlib.Path] = None) -> list[str]:
+        """
+        Reads the metadata json file. Embeds all the video clips in metadata file as a batch
+        and adds them along with their metadata to the VDMS Vector DB.
 
         Args:
-            None
+            video_metadata_path (Path, optional) : Metadata file to read. Defaults to the
+                path given at construction, so that a single client can be shared across
+                requests for different videos.
 
         Returns:
             ids (list) : List of string IDs for videos added to vector DB.
         """
+        clips, metadatas = self._read_clips(video_metadata_path)
 
-        # Read metadata file containing all information about video files
-        metadata = read_config(self.video_metadata_path, type="json")
-        logger.info(f"store_embeddings Metadata: \n{metadata}")
-        if metadata is None:
-            raise Exception(Strings.metadata_read_error)
-
-        logger.info("Storing embeddings . . .")
-        videos_ids: list = []
+        logger.info(f"Storing embeddings for {len(clips)} clips . . .")
         try:
-            # Add video embeddings in db for each video
-            for _, (_, data) in enumerate(metadata.items()):
-                paths = [data["video_temp_path"]]
-                del data["video_temp_path"]
-                ids: list = self.video_db.add_videos(
-                    metadatas=[data],
-                    paths=paths,
-                    start_time=[data["timestamp"]],
-                    clip_duration=[data["clip_duration"]],
-                )
-                # Put list of ids returned into final videos_ids list.
-                if ids:
-                    videos_ids.extend(ids)
-
-            return videos_ids
+            embeddings = self.video_embedder.embed_video_clips(clips)
+            return self._add_embeddings(embeddings, metadatas)
         except Exception as ex:
             logger.error(f"Error in store_embeddings: {ex}")
             raise Exception(Strings.embedding_error)
+
+    async def astore_embeddings(
+        self, video_metadata_path: Optional[pathlib.Path] = None
+    ) -> list[str]:
+        """
+        Async version of `store_embeddings`. Clips are embedded concurrently by the embedding
+        service when it is used, else by the local model in a worker thread. DB insertion
+        also runs in a worker thread, so the event loop is never blocked.
+        """
+        clips, metadatas = self._read_clips(video_metadata_path)
+
+        logger.info(f"Storing embeddings for {len(clips)} clips . . .")
+        try:
+            if isinstance(self.video_embedder, vCLIPEmbeddingsWrapper):
+                embeddings = await self.video_embedder.aembed_video_clips(clips)
+            else:
+                embeddings = await asyncio.to_thread(self.video_embedder.embed_video_clips, clips)
+            return await asyncio.to_thread(self._add_embeddings, embeddings, metadatas)
+        except Exception as ex:
+            logger.error(f"Error in astore_embeddings: {ex}")
+            raise Exception(Strings.embedding_error)
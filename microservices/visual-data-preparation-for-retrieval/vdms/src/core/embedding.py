@@ -1,14 +1,20 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List
 
-import numpy as np
+import torch
 import torchvision.transforms as T
 from decord import VideoReader, cpu
 from langchain_core.embeddings import Embeddings
+from PIL import Image
 from pydantic import BaseModel, model_validator
 
+from src.common import Strings, settings
+from src.core.util import VideoClip, decode_clips, sample_frame_indices
 from src.logger import logger
 
 toPIL = T.ToPILImage()
@@ -18,6 +24,10 @@ class vCLIPEmbeddings(BaseModel, Embeddings):
     """MeanCLIP Embeddings model."""
 
     model: Any
+    # Number of clips embedded in a single forward pass of the model
+    batch_size: int = settings.EMBEDDING_BATCH_SIZE
+    # Number of videos decoded in parallel, each one in a single pass
+    decode_workers: int = settings.EMBEDDING_DECODE_WORKERS
 
     @model_validator(mode="before")
     @classmethod
@@ -75,6 +85,89 @@ class vCLIPEmbeddings(BaseModel, Embeddings):
 
         return video_features
 
+    def _decode_video(
+        self,
+        path: str,
+        positions: List[int],
+        clips: List[VideoClip],
+        frames_queue: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        for idx, frames in decode_clips(path, clips, self.model.num_frm):
+            item = (positions[idx], [Image.fromarray(frame) for frame in frames])
+            while not stop.is_set():
+                try:
+                    frames_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+
+    def embed_video_clips(self, clips: List[VideoClip]) -> List[List[float]]:
+        """
+        Embed many clips in batches of `batch_size` clips. Each video is decoded in a single
+        pass (one thread per video, up to `decode_workers`), which hands sampled frames of
+        every clip to the embedding loop through a bounded queue. Decoding thus overlaps
+        with embedding, and at most a few batches of frames are held in memory.
+
+        Args:
+            clips (list) : Clips to embed
+
+        Returns:
+            video_features (list) : One embedding per clip, in the order of `clips`
+        """
+        videos: Dict[str, List[int]] = {}
+        for position, clip in enumerate(clips):
+            videos.setdefault(clip.path, []).append(position)
+
+        video_features: List[Any] = [None] * len(clips)
+        frames_queue: queue.Queue = queue.Queue(maxsize=2 * self.batch_size)
+        stop = threading.Event()
+
+        def embed_batch(batch: list) -> None:
+            with torch.no_grad():
+                embeddings_tensor = self.model.get_video_embeddings([frames for _, frames in batch])
+            for (position, _), embedding in zip(batch, embeddings_tensor.tolist()):
+                video_features[position] = embedding
+
+        with ThreadPoolExecutor(max_workers=self.decode_workers) as pool:
+            futures = [
+                pool.submit(
+                    self._decode_video,
+                    path,
+                    positions,
+                    [clips[position] for position in positions],
+                    frames_queue,
+                    stop,
+                )
+                for path, positions in videos.items()
+            ]
+            try:
+                batch: list = []
+                embedded = 0
+                while embedded < len(clips):
+                    try:
+                        batch.append(frames_queue.get(timeout=0.1))
+                    except queue.Empty:
+                        # Surface decoding errors instead of waiting on clips which never come
+                        for future in futures:
+                            if future.done() and future.exception() is not None:
+                                raise future.exception()
+                        if all(future.done() for future in futures) and frames_queue.empty():
+                            raise Exception(Strings.video_open_error)
+                        continue
+
+                    if len(batch) == self.batch_size or embedded + len(batch) == len(clips):
+                        embed_batch(batch)
+                        embedded += len(batch)
+                        batch = []
+                        logger.debug(f"Embedded {embedded}/{len(clips)} clips")
+            finally:
+                stop.set()
+
+        return video_features
+
     def load_video_for_vclip(self, vid_path, num_frm=4, **kwargs):
         # Load video with VideoReader
         import decord
@@ -83,11 +176,11 @@ class vCLIPEmbeddings(BaseModel, Embeddings):
         vr = VideoReader(vid_path, ctx=cpu(0))
         fps = vr.get_avg_fps()
         num_frames = len(vr)
-        start_idx = int(fps * kwargs.get("start_time", [0])[0])
-        end_idx = start_idx + int(fps * kwargs.get("clip_duration", [num_frames])[0])
-
-        frame_idx = np.linspace(
-            start_idx, end_idx, num=num_frm, endpoint=False, dtype=int
+        frame_idx = sample_frame_indices(
+            fps,
+            kwargs.get("start_time", [0])[0],
+            kwargs.get("clip_duration", [num_frames])[0],
+            num_frm,
         )  # Uniform sampling
         clip_images = []
 
@@ -1,13 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
 from langchain_core.embeddings import Embeddings
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
-from src.common import Strings
+from src.common import Strings, settings
+from src.core.util import VideoClip
 from src.logger import logger
 
 
@@ -17,17 +20,64 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
     api_url: str
     model_name: str
     num_frames: int
+    # Max number of requests sent to the embedding service in parallel
+    max_concurrency: int = settings.MULTIMODAL_EMBEDDING_MAX_CONCURRENCY
+    timeout: float = settings.MULTIMODAL_EMBEDDING_TIMEOUT
+
+    # Connection pools reused across calls
+    _session: requests.Session = PrivateAttr(default_factory=requests.Session)
+    _async_client: Optional[httpx.AsyncClient] = PrivateAttr(default=None)
+    _async_client_loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+
+    def _video_request(self, path: str, start_time: float, clip_duration: float) -> dict:
+        segment_config = {
+            "startOffsetSec": start_time,
+            "clip_duration": clip_duration,
+            "num_frames": self.num_frames,
+        }
+        logger.debug(f"Segment config for {path}: {segment_config}")
+        return {
+            "model": self.model_name,
+            "input": {
+                "type": "video_file",
+                "video_path": path,
+                "segment_config": segment_config,
+            },
+            "encoding_format": "float",
+        }
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # An AsyncClient is bound to the event loop it was first used in
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._session.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         logger.debug(f"Embedding documents: {texts}")
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}",
                 json={
                     "model": self.model_name,
                     "input": {"type": "text", "text": texts},
                     "encoding_format": "float",
                 },
+                timeout=self.timeout,
             )
             logger.debug(f"Response status code: {response.status_code}")
             response.raise_for_status()
@@ -41,13 +91,14 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
     def embed_query(self, text: str) -> List[float]:
         logger.debug(f"Embedding query: {text}")
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}",
                 json={
                     "model": self.model_name,
                     "input": {"type": "text", "text": text},
                     "encoding_format": "float",
                 },
+                timeout=self.timeout,
             )
             logger.debug(f"Response status code: {response.status_code}")
             response.raise_for_status()
@@ -63,23 +114,12 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
         try:
             video_features = []
             for path in paths:
-                segment_config = {
-                    "startOffsetSec": kwargs["start_time"][0],
-                    "clip_duration": kwargs["clip_duration"][0],
-                    "num_frames": self.num_frames,
-                }
-                logger.debug(f"Segment config for {path}: {segment_config}")
-                response = requests.post(
+                response = self._session.post(
                     f"{self.api_url}",
-                    json={
-                        "model": self.model_name,
-                        "input": {
-                            "type": "video_file",
-                            "video_path": path,
-                            "segment_config": segment_config,
-                        },
-                        "encoding_format": "float",
-                    },
+                    json=self._video_request(
+                        path, kwargs["start_time"][0], kwargs["clip_duration"][0]
+                    ),
+                    timeout=self.timeout,
                 )
                 logger.debug(f"Response status code: {response.status_code}")
                 response.raise_for_status()
@@ -90,3 +130,43 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
         except requests.RequestException as ex:
             logger.error(f"Error in embed_video: {ex}")
             raise Exception(Strings.embedding_error) from ex
+
+    def embed_video_clips(self, clips: List[VideoClip]) -> List[List[float]]:
+        """Synchronous counterpart of `aembed_video_clips`, sending one request at a time."""
+        video_features = []
+        for clip in clips:
+            video_features.extend(
+                self.embed_video(
+                    [clip.path], start_time=[clip.start_time], clip_duration=[clip.clip_duration]
+                )
+            )
+        return video_features
+
+    async def aembed_video_clips(self, clips: List[VideoClip]) -> List[List[float]]:
+        """
+        Embed many clips with up to `max_concurrency` requests in flight over a pooled
+        async HTTP client.
+
+        Args:
+            clips (list) : Clips to embed
+
+        Returns:
+            video_features (list) : One embedding per clip, in the order of `clips`
+        """
+        client = self._get_async_client()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_clip(clip: VideoClip) -> List[float]:
+            async with semaphore:
+                response = await client.post(
+                    f"{self.api_url}",
+                    json=self._video_request(clip.path, clip.start_time, clip.clip_duration),
+                )
+            response.raise_for_status()
+            return response.json()["embedding"]
+
+        try:
+            return list(await asyncio.gather(*(embed_clip(clip) for clip in clips)))
+        except httpx.HTTPError as ex:
+            logger.error(f"Error in aembed_video_clips: {ex}")
+            raise Exception(Strings.embedding_error) from ex
@@ -5,9 +5,10 @@ import io
 import os
 import pathlib
 from http import HTTPStatus
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 from minio import Minio
+from minio.datatypes import Object
 from minio.error import S3Error
 
 from src.common import DataPrepException, Strings
@@ -115,30 +116,14 @@ class MinioClient:
             Exception: If listing objects fails
         """
         try:
-            # First get all objects to identify directories
-            all_objects = list(self.client.list_objects(bucket_name, recursive=True))
-
-            # Extract unique directories (video_ids)
-            directories = set()
-            for obj in all_objects:
+            # Group videos by their top level directory (video_id) in a single pass
+            directories: dict[str, List[str]] = {}
+            for obj in self.client.list_objects(bucket_name, recursive=True):
                 path = pathlib.Path(obj.object_name)
-                if len(path.parts) > 1:  # Has at least one directory component
-                    directories.add(path.parts[0])
-
-            # For each directory, find videos
-            result = []
-            for directory in directories:
-                videos = []
-                for obj in all_objects:
-                    if obj.object_name.startswith(
-                        f"{directory}/"
-                    ) and obj.object_name.lower().endswith(".mp4"):
-                        videos.append(pathlib.Path(obj.object_name).name)
-
-                if videos:  # Only include directories that have videos
-                    result.append((directory, videos))
+                if len(path.parts) > 1 and obj.object_name.lower().endswith(".mp4"):
+                    directories.setdefault(path.parts[0], []).append(path.name)
 
-            return result
+            return list(directories.items())
         except S3Error as ex:
             logger.error(f"Error listing directories in bucket {bucket_name}: {ex}")
             raise Exception(f"Error listing video directories in bucket {bucket_name}: {ex}")
@@ -173,51 +158,94 @@ class MinioClient:
             logger.error(f"Error getting video in directory {video_id}: {ex}")
             raise Exception(f"Error getting video in directory {video_id}: {ex}")
 
-    def download_video_stream(self, bucket_name: str, object_name: str) -> Optional[io.BytesIO]:
-        """Download a video file as a stream.
+    def download_video_to_file(
+        self, bucket_name: str, object_name: str, file_path: str | pathlib.Path
+    ) -> pathlib.Path:
+        """Download a video file straight to disk, streaming it in parts, without holding
+        it in memory.
 
         Args:
             bucket_name (str): The bucket containing the video
             object_name (str): The object name (path) of the video
+            file_path (str | Path): Local path to write the video to
 
         Returns:
-            Optional[io.BytesIO]: BytesIO stream containing the video data
+            pathlib.Path: Path of the downloaded file
 
         Raises:
             Exception: If getting the object fails
         """
         try:
-            response = self.client.get_object(bucket_name, object_name)
-            data = io.BytesIO()
-            for d in response.stream(32 * 1024):
-                data.write(d)
-            data.seek(0)
-            response.close()
-            response.release_conn()
-            return data
+            self.client.fget_object(bucket_name, object_name, str(file_path))
+            return pathlib.Path(file_path)
         except S3Error as ex:
             logger.error(f"Error downloading video {object_name} from bucket {bucket_name}: {ex}")
             raise Exception(f"Error downloading video: {ex}")
 
-    def get_object_size(self, bucket_name: str, object_name: str) -> int:
-        """Get the size of an object in bytes.
+    def get_object_stat(self, bucket_name: str, object_name: str) -> Optional[Object]:
+        """Get size, ETag and last modified time of an object with a single HEAD request.
 
         Args:
             bucket_name (str): The bucket containing the object
-            object_name (str): The object name
+            object_name (str): The object name (path)
 
         Returns:
-            int: Size of the object in bytes
+            Optional[Object]: Object stats, or None if the object does not exist
 
         Raises:
             Exception: If getting the object stats fails
         """
         try:
-            obj_stat = self.client.stat_object(bucket_name, object_name)
-            return obj_stat.size
+            return self.client.stat_object(bucket_name, object_name)
+        except S3Error as ex:
+            if ex.code in ("NoSuchKey", "NoSuchObject", "NoSuchBucket"):
+                return None
+            logger.error(f"Error getting stats of {object_name} from bucket {bucket_name}: {ex}")
+            raise Exception(f"Error getting object stats: {ex}")
+
+    def stream_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = 1024 * 1024,
+    ) -> Iterator[bytes]:
+        """Stream a byte range of an object in fixed-size chunks, without buffering it.
+
+        The object is requested before returning, so that errors are raised to the caller
+        rather than in the middle of a response. Connection is released once the returned
+        iterator is exhausted or closed.
+
+        Args:
+            bucket_name (str): The bucket containing the object
+            object_name (str): The object name (path)
+            offset (int, optional): Start of the byte range. Defaults to 0.
+            length (int, optional): Length of the byte range, 0 for till the end. Defaults to 0.
+            chunk_size (int, optional): Size of the chunks to read. Defaults to 1 MiB.
+
+        Returns:
+            Iterator[bytes]: Chunks of the requested byte range
+
+        Raises:
+            Exception: If getting the object fails
+        """
+        try:
+            response = self.client.get_object(
+                bucket_name, object_name, offset=offset, length=length
+            )
         except S3Error as ex:
-            logger.error(f"Error getting size of {object_name} from bucket {bucket_name}: {ex}")
-            raise Exception(f"Error getting object size: {ex}")
+            logger.error(f"Error streaming video {object_name} from bucket {bucket_name}: {ex}")
+            raise Exception(f"Error streaming video: {ex}")
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                yield from response.stream(chunk_size)
+            finally:
+                response.close()
+                response.release_conn()
+
+        return chunks()
 
     def list_all_videos(self, bucket_name: str) -> List[dict]:
         """List all videos in the bucket with one video per video_id directory.
@@ -233,12 +261,9 @@ class MinioClient:
             Exception: If listing objects fails
         """
         try:
-            # Get all objects in the bucket
-            all_objects = list(self.client.list_objects(bucket_name, recursive=True))
-
             # Find video files (expecting one video per directory)
             result = []
-            for obj in all_objects:
+            for obj in self.client.list_objects(bucket_name, recursive=True):
                 # Check if it's a video file (.mp4)
                 if obj.object_name.lower().endswith(".mp4"):
                     # Parse the path to get video_id and video_name
@@ -246,17 +271,13 @@ class MinioClient:
 
                     # Only process if the path has a directory structure (video_id/filename)
                     if len(path.parts) > 1:
-                        video_id = path.parts[0]
-                        video_name = path.name
-
-                        # Get metadata including creation timestamp
-                        metadata = self.get_object_metadata(bucket_name, obj.object_name)
-
                         video_info = {
-                            "video_id": video_id,
-                            "video_name": video_name,
+                            "video_id": path.parts[0],
+                            "video_name": path.name,
                             "video_path": obj.object_name,
-                            "creation_ts": metadata["creation_time"],
+                            # Listing already has the last modified time of every object, no
+                            # need for a stat call per video. Seconds precision, same as stat.
+                            "creation_ts": obj.last_modified.replace(microsecond=0).isoformat(),
                         }
 
                         result.append(video_info)
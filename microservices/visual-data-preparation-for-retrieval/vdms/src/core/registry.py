@@ -0,0 +1,190 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from typing import Any, Optional
+
+from PIL import Image
+
+from src.common import Settings, Strings
+from src.core.db import VDMSClient
+from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
+from src.core.util import read_config
+from src.core.vclip import vCLIP
+from src.logger import logger
+from src.schema import ReadinessResponse, ReadinessStatusEnum
+
+
+class ResourceRegistry:
+    """
+    Application scoped holder for the resources which are expensive to create: the app config,
+    the embedding model (local vCLIP or the multimodal embedding service wrapper) and the VDMS
+    client along with its LangChain vector store.
+
+    Resources are created once at startup and shared by all requests. The VDMS client is
+    recreated lazily if a request marks it as broken with `reset_vdms_client()`.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.config: Optional[dict] = None
+        self.embedding_model: Any = None
+        self.vdms_client: Optional[VDMSClient] = None
+        self.ready: bool = False
+        self.error: Optional[str] = None
+
+        self._warmed_up = False
+        self._init_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._init_thread: Optional[threading.Thread] = None
+
+    def load_config(self) -> dict:
+        """Read app config once. Config is needed even if model or DB are not available yet."""
+        if self.config is None:
+            config = read_config(self.settings.CONFIG_FILEPATH, type="yaml")
+            if config is None:
+                raise Exception(Strings.config_error)
+            self.config = config
+        return self.config
+
+    def _create_embedding_model(self, config: dict) -> Any:
+        if self.settings.MULTIMODAL_EMBEDDING_ENDPOINT:
+            logger.info("Using multimodal embedding service for video embeddings . . .")
+            return vCLIPEmbeddingsWrapper(
+                api_url=self.settings.MULTIMODAL_EMBEDDING_ENDPOINT,
+                model_name=self.settings.MULTIMODAL_EMBEDDING_MODEL_NAME,
+                num_frames=self.settings.MULTIMODAL_EMBEDDING_NUM_FRAMES,
+            )
+
+        model = vCLIP(config["embeddings"])
+        model.eval()
+        return model
+
+    def _create_vdms_client(self) -> VDMSClient:
+        config = self.load_config()
+        return VDMSClient(
+            host=self.settings.VDMS_VDB_HOST,
+            port=self.settings.VDMS_VDB_PORT,
+            collection_name=self.settings.DB_COLLECTION,
+            model=self.embedding_model,
+            embedding_dimensions=config["embeddings"]["vector_dimensions"],
+        )
+
+    def warm_up(self) -> None:
+        """
+        Run one small inference so that lazy initialization inside the model (weights
+        placement, kernel selection, thread pools) is not paid by the first ingestion request.
+        For the embedding service, this verifies that the service is reachable.
+        """
+        logger.info("Warming up embedding model . . .")
+        if isinstance(self.embedding_model, vCLIPEmbeddingsWrapper):
+            self.embedding_model.embed_query("warm up")
+            return
+
+        import torch
+
+        with torch.no_grad():
+            self.embedding_model.get_text_embeddings(["warm up"])
+            self.embedding_model.get_video_embeddings([[Image.new("RGB", (224, 224))]])
+
+    def initialize(self) -> None:
+        """
+        Create the embedding model and VDMS client, if not created already, and warm up
+        the model. Safe to call concurrently and repeatedly.
+
+        Raises:
+            Exception: If any resource could not be created. Readiness state keeps the error.
+        """
+        if self.ready:
+            return
+
+        with self._init_lock:
+            if self.ready:
+                return
+            try:
+                config = self.load_config()
+                if self.embedding_model is None:
+                    self.embedding_model = self._create_embedding_model(config)
+                if self.settings.MODEL_WARMUP and not self._warmed_up:
+                    self.warm_up()
+                    self._warmed_up = True
+                if self.vdms_client is None:
+                    self.vdms_client = self._create_vdms_client()
+                self.ready = True
+                self.error = None
+                logger.info("Embedding model and VDMS client are ready.")
+            except Exception as ex:
+                self.error = str(ex)
+                logger.error(f"Error initializing resources: {ex}")
+                raise
+
+    def _initialize_with_retry(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.initialize()
+                return
+            except Exception:
+                logger.info(
+                    f"Retrying resource initialization in {self.settings.RESOURCE_INIT_RETRY_INTERVAL}s . . ."
+                )
+                self._stop.wait(self.settings.RESOURCE_INIT_RETRY_INTERVAL)
+
+    def start(self) -> None:
+        """
+        Initialize resources in a background thread, retrying until successful, so that the
+        API server starts accepting requests (and answering health probes) right away.
+        """
+        if self._init_thread is not None and self._init_thread.is_alive():
+            return
+        self._stop.clear()
+        self._init_thread = threading.Thread(
+            target=self._initialize_with_retry, name="resource-registry-init", daemon=True
+        )
+        self._init_thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._init_thread is not None:
+            self._init_thread.join(timeout=1)
+        self.vdms_client = None
+        self.ready = False
+
+    async def aclose(self) -> None:
+        """Stop initialization and release pooled connections of the embedding service client."""
+        self.shutdown()
+        if isinstance(self.embedding_model, vCLIPEmbeddingsWrapper):
+            await self.embedding_model.aclose()
+
+    def get_vdms_client(self) -> VDMSClient:
+        """
+        Returns the shared VDMS client, initializing resources on the calling thread if
+        background initialization has not finished or the client was reset.
+        """
+        self.initialize()
+        return self.vdms_client
+
+    def reset_vdms_client(self) -> None:
+        """Drop the shared VDMS client, e.g. after a connection error. Next use reconnects."""
+        with self._init_lock:
+            self.vdms_client = None
+            self.ready = False
+
+    def readiness(self) -> ReadinessResponse:
+        if self.ready:
+            status = ReadinessStatusEnum.ready
+        elif self.error:
+            status = ReadinessStatusEnum.error
+        else:
+            status = ReadinessStatusEnum.initializing
+
+        if self.settings.MULTIMODAL_EMBEDDING_ENDPOINT:
+            model_name = self.settings.MULTIMODAL_EMBEDDING_MODEL_NAME
+        else:
+            model_name = (self.config or {}).get("embeddings", {}).get("vclip_model_name")
+
+        return ReadinessResponse(
+            status=status,
+            model=model_name,
+            embedding_service=bool(self.settings.MULTIMODAL_EMBEDDING_ENDPOINT),
+            detail=self.error,
+        )
@@ -2,15 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import datetime
-import io
+import email.utils
 import json
 import os
 import pathlib
+import re
 import shutil
 import tempfile
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import cv2
+import numpy as np
 import yaml
 from tzlocal import get_localzone
 
@@ -20,6 +22,17 @@ from src.logger import logger
 
 settings = Settings()
 
+# Single byte range of a HTTP Range header. Multiple ranges are not supported.
+RANGE_HEADER_PATTERN = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class VideoClip(NamedTuple):
+    """A clip of a video file to be embedded, as described by an entry of the metadata file."""
+
+    path: str
+    start_time: float
+    clip_duration: float
+
 
 def sanitize_input(input: str) -> str | None:
     """Takes an string input and strips whitespaces. Returns None if
@@ -53,26 +66,6 @@ def read_config(config_file: str | pathlib.Path, type: str = "yaml") -> dict | N
     return config
 
 
-def save_video_to_temp(data: io.BytesIO, filename: str, temp_dir: str) -> pathlib.Path:
-    """Save the video data to a temporary directory.
-
-    Args:
-        data (io.BytesIO): The video data
-        filename (str): The filename to use
-        temp_dir (str): The directory path string where videofile needs to be temporarily saved
-
-    Returns:
-        pathlib.Path: Path to the saved file
-    """
-    temp_file = pathlib.Path(temp_dir) / filename
-    temp_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(temp_file, "wb") as file:
-        file.write(data.read())
-
-    return temp_file
-
-
 def get_minio_client() -> MinioClient:
     """Get a configured Minio client instance.
 
@@ -102,18 +95,19 @@ def get_minio_client() -> MinioClient:
         raise DataPrepException(status_code=500, msg=Strings.minio_conn_error)
 
 
-def get_video_from_minio(
-    bucket_name: str, video_id: str, video_name: Optional[str] = None
-) -> Tuple[io.BytesIO, str]:
-    """Get video data from Minio storage.
+def download_video_from_minio(
+    bucket_name: str, video_id: str, temp_dir: str | pathlib.Path, video_name: Optional[str] = None
+) -> pathlib.Path:
+    """Download a video from Minio storage straight to a file in a temporary directory.
 
     Args:
         bucket_name (str): The bucket containing the video
         video_id (str): The directory (video_id) containing the video
+        temp_dir (str | Path): The directory where video file needs to be temporarily saved
         video_name (Optional[str], optional): Specific video filename. If None, first video found is used.
 
     Returns:
-        Tuple[io.BytesIO, str]: Tuple containing the video data and the video filename
+        pathlib.Path: Path of the downloaded video file, named after the video filename
 
     Raises:
         DataPrepException: If video not found or other Minio error occurs
@@ -134,16 +128,13 @@ def get_video_from_minio(
             logger.error(f"No video found in directory {video_id}")
             raise DataPrepException(status_code=404, msg=Strings.video_id_not_found)
 
-        # Get the video data
-        data = minio_client.download_video_stream(bucket_name, object_name)
-        if not data:
-            logger.error(f"Failed to download video {object_name}")
-            raise DataPrepException(status_code=404, msg=Strings.minio_file_not_found)
-
         # Extract just the filename part
         filename = pathlib.Path(object_name).name
+        temp_file = pathlib.Path(temp_dir) / filename
+        temp_file.parent.mkdir(parents=True, exist_ok=True)
 
-        return data, filename
+        # Stream the video to disk
+        return minio_client.download_video_to_file(bucket_name, object_name, temp_file)
     except DataPrepException as ex:
         # Re-raise DataPrepException directly
         raise ex
@@ -152,6 +143,93 @@ def get_video_from_minio(
         raise DataPrepException(status_code=500, msg=Strings.minio_error)
 
 
+def parse_range_header(range_header: str, total_size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single byte range of a HTTP Range header, e.g. `bytes=0-1023`, `bytes=1024-`
+    or `bytes=-500` (last 500 bytes).
+
+    Args:
+        range_header (str): Value of the Range header
+        total_size (int): Size of the resource in bytes
+
+    Returns:
+        Optional[Tuple[int, int]]: First and last byte positions (inclusive), or None if the
+            header is malformed or has multiple ranges, in which case it should be ignored
+
+    Raises:
+        ValueError: If the range can not be satisfied for a resource of `total_size` bytes
+    """
+    match = RANGE_HEADER_PATTERN.match(range_header)
+    if not match or not any(match.groups()):
+        return None
+
+    start, end = match.groups()
+    if not start:
+        # Suffix range, i.e. last N bytes
+        suffix_length = int(end)
+        if suffix_length == 0 or total_size == 0:
+            raise ValueError(f"Range '{range_header}' not satisfiable")
+        return max(total_size - suffix_length, 0), total_size - 1
+
+    start_byte = int(start)
+    end_byte = int(end) if end else total_size - 1
+    if end and start_byte > end_byte:
+        return None
+    if start_byte >= total_size:
+        raise ValueError(f"Range '{range_header}' not satisfiable")
+    return start_byte, min(end_byte, total_size - 1)
+
+
+def _parse_http_date(value: str) -> Optional[datetime.datetime]:
+    try:
+        return email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: datetime.datetime,
+) -> bool:
+    """Evaluate the conditional request headers of a GET/HEAD request (RFC 9110, 13.2.2).
+
+    Returns:
+        bool: True if a 304 Not Modified response should be sent
+    """
+    if if_none_match:
+        return _etag_matches(if_none_match, etag)
+    if if_modified_since:
+        since = _parse_http_date(if_modified_since)
+        if since is not None:
+            return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def if_range_matches(if_range: Optional[str], etag: str, last_modified: datetime.datetime) -> bool:
+    """Evaluate an If-Range header. If it does not match, the Range header must be ignored
+    and the full resource sent.
+    """
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return _etag_matches(if_range, etag, weak=False)
+    since = _parse_http_date(if_range)
+    return since is not None and last_modified.replace(microsecond=0) == since
+
+
 def get_video_fps_and_frames(video_local_path: pathlib.Path) -> tuple[float, int]:
     """
     Open the video file and get fps and total frames in video
@@ -174,6 +252,97 @@ def get_video_fps_and_frames(video_local_path: pathlib.Path) -> tuple[float, int
     return fps, total_frames
 
 
+def sample_frame_indices(
+    fps: float, start_time: float, clip_duration: float, num_frames: int
+) -> np.ndarray:
+    """
+    Uniformly sample `num_frames` frame numbers from a clip of the video.
+
+    Args:
+        fps (float) : Frames/sec value for the video
+        start_time (float) : Start time of the clip in seconds
+        clip_duration (float) : Duration of the clip in seconds
+        num_frames (int) : Number of frames to sample
+
+    Returns:
+        frame_idx (np.ndarray) : Frame numbers, in increasing order
+    """
+    start_idx = int(fps * start_time)
+    end_idx = start_idx + int(fps * clip_duration)
+    return np.linspace(start_idx, end_idx, num=num_frames, endpoint=False, dtype=int)
+
+
+def decode_clips(
+    video_path: str | pathlib.Path, clips: List[VideoClip], num_frames: int
+) -> Iterator[Tuple[int, List[np.ndarray]]]:
+    """
+    Walks the video once and yields sampled RGB frames for each of the clips, as soon as the
+    last sampled frame of a clip is decoded. Frames which are not sampled by any clip are only
+    grabbed (no color conversion or copy), and only frames of clips which are not complete
+    yet are held in memory.
+
+    Args:
+        video_path (str | Path) : Path of the video file
+        clips (list) : Clips of this video to sample frames from
+        num_frames (int) : Number of frames to sample per clip
+
+    Yields:
+        (position, frames) (tuple) : Position of the clip in `clips` and its sampled frames
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise Exception(Strings.video_open_error)
+
+    try:
+        fps: float = cap.get(cv2.CAP_PROP_FPS)
+
+        # frame number -> (clip position, frame slot) of the clips sampling that frame
+        wanted: Dict[int, List[Tuple[int, int]]] = {}
+        for position, clip in enumerate(clips):
+            for slot, frame_idx in enumerate(
+                sample_frame_indices(fps, clip.start_time, clip.clip_duration, num_frames)
+            ):
+                wanted.setdefault(int(frame_idx), []).append((position, slot))
+
+        buffers: Dict[int, List[Optional[np.ndarray]]] = {}
+        remaining: Dict[int, int] = {position: num_frames for position in range(len(clips))}
+        last_frame: Optional[np.ndarray] = None
+        last_wanted = max(wanted, default=-1)
+
+        frame_idx = 0
+        while frame_idx <= last_wanted:
+            if frame_idx not in wanted:
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                continue
+
+            ok, frame = cap.read()
+            if not ok:
+                break
+            last_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            for position, slot in wanted.pop(frame_idx):
+                buffers.setdefault(position, [None] * num_frames)[slot] = last_frame
+                remaining[position] -= 1
+                if remaining[position] == 0:
+                    del remaining[position]
+                    yield position, buffers.pop(position)
+            frame_idx += 1
+
+        # Frame count in the container can be more than the frames which can be decoded.
+        # Clips running past the end are completed with the last decoded frame.
+        if remaining and last_frame is None:
+            raise Exception(Strings.video_open_error)
+        for position in sorted(remaining):
+            frames = buffers.pop(position, [None] * num_frames)
+            for slot in range(num_frames):
+                if frames[slot] is None:
+                    frames[slot] = frames[slot - 1] if slot > 0 else last_frame
+            yield position, frames
+    finally:
+        cap.release()
+
+
 def extract_video_metadata(
     temp_video_path: pathlib.Path,
     bucket_name: str,
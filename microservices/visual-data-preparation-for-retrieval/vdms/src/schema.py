@@ -12,6 +12,12 @@ class StatusEnum(str, Enum):
     error = "error"
 
 
+class ReadinessStatusEnum(str, Enum):
+    ready = "ready"
+    initializing = "initializing"
+    error = "error"
+
+
 class DataPrepResponse(BaseModel):
     """Response model for API Responses from DataStore service"""
 
@@ -83,3 +89,15 @@ class FileListResponse(DataPrepResponse):
 
     bucket_name: str
     files: Optional[List[str]]
+
+
+class ReadinessResponse(BaseModel):
+    """Response model for readiness of the shared embedding model and VDMS connection"""
+
+    status: ReadinessStatusEnum
+    model: Annotated[Optional[str], Field(description="Name of the embedding model in use")] = None
+    embedding_service: Annotated[
+        bool,
+        Field(description="Whether embeddings are created by the multimodal embedding service"),
+    ] = False
+    detail: Annotated[Optional[str], Field(description="Last initialization error, if any")] = None
@@ -1,7 +1,6 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import io
 import pathlib
 from unittest.mock import MagicMock
 
@@ -52,11 +51,6 @@ def mock_minio_client():
     ]
     mock_client.get_video_in_directory.return_value = "video1/file1.mp4"
 
-    # Create a mock binary stream
-    mock_stream = io.BytesIO(b"test video content")
-    mock_client.download_video_stream.return_value = mock_stream
-    mock_client.get_object_size.return_value = 1000
-
     # Handle client directly for some operations
     mock_client.client = MagicMock()
     mock_client.client.put_object.return_value = None
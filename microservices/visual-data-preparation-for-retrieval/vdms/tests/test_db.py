@@ -6,6 +6,8 @@ import pytest
 import src.core.db
 import src.core.embedding
 from src.core.db import VDMSClient
+from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
+from src.core.util import VideoClip
 
 
 @pytest.fixture
@@ -61,15 +63,52 @@ def test_store_embedding(vdms_client, mocker, tmp_path):
     """
     Test create_embedding methods of VDMSClient
     """
-    mock_data = {"video_temp_path": tmp_path, "timestamp": "time", "clip_duration": 30}
-    mock_metadata = {"video": mock_data}
-    paths = [mock_data["video_temp_path"]]
+    mock_data = {"video_temp_path": str(tmp_path), "timestamp": 0.0, "clip_duration": 10.0}
+    mock_data_next = {"video_temp_path": str(tmp_path), "timestamp": 30.0, "clip_duration": 10.0}
+    mock_metadata = {"video_0": dict(mock_data), "video_1": dict(mock_data_next)}
     mocker.patch("src.core.db.read_config", return_value=mock_metadata)
-    vdms_client.store_embeddings()
+    vdms_client.video_embedder = mocker.MagicMock()
+    vdms_client.video_embedder.embed_video_clips.return_value = [[0.1], [0.2]]
+    vdms_client.video_db.add_from.side_effect = lambda **kwargs: kwargs["ids"]
+
+    ids = vdms_client.store_embeddings()
+
     src.core.db.read_config.assert_called_once_with(vdms_client.video_metadata_path, type="json")
-    vdms_client.video_db.add_videos.assert_called_once_with(
-        metadatas=[mock_data],
-        paths=paths,
-        start_time=[mock_data["timestamp"]],
-        clip_duration=[mock_data["clip_duration"]],
+    # All clips are embedded in one batch
+    vdms_client.video_embedder.embed_video_clips.assert_called_once_with(
+        [
+            VideoClip(str(tmp_path), 0.0, 10.0),
+            VideoClip(str(tmp_path), 30.0, 10.0),
+        ]
     )
+    # All embeddings are added in one transaction
+    vdms_client.video_db.add_from.assert_called_once()
+    kwargs = vdms_client.video_db.add_from.call_args.kwargs
+    assert kwargs["embeddings"] == [[0.1], [0.2]]
+    assert kwargs["batch_size"] == 2
+    assert kwargs["metadatas"][0] == {
+        "timestamp": 0.0,
+        "clip_duration": 10.0,
+        "video_path": str(tmp_path),
+    }
+    assert ids == kwargs["ids"]
+
+
+@pytest.mark.asyncio
+async def test_astore_embedding_with_embedding_service(vdms_client, mocker, tmp_path):
+    """
+    Test that the embedding service is called asynchronously for all clips
+    """
+    mock_data = {"video_temp_path": str(tmp_path), "timestamp": 0.0, "clip_duration": 10.0}
+    mocker.patch("src.core.db.read_config", return_value={"video_0": mock_data})
+    wrapper = vCLIPEmbeddingsWrapper(api_url="http://embedding", model_name="model", num_frames=8)
+    mocker.patch.object(
+        vCLIPEmbeddingsWrapper, "aembed_video_clips", mocker.AsyncMock(return_value=[[0.1]])
+    )
+    vdms_client.video_embedder = wrapper
+    vdms_client.video_db.add_from.side_effect = lambda **kwargs: kwargs["ids"]
+
+    ids = await vdms_client.astore_embeddings()
+
+    wrapper.aembed_video_clips.assert_awaited_once_with([VideoClip(str(tmp_path), 0.0, 10.0)])
+    assert len(ids) == 1
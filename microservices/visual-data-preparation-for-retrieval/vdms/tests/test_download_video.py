@@ -1,67 +1,168 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import io
+import datetime
 from http import HTTPStatus
 from unittest.mock import MagicMock
 
+import pytest
+from minio.datatypes import Object
+
 from src.core.minio_client import MinioClient
 
+CONTENT = b"test video content"
+LAST_MODIFIED = datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
 
-def test_download(test_client, mocker):
-    """Test successful download of a video from Minio."""
 
-    # Mock Minio client functionality
-    mock_minio = MagicMock()
-    mock_stream = io.BytesIO(b"test video content")
-    mock_minio.get_video_in_directory.return_value = "test-video-id/test-file.mp4"
-    mock_minio.download_video_stream.return_value = mock_stream
+@pytest.fixture
+def mock_minio(mocker):
+    """Mock Minio client serving CONTENT as the video test-video-id/test-file.mp4"""
+
+    def stream_object(bucket_name, object_name, offset=0, length=0, chunk_size=1024):
+        data = CONTENT[offset : offset + length] if length else CONTENT[offset:]
+        return iter(data[i : i + chunk_size] for i in range(0, len(data), chunk_size))
+
+    minio = MagicMock()
+    minio.validate_object_name.return_value = True
+    minio.get_video_in_directory.return_value = "test-video-id/test-file.mp4"
+    minio.get_object_stat.return_value = Object(
+        "vdms-bucket-test",
+        "test-video-id/test-file.mp4",
+        last_modified=LAST_MODIFIED,
+        etag="abc123",
+        size=len(CONTENT),
+    )
+    minio.stream_object.side_effect = stream_object
+    mocker.patch("src.app.get_minio_client", return_value=minio)
+    return minio
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
-    mocker.patch("src.app.StreamingResponse", return_value={})
+
+def test_download(test_client, mock_minio):
+    """Test successful download of a video from Minio."""
 
     response = test_client.get("/videos/download?video_id=test-video-id")
     assert response.status_code == HTTPStatus.OK
+    assert response.content == CONTENT
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == '"abc123"'
+    assert response.headers["last-modified"] == "Thu, 02 Jan 2025 03:04:05 GMT"
 
 
-def test_download_video_not_found(test_client, mocker):
+def test_download_video_not_found(test_client, mock_minio):
     """Test when video is not found in Minio."""
 
-    # Mock Minio client with no video found
-    mock_minio = MagicMock()
     mock_minio.get_video_in_directory.return_value = None
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
-
     response = test_client.get("/videos/download?video_id=non-existent-id")
     assert response.status_code == HTTPStatus.NOT_FOUND
 
+    mock_minio.get_object_stat.return_value = None
+    response = test_client.get("/test-video-id/missing.mp4")
+    assert response.status_code == HTTPStatus.NOT_FOUND
 
-def test_download_minio_error(test_client, mocker):
-    """Test when Minio service throws an error."""
 
-    # Mock Minio client to throw an exception
-    mock_minio = MagicMock()
-    mock_minio.get_video_in_directory.side_effect = Exception("Minio error")
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+def test_download_minio_error(test_client, mock_minio):
+    """Test when Minio service throws an error."""
 
-    response = test_client.get("/videos/download?video_id=test-video-id")
+    mock_minio.get_object_stat.side_effect = Exception("Minio error")
+    response = test_client.get("/test-video-id/test-file.mp4")
     assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-def test_download_with_range_header(test_client, mocker):
+@pytest.mark.parametrize(
+    "range_header, expected",
+    [
+        ("bytes=0-3", b"test"),
+        ("bytes=5-", b"video content"),
+        ("bytes=-7", b"content"),
+        ("bytes=11-100", b"content"),
+    ],
+)
+def test_download_with_range_header(test_client, mock_minio, range_header, expected):
     """Test video download with HTTP Range header."""
 
-    # Mock Minio client functionality
-    mock_minio = MagicMock()
-    mock_stream = io.BytesIO(b"test video content")
-    mock_minio.get_video_in_directory.return_value = "test-video-id/test-file.mp4"
-    mock_minio.download_video_stream.return_value = mock_stream
-    mock_minio.get_object_size.return_value = 1000
+    response = test_client.get("/test-video-id/test-file.mp4", headers={"Range": range_header})
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == expected
+    assert response.headers["content-length"] == str(len(expected))
+    start = CONTENT.index(expected)
+    assert (
+        response.headers["content-range"]
+        == f"bytes {start}-{start + len(expected) - 1}/{len(CONTENT)}"
+    )
+    # Only the requested range is read from Minio
+    kwargs = mock_minio.stream_object.call_args.kwargs
+    assert (kwargs["offset"], kwargs["length"]) == (start, len(expected))
+
+
+def test_download_range_not_satisfiable(test_client, mock_minio):
+    """Test video download with a range outside of the video."""
+
+    response = test_client.get("/test-video-id/test-file.mp4", headers={"Range": "bytes=100-"})
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    mock_minio.stream_object.assert_not_called()
+
+
+def test_download_if_range(test_client, mock_minio):
+    """Test that a range is ignored if the video changed since If-Range."""
+
+    headers = {"Range": "bytes=0-3", "If-Range": '"abc123"'}
+    response = test_client.get("/test-video-id/test-file.mp4", headers=headers)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+
+    headers["If-Range"] = '"changed"'
+    response = test_client.get("/test-video-id/test-file.mp4", headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == CONTENT
+
+
+def test_download_not_modified(test_client, mock_minio):
+    """Test conditional requests on a video which did not change."""
+
+    response = test_client.get(
+        "/test-video-id/test-file.mp4", headers={"If-None-Match": '"abc123"'}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+
+    response = test_client.get(
+        "/test-video-id/test-file.mp4",
+        headers={"If-Modified-Since": "Thu, 02 Jan 2025 03:04:05 GMT"},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = test_client.get("/test-video-id/test-file.mp4", headers={"If-None-Match": '"other"'})
+    assert response.status_code == HTTPStatus.OK
+    mock_minio.stream_object.assert_called_once()
+
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
-    mocker.patch("src.app.StreamingResponse", return_value={})
+def test_download_head(test_client, mock_minio):
+    """Test HEAD request returns headers without reading the video."""
 
-    # Test with range header
-    headers = {"Range": "bytes=0-499"}
-    response = test_client.get("/videos/download?video_id=test-video-id", headers=headers)
+    response = test_client.head("/test-video-id/test-file.mp4", headers={"Range": "bytes=0-3"})
     assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.headers["content-length"] == "4"
+    assert response.content == b""
+    mock_minio.stream_object.assert_not_called()
+
+
+def test_stream_object_releases_connection():
+    """Test that MinioClient.stream_object reads a byte range in chunks and releases the connection."""
+
+    minio_client = object.__new__(MinioClient)
+    minio_client.client = MagicMock()
+    response = minio_client.client.get_object.return_value
+    response.stream.return_value = iter([b"test", b" vid"])
+
+    chunks = minio_client.stream_object(
+        "bucket", "video/file.mp4", offset=2, length=8, chunk_size=4
+    )
+
+    minio_client.client.get_object.assert_called_once_with(
+        "bucket", "video/file.mp4", offset=2, length=8
+    )
+    assert list(chunks) == [b"test", b" vid"]
+    response.stream.assert_called_once_with(4)
+    response.close.assert_called_once()
+    response.release_conn.assert_called_once()
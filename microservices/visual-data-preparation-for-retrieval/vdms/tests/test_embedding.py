@@ -1,9 +1,17 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import json
+
+import httpx
+import numpy as np
 import pytest
+import torch
 
 from src.core.embedding import vCLIPEmbeddings
+from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
+from src.core.util import VideoClip
+from src.core.vclip import vCLIP
 
 
 def test_validate_environment():
@@ -29,3 +37,96 @@ def test_validate_environment_handle_import_error(mocker):
     mocker.patch("src.core.embedding.ValueError", side_effect=ImportError)
     with pytest.raises(ImportError):
         vCLIPEmbeddings.validate_environment(values)
+
+
+def test_embed_video_clips_batches(mocker):
+    """
+    Test that clips are embedded in batches and embeddings are returned in clip order
+    """
+    model = mocker.MagicMock()
+    model.num_frm = 2
+    model.get_video_embeddings.side_effect = lambda frames_batch: torch.tensor(
+        [[float(frames[0].getpixel((0, 0)))] for frames in frames_batch]
+    )
+    embedder = vCLIPEmbeddings(model=model, batch_size=2, decode_workers=2)
+
+    def mock_decode_clips(path, clips, num_frames):
+        for position, clip in enumerate(clips):
+            yield position, [np.full((2, 2), clip.start_time, dtype=np.uint8)] * num_frames
+
+    mocker.patch("src.core.embedding.decode_clips", side_effect=mock_decode_clips)
+
+    clips = [VideoClip("video.mp4", float(start), 10.0) for start in (0, 30, 60)]
+    clips.append(VideoClip("other.mp4", 90.0, 10.0))
+    embeddings = embedder.embed_video_clips(clips)
+
+    assert sorted(embeddings) == embeddings == [[0.0], [30.0], [60.0], [90.0]]
+    assert model.get_video_embeddings.call_count == 2
+
+
+def test_embed_video_clips_decode_error(mocker):
+    """
+    Test that a decoding error is raised instead of waiting for clips
+    """
+    model = mocker.MagicMock()
+    model.num_frm = 2
+    embedder = vCLIPEmbeddings(model=model)
+    mocker.patch("src.core.embedding.decode_clips", side_effect=Exception("bad video"))
+
+    with pytest.raises(Exception, match="bad video"):
+        embedder.embed_video_clips([VideoClip("video.mp4", 0.0, 10.0)])
+
+
+def test_vclip_video_embeddings_batch(mocker):
+    """
+    Test that a batch of videos gives the same embeddings as embedding videos one at a time
+    """
+    mocker.patch("src.core.vclip.CLIPModel")
+    mocker.patch("src.core.vclip.AutoProcessor")
+    mocker.patch("src.core.vclip.AutoTokenizer")
+    model = vCLIP({"vclip_num_frame": 3, "vclip_model_name": "super-model"})
+    torch.manual_seed(0)
+    frame_features = {idx: torch.randn(8) for idx in range(6)}
+    mocker.patch.object(
+        model,
+        "get_image_embeddings",
+        side_effect=lambda frames: torch.stack([frame_features[frame] for frame in frames]),
+    )
+
+    batch = model.get_video_embeddings([[0, 1, 2], [3, 4, 5]])
+    single = torch.cat(
+        [model.get_video_embeddings([[0, 1, 2]]), model.get_video_embeddings([[3, 4, 5]])]
+    )
+
+    assert batch.shape == (2, 8)
+    assert torch.allclose(batch, single)
+    assert torch.allclose(batch.norm(dim=-1), torch.ones(2))
+
+
+@pytest.mark.asyncio
+async def test_aembed_video_clips(mocker):
+    """
+    Test that all clips are sent to the embedding service over a shared async client
+    """
+    requests = []
+
+    def handler(request):
+        payload = json.loads(request.content)
+        requests.append(payload)
+        return httpx.Response(
+            200, json={"embedding": [payload["input"]["segment_config"]["startOffsetSec"]]}
+        )
+
+    wrapper = vCLIPEmbeddingsWrapper(
+        api_url="http://embedding/embeddings", model_name="m", num_frames=8
+    )
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    mocker.patch.object(vCLIPEmbeddingsWrapper, "_get_async_client", return_value=client)
+
+    clips = [VideoClip("video.mp4", float(start), 10.0) for start in (0, 30, 60)]
+    embeddings = await wrapper.aembed_video_clips(clips)
+
+    assert embeddings == [[0.0], [30.0], [60.0]]
+    assert len(requests) == 3
+    assert requests[0]["input"]["segment_config"]["num_frames"] == 8
+    await client.aclose()
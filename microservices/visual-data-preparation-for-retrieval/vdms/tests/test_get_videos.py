@@ -1,9 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import datetime
 from http import HTTPStatus
 from unittest.mock import MagicMock
 
+from minio.datatypes import Object
+
+from src.core.minio_client import MinioClient
+
+LAST_MODIFIED = datetime.datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)
+
 
 def test_getvideos_list(test_client, mocker):
     """Test successful retrieval of videos list from Minio."""
@@ -11,12 +18,22 @@ def test_getvideos_list(test_client, mocker):
     # Mock MinioClient
     mock_minio = MagicMock()
     mock_minio.ensure_bucket_exists.return_value = None
-    mock_minio.list_video_directories.return_value = [
-        ("video1", ["file1.mp4"]),
-        ("video2", ["file2.mp4", "file3.mp4"]),
+    mock_minio.list_all_videos.return_value = [
+        {
+            "video_id": "video1",
+            "video_name": "file1.mp4",
+            "video_path": "video1/file1.mp4",
+            "creation_ts": "2025-01-02T03:04:05+00:00",
+        },
+        {
+            "video_id": "video2",
+            "video_name": "file2.mp4",
+            "video_path": "video2/file2.mp4",
+            "creation_ts": "2025-01-02T03:04:05+00:00",
+        },
     ]
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+    mocker.patch("src.app.get_minio_client", return_value=mock_minio)
 
     # Test API endpoint
     response = test_client.get("/videos")
@@ -26,12 +43,9 @@ def test_getvideos_list(test_client, mocker):
     response_json = response.json()
     assert response_json["status"] == "success"
     assert response_json["bucket_name"] is not None
-    assert "video_collections" in response_json
-    assert len(response_json["video_collections"]) == 2
-    assert "video1" in response_json["video_collections"]
-    assert "video2" in response_json["video_collections"]
-    assert response_json["video_collections"]["video1"] == ["file1.mp4"]
-    assert len(response_json["video_collections"]["video2"]) == 2
+    assert len(response_json["videos"]) == 2
+    assert response_json["videos"][0]["video_id"] == "video1"
+    assert response_json["videos"][1]["video_path"] == "video2/file2.mp4"
 
 
 def test_getvideos_minio_error(test_client, mocker):
@@ -41,7 +55,7 @@ def test_getvideos_minio_error(test_client, mocker):
     mock_minio = MagicMock()
     mock_minio.ensure_bucket_exists.side_effect = Exception("Minio error")
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+    mocker.patch("src.app.get_minio_client", return_value=mock_minio)
 
     # Test API endpoint
     response = test_client.get("/videos")
@@ -54,19 +68,18 @@ def test_getvideos_empty_bucket(test_client, mocker):
     # Mock MinioClient with empty list
     mock_minio = MagicMock()
     mock_minio.ensure_bucket_exists.return_value = None
-    mock_minio.list_video_directories.return_value = []
+    mock_minio.list_all_videos.return_value = []
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+    mocker.patch("src.app.get_minio_client", return_value=mock_minio)
 
     # Test API endpoint
     response = test_client.get("/videos")
     assert response.status_code == HTTPStatus.OK
 
-    # Verify response content shows empty video collections
+    # Verify response content shows empty video list
     response_json = response.json()
     assert response_json["status"] == "success"
-    assert "video_collections" in response_json
-    assert len(response_json["video_collections"]) == 0
+    assert response_json["videos"] == []
 
 
 def test_getvideos_with_bucket_param(test_client, mocker):
@@ -75,9 +88,9 @@ def test_getvideos_with_bucket_param(test_client, mocker):
     # Mock MinioClient
     mock_minio = MagicMock()
     mock_minio.ensure_bucket_exists.return_value = None
-    mock_minio.list_video_directories.return_value = [("video1", ["file1.mp4"])]
+    mock_minio.list_all_videos.return_value = []
 
-    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+    mocker.patch("src.app.get_minio_client", return_value=mock_minio)
 
     # Test API endpoint with custom bucket
     custom_bucket = "custom-bucket"
@@ -86,4 +99,37 @@ def test_getvideos_with_bucket_param(test_client, mocker):
 
     # Verify bucket was passed correctly
     mock_minio.ensure_bucket_exists.assert_called_once_with(custom_bucket)
-    mock_minio.list_video_directories.assert_called_once_with(custom_bucket)
+    mock_minio.list_all_videos.assert_called_once_with(custom_bucket)
+
+
+def test_list_all_videos_from_listing():
+    """Test that video details are read from the object listing, without a stat call per video."""
+
+    minio_client = object.__new__(MinioClient)
+    minio_client.client = MagicMock()
+    minio_client.client.list_objects.return_value = iter(
+        [
+            Object("bucket", "video1/file1.mp4", last_modified=LAST_MODIFIED),
+            Object("bucket", "video1/notes.txt", last_modified=LAST_MODIFIED),
+            Object("bucket", "file-at-root.mp4", last_modified=LAST_MODIFIED),
+            Object("bucket", "video2/file2.MP4", last_modified=LAST_MODIFIED),
+        ]
+    )
+
+    videos = minio_client.list_all_videos("bucket")
+
+    assert videos == [
+        {
+            "video_id": "video1",
+            "video_name": "file1.mp4",
+            "video_path": "video1/file1.mp4",
+            "creation_ts": "2025-01-02T03:04:05+00:00",
+        },
+        {
+            "video_id": "video2",
+            "video_name": "file2.MP4",
+            "video_path": "video2/file2.MP4",
+            "creation_ts": "2025-01-02T03:04:05+00:00",
+        },
+    ]
+    minio_client.client.stat_object.assert_not_called()
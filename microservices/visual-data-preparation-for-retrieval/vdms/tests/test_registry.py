@@ -0,0 +1,86 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+
+import pytest
+
+import src.core.registry
+from src.common import Settings
+from src.core.registry import ResourceRegistry
+from src.schema import ReadinessStatusEnum
+
+
+@pytest.fixture
+def registry(mocker):
+    """
+    A pytest fixture to create a ResourceRegistry with mocked model and VDMS client
+    """
+    mocker.patch("src.core.registry.vCLIP")
+    mocker.patch("src.core.registry.VDMSClient")
+    mocker.patch.object(ResourceRegistry, "warm_up")
+    return ResourceRegistry(Settings(MULTIMODAL_EMBEDDING_ENDPOINT=""))
+
+
+def test_registry_initialize_once(registry):
+    """
+    Test that model and VDMS client are created only once and shared across calls
+    """
+    assert registry.readiness().status == ReadinessStatusEnum.initializing
+
+    first = registry.get_vdms_client()
+    second = registry.get_vdms_client()
+
+    assert first is second
+    src.core.registry.vCLIP.assert_called_once_with(registry.config["embeddings"])
+    src.core.registry.VDMSClient.assert_called_once()
+    registry.warm_up.assert_called_once()
+    assert registry.readiness().status == ReadinessStatusEnum.ready
+
+
+def test_registry_reset_vdms_client(registry):
+    """
+    Test that a reset VDMS client is reconnected, while the model is reused
+    """
+    registry.get_vdms_client()
+    registry.reset_vdms_client()
+    assert registry.readiness().status == ReadinessStatusEnum.initializing
+
+    registry.get_vdms_client()
+    src.core.registry.vCLIP.assert_called_once()
+    assert src.core.registry.VDMSClient.call_count == 2
+    registry.warm_up.assert_called_once()
+
+
+def test_registry_initialize_error(registry):
+    """
+    Test that an initialization error is reported in readiness and retried on next use
+    """
+    src.core.registry.VDMSClient.side_effect = [Exception("db down"), object()]
+
+    with pytest.raises(Exception):
+        registry.get_vdms_client()
+    readiness = registry.readiness()
+    assert readiness.status == ReadinessStatusEnum.error
+    assert readiness.detail == "db down"
+
+    registry.get_vdms_client()
+    readiness = registry.readiness()
+    assert readiness.status == ReadinessStatusEnum.ready
+    assert readiness.detail is None
+
+
+def test_readiness_endpoint(test_client, mocker):
+    """
+    Test the readiness API for ready and not ready states
+    """
+    mocker.patch("src.app.registry.ready", False)
+    mocker.patch("src.app.registry.error", None)
+    response = test_client.get("/health/ready")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()["status"] == ReadinessStatusEnum.initializing
+
+    mocker.patch("src.app.registry.ready", True)
+    response = test_client.get("/health/ready")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["status"] == ReadinessStatusEnum.ready
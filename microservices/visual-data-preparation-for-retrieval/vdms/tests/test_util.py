@@ -2,12 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import cv2
+import numpy as np
 import pytest
 
 from src.core.util import (
+    VideoClip,
     calculate_intervals,
+    decode_clips,
+    download_video_from_minio,
     extract_video_metadata,
     get_video_fps_and_frames,
+    sample_frame_indices,
     sanitize_input,
 )
 
@@ -81,3 +86,59 @@ def test_calculate_intervals():
         start_frame, end_frame, start_time, end_time = interval
         assert start_frame <= end_frame
         assert start_time <= end_time
+
+
+def test_decode_clips(tmp_path):
+    """
+    Test that a single pass over the video yields the sampled frames of every clip
+    """
+    video_path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    for idx in range(100):
+        writer.write(np.full((24, 32, 3), idx * 2, dtype=np.uint8))
+    writer.release()
+
+    cap = cv2.VideoCapture(video_path)
+    all_frames = []
+    ok, frame = cap.read()
+    while ok:
+        all_frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        ok, frame = cap.read()
+    cap.release()
+
+    # Last clip runs past the end of the 10 sec video
+    clips = [VideoClip(video_path, start, 3.0) for start in (0.0, 4.0, 8.0)]
+    decoded = list(decode_clips(video_path, clips, num_frames=4))
+
+    assert [position for position, _ in decoded] == [0, 1, 2]
+    for position, frames in decoded[:2]:
+        frame_idx = sample_frame_indices(10, clips[position].start_time, 3.0, 4)
+        assert len(frames) == 4
+        for frame, idx in zip(frames, frame_idx):
+            assert np.array_equal(frame, all_frames[idx])
+
+    # Frames past the end are filled with the last decoded frame of the clip
+    _, frames = decoded[2]
+    assert np.array_equal(frames[0], all_frames[80])
+    assert np.array_equal(frames[1], all_frames[87])
+    assert np.array_equal(frames[2], all_frames[95])
+    assert np.array_equal(frames[3], all_frames[95])
+
+
+def test_download_video_from_minio(mocker, tmp_path):
+    """
+    Test that a video is downloaded straight to a file named after the video
+    """
+    mock_minio = mocker.MagicMock()
+    mock_minio.get_video_in_directory.return_value = "video-id/first.mp4"
+    mock_minio.download_video_to_file.side_effect = lambda bucket, obj, path: path
+    mocker.patch("src.core.util.get_minio_client", return_value=mock_minio)
+
+    path = download_video_from_minio("bucket", "video-id", tmp_path / "request")
+
+    assert path == tmp_path / "request" / "first.mp4"
+    assert path.parent.is_dir()
+    mock_minio.download_video_to_file.assert_called_once_with("bucket", "video-id/first.mp4", path)
+
+    path = download_video_from_minio("bucket", "video-id", tmp_path, video_name="other.mp4")
+    assert path == tmp_path / "other.mp4"